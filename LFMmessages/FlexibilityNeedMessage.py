@@ -3,7 +3,7 @@
 """This module contains the message class for the simulation platform request messages."""
 
 from __future__ import annotations
-from typing import Union, List, Dict, Any
+from typing import Union, List, Dict, Any, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage
@@ -295,9 +295,7 @@ class FlexibilityNeedMessage(AbstractResultMessage):
 
     @classmethod
     def from_json(cls, json_message: Dict[str, Any]) -> Union[FlexibilityNeedMessage, None]:
-        if cls.validate_json(json_message):
-            return FlexibilityNeedMessage(**json_message)
-        return None
+        return cast(Union[FlexibilityNeedMessage, None], super().from_json(json_message))
 
 
 FlexibilityNeedMessage.register_to_factory()
@@ -3,7 +3,7 @@
 """This module contains the message class for the simulation platform offer messages."""
 
 from __future__ import annotations
-from typing import Union, Dict, Any, List
+from typing import Union, Dict, Any, List, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage
@@ -346,9 +346,7 @@ class LFMOfferingMessage(AbstractResultMessage):
 
     @classmethod
     def from_json(cls, json_message: Dict[str, Any]) -> Union[LFMOfferingMessage, None]:
-        if cls.validate_json(json_message):
-            return LFMOfferingMessage(**json_message)
-        return None
+        return cast(Union[LFMOfferingMessage, None], super().from_json(json_message))
 
 
 LFMOfferingMessage.register_to_factory()
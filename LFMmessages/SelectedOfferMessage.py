@@ -3,7 +3,7 @@
 """This module contains the message class for the selected offer messages."""
 
 from __future__ import annotations
-from typing import Union, List, Dict, Any
+from typing import Union, List, Dict, Any, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage
@@ -107,9 +107,7 @@ class SelectedOfferMessage(AbstractResultMessage):
 
     @classmethod
     def from_json(cls, json_message: Dict[str, Any]) -> Union[SelectedOfferMessage, None]:
-        if cls.validate_json(json_message):
-            return SelectedOfferMessage(**json_message)
-        return None
+        return cast(Union[SelectedOfferMessage, None], super().from_json(json_message))
 
 
 SelectedOfferMessage.register_to_factory()
@@ -1 +1,14 @@
-import init
\ No newline at end of file
+import init
+
+from tools.message.factory import MessageFactory
+
+# The LFM message classes are registered to the message factory by their message type.
+# The module containing the message class is imported only when the message type is first needed.
+LAZY_MESSAGE_TYPES = {
+    "FlexibilityNeed": "LFMmessages.FlexibilityNeedMessage",
+    "LFMOffering": "LFMmessages.LFMOfferingMessage",
+    "SelectedOffer": "LFMmessages.SelectedOfferMessage"
+}
+
+for lazy_message_type, lazy_module_name in LAZY_MESSAGE_TYPES.items():
+    MessageFactory.register_lazy_message_type(lazy_message_type, lazy_module_name)
@@ -14,7 +14,7 @@
 """This module contains the message class for the simulation platform offer messages."""
 
 from __future__ import annotations
-from typing import Union, Dict, Any, List
+from typing import Union, Dict, Any, List, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage
@@ -160,9 +160,7 @@ class InitCISCustomerInfoMessage(AbstractResultMessage):
 
     @classmethod
     def from_json(cls, json_message: Dict[str, Any]) -> Union[InitCISCustomerInfoMessage, None]:
-        if cls.validate_json(json_message):
-            return InitCISCustomerInfoMessage(**json_message)
-        return None
+        return cast(Union[InitCISCustomerInfoMessage, None], super().from_json(json_message))
 
 
 InitCISCustomerInfoMessage.register_to_factory()
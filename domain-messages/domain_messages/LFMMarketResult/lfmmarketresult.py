@@ -14,7 +14,7 @@
 """This module contains the message class for the simulation platform LFMMarketResult messages."""
 
 from __future__ import annotations
-from typing import Union, Dict, Any, List
+from typing import Union, Dict, Any, List, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage
@@ -362,9 +362,7 @@ class LFMMarketResultMessage(AbstractResultMessage):
 
     @classmethod
     def from_json(cls, json_message: Dict[str, Any]) -> Union[LFMMarketResultMessage, None]:
-        if cls.validate_json(json_message):
-            return LFMMarketResultMessage(**json_message)
-        return None
+        return cast(Union[LFMMarketResultMessage, None], super().from_json(json_message))
 
 
 LFMMarketResultMessage.register_to_factory()
@@ -14,7 +14,7 @@
 """This module contains the message class for the simulation platform offer messages."""
 
 from __future__ import annotations
-from typing import Union, Dict, Any, List
+from typing import Union, Dict, Any, List, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage
@@ -357,9 +357,7 @@ class OfferMessage(AbstractResultMessage):
 
     @classmethod
     def from_json(cls, json_message: Dict[str, Any]) -> Union[OfferMessage, None]:
-        if cls.validate_json(json_message):
-            return OfferMessage(**json_message)
-        return None
+        return cast(Union[OfferMessage, None], super().from_json(json_message))
 
 
 OfferMessage.register_to_factory()
@@ -14,7 +14,7 @@
 """This module contains the message class for the simulation platform request messages."""
 
 from __future__ import annotations
-from typing import Union, List, Dict, Any
+from typing import Union, List, Dict, Any, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage
@@ -306,9 +306,7 @@ class RequestMessage(AbstractResultMessage):
 
     @classmethod
     def from_json(cls, json_message: Dict[str, Any]) -> Union[RequestMessage, None]:
-        if cls.validate_json(json_message):
-            return RequestMessage(**json_message)
-        return None
+        return cast(Union[RequestMessage, None], super().from_json(json_message))
 
 
 RequestMessage.register_to_factory()
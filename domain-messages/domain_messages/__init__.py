@@ -10,4 +10,23 @@
 #            Tanjim <tanjim0023@gmail.com>
 #            Ville Heikkilä <ville.heikkila@tuni.fi>
 #            Ville Mörsky (TAU) <ville.morsky@tuni.fi>
-import init_tools
\ No newline at end of file
+import init_tools
+
+from tools.message.factory import MessageFactory
+
+# The domain message classes are registered to the message factory by their message type.
+# The module containing the message class is imported only when the message type is first needed.
+LAZY_MESSAGE_TYPES = {
+    "ControlState.PowerSetpoint": "domain_messages.ControlState.ControlState_Power_Setpoint",
+    "Init.CIS.CustomerInfo": "domain_messages.InitCISCustomerInfo.initciscustomerinfo",
+    "LFMMarketResult": "domain_messages.LFMMarketResult.lfmmarketresult",
+    "Offer": "domain_messages.Offer.offer",
+    "PriceForecastState": "domain_messages.price_forecaster.price_forecast",
+    "Request": "domain_messages.Request.request",
+    "ResourceForecastState.Dispatch": "domain_messages.dispatch.dispatch",
+    "ResourceForecastState.Power": "domain_messages.resource_forecast.resource_forecast_state",
+    "ResourceState": "domain_messages.resource.resource_state"
+}
+
+for lazy_message_type, lazy_module_name in LAZY_MESSAGE_TYPES.items():
+    MessageFactory.register_lazy_message_type(lazy_message_type, lazy_module_name)
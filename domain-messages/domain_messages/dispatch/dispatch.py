@@ -32,6 +32,8 @@ class DispatchBlock:
     where block is a DispatchBlock. Other helper methods assist in slicing one dispatch message into multiple.
     """
 
+    __slots__ = ("__dispatch",)
+
     DISPATCH_SERIES_UNITS = {"RealPower": "kW"}
 
     def __init__(self, **kwargs):
@@ -14,7 +14,7 @@
 """This module contains the message class for the simulation platform price forecast messages."""
 
 from __future__ import annotations
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Union, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage, AbstractMessage
@@ -193,9 +193,7 @@ class PriceForecastStateMessage(AbstractResultMessage):
     def from_json(cls, json_message: Dict[str, Any]) -> Union[PriceForecastStateMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON is not validated returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Union[PriceForecastStateMessage, None], super().from_json(json_message))
 
 
 PriceForecastStateMessage.register_to_factory()
@@ -14,7 +14,7 @@
 """This module contains the message class for the simulation platform resource state messages."""
 
 from __future__ import annotations
-from typing import Any, Dict, Union
+from typing import Any, Dict, Union, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage, AbstractMessage
@@ -203,9 +203,7 @@ class ResourceStateMessage(AbstractResultMessage):
     def from_json(cls, json_message: Dict[str, Any]) -> Union[ResourceStateMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON is not validated returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Union[ResourceStateMessage, None], super().from_json(json_message))
 
 
 ResourceStateMessage.register_to_factory()
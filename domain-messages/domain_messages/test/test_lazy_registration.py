@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+"""
+Tests for the lazy registration of the domain message classes to the message factory.
+"""
+import subprocess
+import sys
+import unittest
+
+import domain_messages
+
+# The test is run in a new interpreter to make sure that none of the message modules have been imported before.
+LAZY_REGISTRATION_CODE = """
+import sys
+import domain_messages
+from tools.message.factory import MessageFactory
+
+for message_type, module_name in domain_messages.LAZY_MESSAGE_TYPES.items():
+    assert module_name not in sys.modules, module_name
+    assert MessageFactory.has_message_type(message_type), message_type
+
+offer_class = MessageFactory.get_message_class("Offer")
+assert offer_class.__name__ == "OfferMessage"
+assert "domain_messages.Offer.offer" in sys.modules
+assert "domain_messages.Request.request" not in sys.modules
+print("ok")
+"""
+
+
+class TestLazyRegistration(unittest.TestCase):
+    """Unit tests for the lazy registration of the domain message classes."""
+
+    def test_message_types(self):
+        """Test that the lazily registered message types match the message classes."""
+        from tools.message.factory import MessageFactory
+
+        for message_type in domain_messages.LAZY_MESSAGE_TYPES:
+            with self.subTest(message_type=message_type):
+                message_class = MessageFactory.get_message_class(message_type)
+                self.assertIsNotNone(message_class)
+                self.assertEqual(message_class.CLASS_MESSAGE_TYPE, message_type)
+
+    def test_lazy_import(self):
+        """Test that the message modules are imported only when the message type is first needed."""
+        result = subprocess.run(
+            [sys.executable, "-c", LAZY_REGISTRATION_CODE],
+            check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0, result.stderr.decode("UTF-8"))
+        self.assertEqual(result.stdout.decode("UTF-8").strip().splitlines()[-1], "ok")
+
+
+if __name__ == '__main__':
+    unittest.main()
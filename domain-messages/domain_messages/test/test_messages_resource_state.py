@@ -130,6 +130,10 @@ class TestResourceStateMessage(unittest.TestCase):
         self.assertEqual(message_copy.reactive_power, message_full.reactive_power)
         self.assertEqual(message_copy.node, message_full.node)
 
+        # modifying the real power block through its own setter is seen in the bytes representation
+        message_full.real_power.value = 99.0
+        self.assertEqual(json.loads(message_full.bytes().decode("UTF-8"))[REAL_POWER_ATTRIBUTE]["Value"], 99.0)
+
     def test_message_equals(self):
         """Test that equals method works correctly."""
         message_full = ResourceStateMessage(Timestamp=DEFAULT_TIMESTAMP, **MESSAGE_JSON)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Benchmark for the import time of the simulation tools modules and for the time it takes to create
+   the first message object of each message type, i.e. the startup time work that a component has to do.
+
+   Each measurement is done in a new Python interpreter so that the previously imported modules do not affect
+   the results. Usage (from the directory containing the tools package):
+
+       python -m examples.startup_benchmark [--repeat N] [module ...]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+DEFAULT_MODULES = [
+    "tools.messages",
+    "tools.callbacks",
+    "tools.components"
+]
+DEFAULT_REPEAT = 5
+
+# The code that is run in a new interpreter for each measurement.
+# It prints a JSON object containing the measured times in seconds.
+MEASUREMENT_CODE = """
+import json, sys, time
+start_time = time.perf_counter()
+import {module_name}
+import_time = time.perf_counter() - start_time
+
+from tools.message.factory import MessageFactory
+first_message_times = {{}}
+for message_type in MessageFactory.get_message_types():
+    start_time = time.perf_counter()
+    message_class = MessageFactory.get_message_class(message_type)
+    first_message_times[message_type] = time.perf_counter() - start_time
+print(json.dumps({{
+    "import": import_time,
+    "modules": len(sys.modules),
+    "message_types": first_message_times
+}}))
+"""
+
+
+def measure(module_name: str) -> Dict[str, float]:
+    """Returns the import time and the first message class resolution times for the given module
+       as measured in a new interpreter."""
+    environment = {**os.environ, "SIMULATION_LOG_LEVEL": "50"}
+    result = subprocess.run(
+        [sys.executable, "-c", MEASUREMENT_CODE.format(module_name=module_name)],
+        check=True, stdout=subprocess.PIPE, env=environment)
+    return json.loads(result.stdout.decode("UTF-8").strip().splitlines()[-1])
+
+
+def run_benchmark(module_names: List[str], repeat: int):
+    """Prints the median import time and the median class resolution times for the given modules."""
+    for module_name in module_names:
+        results = [measure(module_name) for _ in range(repeat)]
+        import_times = [result["import"] for result in results]
+        print("{:s}: import {:.1f} ms (median of {:d}), {:d} modules loaded".format(
+            module_name, statistics.median(import_times) * 1000, repeat, results[0]["modules"]))
+
+        for message_type in results[0]["message_types"]:
+            message_type_times = [result["message_types"][message_type] for result in results]
+            print("    first {:s} message class: {:.2f} ms".format(
+                message_type, statistics.median(message_type_times) * 1000))
+
+
+def main():
+    """Parses the command line arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description="Measures the startup time of the simulation tools modules.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="the modules to import")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="the number of measurements")
+    arguments = parser.parse_args()
+    run_benchmark(arguments.modules, arguments.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,23 +6,287 @@
 
 """This module contains classes for the callbacks for the RabbitMQ message bus listeners."""
 
+from __future__ import annotations
+
 import asyncio
+import collections
 import inspect
 import json
-from typing import Awaitable, Callable, Union
+import logging
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, OrderedDict, Tuple, Union
 
 import aio_pika.message
 
+from tools import serialization
 from tools.exceptions.messages import MessageError
+from tools.executors import WorkerPool
+from tools.metrics import METRICS, DECODE_DURATION, RECEIVED_MESSAGES
 from tools.messages import (
     AbstractMessage, AbstractResultMessage, BaseMessage, EpochMessage, GeneralMessage,
     SimulationStateMessage, StatusMessage, MessageFactory)
-from tools.tools import FullLogger
+from tools.tools import FullLogger, LogSampler
 
 CallbackFunctionType = Callable[[Union[BaseMessage, dict, str], str], Awaitable[None]]
 
 LOGGER = FullLogger(__name__)
 
+MessageIdentifier = Tuple[str, str]
+DecodedMessageType = Union[BaseMessage, Dict[str, Any], str]
+
+
+def get_attribute_pattern(attribute_name: str) -> re.Pattern[bytes]:
+    """Returns a regular expression pattern that matches a string valued attribute in a JSON formatted bytes object.
+       The first group in the pattern will contain the attribute value without the quotation marks."""
+    return re.compile(b'"' + re.escape(attribute_name.encode("UTF-8")) + rb'"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def get_integer_attribute_pattern(attribute_name: str) -> re.Pattern[bytes]:
+    """Returns a regular expression pattern that matches an integer valued attribute in a JSON formatted bytes object.
+       The first group in the pattern will contain the attribute value."""
+    return re.compile(b'"' + re.escape(attribute_name.encode("UTF-8")) + rb'"\s*:\s*(-?[0-9]+)')
+
+
+class MessageHeader:
+    """Class for holding the header attributes (Type, SimulationId, EpochNumber and SourceProcessId) of a message.
+       The header is read directly from the raw message body without decoding the full message and it can be used
+       to reject unwanted messages before the expensive message object construction. The first occurrence of each
+       attribute in the message body is used. The attributes that could not be found are set to None.
+    """
+    MESSAGE_TYPE_PATTERN = get_attribute_pattern("Type")
+    SIMULATION_ID_PATTERN = get_attribute_pattern("SimulationId")
+    EPOCH_NUMBER_PATTERN = get_integer_attribute_pattern("EpochNumber")
+    SOURCE_PROCESS_ID_PATTERN = get_attribute_pattern("SourceProcessId")
+
+    def __init__(self, message_type: Optional[str] = None, simulation_id: Optional[str] = None,
+                 epoch_number: Optional[int] = None, source_process_id: Optional[str] = None):
+        self.__message_type = message_type
+        self.__simulation_id = simulation_id
+        self.__epoch_number = epoch_number
+        self.__source_process_id = source_process_id
+
+    @property
+    def message_type(self) -> Optional[str]:
+        """The message type, i.e. the Type attribute, or None if it was not found."""
+        return self.__message_type
+
+    @property
+    def simulation_id(self) -> Optional[str]:
+        """The simulation id, i.e. the SimulationId attribute, or None if it was not found."""
+        return self.__simulation_id
+
+    @property
+    def epoch_number(self) -> Optional[int]:
+        """The epoch number, i.e. the EpochNumber attribute, or None if it was not found."""
+        return self.__epoch_number
+
+    @property
+    def source_process_id(self) -> Optional[str]:
+        """The source process id, i.e. the SourceProcessId attribute, or None if it was not found."""
+        return self.__source_process_id
+
+    @classmethod
+    def from_bytes(cls, message_body: bytes) -> MessageHeader:
+        """Returns the header for the given raw message body."""
+        epoch_number_match = cls.EPOCH_NUMBER_PATTERN.search(message_body)
+        return cls(
+            message_type=cls.__get_string_value(cls.MESSAGE_TYPE_PATTERN, message_body),
+            simulation_id=cls.__get_string_value(cls.SIMULATION_ID_PATTERN, message_body),
+            epoch_number=int(epoch_number_match.group(1)) if epoch_number_match is not None else None,
+            source_process_id=cls.__get_string_value(cls.SOURCE_PROCESS_ID_PATTERN, message_body)
+        )
+
+    @classmethod
+    def from_json(cls, json_message: Any) -> MessageHeader:
+        """Returns the header for the given already decoded message, e.g. a message received in MessagePack format."""
+        if not isinstance(json_message, dict):
+            return cls()
+        epoch_number = json_message.get("EpochNumber", None)
+        return cls(
+            message_type=cls.__get_json_string_value(json_message, "Type"),
+            simulation_id=cls.__get_json_string_value(json_message, "SimulationId"),
+            epoch_number=epoch_number if isinstance(epoch_number, int) else None,
+            source_process_id=cls.__get_json_string_value(json_message, "SourceProcessId")
+        )
+
+    @staticmethod
+    def __get_json_string_value(json_message: Dict[str, Any], attribute_name: str) -> Optional[str]:
+        """Returns the string value for the given attribute or None if there is no such string valued attribute."""
+        value = json_message.get(attribute_name, None)
+        return value if isinstance(value, str) else None
+
+    @staticmethod
+    def __get_string_value(pattern: re.Pattern[bytes], message_body: bytes) -> Optional[str]:
+        """Returns the first value matching the given attribute pattern or None if there is no match."""
+        value_match = pattern.search(message_body)
+        if value_match is None:
+            return None
+        return value_match.group(1).decode(MessageCallback.MESSAGE_CODING)
+
+    def __str__(self) -> str:
+        return "Type: {}, SimulationId: {}, EpochNumber: {}, SourceProcessId: {}".format(
+            self.message_type, self.simulation_id, self.epoch_number, self.source_process_id)
+
+
+# The prefilter function is called with the message header and the topic name and
+# it should return True if the message should be handled and False if the message should be discarded.
+MessagePrefilterType = Callable[[MessageHeader, str], bool]
+
+
+class MessageDeduplicator:
+    """Class for detecting repeated deliveries of the same message.
+       The messages are identified by the (SourceProcessId, MessageId) pair that is read directly from
+       the raw message body without decoding the full message. A bounded number of the recently seen identifiers
+       is stored and the identifiers older than the given maximum age are forgotten.
+    """
+    DEFAULT_MAX_SIZE = 10000
+    DEFAULT_MAX_AGE = 3600.0  # in seconds
+
+    # should be "SourceProcessId" and "MessageId"
+    SOURCE_PROCESS_ID_ATTRIBUTE, MESSAGE_ID_ATTRIBUTE = AbstractMessage.MESSAGE_ATTRIBUTES
+    SOURCE_PROCESS_ID_PATTERN = get_attribute_pattern(SOURCE_PROCESS_ID_ATTRIBUTE)
+    MESSAGE_ID_PATTERN = get_attribute_pattern(MESSAGE_ID_ATTRIBUTE)
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, max_age: float = DEFAULT_MAX_AGE):
+        """Creates a new deduplicator.
+           - max_size  : the maximum number of message identifiers that are remembered
+           - max_age   : the time in seconds after which a message identifier is forgotten
+        """
+        self.__max_size = max(max_size, 1)
+        self.__max_age = max_age
+        # message identifier => the time the identifier was first seen, in the order of arrival
+        self.__seen_messages: OrderedDict[MessageIdentifier, float] = collections.OrderedDict()
+        self.__duplicate_count = 0
+
+    @property
+    def max_size(self) -> int:
+        """The maximum number of message identifiers that are remembered."""
+        return self.__max_size
+
+    @property
+    def max_age(self) -> float:
+        """The time in seconds after which a message identifier is forgotten."""
+        return self.__max_age
+
+    @property
+    def duplicate_count(self) -> int:
+        """The total number of the detected duplicate messages."""
+        return self.__duplicate_count
+
+    def __len__(self) -> int:
+        return len(self.__seen_messages)
+
+    @classmethod
+    def get_message_identifier(cls, message_body: Union[bytes, Dict[str, Any]]) -> Optional[MessageIdentifier]:
+        """Returns the (SourceProcessId, MessageId) pair for the given raw message body or already decoded message.
+           Returns None if either of the attributes could not be found."""
+        if isinstance(message_body, dict):
+            source_process_id = message_body.get(cls.SOURCE_PROCESS_ID_ATTRIBUTE, None)
+            message_id = message_body.get(cls.MESSAGE_ID_ATTRIBUTE, None)
+            if not isinstance(source_process_id, str) or not isinstance(message_id, str):
+                return None
+            return source_process_id, message_id
+
+        source_process_id_match = cls.SOURCE_PROCESS_ID_PATTERN.search(message_body)
+        if source_process_id_match is None:
+            return None
+        message_id_match = cls.MESSAGE_ID_PATTERN.search(message_body)
+        if message_id_match is None:
+            return None
+
+        return (
+            source_process_id_match.group(1).decode(MessageCallback.MESSAGE_CODING),
+            message_id_match.group(1).decode(MessageCallback.MESSAGE_CODING)
+        )
+
+    def is_duplicate(self, message_body: Union[bytes, Dict[str, Any]]) -> bool:
+        """Returns True, if a message with the same identifier as the given raw message body or already decoded
+           message has been seen recently.
+           Otherwise, registers the message identifier and returns False.
+           The messages without an identifier are never considered as duplicates."""
+        return self.is_duplicate_identifier(self.get_message_identifier(message_body))
+
+    def is_duplicate_identifier(self, message_identifier: Optional[MessageIdentifier]) -> bool:
+        """Returns True, if the given (SourceProcessId, MessageId) pair has been seen recently.
+           Otherwise, registers the message identifier and returns False. None is never considered as a duplicate."""
+        if message_identifier is None:
+            return False
+
+        current_time = time.monotonic()
+        self.__remove_old_identifiers(current_time)
+
+        if message_identifier in self.__seen_messages:
+            self.__duplicate_count += 1
+            return True
+
+        self.__seen_messages[message_identifier] = current_time
+        if len(self.__seen_messages) > self.__max_size:
+            self.__seen_messages.popitem(last=False)
+        return False
+
+    def clear(self) -> None:
+        """Forgets all the seen message identifiers."""
+        self.__seen_messages.clear()
+
+    def __remove_old_identifiers(self, current_time: float) -> None:
+        """Removes the identifiers that are older than the maximum age."""
+        oldest_allowed_time = current_time - self.__max_age
+        while self.__seen_messages:
+            oldest_time = next(iter(self.__seen_messages.values()))
+            if oldest_time >= oldest_allowed_time:
+                break
+            self.__seen_messages.popitem(last=False)
+
+
+def decode_message(message_body: bytes, content_type: Optional[str], message_type: Optional[str] = None,
+                   decoded_json: Optional[Any] = None) -> Tuple[DecodedMessageType, str]:
+    """Creates a message object from the given raw message body and returns it together with the message type
+       that was used. If the message does not conform to the message definitions, the decoded JSON object is
+       returned instead of the message object. If the message could not be decoded, the message body is returned
+       as a string.
+
+       If message_type is None, the message type is determined by the "Type" attribute.
+       If decoded_json is given, it is used instead of decoding the message body again.
+       The function is defined at the module level so that it can be run in a worker process.
+    """
+    expected_message_type = MessageCallback.DEFAULT_MESSAGE_TYPE
+    message_json = {}
+    try:
+        if decoded_json is not None:
+            message_json = decoded_json
+        else:
+            # the message body is parsed directly from bytes without decoding it to a string first
+            message_json = serialization.decode(message_body, content_type)
+
+        if message_type is None:
+            # Convert the message to the specified special cases if possible.
+            expected_message_type = message_json.get(
+                MessageCallback.MESSAGE_TYPE_ATTRIBUTE,
+                MessageCallback.DEFAULT_MESSAGE_TYPE)
+            if not MessageFactory.has_message_type(expected_message_type):
+                expected_message_type = MessageCallback.DEFAULT_MESSAGE_TYPE
+        else:
+            expected_message_type = message_type
+
+        message_object = MessageFactory.get_message(
+            message_type=expected_message_type,
+            **message_json,
+        )
+
+    except serialization.DECODE_ERRORS:
+        LOGGER.warning("Received message could not be decoded into JSON format.")
+        message_object = message_body.decode(MessageCallback.MESSAGE_CODING, errors="replace")
+    except (TypeError, ValueError, MessageError) as message_error:
+        # The message did not conform to the simulation platform message schema or
+        # the message type was not supported by the message factory.
+        LOGGER.warning("Received {:s} error when creating message object: {:s}".format(
+            type(message_error).__name__, str(message_error)
+        ))
+        message_object = message_json
+
+    return message_object, expected_message_type
+
 
 class MessageCallback():
     """The callback class for handling received messages that are instances of AbstractMessage.
@@ -32,7 +296,9 @@ class MessageCallback():
     MESSAGE_TYPE_ATTRIBUTE = next(iter(BaseMessage.MESSAGE_ATTRIBUTES))  # should be "Type"
     DEFAULT_MESSAGE_TYPE = GeneralMessage.CLASS_MESSAGE_TYPE
 
-    def __init__(self, callback_function: CallbackFunctionType, message_type: Union[str, None] = None):
+    def __init__(self, callback_function: CallbackFunctionType, message_type: Union[str, None] = None,
+                 deduplicator: Optional[MessageDeduplicator] = None, prefilter: Optional[MessagePrefilterType] = None,
+                 worker_pool: Optional[WorkerPool] = None):
         """Sets up a callback that receives incoming messages from the message bus, transforms the received object
            to an instance of BaseMessage and sends the transformed object to the given callback_function.
 
@@ -47,17 +313,47 @@ class MessageCallback():
            If message_type is None, the actual type for the transformed message is determined by the "Type" attribute.
            Otherwise, the given message type is used for as transformed message type.
            The legal string for the parameter message_type are defined in tools.messages.MESSAGE_TYPES
+
+           If deduplicator is given, it is used to drop the repeated deliveries of the same message before
+           the message is decoded. The callback_function is not called for the dropped messages.
+
+           If prefilter is given, it is called with the message header (read from the raw message body) and
+           the topic name before the message is decoded. If the prefilter returns False, the message is discarded
+           without calling the callback_function.
+
+           If worker_pool is given and it is enabled, the messages that are larger than the decode threshold
+           of the pool are decoded in the pool so that the event loop is not blocked while decoding them.
         """
         self.__lock = asyncio.Lock()
         self.__callback_function = callback_function
+        self.__deduplicator = deduplicator
+        self.__prefilter = prefilter
+        self.__worker_pool = worker_pool
 
-        if message_type is not None and message_type not in MessageFactory.get_message_types():
+        if message_type is not None and not MessageFactory.has_message_type(message_type):
             self.__message_type = self.__class__.DEFAULT_MESSAGE_TYPE
         else:
             self.__message_type = message_type
 
         self.__last_message = None
         self.__last_topic = None
+        self.__log_sampler = LogSampler()
+
+    @property
+    def deduplicator(self) -> Optional[MessageDeduplicator]:
+        """Returns the deduplicator used to drop repeated messages or None if no deduplication is done."""
+        return self.__deduplicator
+
+    @property
+    def prefilter(self) -> Optional[MessagePrefilterType]:
+        """Returns the prefilter function for the received messages or None if no prefilter is used."""
+        return self.__prefilter
+
+    @property
+    def worker_pool(self) -> Optional[WorkerPool]:
+        """Returns the worker pool used to decode the large messages or None if all messages are decoded
+           in the event loop."""
+        return self.__worker_pool
 
     @property
     def last_message(self) -> Union[BaseMessage, dict, str, None]:
@@ -72,79 +368,88 @@ class MessageCallback():
     def log_last_message(self) -> None:
         """Writes a log message based on the last received message."""
         if isinstance(self.last_message, SimulationStateMessage):
-            LOGGER.info("Received simulation state message '{:s}' from '{:s}'".format(
-                self.last_message.simulation_state, self.last_message.source_process_id))
+            LOGGER.info("Received simulation state message '%s' from '%s'",
+                        self.last_message.simulation_state, self.last_message.source_process_id)
         elif isinstance(self.last_message, EpochMessage):
-            LOGGER.info("Epoch message received from '{:s}' for epoch number {:d} ({:s} - {:s})".format(
-                self.last_message.source_process_id,
-                self.last_message.epoch_number,
-                self.last_message.start_time,
-                self.last_message.end_time))
+            LOGGER.info("Epoch message received from '%s' for epoch number %d (%s - %s)",
+                        self.last_message.source_process_id,
+                        self.last_message.epoch_number,
+                        self.last_message.start_time,
+                        self.last_message.end_time)
         elif isinstance(self.last_message, StatusMessage):
-            LOGGER.info("Status message received from '{:s}' for epoch number {:d} with value: {:s}".format(
-                self.last_message.source_process_id,
-                self.last_message.epoch_number,
-                self.last_message.value))
+            LOGGER.info("Status message received from '%s' for epoch number %d with value: %s",
+                        self.last_message.source_process_id,
+                        self.last_message.epoch_number,
+                        self.last_message.value)
         elif isinstance(self.last_message, AbstractResultMessage):
-            LOGGER.info("Received '{:s}' message from '{:s}' for epoch {:d}".format(
-                self.last_message.message_type,
-                self.last_message.source_process_id,
-                self.last_message.epoch_number))
+            LOGGER.info("Received '%s' message from '%s' for epoch %d",
+                        self.last_message.message_type,
+                        self.last_message.source_process_id,
+                        self.last_message.epoch_number)
         elif isinstance(self.last_message, AbstractMessage):
-            LOGGER.info("Received '{:s}' message from '{:s}' on topic '{:s}'".format(
-                self.last_message.message_type,
-                self.last_message.source_process_id,
-                self.last_topic))
+            LOGGER.info("Received '%s' message from '%s' on topic '%s'",
+                        self.last_message.message_type,
+                        self.last_message.source_process_id,
+                        self.last_topic)
         elif isinstance(self.last_message, BaseMessage):
-            LOGGER.info("Received message from topic '{:s}'".format(self.last_topic))
+            LOGGER.info("Received message from topic '%s'", self.last_topic)
         elif isinstance(self.last_message, dict):
-            LOGGER.info("Received a JSON message with errors: '{:s}'".format(json.dumps(self.last_message)))
+            if LOGGER.is_enabled_for(logging.INFO):
+                LOGGER.info("Received a JSON message with errors: '%s'", json.dumps(self.last_message))
         elif self.last_message is None:
             LOGGER.warning("No last message found.")
         else:
-            LOGGER.warning("The last message in unknown format: '{:s}'".format(str(self.last_message)))
+            LOGGER.warning("The last message in unknown format: '%s'", self.last_message)
 
     async def callback(self, message: aio_pika.message.IncomingMessage) -> None:
         """Callback function for the received messages from the message bus.
            Transforms the message to an instance of AbstractMessage and sends it to the callback_function.
         """
+        # The JSON messages are handled directly from the raw bytes in the prefilter and in the deduplicator.
+        # Other formats, i.e. MessagePack, must be decoded first.
+        decoded_json = None
+        if serialization.is_msgpack_content_type(message.content_type):
+            try:
+                decoded_json = serialization.decode(message.body, message.content_type)
+            except serialization.DECODE_ERRORS:
+                pass  # the error is handled below when the message is decoded again
+        message_header_source = decoded_json if isinstance(decoded_json, dict) else message.body
+
+        if self.__prefilter is not None:
+            message_header = (
+                MessageHeader.from_json(message_header_source) if isinstance(message_header_source, dict)
+                else MessageHeader.from_bytes(message_header_source))
+            if not self.__prefilter(message_header, message.routing_key):
+                LOGGER.debug("Discarded a message from topic '%s' based on the message header", message.routing_key)
+                return
+        if self.__deduplicator is not None and self.__deduplicator.is_duplicate(message_header_source):
+            LOGGER.debug("Dropped a duplicate message from topic '%s'", message.routing_key)
+            return
+
         # Use a lock to be able to handle each incoming message one at a time.
         async with self.__lock:
-            message_str = ""
-            message_json = {}
-            try:
-                message_str = message.body.decode(MessageCallback.MESSAGE_CODING)
-                message_json = json.loads(message_str)
-
-                if self.__message_type is None:
-                    # Convert the message to the specified special cases if possible.
-                    expected_message_type = message_json.get(
-                        self.__class__.MESSAGE_TYPE_ATTRIBUTE,
-                        self.__class__.DEFAULT_MESSAGE_TYPE)
-                    if expected_message_type not in MessageFactory.get_message_types():
-                        expected_message_type = self.__class__.DEFAULT_MESSAGE_TYPE
-                else:
-                    expected_message_type = self.__message_type
-
-                message_object = MessageFactory.get_message(
-                    message_type=expected_message_type,
-                    **message_json,
-                )
-
-            except json.decoder.JSONDecodeError:
-                LOGGER.warning("Received message could not be decoded into JSON format.")
-                message_object = message_str
-            except (TypeError, ValueError, MessageError) as message_error:
-                # The message did not conform to the simulation platform message schema or
-                # the message type was not supported by the message factory.
-                LOGGER.warning("Received {:s} error when creating message object: {:s}".format(
-                    type(message_error).__name__, str(message_error)
-                ))
-                message_object = message_json
+            decode_start_time = time.perf_counter() if METRICS.enabled else 0.0
+            if (decoded_json is None and self.__worker_pool is not None and
+                    self.__worker_pool.should_decode(len(message.body))):
+                # large messages are decoded outside the event loop, the lock keeps the messages in order
+                message_object, expected_message_type = await self.__worker_pool.run(
+                    decode_message, message.body, message.content_type, self.__message_type)
+            else:
+                message_object, expected_message_type = decode_message(
+                    message.body, message.content_type, self.__message_type, decoded_json)
+
+            if METRICS.enabled:
+                METRICS.observe(DECODE_DURATION, time.perf_counter() - decode_start_time,
+                                message_type=expected_message_type)
+                METRICS.increment(RECEIVED_MESSAGES, message_type=expected_message_type)
 
             self.__last_message = message_object
             self.__last_topic = message.routing_key
-            self.log_last_message()
+            if not isinstance(message_object, BaseMessage):
+                # messages with errors are always logged
+                self.log_last_message()
+            elif LOGGER.is_enabled_for(logging.INFO) and self.__log_sampler.should_log(message.routing_key):
+                self.log_last_message()
 
             if inspect.iscoroutinefunction(self.__callback_function):
                 asyncio.create_task(self.__callback_function(message_object, message.routing_key))
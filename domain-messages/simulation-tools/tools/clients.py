@@ -7,23 +7,38 @@
 """This module contains a client class for sending and listening to messages using a RabbitMQ message bus."""
 
 import asyncio
+import logging
+import math
+import random
+import time
 from typing import Dict, List, Optional, Tuple, Union, cast
 
 import aio_pika
 from aio_pika.exceptions import CONNECTION_EXCEPTIONS
 
-from tools.callbacks import CallbackFunctionType, MessageCallback
+from tools import serialization
+from tools.callbacks import CallbackFunctionType, MessageCallback, MessageDeduplicator, MessagePrefilterType
+from tools.executors import WORKER_POOL
 from tools.messages import AbstractMessage
+from tools.metrics import METRICS, ENCODE_DURATION, PUBLISH_DURATION, SENT_MESSAGES
+from tools.outbox import MessageOutbox
 from tools.tools import (
-    FullLogger, handle_async_exception, load_environmental_variables,
+    FullLogger, LogSampler, handle_async_exception, load_environmental_variables,
     EnvironmentVariableType, EnvironmentVariableValue)
 
 LOGGER = FullLogger(__name__)
+SEND_LOG_SAMPLER = LogSampler()
+RECEIVE_LOG_SAMPLER = LogSampler()
 aio_pika.robust_connection.log = LOGGER.logger
 
+# The maximum wait time in seconds between reconnection attempts.
 RECONNECT_INTERVAL = 30
+# The base wait time in seconds for the exponential backoff between reconnection attempts.
 CONNECTION_CREATION_INTERVAL = 5
 MAX_CONNECTION_TRIES = 18
+# The total time in seconds that is spent trying to create a new connection before giving up.
+# Matches the total wait time of the earlier linearly increasing intervals (5 + 10 + ... + 85 seconds).
+RECONNECT_TIMEOUT = 765
 
 
 def default_env_variable_definitions() -> List[Tuple[str, EnvironmentVariableType, EnvironmentVariableValue]]:
@@ -40,7 +55,14 @@ def default_env_variable_definitions() -> List[Tuple[str, EnvironmentVariableTyp
         (env_variable_name("ssl_version"), str, "PROTOCOL_TLS"),
         (env_variable_name("exchange"), str, ""),
         (env_variable_name("exchange_autodelete"), bool, False),
-        (env_variable_name("exchange_durable"), bool, False)
+        (env_variable_name("exchange_durable"), bool, False),
+        (env_variable_name("reconnect_base_interval"), float, CONNECTION_CREATION_INTERVAL),
+        (env_variable_name("reconnect_max_interval"), float, RECONNECT_INTERVAL),
+        (env_variable_name("reconnect_max_tries"), int, MAX_CONNECTION_TRIES),
+        (env_variable_name("reconnect_timeout"), float, RECONNECT_TIMEOUT),
+        (env_variable_name("outbox_size"), int, 10000),
+        (env_variable_name("outbox_memory_size"), int, 1000),
+        (env_variable_name("outbox_file"), str, "")
     ]
 
 
@@ -57,16 +79,23 @@ def load_config_from_env_variables() -> Dict[str, Optional[EnvironmentVariableVa
     }
 
 
-def validate_message(topic_name: str, message_to_publish: Union[bytes, AbstractMessage]) \
+def validate_message(topic_name: str, message_to_publish: Union[bytes, AbstractMessage],
+                     content_type: str = serialization.CONTENT_TYPE_JSON) \
         -> Union[Tuple[None, None], Tuple[str, bytes]]:
     """Validates the message received from a queue for publishing.
+       The message objects are encoded to bytes using the format given by the content type,
+       except for the control messages (Epoch, SimState and Status) which are always encoded as JSON.
        Returns a tuple (topic_name: str, message_to_publish: bytes) if the message is valid.
        Otherwise, returns (None, None)."""
     # Note: no checking for the contents of the message are done currently.
     if not isinstance(topic_name, str):
         topic_name = str(topic_name)
     if isinstance(message_to_publish, AbstractMessage):
-        message_to_publish = message_to_publish.bytes()
+        content_type = serialization.get_message_content_type(message_to_publish.message_type, content_type)
+        if serialization.is_msgpack_content_type(content_type):
+            message_to_publish = serialization.encode(message_to_publish.json(), content_type)
+        else:
+            message_to_publish = message_to_publish.bytes()
 
     if topic_name == "":
         LOGGER.warning("Topic name for the message to publish was empty.")
@@ -79,6 +108,16 @@ def validate_message(topic_name: str, message_to_publish: Union[bytes, AbstractM
     return topic_name, message_to_publish
 
 
+def get_message_log_string(message_body: bytes, content_type: Optional[str]) -> str:
+    """Returns a string representation of the given message body for logging purposes."""
+    if serialization.is_msgpack_content_type(content_type):
+        try:
+            return str(serialization.decode(message_body, content_type))
+        except ValueError:
+            return str(message_body)
+    return message_body.decode(RabbitmqClient.MESSAGE_ENCODING, errors="replace")
+
+
 class RabbitmqExchangeParameters:
     """Class for holding the parameters required for declaring an exchange for RabbitMQ message bus."""
     def __init__(self, exchange_name: str, exchange_autodelete: bool, exchange_durable: bool):
@@ -102,13 +141,88 @@ class RabbitmqExchangeParameters:
         return self.__durable
 
 
+class ReconnectPolicy:
+    """Class for determining the wait times between reconnection attempts to the RabbitMQ message bus.
+       Uses exponential backoff with full jitter, i.e. the wait time before the attempt number n (starting from 0)
+       is a random value between 0 and min(max_interval, base_interval * 2^n). The randomness prevents all the
+       components in a large simulation from trying to reconnect at the same time after a message bus restart.
+
+       The retry budget for creating a new connection is the total time given by timeout. Since the randomized
+       wait times are on average shorter than the maximum, a fixed number of attempts would give up much earlier
+       than intended. If timeout is 0, the number of attempts is limited by max_tries instead.
+    """
+    def __init__(self, base_interval: float, max_interval: float, max_tries: int, timeout: float = 0.0):
+        self.__base_interval = max(base_interval, 0.0)
+        self.__max_interval = max(max_interval, self.__base_interval)
+        self.__max_tries = max_tries
+        self.__timeout = max(timeout, 0.0)
+
+    @property
+    def base_interval(self) -> float:
+        """The base wait time in seconds for the exponential backoff."""
+        return self.__base_interval
+
+    @property
+    def max_interval(self) -> float:
+        """The maximum wait time in seconds between two attempts."""
+        return self.__max_interval
+
+    @property
+    def max_tries(self) -> int:
+        """The maximum number of attempts when creating a new connection."""
+        return self.__max_tries
+
+    @property
+    def timeout(self) -> float:
+        """The total time in seconds spent trying to create a new connection, 0 means that max_tries is used."""
+        return self.__timeout
+
+    def should_retry(self, failed_attempts: int, elapsed_time: float) -> bool:
+        """Returns True if a new connection attempt should be made after the given number of failed attempts
+           that have taken the given time in seconds."""
+        if self.__timeout > 0:
+            return elapsed_time < self.__timeout
+        return failed_attempts < self.__max_tries
+
+    def get_delay(self, attempt_number: int, elapsed_time: Optional[float] = None) -> float:
+        """Returns the wait time in seconds before the given attempt (0 for the first retry).
+           If the elapsed time since the first attempt is given, the wait time does not extend past the timeout."""
+        # the exponent is limited to avoid overflow with large attempt numbers
+        backoff_interval = min(self.__max_interval, self.__base_interval * 2 ** min(max(attempt_number, 0), 32))
+        delay = random.uniform(0.0, backoff_interval)
+        if elapsed_time is not None and self.__timeout > 0:
+            delay = min(delay, max(self.__timeout - elapsed_time, 0.0))
+        return delay
+
+    def get_robust_reconnect_interval(self) -> int:
+        """Returns a randomized reconnect interval in whole seconds for the aio_pika robust connection
+           that is kept the same for the lifetime of the connection."""
+        min_interval = max(math.ceil(self.__base_interval), 1)
+        return random.randint(min_interval, max(min_interval, int(self.__max_interval)))
+
+    async def wait(self, attempt_number: int) -> float:
+        """Sleeps before the given attempt and returns the time slept in seconds."""
+        delay = self.get_delay(attempt_number)
+        await asyncio.sleep(delay)
+        return delay
+
+
+DEFAULT_RECONNECT_POLICY = ReconnectPolicy(
+    base_interval=CONNECTION_CREATION_INTERVAL,
+    max_interval=RECONNECT_INTERVAL,
+    max_tries=MAX_CONNECTION_TRIES,
+    timeout=RECONNECT_TIMEOUT)
+
+
 class RabbitmqConnection:
     """Class for holding a RabbitMQ connection including the channel and exchange.
        This is mainly intended for the use of RabbitmqClient objects.
     """
-    def __init__(self, connection_parameters: dict, exchange_parameters: RabbitmqExchangeParameters):
+    def __init__(self, connection_parameters: dict, exchange_parameters: RabbitmqExchangeParameters,
+                 reconnect_policy: ReconnectPolicy = DEFAULT_RECONNECT_POLICY):
         self.__connection_parameters = connection_parameters
         self.__exchange_parameters = exchange_parameters
+        self.__reconnect_policy = reconnect_policy
 
         self.__rabbitmq_connection = None
         self.__rabbitmq_channel = None
@@ -119,43 +233,43 @@ class RabbitmqConnection:
            If the connection has been closed, tries to create a new connection."""
         if self.__rabbitmq_connection is None or self.__rabbitmq_connection.is_closed:
             connection_created = False
-            connection_creation_interval = 0.0
+            giving_up = False
             connection_try_number = 0
+            first_attempt_time = time.monotonic()
 
-            async def update_connection_attempt_variables(try_number: int, interval: float) -> Tuple[int, float]:
+            async def update_connection_attempt_variables(try_number: int) -> int:
+                nonlocal giving_up
                 try_number += 1
-                interval += CONNECTION_CREATION_INTERVAL
+                elapsed_time = time.monotonic() - first_attempt_time
 
-                if try_number < MAX_CONNECTION_TRIES:
-                    LOGGER.info("Trying to create the connection again in {} seconds.".format(
-                        interval))
+                if self.__reconnect_policy.should_retry(try_number, elapsed_time):
+                    interval = self.__reconnect_policy.get_delay(try_number - 1, elapsed_time)
+                    LOGGER.info("Trying to create the connection again in {:.1f} seconds.".format(interval))
                     await asyncio.sleep(interval)
                 else:
                     LOGGER.error("Giving up on trying to connect to the RabbitMQ message bus.")
                     self.__rabbitmq_connection = None
+                    giving_up = True
 
-                return try_number, interval
+                return try_number
 
-            while not connection_created and connection_try_number < MAX_CONNECTION_TRIES:
+            while not connection_created and not giving_up:
                 try:
                     LOGGER.debug("Creating new connection to RabbitMQ message bus")
                     self.__rabbitmq_connection = await aio_pika.connect_robust(
-                        reconnect_interval=RECONNECT_INTERVAL,
+                        reconnect_interval=self.__reconnect_policy.get_robust_reconnect_interval(),
                         **self.__connection_parameters,
                     )
 
                     if not self.__rabbitmq_connection.is_closed:
                         connection_created = True
                     else:
-                        connection_try_number, connection_creation_interval = \
-                            await update_connection_attempt_variables(
-                                connection_try_number, connection_creation_interval)
+                        connection_try_number = await update_connection_attempt_variables(connection_try_number)
 
                 except CONNECTION_EXCEPTIONS as connection_error:
                     LOGGER.warning("When creating RabbitMQ connection, received: {} : {}".format(
                         type(connection_error).__name__, connection_error))
-                    connection_try_number, connection_creation_interval = \
-                        await update_connection_attempt_variables(connection_try_number, connection_creation_interval)
+                    connection_try_number = await update_connection_attempt_variables(connection_try_number)
 
             self.__rabbitmq_channel = None
             self.__rabbitmq_exchange = None
@@ -231,7 +345,22 @@ class RabbitmqClient:
     EXCHANGE_ATTRIBUTE_DURABLE = "exchange_durable"
     EXCHANGE_PARAMETERS = [EXCHANGE_ATTRIBUTE_NAME, EXCHANGE_ATTRIBUTE_AUTODELETE, EXCHANGE_ATTRIBUTE_DURABLE]
 
-    FULL_ATTRIBUTE_NAME_LIST = CONNECTION_PARAMTERS + [OPTIONAL_SSL_PARAMETER] + EXCHANGE_PARAMETERS
+    OUTBOX_ATTRIBUTE_SIZE = "outbox_size"
+    OUTBOX_ATTRIBUTE_MEMORY_SIZE = "outbox_memory_size"
+    OUTBOX_ATTRIBUTE_FILE = "outbox_file"
+    OUTBOX_PARAMETERS = [OUTBOX_ATTRIBUTE_SIZE, OUTBOX_ATTRIBUTE_MEMORY_SIZE, OUTBOX_ATTRIBUTE_FILE]
+
+    RECONNECT_ATTRIBUTE_BASE_INTERVAL = "reconnect_base_interval"
+    RECONNECT_ATTRIBUTE_MAX_INTERVAL = "reconnect_max_interval"
+    RECONNECT_ATTRIBUTE_MAX_TRIES = "reconnect_max_tries"
+    RECONNECT_ATTRIBUTE_TIMEOUT = "reconnect_timeout"
+    RECONNECT_PARAMETERS = [
+        RECONNECT_ATTRIBUTE_BASE_INTERVAL, RECONNECT_ATTRIBUTE_MAX_INTERVAL, RECONNECT_ATTRIBUTE_MAX_TRIES,
+        RECONNECT_ATTRIBUTE_TIMEOUT]
+
+    FULL_ATTRIBUTE_NAME_LIST = (
+        CONNECTION_PARAMTERS + [OPTIONAL_SSL_PARAMETER] + EXCHANGE_PARAMETERS +
+        RECONNECT_PARAMETERS + OUTBOX_PARAMETERS)
 
     MESSAGE_ENCODING = "UTF-8"
 
@@ -246,6 +375,15 @@ class RabbitmqClient:
            - exchange     : the name for the exchange used by the client
            - exchange_autodelete  : whether to automatically delete the exchange after use
            - exchange_durable     : whether to setup the exchange to survive message bus restarts
+           - reconnect_base_interval  : the base wait time in seconds for the exponential reconnection backoff
+           - reconnect_max_interval   : the maximum wait time in seconds between reconnection attempts
+           - reconnect_max_tries      : the maximum number of attempts when creating a new connection,
+                                        only used if reconnect_timeout is 0
+           - reconnect_timeout        : the total time in seconds spent trying to create a new connection
+           - outbox_size          : the maximum number of messages buffered while the message bus is unavailable
+           - outbox_memory_size   : the maximum number of buffered messages that are kept in memory
+           - outbox_file          : the file for the buffered messages that do not fit in memory,
+                                    empty value means that no file is used
 
            If a value for attribute is missing from kwargs, the value is read from
            the corresponding environmental variable with the given default value as a backup.
@@ -258,6 +396,16 @@ class RabbitmqClient:
            - RABBITMQ_EXCHANGE (default value: "")
            - RABBITMQ_EXCHANGE_AUTODELETE (default value: False)
            - RABBITMQ_EXCHANGE_DURABLE (default value: False)
+           - RABBITMQ_RECONNECT_BASE_INTERVAL (default value: 5)
+           - RABBITMQ_RECONNECT_MAX_INTERVAL (default value: 30)
+           - RABBITMQ_RECONNECT_MAX_TRIES (default value: 18)
+           - RABBITMQ_RECONNECT_TIMEOUT (default value: 765)
+           - RABBITMQ_OUTBOX_SIZE (default value: 10000)
+           - RABBITMQ_OUTBOX_MEMORY_SIZE (default value: 1000)
+           - RABBITMQ_OUTBOX_FILE (default value: "")
+
+           The wire format for the sent message objects is determined by the environmental variable
+           SIMULATION_WIRE_FORMAT, "json" (the default) or "msgpack". Messages given as bytes are sent as such.
         """
         kwargs_env = load_config_from_env_variables()
         kwargs = {
@@ -271,9 +419,24 @@ class RabbitmqClient:
             exchange_autodelete=cast(bool, kwargs[RabbitmqClient.EXCHANGE_ATTRIBUTE_AUTODELETE]),
             exchange_durable=cast(bool, kwargs[RabbitmqClient.EXCHANGE_ATTRIBUTE_DURABLE]))
 
-        self.__send_connection = RabbitmqConnection(self.__connection_parameters, self.__exchange_parameters)
+        self.__reconnect_policy = ReconnectPolicy(
+            base_interval=cast(float, kwargs[RabbitmqClient.RECONNECT_ATTRIBUTE_BASE_INTERVAL]),
+            max_interval=cast(float, kwargs[RabbitmqClient.RECONNECT_ATTRIBUTE_MAX_INTERVAL]),
+            max_tries=cast(int, kwargs[RabbitmqClient.RECONNECT_ATTRIBUTE_MAX_TRIES]),
+            timeout=cast(float, kwargs[RabbitmqClient.RECONNECT_ATTRIBUTE_TIMEOUT]))
+
+        self.__send_connection = RabbitmqConnection(
+            self.__connection_parameters, self.__exchange_parameters, self.__reconnect_policy)
+        self.__outbox = MessageOutbox(
+            max_messages=cast(int, kwargs[RabbitmqClient.OUTBOX_ATTRIBUTE_SIZE]),
+            max_memory_messages=cast(int, kwargs[RabbitmqClient.OUTBOX_ATTRIBUTE_MEMORY_SIZE]),
+            spill_filename=cast(str, kwargs[RabbitmqClient.OUTBOX_ATTRIBUTE_FILE]))
+        self.__outbox_task = None
+        self.__content_type = serialization.get_default_content_type()
         self.__listened_topics = set()
         self.__listener_tasks = []
+        # one event for each listener, set when the listener has bound its queue to the topics
+        self.__listener_ready_events: List[asyncio.Event] = []
 
         self.__lock = asyncio.Lock()
         self.__is_closed = False
@@ -286,6 +449,14 @@ class RabbitmqClient:
         """Closes the sender connection and all the listener connections."""
         async with self.__lock:
             await self.remove_listeners()
+            if self.__outbox_task is not None:
+                self.__outbox_task.cancel()
+                self.__outbox_task = None
+            if not self.__outbox.is_empty():
+                await self.__flush_outbox()
+                if not self.__outbox.is_empty():
+                    LOGGER.warning("Closing the client with {} unsent messages in the outbox.".format(
+                        self.__outbox.depth))
             await self.__send_connection.close()
             self.__is_closed = True
 
@@ -304,7 +475,24 @@ class RabbitmqClient:
         """Returns a list of the topics the client is currently listening."""
         return list(self.__listened_topics)
 
-    def add_listener(self, topic_names: Union[str, List[str]], callback_function: CallbackFunctionType) -> None:
+    @property
+    def reconnect_policy(self) -> ReconnectPolicy:
+        """Returns the reconnect policy that is shared by all the connections of the client."""
+        return self.__reconnect_policy
+
+    @property
+    def content_type(self) -> str:
+        """Returns the content type, i.e. the wire format, that is used for the sent message objects."""
+        return self.__content_type
+
+    @property
+    def outbox_depth(self) -> int:
+        """Returns the number of messages that are waiting in the outbox to be sent."""
+        return self.__outbox.depth
+
+    def add_listener(self, topic_names: Union[str, List[str]], callback_function: CallbackFunctionType,
+                     deduplicator: Optional[MessageDeduplicator] = None,
+                     prefilter: Optional[MessagePrefilterType] = None) -> None:
         """Adds a new topic listener to the client for the given topic(s). One listener can listen to multiple topics.
            Each topic name should be an acceptable routing key for RabbitMQ.
 
@@ -316,6 +504,16 @@ class RabbitmqClient:
            a dictionary containing the received message is send to the callback_function instead of
            AbstractMessage object. In case the received message was not in JSON format, a string containing the message
            is used as the first parameter for the callback_function instead.
+
+           If deduplicator is given, the repeated deliveries of the same message, identified by the SourceProcessId
+           and MessageId attributes, are dropped before the message is decoded.
+
+           If prefilter is given, it is called with the header of each received message (tools.callbacks.MessageHeader)
+           and the topic name before the message is decoded. The messages for which the prefilter returns False
+           are discarded.
+
+           The received messages larger than the decode threshold are decoded in the worker pool
+           tools.executors.WORKER_POOL if the pool has been enabled.
         """
         if self.is_closed:
             LOGGER.warning("Client is closed, no topic listener added.")
@@ -324,14 +522,19 @@ class RabbitmqClient:
         if isinstance(topic_names, str):
             topic_names = [topic_names]
 
-        new_connection = RabbitmqConnection(self.__connection_parameters, self.__exchange_parameters)
+        new_connection = RabbitmqConnection(
+            self.__connection_parameters, self.__exchange_parameters, self.__reconnect_policy)
+        ready_event = asyncio.Event()
         listener_task = asyncio.create_task(self.__listen_to_topics(
             connection_class=new_connection,
             topic_names=topic_names,
-            callback_class=MessageCallback(callback_function)
+            callback_class=MessageCallback(
+                callback_function, deduplicator=deduplicator, prefilter=prefilter, worker_pool=WORKER_POOL),
+            ready_event=ready_event
         ))
 
         self.__listener_tasks.append(listener_task)
+        self.__listener_ready_events.append(ready_event)
         for topic_name in topic_names:
             self.__listened_topics.add(topic_name)
 
@@ -345,47 +548,149 @@ class RabbitmqClient:
                 pass
 
         self.__listener_tasks = []
+        self.__listener_ready_events = []
         self.__listened_topics = set()
 
-    async def send_message(self, topic_name: str, message_bytes: bytes) -> None:
-        """Sends the given message to the given topic. Assumes that the message is in bytes format."""
+    async def wait_for_listeners(self, timeout: Optional[float] = None) -> bool:
+        """Waits until all the added topic listeners have bound their queues to the topics, i.e. until
+           the client is receiving the messages from all the listened topics.
+           Returns True if all the listeners are ready and False if the timeout, in seconds, was reached first."""
+        pending_events = [event for event in self.__listener_ready_events if not event.is_set()]
+        if not pending_events:
+            return True
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(event.wait() for event in pending_events)), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def open_send_connection(self) -> bool:
+        """Opens the connection used for sending the messages and declares the exchange, so that the first
+           sent message does not have to wait for them. Otherwise the connection is opened when the first message
+           is sent. Returns True if the connection is open."""
+        async with self.__lock:
+            if self.is_closed:
+                return False
+            return await self.__send_connection.get_exchange() is not None
+
+    async def send_message(self, topic_name: str, message_bytes: Union[bytes, AbstractMessage]) -> None:
+        """Sends the given message to the given topic. The message can be given either in bytes format or
+           as a message object which is then encoded using the wire format of the client.
+           If the message cannot be sent because there is no connection to the message bus, the message is
+           added to the outbox and it will be sent, in order with the other buffered messages, after reconnecting."""
         async with self.__lock:
             if self.is_closed:
                 LOGGER.warning("Message not sent because the client is closed.")
                 return
 
-            validated_topic_name, message_to_publish = validate_message(topic_name, message_bytes)
+            encode_start_time = time.perf_counter() if METRICS.enabled else 0.0
+            validated_topic_name, message_to_publish = validate_message(
+                topic_name, message_bytes, self.__content_type)
             if validated_topic_name is None or message_to_publish is None:
                 return
+            if METRICS.enabled and isinstance(message_bytes, AbstractMessage):
+                METRICS.observe(ENCODE_DURATION, time.perf_counter() - encode_start_time,
+                                message_type=message_bytes.message_type)
 
-            try:
-                send_exchange = await self.__send_connection.get_exchange()
-                if send_exchange is None:
-                    LOGGER.warning("Cannot publish message because there is no connection")
-                    return
+            # the earlier buffered messages must be sent first to preserve the message order
+            if not self.__outbox.is_empty():
+                await self.__flush_outbox()
 
-                await send_exchange.publish(aio_pika.Message(message_to_publish), routing_key=topic_name)
-                LOGGER.debug("Message '{:s}' send to topic: '{:s}'".format(
-                    message_to_publish.decode(RabbitmqClient.MESSAGE_ENCODING), topic_name))
+            if not self.__outbox.is_empty() or not await self.__publish(validated_topic_name, message_to_publish):
+                self.__add_to_outbox(validated_topic_name, message_to_publish)
 
-            except SystemExit:
-                LOGGER.debug("SystemExit received when trying to publish message.")
-                await self.__send_connection.close()
-                raise
-            except CONNECTION_EXCEPTIONS as error:
-                LOGGER.warning("{}: '{}' when trying to publish message.".format(type(error).__name__, error))
-            except GeneratorExit:
-                LOGGER.warning("GeneratorExit received when trying to publish message.")
+    async def flush_outbox(self) -> int:
+        """Tries to send all the messages in the outbox. Returns the number of messages still left in the outbox."""
+        async with self.__lock:
+            if not self.is_closed:
+                await self.__flush_outbox()
+            return self.__outbox.depth
+
+    async def __publish(self, topic_name: str, message_to_publish: bytes) -> bool:
+        """Publishes the given message to the given topic. Returns True if the message was published."""
+        try:
+            send_exchange = await self.__send_connection.get_exchange()
+            if send_exchange is None:
+                LOGGER.warning("Cannot publish message because there is no connection")
+                return False
+
+            # the content type is determined from the message body since the messages in the outbox are plain bytes
+            content_type = serialization.get_content_type(message_to_publish)
+            publish_start_time = time.perf_counter() if METRICS.enabled else 0.0
+            await send_exchange.publish(
+                aio_pika.Message(message_to_publish, content_type=content_type), routing_key=topic_name)
+            if METRICS.enabled:
+                METRICS.observe(PUBLISH_DURATION, time.perf_counter() - publish_start_time, topic=topic_name)
+                METRICS.increment(SENT_MESSAGES, topic=topic_name)
+            # the message is only decoded when it is actually logged
+            if LOGGER.is_enabled_for(logging.DEBUG) and SEND_LOG_SAMPLER.should_log(topic_name):
+                LOGGER.debug("Message '%s' send to topic: '%s'",
+                             get_message_log_string(message_to_publish, content_type), topic_name)
+            return True
+
+        except SystemExit:
+            LOGGER.debug("SystemExit received when trying to publish message.")
+            await self.__send_connection.close()
+            raise
+        except CONNECTION_EXCEPTIONS as error:
+            LOGGER.warning("{}: '{}' when trying to publish message.".format(type(error).__name__, error))
+        except GeneratorExit:
+            LOGGER.warning("GeneratorExit received when trying to publish message.")
+
+        return False
+
+    async def __flush_outbox(self) -> None:
+        """Sends the messages from the outbox in order until the outbox is empty or a message cannot be sent.
+           Assumes that the caller holds the client lock."""
+        initial_depth = self.__outbox.depth
+        outbox_item = self.__outbox.peek()
+        while outbox_item is not None:
+            if not await self.__publish(*outbox_item):
+                break
+            self.__outbox.pop()
+            outbox_item = self.__outbox.peek()
+
+        if initial_depth > self.__outbox.depth:
+            LOGGER.info("Sent {} messages from the outbox, {} messages remaining.".format(
+                initial_depth - self.__outbox.depth, self.__outbox.depth))
+
+    def __add_to_outbox(self, topic_name: str, message_to_publish: bytes) -> None:
+        """Adds the given message to the outbox and makes sure that there is a task trying to empty the outbox."""
+        if self.__outbox.put(topic_name, message_to_publish):
+            LOGGER.warning("Message to topic '{}' added to the outbox, outbox depth: {}".format(
+                topic_name, self.__outbox.depth))
+
+        if self.__outbox_task is None or self.__outbox_task.done():
+            self.__outbox_task = asyncio.create_task(self.__outbox_flusher())
+
+    async def __outbox_flusher(self) -> None:
+        """Tries periodically to send the messages in the outbox until the outbox is empty."""
+        attempt_number = 0
+        while not self.is_closed and not self.__outbox.is_empty():
+            await self.__reconnect_policy.wait(attempt_number)
+            attempt_number += 1
+            async with self.__lock:
+                if not self.is_closed:
+                    await self.__flush_outbox()
 
     async def __listen_to_topics(self, connection_class: RabbitmqConnection, topic_names: Union[str, List[str]],
-                                 callback_class: MessageCallback) -> None:
-        """Starts a RabbitMQ message bus listener for the given topics."""
+                                 callback_class: MessageCallback,
+                                 ready_event: Optional[asyncio.Event] = None) -> None:
+        """Starts a RabbitMQ message bus listener for the given topics.
+           The optional ready_event is set when the queue has been bound to all the topics."""
         if isinstance(topic_names, str):
             topic_names = [topic_names]
 
+        reconnect_attempt = 0
+
         async def wait_before_reconnecting():
-            LOGGER.info("Could not create a connection. Trying again in {} seconds.".format(RECONNECT_INTERVAL))
-            await asyncio.sleep(RECONNECT_INTERVAL)
+            nonlocal reconnect_attempt
+            delay = self.__reconnect_policy.get_delay(reconnect_attempt)
+            reconnect_attempt += 1
+            LOGGER.info("Could not create a connection. Trying again in {:.1f} seconds.".format(delay))
+            await asyncio.sleep(delay)
 
         reconnect_listeners = True
         while reconnect_listeners:
@@ -414,17 +719,26 @@ class RabbitmqClient:
                         reconnect_listeners = True
 
                     if rabbitmq_queue is not None and rabbitmq_exchange is not None:
-                        # Binding the queue to the given topics
-                        for topic_name in topic_names:
-                            await rabbitmq_queue.bind(rabbitmq_exchange, routing_key=topic_name)
-                            LOGGER.info("Now listening to messages; exc={}, topic={}".format(
-                                rabbitmq_exchange.name, topic_name))
+                        # Binding the queue to all the given topics in one step
+                        await asyncio.gather(*(
+                            rabbitmq_queue.bind(rabbitmq_exchange, routing_key=topic_name)
+                            for topic_name in topic_names
+                        ))
+                        LOGGER.info("Now listening to messages; exc={}, topics={}".format(
+                            rabbitmq_exchange.name, ", ".join(topic_names)))
+                        # the connection is working again => start the backoff from the beginning after next failure
+                        reconnect_attempt = 0
+                        if ready_event is not None:
+                            ready_event.set()
 
                         async with rabbitmq_queue.iterator() as queue_iter:
                             async for message in queue_iter:
                                 async with message.process():
-                                    LOGGER.debug("Message '{}' received from topic: '{}'".format(
-                                        message.body.decode(RabbitmqClient.MESSAGE_ENCODING), message.routing_key))
+                                    if (LOGGER.is_enabled_for(logging.DEBUG) and
+                                            RECEIVE_LOG_SAMPLER.should_log(message.routing_key)):
+                                        LOGGER.debug("Message '%s' received from topic: '%s'",
+                                                     get_message_log_string(message.body, message.content_type),
+                                                     message.routing_key)
                                     asyncio.create_task(callback_class.callback(message))
 
                 if reconnect_listeners:
@@ -8,13 +8,33 @@
 """This module contains a base simulation component that can communicate with the RabbitMQ message bus."""
 
 import asyncio
+import contextlib
+import datetime
+import functools
 import json
-from typing import cast, Any, Dict, List, Optional, Union
+import time
+from typing import cast, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
 
+from tools.callbacks import CallbackFunctionType, MessageDeduplicator, MessageHeader
 from tools.clients import RabbitmqClient
+from tools.datetime_tools import get_utcnow_in_milliseconds, to_utc_datetime_object
+from tools.epoch_inputs import EpochInputTracker
 from tools.exceptions.messages import MessageError
+from tools.executors import WORKER_POOL, ResultType
+from tools.health import HEALTHY_ATTRIBUTE, HealthServer
 from tools.messages import (
-    BaseMessage, AbstractMessage, EpochMessage, StatusMessage, SimulationStateMessage, MessageGenerator)
+    BaseMessage, AbstractMessage, EpochMessage, GeneralMessage, StatusMessage, SimulationStateMessage,
+    MessageGenerator)
+from tools.metrics import (
+    METRICS, METRICS_MESSAGE_TYPE, EPOCH_DURATION, HANDLER_DURATION, LOCK_WAIT, MetricsExporter)
+from tools.profiling import (
+    COMPONENT_NAMES_ATTRIBUTE, PROFILED_EPOCHS_ATTRIBUTE, SIMULATION_PROFILING_TOPIC, TARGETS_ATTRIBUTE,
+    TARGET_MESSAGE_HANDLER, TARGET_PROCESS_EPOCH, TARGET_SEND_MESSAGE, EpochProfiler)
+from tools.startup import (
+    DEFAULT_STARTUP_TIMEOUT, PHASE_CLIENT, PHASE_LISTENERS, PHASE_PREFLIGHT, PHASE_SEND_CONNECTION, PHASE_TOTAL,
+    SIMULATION_STARTUP_PREFLIGHT, SIMULATION_STARTUP_TIMEOUT, StartupTimer, get_topic_message_types,
+    preflight_warm_up)
+from tools.timer import Timer
 from tools.tools import FullLogger, EnvironmentVariable
 
 LOGGER = FullLogger(__name__)
@@ -34,6 +54,28 @@ SIMULATION_START_MESSAGE_FILENAME = "SIMULATION_START_MESSAGE_FILENAME"
 # "Result" and "Info" in addition to the topics "Epoch" and "SimState
 SIMULATION_OTHER_TOPICS = "SIMULATION_OTHER_TOPICS"
 
+# Whether to drop the repeated deliveries of the same message, i.e. messages with the same SourceProcessId and
+# MessageId, before they reach the message handlers.
+SIMULATION_MESSAGE_DEDUPLICATION = "SIMULATION_MESSAGE_DEDUPLICATION"
+
+# The time in seconds after the Epoch message after which the epoch is processed even if some of the expected
+# epoch inputs are still missing. Only used when the expected inputs have been registered with expect_epoch_input.
+# The value 0 means that there is no deadline.
+SIMULATION_EPOCH_INPUT_DEADLINE = "SIMULATION_EPOCH_INPUT_DEADLINE"
+
+# The maximum number of upcoming epochs that are checked with is_idle_epoch after each processed epoch.
+# The value 0 means that no idle epochs are used.
+SIMULATION_IDLE_EPOCH_LOOKAHEAD = "SIMULATION_IDLE_EPOCH_LOOKAHEAD"
+# Whether the simulation manager accepts the IdleUntilEpoch attribute in the ready status messages as the ready
+# status for the announced idle epochs. If not, the idle epochs are acknowledged one by one without processing them.
+SIMULATION_IDLE_EPOCH_ANNOUNCEMENTS = "SIMULATION_IDLE_EPOCH_ANNOUNCEMENTS"
+DEFAULT_IDLE_EPOCH_LOOKAHEAD = 100
+
+# The minimum time in seconds between two status messages for the same epoch. The status message for an already
+# completed epoch is resent only when the simulation manager sends the Epoch message for the epoch again.
+SIMULATION_STATUS_RESEND_INTERVAL = "SIMULATION_STATUS_RESEND_INTERVAL"
+DEFAULT_STATUS_RESEND_INTERVAL = 1.0
+
 
 class AbstractSimulationComponent:
     """Class for holding the state of a abstract simulation component.
@@ -52,6 +94,14 @@ class AbstractSimulationComponent:
                  status_message_topic: Optional[str] = None,
                  error_message_topic: Optional[str] = None,
                  other_topics: Optional[List[str]] = None,
+                 message_deduplication: Optional[bool] = None,
+                 epoch_input_deadline: Optional[float] = None,
+                 idle_epoch_lookahead: Optional[int] = None,
+                 idle_epoch_announcements: Optional[bool] = None,
+                 status_resend_interval: Optional[float] = None,
+                 startup_preflight: Optional[bool] = None,
+                 startup_timeout: Optional[float] = None,
+                 rabbitmq_client: Optional[RabbitmqClient] = None,
                  rabbitmq_host: Optional[str] = None,
                  rabbitmq_port: Optional[int] = None,
                  rabbitmq_login: Optional[str] = None,
@@ -100,6 +150,47 @@ class AbstractSimulationComponent:
             - environmental variable: "SIMULATION_OTHER_TOPICS"
                 - in the environmental variable the list is given as a comma seprated string, e.g. "Result,Info"
             - default value: []
+        - message_deduplication (bool)
+            - whether to drop the repeated deliveries of the same message before they reach the message handlers
+            - the messages are identified by their SourceProcessId and MessageId attributes
+            - environmental variable: "SIMULATION_MESSAGE_DEDUPLICATION"
+            - default value: False
+        - epoch_input_deadline (float)
+            - the time in seconds after the Epoch message after which the epoch is processed even if some of
+              the expected epoch inputs, registered with expect_epoch_input, have not been received
+            - environmental variable: "SIMULATION_EPOCH_INPUT_DEADLINE"
+            - default value: 0.0 (no deadline)
+        - idle_epoch_lookahead (int)
+            - the maximum number of upcoming epochs that are checked with is_idle_epoch after each processed epoch
+            - environmental variable: "SIMULATION_IDLE_EPOCH_LOOKAHEAD"
+            - default value: 100
+        - idle_epoch_announcements (bool)
+            - whether the idle epochs are announced to the simulation manager with the IdleUntilEpoch attribute in
+              the ready status message, in which case no status messages are sent for the idle epochs
+            - if False, the idle epochs are acknowledged with a ready status without processing them
+            - environmental variable: "SIMULATION_IDLE_EPOCH_ANNOUNCEMENTS"
+            - default value: False
+        - status_resend_interval (float)
+            - the minimum time in seconds between two status messages for the same epoch
+            - the status for an already completed epoch is resent only when the Epoch message is received again
+            - a request received within the interval is answered when the interval has passed
+            - environmental variable: "SIMULATION_STATUS_RESEND_INTERVAL"
+            - default value: 1.0
+        - startup_preflight (bool)
+            - whether to load the message classes of the listened message types and exercise the message codecs
+              at startup in the default executor, instead of when the first messages arrive
+            - environmental variable: "SIMULATION_STARTUP_PREFLIGHT"
+            - default value: True
+        - startup_timeout (float)
+            - the maximum time in seconds that start waits for the message bus connections and the preflight
+              warm-up to be ready, 0 means that start does not wait for them
+            - environmental variable: "SIMULATION_STARTUP_TIMEOUT"
+            - default value: 0.0
+        - rabbitmq_client (RabbitmqClient)
+            - an existing RabbitMQ client that is shared with other components, e.g. by SimulationComponentHost
+            - when given, the component does not add its own topic listener or close the client when stopped,
+              and the RabbitMQ connection parameters below are ignored
+            - default value: None (the component creates its own client)
         - rabbitmq_host (str)
             - the host name for the RabbitMQ server
             - environmental variable: "RABBITMQ_HOST"
@@ -154,7 +245,11 @@ class AbstractSimulationComponent:
             exchange_autodelete=rabbitmq_exchange_autodelete,
             exchange_durable=rabbitmq_exchange_durable
         )
-        self._rabbitmq_client = RabbitmqClient(**self._rabbitmq_parameters)
+        self._owns_rabbitmq_client = rabbitmq_client is None
+        if rabbitmq_client is None:
+            self._rabbitmq_client = RabbitmqClient(**self._rabbitmq_parameters)
+        else:
+            self._rabbitmq_client = rabbitmq_client
 
         # set the component variables for which the values can also be received from the environmental variables
         self.__set_component_variables(
@@ -167,6 +262,42 @@ class AbstractSimulationComponent:
             other_topics=other_topics
         )
 
+        if message_deduplication is None:
+            message_deduplication = cast(
+                bool, EnvironmentVariable(SIMULATION_MESSAGE_DEDUPLICATION, bool, False).value)
+        self._message_deduplication = message_deduplication
+
+        if epoch_input_deadline is None:
+            epoch_input_deadline = cast(
+                float, EnvironmentVariable(SIMULATION_EPOCH_INPUT_DEADLINE, float, 0.0).value)
+        self._epoch_input_deadline = max(epoch_input_deadline, 0.0)
+
+        if idle_epoch_lookahead is None:
+            idle_epoch_lookahead = cast(
+                int, EnvironmentVariable(SIMULATION_IDLE_EPOCH_LOOKAHEAD, int, DEFAULT_IDLE_EPOCH_LOOKAHEAD).value)
+        self._idle_epoch_lookahead = max(idle_epoch_lookahead, 0)
+        if idle_epoch_announcements is None:
+            idle_epoch_announcements = cast(
+                bool, EnvironmentVariable(SIMULATION_IDLE_EPOCH_ANNOUNCEMENTS, bool, False).value)
+        self._idle_epoch_announcements = idle_epoch_announcements
+
+        if status_resend_interval is None:
+            status_resend_interval = cast(float, EnvironmentVariable(
+                SIMULATION_STATUS_RESEND_INTERVAL, float, DEFAULT_STATUS_RESEND_INTERVAL).value)
+        self._status_resend_interval = max(status_resend_interval, 0.0)
+
+        if startup_preflight is None:
+            startup_preflight = cast(bool, EnvironmentVariable(SIMULATION_STARTUP_PREFLIGHT, bool, True).value)
+        self._startup_preflight = startup_preflight
+        if startup_timeout is None:
+            startup_timeout = cast(
+                float, EnvironmentVariable(SIMULATION_STARTUP_TIMEOUT, float, DEFAULT_STARTUP_TIMEOUT).value)
+        self._startup_timeout = max(startup_timeout, 0.0)
+        # the timer for the startup phases of the latest start of the component
+        self._startup_timer: Optional[StartupTimer] = None
+        # the preflight warm-up running in the default executor
+        self._preflight_task: Optional[asyncio.Task] = None
+
         self.__start_message = self.__load_start_message()
 
         self._is_stopped = True
@@ -184,6 +315,34 @@ class AbstractSimulationComponent:
         self._triggering_message_ids = [""]
         self._latest_status_message_id = None
         self._latest_epoch_message = None
+        # the epoch and the time (time.monotonic) for the latest sent status message
+        self._latest_status_epoch: Optional[int] = None
+        self._latest_status_time = 0.0
+        # set when the Epoch message for an already completed epoch is received again
+        self._status_resend_requested = False
+        # the timer for the status resend requested within the status resend interval
+        self._status_resend_timer: Optional[Timer] = None
+        # the largest epoch number seen in the headers of the accepted epoch messages, updated by message_prefilter
+        # before the epoch message is handled
+        self._latest_prefiltered_epoch = 0
+
+        # the expected input messages for each epoch, see expect_epoch_input
+        self._epoch_inputs = EpochInputTracker()
+        self._epoch_deadline_timer: Optional[Timer] = None
+        self._epoch_deadline_passed = False
+        # the last epoch of the current range of idle epochs, see is_idle_epoch
+        self._idle_until_epoch = 0
+        # the handlers for the topics whose messages are handled without the message handling lock,
+        # see add_read_only_handler
+        self._read_only_handlers: Dict[str, CallbackFunctionType] = {}
+
+        # the time when the Epoch message for the current epoch was received, used for the epoch duration metric
+        self._epoch_start_time: Optional[float] = None
+        self._metrics_exporter = MetricsExporter(METRICS)
+
+        # the profiler for the epoch processing and the message handlers, see tools.profiling
+        self._profiler = EpochProfiler(self._component_name, self._simulation_id)
+        self._profiling_topic = cast(str, EnvironmentVariable(SIMULATION_PROFILING_TOPIC, str, "").value)
 
         self._message_generator = MessageGenerator(self._simulation_id, self._component_name)
         # include the message id generator separately to be compatible with older code created before
@@ -192,6 +351,11 @@ class AbstractSimulationComponent:
 
         # lock that is set while the component is handling a message
         self._lock = asyncio.Lock()
+        # the number of received messages that are waiting for the lock
+        self._waiting_message_count = 0
+
+        # the optional HTTP endpoint for the health status and the metrics, see tools.health
+        self._health_server = HealthServer(self.get_health_status, self.__get_metrics_text)
 
     @property
     def simulation_id(self) -> str:
@@ -208,6 +372,46 @@ class AbstractSimulationComponent:
         """Returns True, if the component is stopped."""
         return self._is_stopped
 
+    @property
+    def message_deduplication(self) -> bool:
+        """Whether the repeated deliveries of the same message are dropped before the message handlers."""
+        return self._message_deduplication
+
+    @property
+    def idle_until_epoch(self) -> int:
+        """The last epoch of the current range of idle epochs. The epochs after the latest processed epoch
+           up to and including this epoch are not processed, see is_idle_epoch."""
+        return self._idle_until_epoch
+
+    @property
+    def startup_durations(self) -> Dict[str, float]:
+        """The durations in seconds of the phases of the latest component startup.
+           The phases that were not waited for by start are included when they have finished."""
+        if self._startup_timer is None:
+            return {}
+        return self._startup_timer.durations
+
+    @property
+    def health_server(self) -> HealthServer:
+        """The server for the health status and the metrics endpoints of the component."""
+        return self._health_server
+
+    @property
+    def profiler(self) -> EpochProfiler:
+        """The profiler for the epoch processing and the message handlers of the component."""
+        return self._profiler
+
+    @property
+    def listened_topics(self) -> List[str]:
+        """The topics that the component listens to."""
+        topics = self._other_topics + [
+            self._simulation_state_topic,
+            self._epoch_topic
+        ]
+        if self._profiling_topic:
+            topics.append(self._profiling_topic)
+        return topics
+
     @property
     def is_client_closed(self) -> bool:
         """Returns True if the RabbitMQ client has been stopped."""
@@ -230,8 +434,56 @@ class AbstractSimulationComponent:
            The Start message is set to None if the Start message is not available."""
         return self.__start_message
 
+    @property
+    def epoch_inputs(self) -> EpochInputTracker:
+        """The tracker for the expected input messages for each epoch."""
+        return self._epoch_inputs
+
+    def expect_epoch_input(self, topic_name: str, source_process_id: Optional[str] = None, count: int = 1) -> None:
+        """Registers that the component needs count messages from the given topic and source for each epoch
+           before the epoch can be processed. If source_process_id is None, the messages can come from any source.
+           Registering the same topic and source again replaces the earlier count and a count of 0 removes it.
+
+           When at least one expected input has been registered, the arrivals of the received messages are
+           tracked automatically and the component starts the epoch processing, i.e. calls process_epoch, once
+           all the expected inputs for the current epoch have arrived or when the epoch input deadline has passed.
+           The received messages are counted for the epoch given by their EpochNumber attribute.
+           The expectations can be registered in the constructor, or in clear_epoch_variables if they change
+           from epoch to epoch. The general_message_handler should not call start_epoch in this case.
+        """
+        self._epoch_inputs.expect(topic_name, source_process_id, count)
+
+    def add_read_only_handler(self, topic_name: str, handler_function: CallbackFunctionType) -> None:
+        """Registers the given handler for the messages from the given topic. The handler is called with
+           the message object and the topic name like general_message_handler, but without taking the message
+           handling lock. Thus, the messages are handled immediately, even while another message handler or
+           a long epoch calculation is running, and the messages are not passed to general_message_handler.
+           The topic is added to the listened topics, so the handlers should be registered in the constructor.
+
+           The handler must only read the component state, e.g. to answer queries, since it can run concurrently
+           with the other handlers. It can send messages with the message client. The read-only handlers
+           are called also when the component is in an error state.
+           The Epoch and SimState topics cannot have read-only handlers.
+        """
+        if topic_name in (self._epoch_topic, self._simulation_state_topic, self._profiling_topic):
+            LOGGER.warning("Cannot add a read-only handler for topic '{}'".format(topic_name))
+            return
+
+        self._read_only_handlers[topic_name] = handler_function
+        if topic_name not in self._other_topics:
+            self._other_topics = self._other_topics + [topic_name]
+
+    @property
+    def read_only_topics(self) -> List[str]:
+        """The topics whose messages are handled by read-only handlers without the message handling lock."""
+        return list(self._read_only_handlers)
+
     async def start(self) -> None:
-        """Starts the component."""
+        """Starts the component.
+           The connections for sending and for listening to the messages are opened concurrently while
+           the preflight warm-up is run in the default executor. If a startup timeout has been given, waits until
+           the connections and the warm-up are ready or until the timeout has been reached. The durations of
+           the startup phases are logged and stored in startup_durations."""
         if self.initialization_error is not None or self._in_error_state:
             if self.initialization_error is not None:
                 LOGGER.error("Component has an initialization error: {}".format(self.initialization_error))
@@ -239,24 +491,89 @@ class AbstractSimulationComponent:
                 LOGGER.error("Component because it is in an error state: {}".format(self._error_description))
             LOGGER.warning("The component will be started to allow the others to know about the error.")
 
-        if self.is_client_closed:
-            self._rabbitmq_client = RabbitmqClient(**self._rabbitmq_parameters)
-
         LOGGER.info("Starting the component: '{}'".format(self.component_name))
-        topics_to_listen = self._other_topics + [
-            self._simulation_state_topic,
-            self._epoch_topic
-        ]
-        self._rabbitmq_client.add_listener(topics_to_listen, self.general_message_handler_base)
+        startup_timer = StartupTimer()
+        self._startup_timer = startup_timer
+        startup_tasks = []
+        if self._owns_rabbitmq_client:
+            # with a shared client, the components would compete for the same health server address
+            await self._health_server.start()
+            if self.is_client_closed:
+                with startup_timer.measure(PHASE_CLIENT):
+                    self._rabbitmq_client = RabbitmqClient(**self._rabbitmq_parameters)
+
+            self._rabbitmq_client.add_listener(
+                self.listened_topics, self.general_message_handler_base,
+                deduplicator=MessageDeduplicator() if self._message_deduplication else None,
+                prefilter=self.message_prefilter)
+            if self._startup_timeout > 0:
+                startup_tasks = [
+                    asyncio.create_task(self.__run_startup_phase(
+                        startup_timer, PHASE_SEND_CONNECTION, self._rabbitmq_client.open_send_connection())),
+                    asyncio.create_task(self.__run_startup_phase(
+                        startup_timer, PHASE_LISTENERS, self._rabbitmq_client.wait_for_listeners()))
+                ]
+        # with a shared client, the messages are routed to the component by the owner of the client
+
+        if self._startup_preflight and (self._preflight_task is None or self._preflight_task.done()):
+            self._preflight_task = asyncio.create_task(
+                self.__run_startup_phase(startup_timer, PHASE_PREFLIGHT, self.__run_preflight_warm_up()))
+
+        if self._startup_timeout > 0 and self._preflight_task is not None:
+            startup_tasks.append(self._preflight_task)
+        if startup_tasks:
+            _, pending_tasks = await asyncio.wait(
+                startup_tasks, timeout=max(self._startup_timeout - startup_timer.elapsed(), 0.0))
+            if pending_tasks:
+                LOGGER.warning("The message bus connections or the warm-up were not ready within {} seconds".format(
+                    self._startup_timeout))
+                for pending_task in pending_tasks:
+                    # the warm-up cannot be interrupted, so it is left to finish in the background
+                    if pending_task is not self._preflight_task:
+                        pending_task.cancel()
+
+        startup_timer.record_since_start(PHASE_TOTAL)
+        LOGGER.info("Component '{}' started: {}".format(self.component_name, startup_timer.report()))
         self._is_stopped = False
 
     async def stop(self) -> None:
         """Stops the component."""
         LOGGER.info("Stopping the component: '{}'".format(self.component_name))
+        await self.__cancel_epoch_deadline()
+        await self.__cancel_status_resend()
+        if self._preflight_task is not None:
+            # the warm-up running in the executor cannot be interrupted, so it is waited for
+            await self._preflight_task
+            self._preflight_task = None
+        await self._health_server.stop()
         self._simulation_state = AbstractSimulationComponent.SIMULATION_STATE_VALUE_STOPPED
-        await self._rabbitmq_client.close()
+        if self._owns_rabbitmq_client:
+            await self._rabbitmq_client.close()
+            WORKER_POOL.shutdown(wait=False)
         self._is_stopped = True
 
+    async def __run_preflight_warm_up(self) -> bool:
+        """Runs the preflight warm-up for the listened message types in the default executor.
+           Returns True if the warm-up was completed without errors."""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, functools.partial(
+                preflight_warm_up, self.simulation_id, self.component_name,
+                get_topic_message_types(self.listened_topics)))
+            return True
+        except Exception as warm_up_error:  # pylint: disable=broad-except
+            # the message classes are loaded again when the first messages arrive
+            LOGGER.warning("The preflight warm-up failed: {}".format(warm_up_error))
+            return False
+
+    @staticmethod
+    async def __run_startup_phase(startup_timer: StartupTimer, phase: str, phase_result: Awaitable[bool]) -> None:
+        """Awaits the given startup phase and records its duration if the phase was successful."""
+        phase_start_time = time.perf_counter()
+        if await phase_result:
+            startup_timer.record(phase, time.perf_counter() - phase_start_time)
+        else:
+            LOGGER.warning("The startup phase '{}' was not successful".format(phase))
+
     def get_simulation_state(self) -> str:
         """Returns the simulation state attribute."""
         return self._simulation_state
@@ -318,16 +635,34 @@ class AbstractSimulationComponent:
             return True
 
         if self._completed_epoch == self._latest_epoch:
-            LOGGER.warning("The epoch {} has already been processed.".format(self._completed_epoch))
-            LOGGER.debug("Resending status message for epoch {}".format(self._latest_epoch))
-            await self.send_status_message()
+            await self.__resend_status_message()
+            return True
+
+        if self._latest_epoch <= self._idle_until_epoch:
+            # the epoch was found to be idle in advance => no processing needed
+            LOGGER.debug("Epoch {} is an idle epoch".format(self._latest_epoch))
+            self._completed_epoch = self._latest_epoch
+            if not self._idle_epoch_announcements:
+                await self.send_status_message()
+                return True
+
+            # the simulation manager does not expect a status message for an announced idle epoch,
+            # unless it is needed to announce that the idle epochs continue after the current range
+            self._epoch_start_time = None
+            if self._latest_epoch == self._idle_until_epoch:
+                self.__update_idle_epochs()
+                if self._idle_until_epoch > self._latest_epoch:
+                    await self.send_status_message()
             return True
 
         if await self.ready_for_new_epoch():
-            if await self.process_epoch():
+            with self._profiler.profile(TARGET_PROCESS_EPOCH):
+                epoch_processed = await self.process_epoch()
+            if epoch_processed:
                 # The current epoch was successfully processed.
                 self._completed_epoch = self._latest_epoch
                 await self.send_status_message()
+                self._profiler.finish_epoch(self._completed_epoch)
                 LOGGER.info("Finished processing epoch {}".format(self._completed_epoch))
                 return True
 
@@ -348,6 +683,22 @@ class AbstractSimulationComponent:
         # Also sending of any result messages (other than Status message) would be included here.
         return True
 
+    def is_idle_epoch(self, epoch_number: int, start_time: datetime.datetime, end_time: datetime.datetime) -> bool:
+        """Returns True, if the component has nothing to do in the given upcoming epoch.
+           Called after each processed epoch for the following epochs until the first non-idle epoch is found or
+           the idle epoch lookahead is reached. The start and end times for the upcoming epochs are calculated
+           assuming that all epochs have the same length as the latest epoch.
+
+           The idle epochs are acknowledged without calling process_epoch or waiting for any other input, and if
+           idle epoch announcements are enabled, no status messages are sent for them. Thus, the result should
+           depend only on the given epoch and the component configuration, not on the input received later.
+
+           NOTE: this method can be overwritten in a child class that has nothing to do in some epochs,
+                 for example a market that is closed during the night. By default, no epoch is idle.
+        """
+        # pylint: disable=unused-argument
+        return False
+
     async def ready_for_new_epoch(self) -> bool:
         """Returns True, if all the messages required to start the processing for the current epoch are available.
         """
@@ -364,30 +715,69 @@ class AbstractSimulationComponent:
            Checks only that all the required information is available.
            Does not check any other conditions like the simulation state.
 
+           If the expected epoch inputs have been registered with expect_epoch_input, returns True when all of
+           them have been received for the current epoch or when the epoch input deadline has passed.
+
            NOTE: this method should be overwritten in any child class that needs more information
-                 than just the Epoch message.
+                 than just the Epoch message and that does not use expect_epoch_input.
         """
         # The AbstractSimulationComponent needs no other information other than Epoch message for processing.
+        return (
+            not self._epoch_inputs.has_expectations or
+            self._epoch_deadline_passed or
+            self._epoch_inputs.is_complete(self._latest_epoch)
+        )
+
+    def message_prefilter(self, message_header: MessageHeader, message_routing_key: str) -> bool:
+        """Decides based on the message header whether the received message should be handled at all.
+           Called for each received message before the message is decoded. Returns True if the message
+           should be handled and False if it should be discarded.
+
+           The default implementation discards the messages for other simulations.
+           The child classes can overwrite this method to discard messages more aggressively, for example
+           based on the epoch number. Any overriding method should call this method as well.
+        """
+        if message_header.simulation_id is not None and message_header.simulation_id != self.simulation_id:
+            LOGGER.debug("Discarding message from topic %s for a different simulation: '%s'",
+                         message_routing_key, message_header.simulation_id)
+            return False
+
+        if (message_header.message_type == EpochMessage.CLASS_MESSAGE_TYPE and
+                message_header.epoch_number is not None):
+            self._latest_prefiltered_epoch = max(self._latest_prefiltered_epoch, message_header.epoch_number)
         return True
 
     async def general_message_handler_base(self, message_object: Union[BaseMessage, Any],
                                            message_routing_key: str) -> None:
-        """Forwards the message handling to the appropriate function depending on the message type."""
-        # only allow handling one message at a time
-        async with self._lock:
-            if isinstance(message_object, SimulationStateMessage):
-                await self.simulation_state_message_handler(message_object, message_routing_key)
-
-            elif isinstance(message_object, EpochMessage):
-                await self.epoch_message_handler(message_object, message_routing_key)
-
-            elif self._in_error_state:
-                # component is in an error state and will not react to any other messages
+        """Forwards the message handling to the appropriate function depending on the message type.
+           The messages are handled one at a time while holding the message handling lock, except for
+           the read-only messages that are handled immediately without the lock. The read-only messages are
+           the messages from the topics registered with add_read_only_handler, the repeated Epoch messages
+           for which the status has already been registered and the repeated SimState running messages."""
+        read_only_handler = self.__get_read_only_handler(message_object, message_routing_key)
+        if not METRICS.enabled:
+            if read_only_handler is not None:
+                await read_only_handler(message_object, message_routing_key)
                 return
+            # only allow handling one message at a time
+            async with self.__message_handling_lock():
+                await self.__dispatch_message(message_object, message_routing_key)
+            return
 
-            else:
-                # Handling of any other message types would be added to a separate function.
-                await self.general_message_handler(message_object, message_routing_key)
+        lock_start_time = time.perf_counter()
+        if read_only_handler is not None:
+            handler_start_time = lock_start_time
+            await read_only_handler(message_object, message_routing_key)
+            handler_end_time = time.perf_counter()
+        else:
+            async with self.__message_handling_lock():
+                handler_start_time = time.perf_counter()
+                await self.__dispatch_message(message_object, message_routing_key)
+                handler_end_time = time.perf_counter()
+
+        message_type = message_object.message_type if isinstance(message_object, BaseMessage) else "unknown"
+        METRICS.observe(LOCK_WAIT, handler_start_time - lock_start_time, message_type=message_type)
+        METRICS.observe(HANDLER_DURATION, handler_end_time - handler_start_time, message_type=message_type)
 
     async def general_message_handler(self, message_object: Union[BaseMessage, Any],
                                       message_routing_key: str) -> None:
@@ -397,10 +787,9 @@ class AbstractSimulationComponent:
            NOTE: this method should be overwritten in any child class that listens to other messages.
         """
         if isinstance(message_object, AbstractMessage):
-            LOGGER.debug("Received {} message from topic {}".format(
-                message_object.message_type, message_routing_key))
+            LOGGER.debug("Received %s message from topic %s", message_object.message_type, message_routing_key)
         else:
-            LOGGER.debug("Received unknown message: {}".format(str(message_object)))
+            LOGGER.debug("Received unknown message: %s", message_object)
 
     async def simulation_state_message_handler(self, message_object: SimulationStateMessage,
                                                message_routing_key: str) -> None:
@@ -437,6 +826,17 @@ class AbstractSimulationComponent:
                 message_object.source_process_id, message_routing_key))
             self._triggering_message_ids = [message_object.message_id]
             self._latest_epoch_message = message_object
+            # a repeated Epoch message for a completed epoch is a request to resend the status message
+            self._status_resend_requested = (
+                message_object.epoch_number == self._latest_epoch and
+                self._completed_epoch == self._latest_epoch)
+
+            if message_object.epoch_number != self._latest_epoch:
+                self._epoch_start_time = time.perf_counter() if METRICS.enabled else None
+                await self.__cancel_epoch_deadline()
+                await self.__cancel_status_resend()
+                self._epoch_deadline_passed = False
+                self._epoch_inputs.start_epoch(message_object.epoch_number)
 
             # clear and initialize any variables used to store input within the epoch
             self.clear_epoch_variables()
@@ -445,6 +845,7 @@ class AbstractSimulationComponent:
             if not await self.start_epoch():
                 LOGGER.debug("Waiting for other required messages before processing epoch {}".format(
                     self._latest_epoch))
+                self.__start_epoch_deadline()
 
     async def send_status_message(self) -> None:
         """Sends a new status message to the message bus."""
@@ -453,13 +854,45 @@ class AbstractSimulationComponent:
             await self.send_error_message(self._error_description)
             return
 
+        self.__update_idle_epochs()
         status_message = self._get_status_message()
         if status_message is None:
             await self.send_error_message("Internal error when creating status message.")
         else:
-            await self._rabbitmq_client.send_message(self._status_topic, status_message.bytes())
+            with self._profiler.profile(TARGET_SEND_MESSAGE):
+                await self._rabbitmq_client.send_message(self._status_topic, status_message)
             self._completed_epoch = self._latest_epoch
             self._latest_status_message_id = status_message.message_id
+            self._latest_status_epoch = self._latest_epoch
+            self._latest_status_time = time.monotonic()
+
+            if self._epoch_start_time is not None:
+                METRICS.observe(EPOCH_DURATION, time.perf_counter() - self._epoch_start_time)
+                self._epoch_start_time = None
+            if self._metrics_exporter.is_export_epoch(self._latest_epoch):
+                await self.export_metrics()
+
+    async def run_in_worker(self, function: Callable[..., ResultType], *args: Any, **kwargs: Any) -> ResultType:
+        """Runs the given function in the worker pool tools.executors.WORKER_POOL and returns the result.
+           Meant for CPU heavy work in the message handlers and in process_epoch, for example validating
+           a large time series or running a market computation, so that the event loop is not blocked.
+           If the worker pool is disabled, the function is run directly in the event loop.
+           With a process pool, the function and its arguments must be picklable and the function
+           cannot modify the state of the component."""
+        return await WORKER_POOL.run(function, *args, **kwargs)
+
+    async def export_metrics(self) -> None:
+        """Sends the collected metrics as a summary message to the message bus and writes them to the metrics file.
+           Which of these are done is determined by the environmental variables SIMULATION_METRICS_TOPIC and
+           SIMULATION_METRICS_FILE. Called automatically after every SIMULATION_METRICS_INTERVAL epochs
+           when the metrics collection has been enabled with SIMULATION_METRICS_ENABLED."""
+        if self._metrics_exporter.topic_name:
+            metrics_message = self._get_metrics_message()
+            if metrics_message is not None:
+                with self._profiler.profile(TARGET_SEND_MESSAGE):
+                    await self._rabbitmq_client.send_message(
+                        self._metrics_exporter.topic_name, metrics_message.bytes())
+        await self._metrics_exporter.write_file_async(component=self.component_name)
 
     async def send_error_message(self, description: str) -> None:
         """Sends an error message to the message bus."""
@@ -472,7 +905,8 @@ class AbstractSimulationComponent:
             LOGGER.error("Could not create an error message")
             await self.stop()
         else:
-            await self._rabbitmq_client.send_message(self._error_topic, error_message.bytes())
+            with self._profiler.profile(TARGET_SEND_MESSAGE):
+                await self._rabbitmq_client.send_message(self._error_topic, error_message)
 
     def _get_status_message(self) -> Union[StatusMessage, None]:
         """Creates a new status message and returns the created message object.
@@ -480,12 +914,33 @@ class AbstractSimulationComponent:
         try:
             return self._message_generator.get_status_ready_message(
                 EpochNumber=self._latest_epoch,
-                TriggeringMessageIds=self._triggering_message_ids)
+                TriggeringMessageIds=self._triggering_message_ids,
+                IdleUntilEpoch=(
+                    self._idle_until_epoch
+                    if self._idle_epoch_announcements and self._idle_until_epoch > self._latest_epoch
+                    else None))
 
         except (ValueError, TypeError, MessageError) as message_error:
             LOGGER.error("Problem with creating a status message: {}".format(message_error))
             return None
 
+    def _get_metrics_message(self) -> Union[GeneralMessage, None]:
+        """Creates a new metrics summary message and returns the created message object.
+           Returns None, if there was a problem creating the message."""
+        try:
+            return GeneralMessage(
+                Type=METRICS_MESSAGE_TYPE,
+                SimulationId=self.simulation_id,
+                SourceProcessId=self.component_name,
+                MessageId=next(self._message_id_generator),
+                Timestamp=get_utcnow_in_milliseconds(),
+                EpochNumber=self._latest_epoch,
+                Metrics=METRICS.to_json())
+
+        except (ValueError, TypeError, MessageError) as message_error:
+            LOGGER.error("Problem with creating a metrics message: {}".format(message_error))
+            return None
+
     def _get_error_message(self, description: str) -> Union[StatusMessage, None]:
         """Creates a new error message and returns the created message object.
            Returns None, if there was a problem creating the message."""
@@ -499,6 +954,244 @@ class AbstractSimulationComponent:
             LOGGER.error("Problem with creating an error message: {}".format(message_error))
             return None
 
+    def get_health_status(self) -> Dict[str, Any]:
+        """Returns the current state of the component for the health endpoint. The child classes can add
+           their own attributes to the dictionary returned by this method. This method is called without the message
+           handling lock, so it must not modify the component state."""
+        waiting_inputs = []
+        if self._epoch_inputs.has_expectations and self._completed_epoch < self._latest_epoch:
+            waiting_inputs = [
+                {"Topic": topic_name, "SourceProcessId": source_process_id, "Count": count}
+                for topic_name, source_process_id, count in self._epoch_inputs.missing_inputs(self._latest_epoch)
+            ]
+
+        return {
+            HEALTHY_ATTRIBUTE: self.initialization_error is None and not self._in_error_state,
+            "ComponentName": self.component_name,
+            "SimulationId": self.simulation_id,
+            "SimulationState": self._simulation_state,
+            "LatestEpoch": self._latest_epoch,
+            "CompletedEpoch": self._completed_epoch,
+            "IdleUntilEpoch": self._idle_until_epoch,
+            "WaitingForInputs": waiting_inputs,
+            "WaitingMessages": self._waiting_message_count,
+            "OutboxDepth": getattr(self._rabbitmq_client, "outbox_depth", 0),
+            "Error": self.initialization_error or self._error_description or None,
+            "Metrics": METRICS.to_json()
+        }
+
+    def __get_metrics_text(self) -> str:
+        """Returns the collected metrics in the Prometheus text format for the metrics endpoint."""
+        return METRICS.to_prometheus(component=self.component_name)
+
+    @contextlib.asynccontextmanager
+    async def __message_handling_lock(self) -> AsyncIterator[None]:
+        """Holds the message handling lock while keeping count of the messages waiting for the lock."""
+        self._waiting_message_count += 1
+        try:
+            await self._lock.acquire()
+        finally:
+            self._waiting_message_count -= 1
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    def __get_read_only_handler(self, message_object: Union[BaseMessage, Any],
+                                message_routing_key: str) -> Optional[CallbackFunctionType]:
+        """Returns the handler for the given message if the message can be handled without the message handling
+           lock. Returns None if the message must be handled while holding the lock."""
+        if isinstance(message_object, EpochMessage):
+            if (message_object.simulation_id == self.simulation_id and
+                    message_object.epoch_number == self._latest_epoch and
+                    self._latest_status_message_id in message_object.triggering_message_ids):
+                return self.__handle_registered_epoch_message
+            return None
+
+        if isinstance(message_object, SimulationStateMessage):
+            if (message_object.simulation_id == self.simulation_id and self._latest_epoch > 0 and
+                    message_object.simulation_state == self._simulation_state ==
+                    AbstractSimulationComponent.SIMULATION_STATE_VALUE_RUNNING):
+                return self.__handle_repeated_simulation_state_message
+            return None
+
+        return self._read_only_handlers.get(message_routing_key, None)
+
+    async def __handle_registered_epoch_message(self, message_object: EpochMessage, message_routing_key: str) -> None:
+        """Handles an Epoch message for the current epoch for which the status has already been registered."""
+        # pylint: disable=unused-argument
+        LOGGER.info("Status message has already been registered for epoch {}".format(message_object.epoch_number))
+
+    async def __handle_repeated_simulation_state_message(self, message_object: SimulationStateMessage,
+                                                         message_routing_key: str) -> None:
+        """Handles a SimState message that does not change the simulation state."""
+        LOGGER.debug("Received a repeated state message '{}' on topic {}".format(
+            message_object.simulation_state, message_routing_key))
+
+    async def __dispatch_message(self, message_object: Union[BaseMessage, Any], message_routing_key: str) -> None:
+        """Calls the handler for the given message. Called while holding the message handling lock."""
+        if isinstance(message_object, SimulationStateMessage):
+            await self.simulation_state_message_handler(message_object, message_routing_key)
+
+        elif isinstance(message_object, EpochMessage):
+            await self.epoch_message_handler(message_object, message_routing_key)
+
+        elif self._profiling_topic and message_routing_key == self._profiling_topic:
+            self.__handle_profiling_message(message_object)
+
+        elif self._in_error_state:
+            # component is in an error state and will not react to any other messages
+            return
+
+        else:
+            # Handling of any other message types would be added to a separate function.
+            with self._profiler.profile(TARGET_MESSAGE_HANDLER):
+                await self.general_message_handler(message_object, message_routing_key)
+            if self._epoch_inputs.has_expectations:
+                await self.__register_epoch_input(message_object, message_routing_key)
+
+    async def __resend_status_message(self) -> None:
+        """Resends the status message for the already completed current epoch if the simulation manager has
+           requested it by sending the Epoch message again. The calls to start_epoch after the epoch has been
+           completed, e.g. after late input messages, do not cause new status messages. The requests received
+           within the status resend interval are answered with one status message when the interval has passed."""
+        if not self._status_resend_requested:
+            LOGGER.debug("The epoch {} has already been processed".format(self._completed_epoch))
+            return
+        self._status_resend_requested = False
+
+        if self._latest_status_epoch == self._latest_epoch:
+            remaining_interval = self._status_resend_interval - (time.monotonic() - self._latest_status_time)
+            if remaining_interval > 0:
+                if self._status_resend_timer is None:
+                    LOGGER.debug("The status for epoch {} was sent less than {} seconds ago, resending in {} s".format(
+                        self._latest_epoch, self._status_resend_interval, remaining_interval))
+                    self._status_resend_timer = Timer(
+                        False, remaining_interval, self.__status_resend_handler, self._latest_epoch)
+                return
+
+        LOGGER.info("Resending status message for epoch {}".format(self._latest_epoch))
+        await self.send_status_message()
+
+    async def __cancel_status_resend(self) -> None:
+        """Cancels the timer for the delayed status resend if it is running."""
+        if self._status_resend_timer is not None:
+            status_resend_timer = self._status_resend_timer
+            self._status_resend_timer = None
+            await status_resend_timer.cancel()
+
+    async def __status_resend_handler(self, epoch_number: int) -> None:
+        """Resends the status message for the given epoch if it is still the current completed epoch.
+           Called by the status resend timer."""
+        async with self._lock:
+            # the timer is not cancelled from within its own callback
+            self._status_resend_timer = None
+            if epoch_number != self._latest_epoch or self._completed_epoch != epoch_number:
+                return
+
+            LOGGER.info("Resending status message for epoch {}".format(epoch_number))
+            await self.send_status_message()
+
+    def __update_idle_epochs(self) -> None:
+        """Checks the upcoming epochs with is_idle_epoch if the current range of idle epochs has ended."""
+        if (self._idle_epoch_lookahead <= 0 or self._latest_epoch_message is None or
+                self._idle_until_epoch > self._latest_epoch):
+            return
+
+        try:
+            start_time = to_utc_datetime_object(self._latest_epoch_message.start_time)
+            end_time = to_utc_datetime_object(self._latest_epoch_message.end_time)
+        except ValueError as time_error:
+            LOGGER.warning("Could not determine the epoch times: {}".format(time_error))
+            return
+        epoch_length = end_time - start_time
+        if epoch_length <= datetime.timedelta(0):
+            return
+
+        idle_until_epoch = self._latest_epoch
+        for epoch_number in range(self._latest_epoch + 1, self._latest_epoch + self._idle_epoch_lookahead + 1):
+            time_offset = (epoch_number - self._latest_epoch) * epoch_length
+            if not self.is_idle_epoch(epoch_number, start_time + time_offset, end_time + time_offset):
+                break
+            idle_until_epoch = epoch_number
+
+        if idle_until_epoch > self._latest_epoch:
+            LOGGER.info("Epochs {} - {} are idle epochs".format(self._latest_epoch + 1, idle_until_epoch))
+        self._idle_until_epoch = idle_until_epoch
+
+    def __handle_profiling_message(self, message_object: Union[BaseMessage, Any]) -> None:
+        """Starts or stops the profiling based on the given control message.
+           The message must contain the attribute ProfiledEpochs (the number of profiled epochs, 0 to stop) and
+           can contain the lists Targets (the profiled targets) and ComponentNames (the components to profile)."""
+        if isinstance(message_object, GeneralMessage):
+            attributes = message_object.general_attributes
+        elif isinstance(message_object, dict):
+            attributes = message_object
+        else:
+            attributes = {}
+
+        component_names = attributes.get(COMPONENT_NAMES_ATTRIBUTE, None)
+        if isinstance(component_names, list) and self.component_name not in component_names:
+            return
+
+        profiled_epochs = attributes.get(PROFILED_EPOCHS_ATTRIBUTE, None)
+        targets = attributes.get(TARGETS_ATTRIBUTE, None)
+        if (not isinstance(profiled_epochs, int) or isinstance(profiled_epochs, bool) or profiled_epochs < 0 or
+                (targets is not None and not isinstance(targets, list))):
+            LOGGER.warning("Received an invalid profiling control message: {}".format(attributes))
+            return
+
+        if profiled_epochs == 0:
+            LOGGER.info("Stopping the profiling")
+            self._profiler.stop()
+        else:
+            self._profiler.start(profiled_epochs, targets)
+
+    async def __register_epoch_input(self, message_object: Union[BaseMessage, Any], message_routing_key: str) -> None:
+        """Registers the arrival of the given message to the epoch input tracker and starts the epoch processing
+           if the message completed the expected inputs for the current epoch."""
+        if not isinstance(message_object, AbstractMessage):
+            return
+
+        epoch_number = getattr(message_object, "epoch_number", None)
+        if epoch_number is None:
+            epoch_number = self._latest_epoch
+
+        if (self._epoch_inputs.add_arrival(
+                epoch_number, message_routing_key, message_object.source_process_id, message_object.message_id) and
+                epoch_number == self._latest_epoch and self._completed_epoch < self._latest_epoch):
+            LOGGER.debug("All the expected inputs received for epoch {}".format(epoch_number))
+            await self.start_epoch()
+
+    def __start_epoch_deadline(self) -> None:
+        """Starts the deadline timer for the current epoch if a deadline is used and the component is
+           waiting for the expected epoch inputs."""
+        if (self._epoch_input_deadline > 0 and self._epoch_inputs.has_expectations and
+                self._epoch_deadline_timer is None and self._completed_epoch < self._latest_epoch):
+            self._epoch_deadline_timer = Timer(
+                False, self._epoch_input_deadline, self.__epoch_deadline_handler, self._latest_epoch)
+
+    async def __cancel_epoch_deadline(self) -> None:
+        """Cancels the deadline timer for the current epoch if it is running."""
+        if self._epoch_deadline_timer is not None:
+            epoch_deadline_timer = self._epoch_deadline_timer
+            self._epoch_deadline_timer = None
+            await epoch_deadline_timer.cancel()
+
+    async def __epoch_deadline_handler(self, epoch_number: int) -> None:
+        """Starts the epoch processing for the given epoch without all the expected inputs.
+           Called by the deadline timer."""
+        async with self._lock:
+            # the timer is not cancelled from within its own callback
+            self._epoch_deadline_timer = None
+            if epoch_number != self._latest_epoch or self._completed_epoch >= epoch_number:
+                return
+
+            LOGGER.warning("Epoch input deadline passed for epoch {}, missing inputs: {}".format(
+                epoch_number, self._epoch_inputs.missing_inputs(epoch_number)))
+            self._epoch_deadline_passed = True
+            await self.start_epoch()
+
     def __set_component_variables(self,
                                   simulation_id: Optional[str] = None,
                                   component_name: Optional[str] = None,
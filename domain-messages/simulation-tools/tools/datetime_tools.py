@@ -7,6 +7,8 @@
 """Module containing utility functions related to datetime values."""
 
 import datetime
+import functools
+import re
 from typing import Union
 
 from tools.tools import FullLogger
@@ -16,35 +18,70 @@ LOGGER = FullLogger(__name__)
 UTC_TIMEZONE_MARK = "Z"
 DIGITS_IN_MILLISECONDS = 3
 
+# The datetime format used in the messages, e.g. "2020-06-03T04:00:00.000Z".
+# Only ASCII digits are accepted since the str.isdigit and int would also accept other Unicode digits.
+CANONICAL_DATETIME_PATTERN = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}Z\Z", re.ASCII)
+CANONICAL_DATETIME_FORMAT = "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}.{:03d}Z"
+
+# The number of parsed datetime objects that are kept in memory.
+DATETIME_CACHE_SIZE = 1024
+
 
 def get_utcnow_in_milliseconds() -> str:
     """Returns the current ISO 8601 format datetime string in UTC timezone."""
-    isoformat_with_milliseconds = isoformat_to_milliseconds(datetime.datetime.utcnow().isoformat())
-    if isoformat_with_milliseconds is None:
-        LOGGER.error("Unexpected error when trying to get current time in ISO 8601 format")
-        return "1970-01-01T00:00:00.000Z"
+    return datetime.datetime.utcnow().isoformat(timespec="milliseconds") + UTC_TIMEZONE_MARK
+
+
+def is_canonical_datetime_string(datetime_str: str) -> bool:
+    """Returns True if the given string has the format used in the messages, e.g. "2020-06-03T04:00:00.000Z".
+       The actual date and time values are not validated."""
+    return CANONICAL_DATETIME_PATTERN.match(datetime_str) is not None
+
 
-    return isoformat_with_milliseconds + UTC_TIMEZONE_MARK
+def parse_canonical_datetime_string(datetime_str: str) -> datetime.datetime:
+    """Returns a datetime object in UTC timezone corresponding to the given string that must be in the format
+       used in the messages, e.g. "2020-06-03T04:00:00.000Z".
+       Raises ValueError if the string is not in the correct format or if it contains invalid values."""
+    if CANONICAL_DATETIME_PATTERN.match(datetime_str) is None:
+        raise ValueError("'{:s}' is not in the format YYYY-MM-DDTHH:MM:SS.mmmZ".format(datetime_str))
+    return datetime.datetime(
+        int(datetime_str[0:4]), int(datetime_str[5:7]), int(datetime_str[8:10]),
+        int(datetime_str[11:13]), int(datetime_str[14:16]), int(datetime_str[17:19]),
+        int(datetime_str[20:23]) * 1000, tzinfo=datetime.timezone.utc)
+
+
+def format_utc_datetime(datetime_value: datetime.datetime) -> str:
+    """Returns the given datetime object as ISO 8601 formatted string in UTC timezone with millisecond precision.
+       The datetime object without timezone information is assumed to be in local time."""
+    if datetime_value.tzinfo is not datetime.timezone.utc:
+        datetime_value = datetime_value.astimezone(datetime.timezone.utc)
+    return CANONICAL_DATETIME_FORMAT.format(
+        datetime_value.year, datetime_value.month, datetime_value.day,
+        datetime_value.hour, datetime_value.minute, datetime_value.second,
+        datetime_value.microsecond // 1000)
 
 
 def to_iso_format_datetime_string(datetime_value: Union[str, datetime.datetime]) -> Union[str, None]:
     """Returns the given datetime value as ISO 8601 formatted string in UTC timezone.
        Accepts either datetime objects or strings.
        Return None if the given values was invalid."""
-    if isinstance(datetime_value, datetime.datetime):
-        isoformat_with_milliseconds = isoformat_to_milliseconds(
-            datetime_value.astimezone(datetime.timezone.utc).isoformat())
-        if isoformat_with_milliseconds is None:
-            return None
-        return isoformat_with_milliseconds + UTC_TIMEZONE_MARK
     if isinstance(datetime_value, str):
-        datetime_object = to_utc_datetime_object(datetime_value)
-        return to_iso_format_datetime_string(datetime_object)
+        if CANONICAL_DATETIME_PATTERN.match(datetime_value) is not None:
+            # the string is already in the correct format, only the date and time values need to be validated
+            to_utc_datetime_object(datetime_value)
+            return datetime_value
+        return format_utc_datetime(to_utc_datetime_object(datetime_value))
+    if isinstance(datetime_value, datetime.datetime):
+        return format_utc_datetime(datetime_value)
     return None
 
 
+@functools.lru_cache(maxsize=DATETIME_CACHE_SIZE)
 def to_utc_datetime_object(datetime_str: str) -> datetime.datetime:
-    """Returns a datetime object corresponding to the given ISO 8601 formatted string."""
+    """Returns a datetime object corresponding to the given ISO 8601 formatted string.
+       The results are cached since the same epoch start and end times are parsed repeatedly."""
+    if CANONICAL_DATETIME_PATTERN.match(datetime_str) is not None:
+        return parse_canonical_datetime_string(datetime_str)
     return datetime.datetime.fromisoformat(datetime_str.replace(UTC_TIMEZONE_MARK, "+00:00"))
 
 
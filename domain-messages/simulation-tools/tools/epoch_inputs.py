@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains a class for keeping track of the input messages that a component expects for each epoch."""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from tools.tools import FullLogger
+
+LOGGER = FullLogger(__name__)
+
+# (topic name, source process id), the source process id None matches any source
+EpochInputKey = Tuple[str, Optional[str]]
+
+
+class EpochArrivals:
+    """Holds the arrival counts of the input messages for a single epoch."""
+    __slots__ = ("counts", "topic_counts", "message_ids", "missing", "is_complete")
+
+    def __init__(self):
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self.topic_counts: Dict[str, int] = {}
+        self.message_ids: Set[Tuple[str, str]] = set()
+        self.missing = 0
+        self.is_complete = False
+
+
+class EpochInputTracker:
+    """Keeps track of the expected input messages for each epoch.
+       The expected inputs are given as (topic name, source process id, count) triples where a missing
+       source process id means that the messages can come from any source. The arrivals are counted incrementally,
+       so checking whether all the inputs for an epoch have been received does not depend on the number of
+       received messages. The specific source expectations are filled before the any source expectation
+       for the same topic.
+    """
+
+    def __init__(self):
+        self.__expected: Dict[EpochInputKey, int] = {}
+        self.__expected_by_topic: Dict[str, Dict[Optional[str], int]] = {}
+        self.__epochs: Dict[int, EpochArrivals] = {}
+
+    @property
+    def has_expectations(self) -> bool:
+        """True if at least one expected input has been registered."""
+        return bool(self.__expected)
+
+    @property
+    def expected_inputs(self) -> List[Tuple[str, Optional[str], int]]:
+        """The registered expected inputs as a list of (topic name, source process id, count) triples."""
+        return [
+            (topic_name, source_process_id, count)
+            for (topic_name, source_process_id), count in self.__expected.items()
+        ]
+
+    def expect(self, topic_name: str, source_process_id: Optional[str] = None, count: int = 1) -> None:
+        """Registers that count messages are expected from the given topic and source for each epoch.
+           If source_process_id is None, the messages can come from any source.
+           Registering the same topic and source again replaces the earlier count and a count of 0 removes
+           the expectation.
+        """
+        if count < 0:
+            raise ValueError("The expected message count cannot be negative: {}".format(count))
+
+        key = (topic_name, source_process_id)
+        if count == 0:
+            self.__expected.pop(key, None)
+        else:
+            self.__expected[key] = count
+        self.__update_topic_expectations()
+
+    def clear_expectations(self) -> None:
+        """Removes all the registered expected inputs."""
+        self.__expected.clear()
+        self.__update_topic_expectations()
+
+    def start_epoch(self, epoch_number: int) -> None:
+        """Discards the arrival information for the epochs before the given epoch."""
+        for old_epoch_number in [number for number in self.__epochs if number < epoch_number]:
+            del self.__epochs[old_epoch_number]
+
+    def add_arrival(self, epoch_number: int, topic_name: str, source_process_id: str,
+                    message_id: Optional[str] = None) -> bool:
+        """Registers an arrived message for the given epoch.
+           The repeated deliveries of a message with the same source process id and message id are counted only once.
+           Returns True only for the arrival that completed the expected inputs for the epoch.
+        """
+        epoch_arrivals = self.__get_epoch_arrivals(epoch_number)
+        if message_id is not None:
+            message_key = (source_process_id, message_id)
+            if message_key in epoch_arrivals.message_ids:
+                return False
+            epoch_arrivals.message_ids.add(message_key)
+
+        topic_expectations = self.__expected_by_topic.get(topic_name, None)
+        satisfied_before = self.__satisfied_count(epoch_arrivals, topic_name, topic_expectations)
+
+        arrival_key = (topic_name, source_process_id)
+        epoch_arrivals.counts[arrival_key] = epoch_arrivals.counts.get(arrival_key, 0) + 1
+        epoch_arrivals.topic_counts[topic_name] = epoch_arrivals.topic_counts.get(topic_name, 0) + 1
+
+        if topic_expectations is None or epoch_arrivals.is_complete:
+            return False
+
+        epoch_arrivals.missing -= (
+            self.__satisfied_count(epoch_arrivals, topic_name, topic_expectations) - satisfied_before)
+        if epoch_arrivals.missing <= 0:
+            epoch_arrivals.is_complete = True
+            return True
+        return False
+
+    def is_complete(self, epoch_number: int) -> bool:
+        """Returns True if all the expected inputs for the given epoch have been received."""
+        epoch_arrivals = self.__epochs.get(epoch_number, None)
+        if epoch_arrivals is None:
+            return not self.__expected
+        return epoch_arrivals.is_complete
+
+    def missing_inputs(self, epoch_number: int) -> List[Tuple[str, Optional[str], int]]:
+        """Returns the expected inputs that are still missing for the given epoch
+           as a list of (topic name, source process id, missing message count) triples."""
+        epoch_arrivals = self.__epochs.get(epoch_number, EpochArrivals())
+        missing_inputs = []
+        for topic_name, topic_expectations in self.__expected_by_topic.items():
+            specific_arrivals = 0
+            for source_process_id, count in topic_expectations.items():
+                if source_process_id is None:
+                    continue
+                arrivals = min(epoch_arrivals.counts.get((topic_name, source_process_id), 0), count)
+                specific_arrivals += arrivals
+                if arrivals < count:
+                    missing_inputs.append((topic_name, source_process_id, count - arrivals))
+
+            any_source_count = topic_expectations.get(None, 0)
+            any_source_arrivals = min(epoch_arrivals.topic_counts.get(topic_name, 0) - specific_arrivals,
+                                      any_source_count)
+            if any_source_arrivals < any_source_count:
+                missing_inputs.append((topic_name, None, any_source_count - any_source_arrivals))
+
+        return missing_inputs
+
+    def __get_epoch_arrivals(self, epoch_number: int) -> EpochArrivals:
+        """Returns the arrival information for the given epoch. Creates it if it does not yet exist."""
+        epoch_arrivals = self.__epochs.get(epoch_number, None)
+        if epoch_arrivals is None:
+            epoch_arrivals = EpochArrivals()
+            self.__update_missing_count(epoch_arrivals)
+            self.__epochs[epoch_number] = epoch_arrivals
+        return epoch_arrivals
+
+    def __update_topic_expectations(self) -> None:
+        """Rebuilds the topic based lookup table and updates the missing counts for the tracked epochs.
+           Called after the expectations have been modified."""
+        self.__expected_by_topic = {}
+        for (topic_name, source_process_id), count in self.__expected.items():
+            self.__expected_by_topic.setdefault(topic_name, {})[source_process_id] = count
+
+        for epoch_arrivals in self.__epochs.values():
+            self.__update_missing_count(epoch_arrivals)
+
+    def __update_missing_count(self, epoch_arrivals: EpochArrivals) -> None:
+        """Calculates the number of missing messages for the given epoch from the arrival counts."""
+        epoch_arrivals.missing = sum(
+            sum(topic_expectations.values()) - self.__satisfied_count(epoch_arrivals, topic_name, topic_expectations)
+            for topic_name, topic_expectations in self.__expected_by_topic.items()
+        )
+        epoch_arrivals.is_complete = epoch_arrivals.missing <= 0
+
+    @staticmethod
+    def __satisfied_count(epoch_arrivals: EpochArrivals, topic_name: str,
+                          topic_expectations: Optional[Dict[Optional[str], int]]) -> int:
+        """Returns the number of expected messages for the given topic that have already arrived."""
+        if not topic_expectations:
+            return 0
+
+        specific_arrivals = 0
+        for source_process_id, count in topic_expectations.items():
+            if source_process_id is not None:
+                specific_arrivals += min(epoch_arrivals.counts.get((topic_name, source_process_id), 0), count)
+
+        any_source_arrivals = min(epoch_arrivals.topic_counts.get(topic_name, 0) - specific_arrivals,
+                                  topic_expectations.get(None, 0))
+        return specific_arrivals + any_source_arrivals
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains a worker pool that can be used to run CPU heavy work, like decoding large messages,
+   outside the asyncio event loop.
+
+   The module level pool WORKER_POOL is configured with environmental variables and it is disabled by default.
+   When the pool is disabled, all the work is done directly in the event loop.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import importlib
+from typing import cast, Any, Callable, List, Optional, TypeVar
+
+from tools.message.factory import MessageFactory
+from tools.tools import FullLogger, EnvironmentVariable
+
+LOGGER = FullLogger(__name__)
+
+# The names of the environmental variables used by the worker pool.
+# The type of the worker pool: "none" (no pool), "thread" or "process".
+SIMULATION_WORKER_POOL_TYPE = "SIMULATION_WORKER_POOL_TYPE"
+# The maximum number of workers in the pool, 0 means the default of the concurrent.futures executor.
+SIMULATION_WORKER_POOL_SIZE = "SIMULATION_WORKER_POOL_SIZE"
+# The minimum size in bytes for the received messages that are decoded in the worker pool.
+SIMULATION_WORKER_POOL_DECODE_THRESHOLD = "SIMULATION_WORKER_POOL_DECODE_THRESHOLD"
+
+WORKER_POOL_TYPE_NONE = "none"
+WORKER_POOL_TYPE_THREAD = "thread"
+WORKER_POOL_TYPE_PROCESS = "process"
+WORKER_POOL_TYPES = [WORKER_POOL_TYPE_NONE, WORKER_POOL_TYPE_THREAD, WORKER_POOL_TYPE_PROCESS]
+
+DEFAULT_DECODE_THRESHOLD = 65536
+
+ResultType = TypeVar("ResultType")
+
+
+def initialize_worker_process(module_names: List[str]) -> None:
+    """Imports the given modules in a new worker process. Used to register the message classes to the message factory
+       in the worker processes that are not started by forking the main process."""
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as import_error:
+            LOGGER.warning("Could not import module {} in a worker process: {}".format(module_name, import_error))
+
+
+class WorkerPool:
+    """Runs functions in a thread or a process pool and returns the results to the asyncio event loop.
+       The executor is created when it is first needed. If the pool is disabled or the executor is not usable,
+       the functions are run directly in the event loop.
+
+       With the process pool, the function, its arguments and the result must be picklable,
+       i.e. the function must be defined at the module level. The message objects can be returned from
+       the worker processes, since the unpickled message objects are not validated again.
+    """
+
+    def __init__(self, pool_type: Optional[str] = None, max_workers: Optional[int] = None,
+                 decode_threshold: Optional[int] = None):
+        """Creates a new worker pool. The missing parameters are read from the environmental variables:
+           - pool_type         : SIMULATION_WORKER_POOL_TYPE, "none", "thread" or "process" (default: "none")
+           - max_workers       : SIMULATION_WORKER_POOL_SIZE, the maximum number of workers,
+                                 0 means the concurrent.futures default (default: 0)
+           - decode_threshold  : SIMULATION_WORKER_POOL_DECODE_THRESHOLD, the minimum size in bytes for
+                                 the received messages that are decoded in the pool (default: 65536)
+        """
+        if pool_type is None:
+            pool_type = cast(str, EnvironmentVariable(
+                SIMULATION_WORKER_POOL_TYPE, str, WORKER_POOL_TYPE_NONE).value).strip().lower()
+        if max_workers is None:
+            max_workers = cast(int, EnvironmentVariable(SIMULATION_WORKER_POOL_SIZE, int, 0).value)
+        if decode_threshold is None:
+            decode_threshold = cast(int, EnvironmentVariable(
+                SIMULATION_WORKER_POOL_DECODE_THRESHOLD, int, DEFAULT_DECODE_THRESHOLD).value)
+
+        if pool_type not in WORKER_POOL_TYPES:
+            LOGGER.warning("Unknown worker pool type '{}', using '{}'".format(pool_type, WORKER_POOL_TYPE_NONE))
+            pool_type = WORKER_POOL_TYPE_NONE
+
+        self.__pool_type = pool_type
+        self.__max_workers = max(max_workers, 0)
+        self.__decode_threshold = max(decode_threshold, 0)
+        self.__executor: Optional[concurrent.futures.Executor] = None
+
+    @property
+    def pool_type(self) -> str:
+        """The type of the worker pool: "none", "thread" or "process"."""
+        return self.__pool_type
+
+    @property
+    def is_enabled(self) -> bool:
+        """True if the functions are run in a thread or a process pool."""
+        return self.__pool_type != WORKER_POOL_TYPE_NONE
+
+    @property
+    def max_workers(self) -> int:
+        """The maximum number of workers, 0 means the concurrent.futures default."""
+        return self.__max_workers
+
+    @property
+    def decode_threshold(self) -> int:
+        """The minimum size in bytes for the received messages that are decoded in the pool."""
+        return self.__decode_threshold
+
+    def should_decode(self, message_size: int) -> bool:
+        """Returns True if a received message of the given size should be decoded in the pool."""
+        return self.is_enabled and message_size >= self.__decode_threshold
+
+    async def run(self, function: Callable[..., ResultType], *args: Any, **kwargs: Any) -> ResultType:
+        """Runs the given function with the given arguments in the worker pool and returns the result.
+           If the pool is disabled or broken, the function is run directly in the event loop."""
+        executor = self.__get_executor()
+        if executor is None:
+            return function(*args, **kwargs)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(function, *args, **kwargs))
+        except concurrent.futures.BrokenExecutor as executor_error:
+            LOGGER.error("The worker pool is broken, running '{}' in the event loop: {}".format(
+                getattr(function, "__name__", str(function)), executor_error))
+            self.shutdown(wait=False)
+            return function(*args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down the executor. A new executor is created if the pool is used again."""
+        executor = self.__executor
+        self.__executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def __get_executor(self) -> Optional[concurrent.futures.Executor]:
+        """Returns the executor for the pool, creating it if needed. Returns None if the pool is disabled."""
+        if self.__executor is None and self.is_enabled:
+            max_workers = self.__max_workers if self.__max_workers > 0 else None
+            if self.__pool_type == WORKER_POOL_TYPE_THREAD:
+                self.__executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="simulation-worker")
+            else:
+                self.__executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=initialize_worker_process,
+                    initargs=(MessageFactory.get_message_modules(),))
+            LOGGER.info("Started a {} worker pool".format(self.__pool_type))
+        return self.__executor
+
+
+WORKER_POOL = WorkerPool()
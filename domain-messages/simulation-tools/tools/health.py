@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains a minimal HTTP server that exposes the health status and the metrics of a running
+   simulation component either on a TCP port or on a Unix socket.
+
+   The server runs in the asyncio event loop of the component. The requests are answered from the current state
+   of the component without waiting for the message handlers, so the server does not delay the epoch processing.
+"""
+
+import asyncio
+import os
+import stat
+from typing import cast, Any, Callable, Dict, List, Optional
+
+from tools import serialization
+from tools.tools import FullLogger, EnvironmentVariable
+
+LOGGER = FullLogger(__name__)
+
+# The names of the environmental variables used by the health server.
+# The TCP port for the health server, 0 means that the server is not listening to a TCP port.
+SIMULATION_HEALTH_PORT = "SIMULATION_HEALTH_PORT"
+# The host address for the TCP port of the health server.
+SIMULATION_HEALTH_HOST = "SIMULATION_HEALTH_HOST"
+# The path for the Unix socket of the health server, empty value means that no Unix socket is used.
+SIMULATION_HEALTH_SOCKET = "SIMULATION_HEALTH_SOCKET"
+
+DEFAULT_HEALTH_HOST = "127.0.0.1"
+
+HEALTH_PATH = "/health"
+METRICS_PATH = "/metrics"
+# the attribute in the health status that determines whether the response status is 200 or 503
+HEALTHY_ATTRIBUTE = "Healthy"
+
+# the maximum time in seconds for receiving a request and the maximum number of request header lines
+REQUEST_TIMEOUT = 5.0
+MAX_HEADER_LINES = 100
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_STATUS_TEXTS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable"
+}
+
+
+def get_http_response(status_code: int, content_type: str, body: bytes, include_body: bool = True) -> bytes:
+    """Returns a HTTP/1.0 response with the given status code and body."""
+    header = "HTTP/1.0 {} {}\r\nContent-Type: {}\r\nContent-Length: {}\r\nConnection: close\r\n\r\n".format(
+        status_code, HTTP_STATUS_TEXTS.get(status_code, ""), content_type, len(body))
+    return header.encode("ascii") + (body if include_body else b"")
+
+
+class HealthServer:
+    """HTTP server with two endpoints:
+       - GET /health: the health status given by status_function as JSON. The response status is 503 if the status
+         contains the attribute "Healthy" with a false value and 200 otherwise.
+       - GET /metrics: the text given by metrics_function, e.g. the metrics in the Prometheus text format.
+
+       The server is disabled if neither the TCP port nor the Unix socket path is given.
+    """
+
+    def __init__(self, status_function: Callable[[], Dict[str, Any]], metrics_function: Callable[[], str],
+                 port: Optional[int] = None, host: Optional[str] = None, socket_path: Optional[str] = None):
+        """Creates a new health server. The missing parameters are read from the environmental variables:
+           - port         : SIMULATION_HEALTH_PORT, the TCP port, 0 means no TCP port (default: 0)
+           - host         : SIMULATION_HEALTH_HOST, the host address for the TCP port (default: "127.0.0.1")
+           - socket_path  : SIMULATION_HEALTH_SOCKET, the path for the Unix socket,
+                            empty value means no Unix socket (default: "")
+        """
+        if port is None:
+            port = cast(int, EnvironmentVariable(SIMULATION_HEALTH_PORT, int, 0).value)
+        if host is None:
+            host = cast(str, EnvironmentVariable(SIMULATION_HEALTH_HOST, str, DEFAULT_HEALTH_HOST).value)
+        if socket_path is None:
+            socket_path = cast(str, EnvironmentVariable(SIMULATION_HEALTH_SOCKET, str, "").value)
+
+        self.__status_function = status_function
+        self.__metrics_function = metrics_function
+        self.__port = max(port, 0)
+        self.__host = host
+        self.__socket_path = socket_path
+        self.__servers: List[asyncio.AbstractServer] = []
+
+    @property
+    def is_enabled(self) -> bool:
+        """True if the server has a TCP port or a Unix socket path."""
+        return self.__port > 0 or bool(self.__socket_path)
+
+    @property
+    def is_running(self) -> bool:
+        """True if the server has been started and not stopped."""
+        return bool(self.__servers)
+
+    @property
+    def port(self) -> int:
+        """The TCP port for the server, 0 if the server does not listen to a TCP port."""
+        return self.__port
+
+    @property
+    def socket_path(self) -> str:
+        """The path for the Unix socket of the server, empty if no Unix socket is used."""
+        return self.__socket_path
+
+    async def start(self) -> bool:
+        """Starts the server if it is enabled and not already running. Returns True if the server is running."""
+        if not self.is_enabled or self.is_running:
+            return self.is_running
+
+        try:
+            if self.__port > 0:
+                self.__servers.append(
+                    await asyncio.start_server(self.__handle_connection, host=self.__host, port=self.__port))
+                LOGGER.info("Health server listening on {}:{}".format(self.__host, self.__port))
+            if self.__socket_path:
+                self.__remove_stale_socket()
+                self.__servers.append(
+                    await asyncio.start_unix_server(self.__handle_connection, path=self.__socket_path))
+                LOGGER.info("Health server listening on Unix socket {}".format(self.__socket_path))
+        except OSError as server_error:
+            LOGGER.warning("Could not start the health server: {}".format(server_error))
+            await self.stop()
+
+        return self.is_running
+
+    async def stop(self) -> None:
+        """Stops the server and removes the Unix socket file."""
+        servers = self.__servers
+        self.__servers = []
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+        if servers and self.__socket_path:
+            self.__remove_stale_socket()
+
+    def get_response(self, method: str, path: str) -> bytes:
+        """Returns the HTTP response for the given request method and path."""
+        if method not in ("GET", "HEAD"):
+            return get_http_response(405, CONTENT_TYPE_TEXT, b"")
+        include_body = method == "GET"
+
+        # the query string is ignored
+        path = path.split("?", maxsplit=1)[0]
+        try:
+            if path == HEALTH_PATH:
+                health_status = self.__status_function()
+                status_code = 200 if health_status.get(HEALTHY_ATTRIBUTE, True) else 503
+                return get_http_response(
+                    status_code, CONTENT_TYPE_JSON, serialization.dumps(health_status), include_body)
+            if path == METRICS_PATH:
+                return get_http_response(
+                    200, CONTENT_TYPE_TEXT, self.__metrics_function().encode("UTF-8"), include_body)
+        except Exception as status_error:  # pylint: disable=broad-except
+            # an error in the status or metrics function must not close the connection without a response
+            LOGGER.error("Could not create the response for '{}': {}: {}".format(
+                path, type(status_error).__name__, status_error))
+            return get_http_response(
+                500, CONTENT_TYPE_JSON, serialization.dumps({"Error": str(status_error)}), include_body)
+
+        return get_http_response(404, CONTENT_TYPE_TEXT, b"")
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Reads one HTTP request from the connection and writes the response."""
+        try:
+            response = await asyncio.wait_for(self.__read_request(reader), timeout=REQUEST_TIMEOUT)
+            writer.write(response)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            LOGGER.debug("Health server connection closed before the response was sent")
+        finally:
+            writer.close()
+
+    async def __read_request(self, reader: asyncio.StreamReader) -> bytes:
+        """Reads the request line and the headers and returns the response for the request."""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            for _ in range(MAX_HEADER_LINES):
+                if (await reader.readline()).strip() == b"":
+                    break
+        except ValueError as line_error:
+            # readline raises ValueError for a line longer than the stream reader limit
+            LOGGER.debug("Health server received a too long request line: {}".format(line_error))
+            return get_http_response(400, CONTENT_TYPE_TEXT, b"")
+
+        if len(request_line) < 2:
+            return get_http_response(400, CONTENT_TYPE_TEXT, b"")
+        return self.get_response(request_line[0].upper(), request_line[1])
+
+    def __remove_stale_socket(self) -> None:
+        """Removes the Unix socket file left by an earlier server."""
+        try:
+            if stat.S_ISSOCK(os.stat(self.__socket_path).st_mode):
+                os.unlink(self.__socket_path)
+        except FileNotFoundError:
+            pass
+        except OSError as socket_error:
+            LOGGER.warning("Could not remove the old Unix socket {}: {}".format(self.__socket_path, socket_error))
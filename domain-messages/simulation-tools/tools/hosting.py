@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains a host class for running the simulation components of several simulations in one process."""
+
+from typing import cast, Any, Callable, Dict, List, Optional, Set, Union
+
+from tools.callbacks import MessageDeduplicator, MessageHeader
+from tools.clients import RabbitmqClient
+from tools.components import AbstractSimulationComponent, SIMULATION_STATE_MESSAGE_TOPIC
+from tools.datetime_tools import to_iso_format_datetime_string
+from tools.executors import WORKER_POOL
+from tools.health import HEALTHY_ATTRIBUTE, HealthServer
+from tools.messages import AbstractMessage, BaseMessage, SimulationStateMessage
+from tools.metrics import METRICS
+from tools.tools import FullLogger, EnvironmentVariable
+
+LOGGER = FullLogger(__name__)
+
+# The names of the environmental variables used by the component host.
+# A comma separated list of the simulation ids for which a component is created when the host is started.
+SIMULATION_HOST_SIMULATION_IDS = "SIMULATION_HOST_SIMULATION_IDS"
+# Whether to create a new component when a SimState running message for an unknown simulation is received.
+SIMULATION_HOST_ACCEPT_NEW_SIMULATIONS = "SIMULATION_HOST_ACCEPT_NEW_SIMULATIONS"
+# The maximum number of simulations hosted at the same time, 0 means no limit.
+SIMULATION_HOST_MAX_SIMULATIONS = "SIMULATION_HOST_MAX_SIMULATIONS"
+
+# The component factory is called with the keyword arguments simulation_id and rabbitmq_client
+# and it should return a new component instance that uses the given client.
+ComponentFactoryType = Callable[..., AbstractSimulationComponent]
+
+
+def get_hosted_simulation_ids() -> List[str]:
+    """Returns the simulation ids given in the environmental variable SIMULATION_HOST_SIMULATION_IDS."""
+    simulation_ids = cast(str, EnvironmentVariable(SIMULATION_HOST_SIMULATION_IDS, str, "").value)
+    return [simulation_id.strip() for simulation_id in simulation_ids.split(",") if simulation_id.strip()]
+
+
+def hosting_enabled() -> bool:
+    """Returns True if the environmental variables indicate that the component should be run
+       with SimulationComponentHost instead of as a single simulation component."""
+    return (
+        bool(get_hosted_simulation_ids()) or
+        cast(bool, EnvironmentVariable(SIMULATION_HOST_ACCEPT_NEW_SIMULATIONS, bool, False).value)
+    )
+
+
+def get_simulation_key(simulation_id: str) -> str:
+    """Returns the simulation id in the ISO 8601 format used by the message classes
+       so that differently formatted ids for the same simulation are handled as the same simulation."""
+    iso_format_string = to_iso_format_datetime_string(simulation_id)
+    if isinstance(iso_format_string, str):
+        return iso_format_string
+    return simulation_id
+
+
+class SimulationComponentHost:
+    """Runs component instances for several simulations in one process.
+       All the hosted components share one RabbitMQ client, one topic listener and the message decoding.
+       The received messages are routed to the component for the simulation given by the SimulationId attribute.
+       The routing is done based on the message header before the message is decoded, so the messages for
+       the simulations that are not hosted are discarded cheaply. The message deduplication is done separately
+       for each simulation since the components in different simulations can use the same message ids.
+       The host runs one health server, configured with the SIMULATION_HEALTH_* environmental variables, that
+       reports the health status of all the hosted components.
+    """
+
+    def __init__(self, component_factory: ComponentFactoryType,
+                 simulation_ids: Optional[List[str]] = None,
+                 accept_new_simulations: Optional[bool] = None,
+                 max_simulations: Optional[int] = None,
+                 rabbitmq_client: Optional[RabbitmqClient] = None):
+        """Creates a new component host.
+           - component_factory       : callable that creates a new component for a simulation, it is called with
+                                       the keyword arguments simulation_id and rabbitmq_client
+           - simulation_ids          : the simulations for which a component is created when the host is started,
+                                       environmental variable: "SIMULATION_HOST_SIMULATION_IDS", default value: []
+           - accept_new_simulations  : whether to create a new component when a SimState running message for
+                                       a simulation that is not yet hosted is received,
+                                       environmental variable: "SIMULATION_HOST_ACCEPT_NEW_SIMULATIONS",
+                                       default value: False
+           - max_simulations         : the maximum number of simulations hosted at the same time, 0 means no limit,
+                                       environmental variable: "SIMULATION_HOST_MAX_SIMULATIONS", default value: 0
+           - rabbitmq_client         : the RabbitMQ client shared by the components, if None, a new client is
+                                       created using the RabbitMQ environmental variables
+        """
+        if simulation_ids is None:
+            simulation_ids = get_hosted_simulation_ids()
+        if accept_new_simulations is None:
+            accept_new_simulations = cast(
+                bool, EnvironmentVariable(SIMULATION_HOST_ACCEPT_NEW_SIMULATIONS, bool, False).value)
+        if max_simulations is None:
+            max_simulations = cast(int, EnvironmentVariable(SIMULATION_HOST_MAX_SIMULATIONS, int, 0).value)
+
+        self.__component_factory = component_factory
+        self.__initial_simulation_ids = list(simulation_ids)
+        self.__accept_new_simulations = accept_new_simulations
+        self.__max_simulations = max(max_simulations, 0)
+        self.__rabbitmq_client = rabbitmq_client if rabbitmq_client is not None else RabbitmqClient()
+
+        # simulation id in ISO 8601 format => the component for the simulation
+        self.__components: Dict[str, AbstractSimulationComponent] = {}
+        self.__deduplicators: Dict[str, MessageDeduplicator] = {}
+        self.__listened_topics: Set[str] = set()
+        self.__simulation_state_topic = cast(
+            str, EnvironmentVariable(SIMULATION_STATE_MESSAGE_TOPIC, str, "SimState").value)
+        self.__health_server = HealthServer(self.get_health_status, METRICS.to_prometheus)
+        self.__is_stopped = True
+
+    @property
+    def is_stopped(self) -> bool:
+        """Returns True, if the host is stopped."""
+        return self.__is_stopped
+
+    @property
+    def simulation_ids(self) -> List[str]:
+        """The simulation ids, in ISO 8601 format, of the currently hosted simulations."""
+        return list(self.__components)
+
+    @property
+    def listened_topics(self) -> List[str]:
+        """The topics that the host listens to."""
+        return sorted(self.__listened_topics)
+
+    @property
+    def health_server(self) -> HealthServer:
+        """The health server for the host."""
+        return self.__health_server
+
+    def get_component(self, simulation_id: str) -> Optional[AbstractSimulationComponent]:
+        """Returns the component for the given simulation or None if the simulation is not hosted."""
+        return self.__components.get(get_simulation_key(simulation_id), None)
+
+    def get_health_status(self) -> Dict[str, Any]:
+        """Returns the health status of the host for the health endpoint. The host is healthy when it is running
+           and all the hosted components are healthy. The statuses of the components are given in the attribute
+           Simulations with the simulation ids as the keys."""
+        component_statuses = {
+            simulation_id: component.get_health_status()
+            for simulation_id, component in self.__components.items()
+        }
+        return {
+            HEALTHY_ATTRIBUTE: not self.__is_stopped and all(
+                component_status.get(HEALTHY_ATTRIBUTE, True) for component_status in component_statuses.values()),
+            "Simulations": component_statuses
+        }
+
+    async def start(self) -> None:
+        """Starts the host and the components for the initially given simulations."""
+        LOGGER.info("Starting the component host for {} simulations".format(len(self.__initial_simulation_ids)))
+        self.__is_stopped = False
+        # the hosted components share the client, so they do not start their own health servers
+        await self.__health_server.start()
+        if self.__accept_new_simulations:
+            self.__add_listener([self.__simulation_state_topic])
+        for simulation_id in self.__initial_simulation_ids:
+            await self.add_simulation(simulation_id)
+
+    async def stop(self) -> None:
+        """Stops all the hosted components and closes the message bus connection."""
+        LOGGER.info("Stopping the component host")
+        for simulation_id in list(self.__components):
+            await self.remove_simulation(simulation_id)
+        await self.__health_server.stop()
+        await self.__rabbitmq_client.close()
+        WORKER_POOL.shutdown(wait=False)
+        self.__is_stopped = True
+
+    async def add_simulation(self, simulation_id: str) -> Optional[AbstractSimulationComponent]:
+        """Creates and starts a new component for the given simulation and returns it.
+           If the simulation is already hosted, returns the existing component.
+           Returns None if the maximum number of simulations are already hosted."""
+        simulation_key = get_simulation_key(simulation_id)
+        component = self.__components.get(simulation_key, None)
+        if component is not None:
+            return component
+
+        if 0 < self.__max_simulations <= len(self.__components):
+            LOGGER.warning("Cannot host simulation '{}' since already hosting {} simulations".format(
+                simulation_id, len(self.__components)))
+            return None
+
+        component = self.__component_factory(simulation_id=simulation_id, rabbitmq_client=self.__rabbitmq_client)
+        self.__components[simulation_key] = component
+        if component.message_deduplication:
+            self.__deduplicators[simulation_key] = MessageDeduplicator()
+
+        self.__add_listener(component.listened_topics)
+        await component.start()
+        LOGGER.info("Started component '{}' for simulation '{}'".format(component.component_name, simulation_id))
+        return component
+
+    async def remove_simulation(self, simulation_id: str) -> None:
+        """Stops and removes the component for the given simulation."""
+        simulation_key = get_simulation_key(simulation_id)
+        component = self.__components.pop(simulation_key, None)
+        self.__deduplicators.pop(simulation_key, None)
+        if component is not None and not component.is_stopped:
+            await component.stop()
+
+    def message_prefilter(self, message_header: MessageHeader, message_routing_key: str) -> bool:
+        """Decides based on the message header whether the received message is routed to one of the components.
+           Uses the message_prefilter of the component for the simulation of the message."""
+        if message_header.simulation_id is None:
+            # the simulation is determined after the message has been decoded
+            return True
+
+        component = self.__components.get(get_simulation_key(message_header.simulation_id), None)
+        if component is None:
+            return (
+                self.__accept_new_simulations and
+                message_header.message_type == SimulationStateMessage.CLASS_MESSAGE_TYPE
+            )
+        return component.message_prefilter(message_header, message_routing_key)
+
+    async def message_handler(self, message_object: Union[BaseMessage, Any], message_routing_key: str) -> None:
+        """Routes the received message to the component for the simulation of the message."""
+        if isinstance(message_object, BaseMessage):
+            simulation_id = message_object.simulation_id
+        elif isinstance(message_object, dict):
+            simulation_id = message_object.get("SimulationId", None)
+        else:
+            simulation_id = None
+        if not isinstance(simulation_id, str):
+            LOGGER.debug("Received a message without a simulation id from topic %s", message_routing_key)
+            return
+
+        simulation_key = get_simulation_key(simulation_id)
+        component = self.__components.get(simulation_key, None)
+        if component is None:
+            if (not self.__accept_new_simulations or
+                    not isinstance(message_object, SimulationStateMessage) or
+                    message_object.simulation_state != AbstractSimulationComponent.SIMULATION_STATE_VALUE_RUNNING):
+                LOGGER.debug("Discarding message from topic %s for simulation '%s' that is not hosted",
+                             message_routing_key, simulation_id)
+                return
+            component = await self.add_simulation(simulation_id)
+            if component is None:
+                return
+
+        deduplicator = self.__deduplicators.get(simulation_key, None)
+        if (deduplicator is not None and isinstance(message_object, AbstractMessage) and
+                deduplicator.is_duplicate_identifier((message_object.source_process_id, message_object.message_id))):
+            LOGGER.debug("Dropped a duplicate message from topic '%s'", message_routing_key)
+            return
+
+        await component.general_message_handler_base(message_object, message_routing_key)
+
+        if component.is_stopped:
+            LOGGER.info("Simulation '{}' has stopped".format(simulation_id))
+            await self.remove_simulation(simulation_id)
+            if not self.__components and not self.__accept_new_simulations:
+                await self.stop()
+
+    def __add_listener(self, topic_names: List[str]) -> None:
+        """Adds a topic listener for the given topics that are not yet listened to."""
+        new_topics = [topic_name for topic_name in topic_names if topic_name not in self.__listened_topics]
+        if new_topics:
+            self.__rabbitmq_client.add_listener(
+                new_topics, self.message_handler, prefilter=self.message_prefilter)
+            self.__listened_topics.update(new_topics)
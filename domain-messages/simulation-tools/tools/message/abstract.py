@@ -9,69 +9,100 @@
 
 from __future__ import annotations
 import datetime
+import functools
 import json
-from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, cast
 
+from tools import serialization
 from tools.datetime_tools import get_utcnow_in_milliseconds, to_iso_format_datetime_string
 from tools.exceptions.messages import (
     MessageDateError, MessageIdError, MessageSourceError, MessageTypeError,
     MessageValueError, MessageEpochValueError, MessageBlockError)
 from tools.message.block import QuantityArrayBlock, QuantityBlock, TimeSeriesBlock
+from tools.message.codec import OPTIONALLY_GENERATED_ATTRIBUTES  # pylint: disable=unused-import
 from tools.message.factory import MessageFactory
 from tools.tools import FullLogger
 
 LOGGER = FullLogger(__name__)
 
-# These attributes will be generated if they are not given when creating message objects.
-OPTIONALLY_GENERATED_ATTRIBUTES = [
-    "Timestamp"
-]
+# the name of the instance attribute that holds the cached bytes representation of a message object together with
+# the modification stamp of the blocks in the message at the time of the serialization
+SERIALIZATION_CACHE_ATTRIBUTE = "_BaseMessage__serialization_cache"
+
+
+def get_cache_clearing_setter(setter: Callable[[Any, Any], None]) -> Callable[[Any, Any], None]:
+    """Returns a property setter that calls the given setter and then clears the serialization cache."""
+    @functools.wraps(setter)
+    def cache_clearing_setter(message_object: Any, value: Any) -> None:
+        setter(message_object, value)
+        setattr(message_object, SERIALIZATION_CACHE_ATTRIBUTE, None)
+
+    setattr(cache_clearing_setter, "clears_serialization_cache", True)
+    return cache_clearing_setter
+
+
+def add_cache_clearing_to_setters(message_class: Type[BaseMessage]) -> None:
+    """Replaces the property setters defined in the given message class with setters that also clear
+       the serialization cache of the message object."""
+    for attribute_name, class_attribute in list(vars(message_class).items()):
+        if (isinstance(class_attribute, property) and class_attribute.fset is not None and
+                not getattr(class_attribute.fset, "clears_serialization_cache", False)):
+            setattr(message_class, attribute_name,
+                    class_attribute.setter(get_cache_clearing_setter(class_attribute.fset)))
+
+
+class MessageMetaClass(type):
+    """Metaclass for the message classes that adds __slots__ for the private attributes behind the properties.
+
+       The message classes store the property values in private attributes named after the property,
+       e.g. the property epoch_number is stored in self.__epoch_number. For each property defined in a class,
+       a slot with the corresponding private name is added to the class, so that the message objects do not need
+       a per-instance dictionary for the attribute values. Any slot names given explicitly in the class definition
+       are kept. BaseMessage includes the __dict__ slot, so other attributes can still be set,
+       but the dictionary is only created for the objects that actually use such attributes.
+    """
+    def __new__(mcs, name: str, bases: Tuple[type, ...], namespace: Dict[str, Any], **kwargs):
+        explicit_slots = namespace.get("__slots__", ())
+        if isinstance(explicit_slots, str):
+            explicit_slots = (explicit_slots,)
+        property_slots = tuple(
+            "__" + attribute_name
+            for attribute_name, attribute_value in namespace.items()
+            if isinstance(attribute_value, property)
+        )
+        namespace["__slots__"] = tuple(explicit_slots) + tuple(
+            slot_name for slot_name in property_slots if slot_name not in explicit_slots)
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
 
 
 def get_json(message_object: BaseMessage) -> Dict[str, Any]:
     """Returns a JSON based on the values of the given message_object and the attribute parameters."""
-    return {
-        json_attribute_name: (
-            getattr(message_object, object_attribute_name)
-            if not hasattr(getattr(message_object, object_attribute_name), 'json')
-            else getattr(message_object, object_attribute_name).json()
-        )
-        for json_attribute_name, object_attribute_name in message_object.__class__.MESSAGE_ATTRIBUTES_FULL.items()
-        if (json_attribute_name not in message_object.__class__.OPTIONAL_ATTRIBUTES_FULL or
-            getattr(message_object, object_attribute_name) is not None)
-    }
+    return MessageFactory.get_codec(message_object.__class__).encode(message_object)
 
 
 def validate_json(message_class: Type[BaseMessage], json_message: Dict[str, Any]) -> bool:
     """Validates the given the given json object for the attributes covered in the given message class.
         Returns True if the message is ok. Otherwise, return False."""
-    for json_attribute_name, object_attribute_name in message_class.MESSAGE_ATTRIBUTES_FULL.items():
-        if json_attribute_name not in json_message and json_attribute_name in OPTIONALLY_GENERATED_ATTRIBUTES:
-            continue
-
-        if (json_attribute_name not in json_message and
-                json_attribute_name not in message_class.OPTIONAL_ATTRIBUTES_FULL):
-            LOGGER.warning("{:s} attribute is missing from the message".format(json_attribute_name))
-            return False
-
-        if not getattr(
-                message_class,
-                "_".join(["_check", object_attribute_name]))(json_message.get(json_attribute_name, None)):
-            # TODO: handle checking for missing timezone information
-            LOGGER.warning("'{:s}' is not valid message value for {:s}".format(
-                str(json_message[json_attribute_name]), json_attribute_name))
-            return False
-
-    return True
+    # TODO: handle checking for missing timezone information
+    return MessageFactory.get_codec(message_class).validate(json_message)
 
 
-class BaseMessage():
+class BaseMessage(metaclass=MessageMetaClass):
     """The base message class for all simulation platform messages."""
+    # the slots for the message attributes are added by the metaclass
+    __slots__ = ("__dict__", "__weakref__", "__serialization_cache")
+
     MESSAGE_ENCODING = "UTF-8"
     # The "Type" attribute is checked against CLASS_MESSAGE_TYPE if MESSAGE_TYPE_CHECK is True.
     # For example, for EpochMessage, "Type" must be "Epoch", but for AbstractMessage any string is acceptable.
     CLASS_MESSAGE_TYPE = ""
     MESSAGE_TYPE_CHECK = False
+    # Whether the bytes representation is cached. The cache is cleared by the property setters of the message and
+    # it is not used if a block in the message has been modified through the property setters of the block or
+    # if a list attribute has been modified in place, e.g. by appending to it.
+    # Note that modifying the items of a list attribute in place is not detected.
+    # In that case, either set the attribute again or call clear_serialization_cache.
+    SERIALIZATION_CACHE = True
 
     # The relationships between the JSON attributes and the object properties
     MESSAGE_ATTRIBUTES = {
@@ -153,6 +184,10 @@ class BaseMessage():
 
             raise MessageDateError("'{:s}' is an invalid datetime".format(str(timestamp)))
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        add_cache_clearing_to_setters(cls)
+
     def __eq__(self, other: Any) -> bool:
         return (
             isinstance(other, BaseMessage) and
@@ -380,7 +415,22 @@ class BaseMessage():
 
     def bytes(self):
         """Returns the message in bytes format."""
-        return bytes(json.dumps(self.json()), encoding=self.__class__.MESSAGE_ENCODING)
+        if not self.SERIALIZATION_CACHE:
+            return serialization.dumps(self.json())
+
+        cache_stamp = MessageFactory.get_codec(self.__class__).get_cache_stamp(self)
+        cache = getattr(self, SERIALIZATION_CACHE_ATTRIBUTE, None)
+        if cache is not None and cache[1] == cache_stamp:
+            return cache[0]
+
+        message_bytes = serialization.dumps(self.json())
+        self.__serialization_cache = (message_bytes, cache_stamp)
+        return message_bytes
+
+    def clear_serialization_cache(self) -> None:
+        """Clears the cached bytes representation of the message.
+           Only needed if the items of a list attribute have been modified in place."""
+        self.__serialization_cache = None
 
     @classmethod
     def validate_json(cls, json_message: Dict[str, Any]) -> bool:
@@ -392,9 +442,7 @@ class BaseMessage():
     def from_json(cls, json_message: Dict[str, Any]) -> Union[BaseMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON does not contain valid values, returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return MessageFactory.get_codec(cls).decode(json_message)
 
     @classmethod
     def register_to_factory(cls):
@@ -405,6 +453,9 @@ class BaseMessage():
             MessageFactory.register_message_type(cls)
 
 
+add_cache_clearing_to_setters(BaseMessage)
+
+
 class AbstractMessage(BaseMessage):
     """The abstract message class that contains the attributes that all simulation specific messages should have."""
 
@@ -466,9 +517,7 @@ class AbstractMessage(BaseMessage):
     def from_json(cls, json_message: Dict[str, Any]) -> Union[AbstractMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON does not contain valid values, returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Optional[AbstractMessage], super().from_json(json_message))
 
 
 class AbstractResultMessage(AbstractMessage):
@@ -624,6 +673,4 @@ class AbstractResultMessage(AbstractMessage):
     def from_json(cls, json_message: Dict[str, Any]) -> Union[AbstractResultMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON does not contain valid values, returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Optional[AbstractResultMessage], super().from_json(json_message))
@@ -11,21 +11,132 @@ Defines various message attribute value blocks that different kinds of messages
 
 from __future__ import annotations
 import datetime
+import importlib
+import importlib.util
+import itertools
 import json
-from typing import Any, Dict, List, Union
+import sys
+from typing import Any, Dict, List, Union, cast
 
-from tools.datetime_tools import to_iso_format_datetime_string
+from tools.datetime_tools import UTC_TIMEZONE_MARK, is_canonical_datetime_string, to_iso_format_datetime_string
 from tools.exceptions.messages import MessageDateError, MessageError, MessageValueError, MessageUnitValueError
 from tools.message.unit import UnitCode
-from tools.tools import FullLogger
+from tools.tools import FullLogger, EnvironmentVariable
 
 LOGGER = FullLogger(__name__)
 
+# The environmental variable for storing the float value arrays as NumPy arrays in the block objects.
+# Has an effect only if the numpy library is installed.
+SIMULATION_ARRAY_BACKED_BLOCKS = "SIMULATION_ARRAY_BACKED_BLOCKS"
 
-class QuantityBlock():
+# The lists shorter than this are handled without NumPy since creating the arrays has a constant overhead.
+MINIMUM_BULK_LENGTH = 16
+DATETIME_ARRAY_TYPE = "datetime64[ms]"
+MINIMUM_DATETIME = "0001-01-01T00:00:00.000"
+
+# numpy is imported only when it is first needed since importing it takes a noticeable amount of time
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+FLOAT_ARRAY_TYPE = "float64"
+# the NumPy dtype kinds that are accepted as number arrays: signed and unsigned integers and floats
+NUMBER_ARRAY_KINDS = "iuf"
+
+# The modification stamps for the blocks. A later modification of any block always gets a larger stamp,
+# so the messages can detect whether their blocks have been modified after the message was serialized.
+MODIFICATION_STAMPS = itertools.count(1)
+
+
+def get_numpy() -> Any:
+    """Returns the numpy module and imports it at the first call. Raises ImportError if numpy is not installed."""
+    numpy = sys.modules.get("numpy", None)
+    if numpy is None:
+        numpy = importlib.import_module("numpy")
+    return numpy
+
+
+def is_array(values: Any) -> bool:
+    """Returns True if the given value is a NumPy array."""
+    # if numpy has not been imported, there cannot be any NumPy arrays
+    numpy = sys.modules.get("numpy", None)
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def get_datetime_array(time_index: List[Any]) -> Any:
+    """Returns the given ISO 8601 datetime strings as a NumPy datetime64 array that has been parsed in bulk.
+       Returns None if numpy is not installed or if the strings are not all in the format used in the messages,
+       e.g. "2020-06-03T04:00:00.000Z". In that case the strings must be handled one by one."""
+    if not NUMPY_AVAILABLE:
+        return None
+    for datetime_value in time_index:
+        if datetime_value.__class__ is not str or not is_canonical_datetime_string(datetime_value):
+            return None
+
+    numpy = get_numpy()
+    try:
+        datetime_array = numpy.array(
+            [datetime_value[:-1] for datetime_value in time_index], dtype=DATETIME_ARRAY_TYPE)
+    except ValueError:
+        return None
+
+    # unlike the datetime module, NumPy accepts the year 0
+    if datetime_array.min() < numpy.datetime64(MINIMUM_DATETIME):
+        return None
+    return datetime_array
+
+
+def values_to_list(values: Any) -> List[Any]:
+    """Returns the given values as a list. The NumPy arrays are converted to lists of Python numbers."""
+    return values.tolist() if is_array(values) else values
+
+
+def values_to_array(values: Any) -> Any:
+    """Returns the given number values as a NumPy array. The NumPy arrays are returned as such.
+       Raises ValueError if the values are not numbers and ImportError if numpy is not installed."""
+    if is_array(values):
+        return values
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy is required for the array representation of the values")
+    values_array = get_numpy().asarray(values)
+    if values_array.dtype.kind not in NUMBER_ARRAY_KINDS:
+        raise ValueError("The values are not numbers")
+    return values_array
+
+
+def datetime_array_to_strings(datetime_array: Any) -> List[str]:
+    """Returns the values of the given NumPy datetime64 array as ISO 8601 formatted strings in UTC timezone."""
+    return [
+        datetime_string + UTC_TIMEZONE_MARK
+        for datetime_string in get_numpy().datetime_as_string(
+            datetime_array.astype(DATETIME_ARRAY_TYPE), unit="ms").tolist()
+    ]
+
+
+class ModificationStampedBlock:
+    """Base class for the blocks that record a modification stamp each time a property setter is called."""
+    __slots__ = ("_modification_stamp",)
+
+    @property
+    def modification_stamp(self) -> int:
+        """The stamp for the latest modification done through the property setters of the block."""
+        return self._modification_stamp
+
+    def _mark_modified(self) -> None:
+        """Records a new modification stamp for the block."""
+        self._modification_stamp = next(MODIFICATION_STAMPS)
+
+    def __setstate__(self, state: Any) -> None:
+        """Restores the attribute values of a pickled or copied block and records a new modification stamp,
+           since the stamps are only comparable within the process in which they were recorded."""
+        _, slot_values = state
+        for slot_name, slot_value in (slot_values or {}).items():
+            object.__setattr__(self, slot_name, slot_value)
+        self._mark_modified()
+
+
+class QuantityBlock(ModificationStampedBlock):
     '''
     Represents a float type value and associated measurement unit.
     '''
+    __slots__ = ("_value", "_unit_of_measure")
 
     # name of block attribute which contains the number value
     VALUE_ATTRIBUTE = 'Value'
@@ -66,6 +177,7 @@ class QuantityBlock():
 
         except ValueError as value_error:
             raise MessageValueError(f'Unable to convert {value} to float for quantity block value.') from value_error
+        self._mark_modified()
 
     @unit_of_measure.setter
     def unit_of_measure(self, unit_of_measure: str):
@@ -77,6 +189,7 @@ class QuantityBlock():
             raise MessageValueError('Unit of measure for quantity block cannot be None')
 
         self._unit_of_measure = str(unit_of_measure)
+        self._mark_modified()
 
     def json(self) -> Dict[str, Union[float, str]]:
         '''
@@ -127,12 +240,21 @@ class QuantityBlock():
         return None
 
 
-class ValueArrayBlock:
+class ValueArrayBlock(ModificationStampedBlock):
     """
     Represents an array of values with an associated unit of measurement.
     The allowed value types are int, float, str and bool. The value array can
     contain only one type of values where int and float together are seen as a number value.
+
+    If numpy is installed, the values can also be given as a one-dimensional NumPy array of numbers.
+    Such values are stored as an array: float arrays are stored as float64 arrays and integer arrays keep
+    their integer dtype. If ARRAY_BACKING is True, also long lists of floats are stored as float64 arrays.
+    The values property always returns a list while values_array gives the stored array without copying it.
+    The JSON representation of the values stored as an array is the list given by the tolist method of the array,
+    i.e. a float array given for a list of integers is written with float values.
     """
+    __slots__ = ("__values", "__unit_of_measure")
+
     ALLOWED_VALUE_TYPES = [int, float, str, bool]
 
     # name of block attribute which contains the array of number values
@@ -143,6 +265,10 @@ class ValueArrayBlock:
     # By default the unit code validator is not in use.
     UNIT_CODE_VALIDATION = False
 
+    # By default the lists of floats are stored as lists.
+    ARRAY_BACKING = NUMPY_AVAILABLE and cast(
+        bool, EnvironmentVariable(SIMULATION_ARRAY_BACKED_BLOCKS, bool, False).value)
+
     def __init__(self, Values: Union[List[Union[int, float]], List[str], List[bool]], UnitOfMeasure: str):
         """Creates a new value array block. Throws an exception if parameters contain invalid values."""
         self.values = Values
@@ -155,7 +281,20 @@ class ValueArrayBlock:
 
     @property
     def values(self) -> Union[List[Union[int, float]], List[str], List[bool]]:
-        """The values for the value array block"""
+        """The values for the value array block as a list.
+           The values stored as a NumPy array are converted to a new list, see values_array."""
+        return values_to_list(self._stored_values)
+
+    @property
+    def values_array(self) -> Any:
+        """The values for the value array block as a NumPy array. The values stored as an array are returned
+           without copying them, so the returned array should not be modified.
+           Raises ValueError if the values are not numbers and ImportError if numpy is not installed."""
+        return values_to_array(self._stored_values)
+
+    @property
+    def _stored_values(self) -> Any:
+        """The values in the form they are stored in the block, i.e. either as a list or as a NumPy array."""
         return self.__values
 
     @unit_of_measure.setter
@@ -163,12 +302,27 @@ class ValueArrayBlock:
         if not self._check_unit_of_measure(unit_of_measure):
             raise MessageUnitValueError("'{:s}' is not an allowed unit of measurement".format(str(unit_of_measure)))
         self.__unit_of_measure = unit_of_measure
+        self._mark_modified()
 
     @values.setter
     def values(self, values: Union[List[Union[int, float]], List[str], List[bool]]):
         if not self._check_values(values):
             raise MessageValueError("'{:s}' is not a valid for value array block".format(str(values)))
-        self.__values = values
+        self.__values = self._to_stored_values(values)
+        self._mark_modified()
+
+    @classmethod
+    def _to_stored_values(cls, values: Any) -> Any:
+        """Returns the given validated values in the form they are stored in the block."""
+        if is_array(values):
+            return values.astype(FLOAT_ARRAY_TYPE if values.dtype.kind == "f" else values.dtype)
+        if (
+            cls.ARRAY_BACKING and len(values) >= MINIMUM_BULK_LENGTH and
+            values[0].__class__ is float and set(map(type, values)) == {float}
+        ):
+            # only the lists containing just floats are converted to keep the JSON representation unchanged
+            return get_numpy().array(values, dtype=FLOAT_ARRAY_TYPE)
+        return values
 
     @classmethod
     def _check_unit_of_measure(cls, unit_of_measure: str) -> bool:
@@ -179,11 +333,18 @@ class ValueArrayBlock:
 
     @classmethod
     def _check_values(cls, values: Union[List[Union[int, float]], List[str], List[bool]]) -> bool:
+        if is_array(values):
+            # only one-dimensional arrays of numbers that do not contain NaN or infinite values are accepted
+            return (
+                values.ndim == 1 and
+                values.dtype.kind in NUMBER_ARRAY_KINDS and
+                bool(get_numpy().isfinite(values).all())
+            )
         if not isinstance(values, list):
             return False
         if not values:  # accept empty list
             return True
-        
+
         value_type = type(values[0])
         if value_type not in cls.ALLOWED_VALUE_TYPES:  # check that the first value is a valid type
             return False
@@ -192,12 +353,10 @@ class ValueArrayBlock:
         NUMBER_TYPES = [ int, float ]
         if value_type in NUMBER_TYPES:
             value_type = tuple(NUMBER_TYPES)
-        
-        for value in values:
-            # Check that all the values in the list are of the same type.
-            if not isinstance(value, value_type):
-                return False
-        return True
+
+        # Check that all the values in the list are of the same type.
+        # The distinct value types are collected first, so that the type check is done only once for each type.
+        return all(issubclass(other_value_type, value_type) for other_value_type in set(map(type, values)))
 
     def json(self) -> Dict[str, Any]:
         """Returns the time series attribute as JSON object."""
@@ -207,11 +366,13 @@ class ValueArrayBlock:
         }
 
     def __eq__(self, other: Any) -> bool:
-        return (
-            isinstance(other, self.__class__) and
-            self.unit_of_measure == other.unit_of_measure and
-            self.values == other.values
-        )
+        if not isinstance(other, self.__class__) or self.unit_of_measure != other.unit_of_measure:
+            return False
+        values = self._stored_values
+        other_values = other._stored_values  # pylint: disable=protected-access
+        if is_array(values) or is_array(other_values):
+            return bool(get_numpy().array_equal(values, other_values))
+        return values == other_values
 
     def __str__(self) -> str:
         return json.dumps(self.json())
@@ -247,22 +408,37 @@ class QuantityArrayBlock(ValueArrayBlock):
     """
     Represents an array of number values with an associated unit of measurement.
     """
+    __slots__ = ("__values",)
+
     ALLOWED_VALUE_TYPES = [int, float]
 
     @property
     def values(self) -> List[Union[int, float]]:
         """The values for the value array block"""
+        return values_to_list(self.__values)
+
+    @property
+    def _stored_values(self) -> Any:
+        """The values in the form they are stored in the block, i.e. either as a list or as a NumPy array."""
         return self.__values
 
     @values.setter
     def values(self, values: List[Union[int, float]]):
         if not self._check_values(values):
             raise MessageValueError("'{:s}' is not a valid for value array block".format(str(values)))
-        self.__values = values
+        self.__values = self._to_stored_values(values)
+        self._mark_modified()
+
+
+class TimeSeriesBlock(ModificationStampedBlock):
+    """Class for containing one time series block for a message in the simulation platform.
 
+    If numpy is installed, the time index can also be given as a NumPy datetime64 array and
+    the long lists of datetime strings are validated in bulk. The time index is still stored
+    as a list of strings while the corresponding datetime64 array is available as time_index_array.
+    """
+    __slots__ = ("__time_index", "__series", "__time_index_array", "__time_index_array_source")
 
-class TimeSeriesBlock():
-    """Class for containing one time series block for a message in the simulation platform. """
     TIMEINDEX_ATTRIBUTE = "TimeIndex"
     SERIES_ATTRIBUTE = "Series"
 
@@ -277,12 +453,33 @@ class TimeSeriesBlock():
         """The list of date times for the time series in ISO 8601 format (UTC)."""
         return self.__time_index
 
+    @property
+    def time_index_array(self) -> Any:
+        """The time index as a NumPy datetime64 array with millisecond precision (UTC).
+           The array is created again if the time index list has been modified in place.
+           Raises ImportError if numpy is not installed."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the array representation of the time index")
+        if self.__time_index_array is None or self.__time_index_array_source != self.__time_index:
+            self.__time_index_array = get_numpy().array(
+                [datetime_value[:-1] for datetime_value in self.__time_index], dtype=DATETIME_ARRAY_TYPE)
+            self.__time_index_array_source = list(self.__time_index)
+        return self.__time_index_array
+
     @property
     def series(self) -> Dict[str, ValueArrayBlock]:
         """The list of the time series values as dictionary with the series name as keys and
            ValueArrayBlock objects as values."""
         return self.__series
 
+    @property
+    def modification_stamp(self) -> int:
+        """The stamp for the latest modification done through the property setters of the block
+           or of the value series contained in the block."""
+        return max(
+            self._modification_stamp,
+            max((series_values.modification_stamp for series_values in self.__series.values()), default=0))
+
     def get_single_series(self, series_name: str) -> Union[ValueArrayBlock, None]:
         """Returns the corresponding time series values as a ValueArrayBlock object.
            Returns None if the series does not exist."""
@@ -294,9 +491,28 @@ class TimeSeriesBlock():
             expected_list_length = None
         else:
             # Check that the time series list is the same length as the first value series list.
-            expected_list_length = len(self.series[next(iter(self.series))].values)
-
-        if self._check_time_index(time_index, expected_list_length):
+            expected_list_length = len(self.series[next(iter(self.series))]._stored_values)
+
+        if is_array(time_index):
+            if time_index.ndim != 1 or time_index.dtype.kind != "M":
+                raise MessageDateError("'{:s}' is not a valid array of date times".format(str(time_index)))
+            time_index = datetime_array_to_strings(time_index)
+
+        datetime_array = (
+            get_datetime_array(time_index)
+            if isinstance(time_index, list) and len(time_index) >= MINIMUM_BULK_LENGTH
+            else None)
+        if datetime_array is not None:
+            # the strings are already in the correct format and they were validated by NumPy
+            if expected_list_length is not None and len(time_index) != expected_list_length:
+                raise MessageDateError("'{:s}' is not a valid list of date times".format(str(time_index)))
+            self.__time_index = list(time_index)
+            self.__time_index_array = datetime_array
+            # the copy of the time index from which the array was created
+            self.__time_index_array_source = list(time_index)
+            self._mark_modified()
+
+        elif self._check_time_index(time_index, expected_list_length):
             new_time_index_list = []
             for datetime_value in time_index:
                 iso_format_string = to_iso_format_datetime_string(datetime_value)
@@ -305,6 +521,9 @@ class TimeSeriesBlock():
                 else:
                     raise MessageDateError("'{:s}' is not a valid date time value".format(str(datetime_value)))
             self.__time_index = new_time_index_list
+            self.__time_index_array = None
+            self.__time_index_array_source = None
+            self._mark_modified()
 
         else:
             raise MessageDateError("'{:s}' is not a valid list of date times".format(str(time_index)))
@@ -326,21 +545,30 @@ class TimeSeriesBlock():
                 self.__series[series_name] = series_values
             else:
                 self.__series[series_name] = ValueArrayBlock(**series_values)
+        self._mark_modified()
 
     def add_series(self, series_name: str, series_values: ValueArrayBlock):
         """Adds a new or replaces an old value series for the TimeSeriesBlock."""
         if self._check_series({series_name: series_values}, len(self.__time_index)):
             self.series[series_name] = series_values
+            self._mark_modified()
         else:
             raise MessageValueError("'{:s}' is not a valid value series for {:s}".format(
                 str(series_name), str(series_values)))
 
     @classmethod
     def _check_time_index(cls, time_index: List[Union[str, datetime.datetime]], list_length: Union[int, None] = None) -> bool:
+        if is_array(time_index):
+            return (
+                time_index.ndim == 1 and time_index.dtype.kind == "M" and
+                (list_length is None or len(time_index) == list_length)
+            )
         if not isinstance(time_index, list):
             return False
         if list_length is not None and len(time_index) != list_length:
             return False
+        if len(time_index) >= MINIMUM_BULK_LENGTH and get_datetime_array(time_index) is not None:
+            return True
 
         for datetime_value in time_index:
             try:
@@ -362,12 +590,12 @@ class TimeSeriesBlock():
                 return False
 
             if isinstance(series_values, ValueArrayBlock):
-                if list_length is not None and len(series_values.values) != list_length:
+                if list_length is not None and len(series_values._stored_values) != list_length:
                     return False
             else:
                 try:
                     timeseries_attribute = ValueArrayBlock(**series_values)
-                    if list_length is not None and len(timeseries_attribute.values) != list_length:
+                    if list_length is not None and len(timeseries_attribute._stored_values) != list_length:
                         return False
                 except (MessageError, ValueError):
                     return False
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains the message codec class that is used to convert message objects to and from JSON."""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TYPE_CHECKING, cast
+
+from tools.exceptions.messages import MessageError
+from tools.message.block import QuantityArrayBlock, QuantityBlock, TimeSeriesBlock
+from tools.tools import FullLogger
+
+# to avoid errors with circular imports with BaseMessage being used in type hints
+if TYPE_CHECKING:
+    from tools.message.abstract import BaseMessage
+
+LOGGER = FullLogger(__name__)
+
+# These attributes will be generated if they are not given when creating message objects.
+OPTIONALLY_GENERATED_ATTRIBUTES = [
+    "Timestamp"
+]
+
+# the value types that can be used in the JSON representation as such
+PLAIN_VALUE_TYPES = frozenset([str, int, float, bool, list, dict, type(None)])
+# the value types that can be stored without the property setter when creating trusted message objects
+TRUSTED_VALUE_TYPES = frozenset([str, int, float, bool])
+
+
+def get_storage_attribute_name(message_class: Type[BaseMessage], getter: Callable[[Any], Any],
+                               object_attribute_name: str) -> Optional[str]:
+    """Returns the name of the private instance attribute, e.g. "_EpochMessage__epoch_number",
+       from which the given property getter reads the attribute value.
+       Returns None if the getter does not simply return the value of such private attribute."""
+    probe_object = message_class.__new__(message_class)
+    probe_value = object()
+    for base_class in message_class.__mro__:
+        storage_attribute_name = "_{:s}__{:s}".format(base_class.__name__, object_attribute_name)
+        object.__setattr__(probe_object, storage_attribute_name, probe_value)
+        try:
+            if getter(probe_object) is probe_value:
+                return storage_attribute_name
+        except Exception:  # pylint: disable=broad-except
+            # the getter can fail in any way for a partially initialized object
+            pass
+        object.__delattr__(probe_object, storage_attribute_name)
+
+    return None
+
+
+class MessageAttributeCodec:
+    """Holds the precomputed information for encoding, validating and decoding a single message attribute."""
+
+    def __init__(self, message_class: Type[BaseMessage], json_attribute_name: str, object_attribute_name: str):
+        self.json_attribute_name = json_attribute_name
+        self.object_attribute_name = object_attribute_name
+        self.is_optional = json_attribute_name in message_class.OPTIONAL_ATTRIBUTES_FULL
+        self.is_generated = json_attribute_name in OPTIONALLY_GENERATED_ATTRIBUTES
+
+        class_attribute = getattr(message_class, object_attribute_name, None)
+        if isinstance(class_attribute, property) and class_attribute.fget is not None:
+            self.getter: Callable[[Any], Any] = class_attribute.fget
+        else:
+            self.getter = lambda message_object: getattr(message_object, object_attribute_name)
+        if isinstance(class_attribute, property) and class_attribute.fset is not None:
+            self.setter: Callable[[Any, Any], None] = class_attribute.fset
+        else:
+            self.setter = lambda message_object, value: setattr(message_object, object_attribute_name, value)
+
+        self.checker: Optional[Callable[[Any], bool]] = getattr(
+            message_class, "_".join(["_check", object_attribute_name]), None)
+
+        # For trusted message objects, the values can be stored directly if the getter reads a private attribute.
+        # The block attributes can be stored directly only if the value is already a block of the correct type.
+        self.storage_name = (
+            get_storage_attribute_name(message_class, self.getter, object_attribute_name)
+            if isinstance(class_attribute, property) else None)
+        self.block_class: Optional[type] = None
+        if json_attribute_name in message_class.QUANTITY_BLOCK_ATTRIBUTES_FULL:
+            self.block_class = QuantityBlock
+        elif json_attribute_name in message_class.QUANTITY_ARRAY_BLOCK_ATTRIBUTES_FULL:
+            self.block_class = QuantityArrayBlock
+        elif json_attribute_name in message_class.TIMESERIES_BLOCK_ATTRIBUTES_FULL:
+            self.block_class = TimeSeriesBlock
+
+    def is_trusted_value(self, value: Any) -> bool:
+        """Returns True if the given value can be stored without calling the property setter."""
+        if self.storage_name is None or value is None:
+            return False
+        value_class = value.__class__
+        if self.block_class is not None:
+            return value_class is self.block_class
+        if value_class is list:
+            # the empty lists are left for the setters since some of them are normalized to None
+            return len(value) > 0 and all(item.__class__ in TRUSTED_VALUE_TYPES for item in value)
+        return value_class in TRUSTED_VALUE_TYPES
+
+
+class MessageCodec:
+    """Class for converting message objects of a specific message class to and from JSON.
+       All the attribute specific information, i.e. the property getters and setters as well as the check methods,
+       are resolved once when the codec is created instead of resolving them for each message.
+       The codecs are created and stored by the MessageFactory, see MessageFactory.get_codec.
+    """
+
+    def __init__(self, message_class: Type[BaseMessage]):
+        """Creates a new codec for the given message class."""
+        self.__message_class = message_class
+        self.__attributes = [
+            MessageAttributeCodec(message_class, json_attribute_name, object_attribute_name)
+            for json_attribute_name, object_attribute_name in message_class.MESSAGE_ATTRIBUTES_FULL.items()
+        ]
+        self.__required_attributes = [
+            attribute.json_attribute_name
+            for attribute in self.__attributes
+            if not attribute.is_optional and not attribute.is_generated
+        ]
+        self.__block_getters = [
+            attribute.getter
+            for attribute in self.__attributes
+            if attribute.block_class is not None
+        ]
+        self.__plain_getters = [
+            attribute.getter
+            for attribute in self.__attributes
+            if attribute.block_class is None
+        ]
+
+        # The objects can be created by calling the setters directly only if the class does not have its own
+        # constructor. Otherwise, the constructor is used to ensure that any additional processing is done.
+        from tools.message.abstract import BaseMessage  # pylint: disable=import-outside-toplevel
+        self.__use_setters = message_class.__init__ is BaseMessage.__init__
+
+    @property
+    def message_class(self) -> Type[BaseMessage]:
+        """The message class for the codec."""
+        return self.__message_class
+
+    @property
+    def attribute_names(self) -> List[str]:
+        """The JSON attribute names for the message class."""
+        return [attribute.json_attribute_name for attribute in self.__attributes]
+
+    def get_block_modification_stamp(self, message_object: BaseMessage) -> int:
+        """Returns the latest modification stamp of the blocks in the given message object.
+           Returns 0 if the message object does not contain any blocks."""
+        modification_stamp = 0
+        for getter in self.__block_getters:
+            modification_stamp = max(modification_stamp, getattr(getter(message_object), "modification_stamp", 0))
+        return modification_stamp
+
+    def get_cache_stamp(self, message_object: BaseMessage) -> Tuple[int, Tuple[Any, ...]]:
+        """Returns a value that changes when the given message object is modified without the property setters:
+           the latest modification stamp of the blocks and shallow copies of the list and dictionary values.
+           The copies detect the in place modifications of the list attributes, e.g. appending to
+           triggering_message_ids, but not the modifications inside the list items."""
+        container_values = []
+        for getter in self.__plain_getters:
+            value = getter(message_object)
+            value_class = value.__class__
+            if value_class is list:
+                container_values.append(tuple(value))
+            elif value_class is dict:
+                container_values.append(tuple(value.items()))
+        return self.get_block_modification_stamp(message_object), tuple(container_values)
+
+    def encode(self, message_object: BaseMessage) -> Dict[str, Any]:
+        """Returns a JSON based on the values of the given message object.
+           Does not include the general attributes for the GeneralMessage objects."""
+        json_message = {}
+        for attribute in self.__attributes:
+            value = attribute.getter(message_object)
+            if value is None:
+                if attribute.is_optional:
+                    continue
+            elif value.__class__ not in PLAIN_VALUE_TYPES and hasattr(value, "json"):
+                value = value.json()
+            json_message[attribute.json_attribute_name] = value
+
+        return json_message
+
+    def validate(self, json_message: Dict[str, Any]) -> bool:
+        """Validates the given the given json object for the attributes covered in the message class.
+           Returns True if the message is ok. Otherwise, return False."""
+        for attribute in self.__attributes:
+            json_attribute_name = attribute.json_attribute_name
+            if json_attribute_name not in json_message:
+                if attribute.is_generated:
+                    continue
+                if not attribute.is_optional:
+                    LOGGER.warning("{:s} attribute is missing from the message".format(json_attribute_name))
+                    return False
+
+            if attribute.checker is None:
+                LOGGER.warning("No check method found for attribute {:s}".format(json_attribute_name))
+                return False
+            if not attribute.checker(json_message.get(json_attribute_name, None)):
+                LOGGER.warning("'{:s}' is not valid message value for {:s}".format(
+                    str(json_message[json_attribute_name]), json_attribute_name))
+                return False
+
+        return True
+
+    def create(self, json_message: Dict[str, Any]) -> BaseMessage:
+        """Returns a new message object created from the given JSON attributes.
+           The attribute values are validated only once by the property setters.
+           If one the attributes is not valid, throws an instance of MessageError, ValueError or TypeError.
+        """
+        if not self.__use_setters:
+            return self.__message_class(**json_message)
+
+        message_object = self.__message_class.__new__(self.__message_class)
+        for attribute in self.__attributes:
+            attribute.setter(message_object, json_message.get(attribute.json_attribute_name, None))
+        return message_object
+
+    def create_trusted(self, attributes: Dict[str, Any]) -> BaseMessage:
+        """Returns a new message object created from the given attribute values without validating them.
+           The values must come from already validated message objects, i.e. the datetime values must be
+           in the same ISO 8601 format that the message classes use and the blocks must be block objects.
+           The values that are plain strings, numbers or booleans and the block objects are stored by reference and
+           the non-empty lists of plain values are stored as copies. The other values, e.g. None values,
+           dictionaries or floats given for quantity blocks, are set using the property setters that do
+           the validation and the conversions.
+           If one the attributes is not valid, throws an instance of MessageError, ValueError or TypeError.
+        """
+        if not self.__use_setters:
+            return self.__message_class(**attributes)
+
+        message_object = self.__message_class.__new__(self.__message_class)
+        for attribute in self.__attributes:
+            value = attributes.get(attribute.json_attribute_name, None)
+            if attribute.is_trusted_value(value):
+                if value.__class__ is list:
+                    value = list(value)
+                object.__setattr__(message_object, cast(str, attribute.storage_name), value)
+            else:
+                attribute.setter(message_object, value)
+        return message_object
+
+    def decode(self, json_message: Dict[str, Any]) -> Optional[BaseMessage]:
+        """Returns a new message object created from the given JSON attributes.
+           If the given JSON does not contain valid values, returns None."""
+        for json_attribute_name in self.__required_attributes:
+            if json_attribute_name not in json_message:
+                LOGGER.warning("{:s} attribute is missing from the message".format(json_attribute_name))
+                return None
+
+        try:
+            return self.create(json_message)
+        except (MessageError, ValueError, TypeError) as message_error:
+            LOGGER.warning("{:s} when creating {:s} object: {:s}".format(
+                type(message_error).__name__, self.__message_class.__name__, str(message_error)))
+            return None
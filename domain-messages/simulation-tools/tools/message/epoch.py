@@ -8,7 +8,7 @@
 
 from __future__ import annotations
 import datetime
-from typing import Any, Dict, Union
+from typing import Any, Dict, Union, cast
 
 from tools.datetime_tools import to_iso_format_datetime_string
 from tools.exceptions.messages import MessageDateError, MessageValueError
@@ -95,9 +95,7 @@ class EpochMessage(AbstractResultMessage):
     def from_json(cls, json_message: Dict[str, Any]) -> Union[EpochMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON does not contain valid values, returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Union[EpochMessage, None], super().from_json(json_message))
 
 
 EpochMessage.register_to_factory()
@@ -7,7 +7,7 @@
 """This module contains the message class for a example message."""
 
 from __future__ import annotations
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Union, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage
@@ -311,9 +311,7 @@ class ExampleMessage(AbstractResultMessage):
 
     @classmethod
     def from_json(cls, json_message: Dict[str, Any]) -> Union[ExampleMessage, None]:
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Union[ExampleMessage, None], super().from_json(json_message))
 
 
 ExampleMessage.register_to_factory()
@@ -8,8 +8,10 @@
    from the JSON contents without explicitly specifying the message class."""
 
 from __future__ import annotations
-from typing import List, Type, TYPE_CHECKING
+import importlib
+from typing import Dict, List, Optional, Type, TYPE_CHECKING
 
+from tools.message.codec import MessageCodec
 from tools.tools import FullLogger
 
 # used https://www.stefaanlippens.net/circular-imports-type-hints-python.html
@@ -26,6 +28,8 @@ class MessageFactory:
     """
     # TODO: implement unit test for the message factory (in addition to what callback unit test do)
     __message_types = {}
+    __lazy_message_types: Dict[str, str] = {}
+    __codecs: Dict[Type[BaseMessage], MessageCodec] = {}
 
     @classmethod
     def register_message_type(cls, message_type: Type[BaseMessage]):
@@ -41,11 +45,78 @@ class MessageFactory:
                 message_type.CLASS_MESSAGE_TYPE))
         else:
             cls.__message_types[message_type.CLASS_MESSAGE_TYPE] = message_type
+            cls.__lazy_message_types.pop(message_type.CLASS_MESSAGE_TYPE, None)
+            cls.__codecs[message_type] = MessageCodec(message_type)
+
+    @classmethod
+    def register_lazy_message_type(cls, message_type: str, module_name: str):
+        """Registers the given message type to the message factory without importing the message class.
+           The module, e.g. "domain_messages.Offer.offer", is imported when the message type is first needed
+           and the module is expected to register the message class to the factory when it is imported.
+           Registration is ignored if the message type has already been registered.
+        """
+        if message_type in cls.__message_types or message_type in cls.__lazy_message_types:
+            LOGGER.debug("Type {:s} has already been registered to the message factory".format(message_type))
+        else:
+            cls.__lazy_message_types[message_type] = module_name
+
+    @classmethod
+    def has_message_type(cls, message_type: Optional[str]) -> bool:
+        """Returns True if the given message type is supported by the factory, i.e. if it has been registered
+           either directly or lazily."""
+        return message_type in cls.__message_types or message_type in cls.__lazy_message_types
+
+    @classmethod
+    def get_message_class(cls, message_type: str) -> Optional[Type[BaseMessage]]:
+        """Returns the message class for the given message type or None if the type is not supported.
+           For the lazily registered message types, the module containing the message class is imported
+           at the first call. The lazy registration is removed only when the module has registered the message
+           class, so the import is tried again at the next call if it failed."""
+        message_class = cls.__message_types.get(message_type, None)
+        if message_class is not None:
+            return message_class
+
+        module_name = cls.__lazy_message_types.get(message_type, None)
+        if module_name is None:
+            return None
+        try:
+            importlib.import_module(module_name)
+        except ImportError as import_error:
+            LOGGER.error("Could not import module {:s} for message type {:s}: {:s}".format(
+                module_name, message_type, str(import_error)))
+            return None
+
+        message_class = cls.__message_types.get(message_type, None)
+        if message_class is None:
+            LOGGER.error("Module {:s} did not register message type {:s}".format(module_name, message_type))
+        return message_class
+
+    @classmethod
+    def get_codec(cls, message_class: Type[BaseMessage]) -> MessageCodec:
+        """Returns the codec for the given message class. For the registered message classes the codec
+           is created at registration. For other classes, e.g. abstract message classes, the codec is created
+           at the first call."""
+        codec = cls.__codecs.get(message_class, None)
+        if codec is None:
+            codec = MessageCodec(message_class)
+            cls.__codecs[message_class] = codec
+        return codec
 
     @classmethod
     def get_message_types(cls) -> List[str]:
-        """Returns the supported message types as a list of strings."""
-        return list(cls.__message_types)
+        """Returns the supported message types as a list of strings.
+           Includes also the lazily registered message types whose classes have not yet been imported."""
+        return list(cls.__message_types) + list(cls.__lazy_message_types)
+
+    @classmethod
+    def get_message_modules(cls) -> List[str]:
+        """Returns the names of the modules that contain the supported message classes, without importing
+           the modules for the lazily registered message types. Modules that cannot be imported by name,
+           like "__main__", are not included."""
+        module_names = {message_class.__module__ for message_class in cls.__message_types.values()}
+        module_names.update(cls.__lazy_message_types.values())
+        module_names.discard("__main__")
+        return sorted(module_names)
 
     @classmethod
     def get_message(cls, message_type: str = None, **kwargs) -> BaseMessage:
@@ -62,7 +133,8 @@ class MessageFactory:
 
         if message_type is None:
             raise TypeError("No message type found")
-        if message_type not in cls.__message_types:
+        message_class = cls.get_message_class(message_type)
+        if message_class is None:
             raise TypeError("Message type {:s} is not supported by the factory".format(str(message_type)))
 
-        return cls.__message_types[message_type](**kwargs)
+        return cls.__codecs[message_class].create(kwargs)
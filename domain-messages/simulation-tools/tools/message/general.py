@@ -7,7 +7,7 @@
 """This module contains general utils for working with simulation platform message classes."""
 
 from __future__ import annotations
-from typing import Any, Dict, Union
+from typing import Any, Dict, Union, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage, BaseMessage, get_json
@@ -21,6 +21,8 @@ class GeneralMessage(BaseMessage):
        Useful when making general use message listeners and
        handling message types that have not yet been implemented."""
     CLASS_MESSAGE_TYPE = "General"
+    # the general attributes are held in a dictionary that can be modified in place
+    SERIALIZATION_CACHE = False
 
     MESSAGE_ATTRIBUTES = {}
     OPTIONAL_ATTRIBUTES = []
@@ -88,14 +90,14 @@ class GeneralMessage(BaseMessage):
     def from_json(cls, json_message: Dict[str, Any]) -> Union[GeneralMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON does not contain valid values, returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Union[GeneralMessage, None], super().from_json(json_message))
 
 
 class ResultMessage(AbstractResultMessage):
     """Class for a generic result message containing at least all the required attributes for AbstractResultMessage."""
     CLASS_MESSAGE_TYPE = "Result"
+    # the result values are held in a dictionary that can be modified in place
+    SERIALIZATION_CACHE = False
 
     MESSAGE_ATTRIBUTES = {}
     OPTIONAL_ATTRIBUTES = []
@@ -157,9 +159,7 @@ class ResultMessage(AbstractResultMessage):
     def from_json(cls, json_message: Dict[str, Any]) -> Union[ResultMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON does not contain valid values, returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Union[ResultMessage, None], super().from_json(json_message))
 
 
 GeneralMessage.register_to_factory()
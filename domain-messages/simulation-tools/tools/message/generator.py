@@ -7,18 +7,23 @@
 """This module contains general utils for working with simulation platform message classes."""
 
 import datetime
-from typing import Iterator, List, Optional, Type, Union
+from typing import Iterator, List, Optional, Type, Union, cast
 
-from tools.exceptions.messages import MessageError
+from tools.datetime_tools import get_utcnow_in_milliseconds, to_iso_format_datetime_string
+from tools.exceptions.messages import MessageDateError, MessageError
 from tools.message.abstract import AbstractMessage
 from tools.message.epoch import EpochMessage
+from tools.message.factory import MessageFactory
 from tools.message.simulation_state import SimulationStateMessage
 from tools.message.status import StatusMessage
 from tools.message.utils import get_next_message_id
-from tools.tools import FullLogger
+from tools.tools import FullLogger, EnvironmentVariable
 
 LOGGER = FullLogger(__name__)
 
+# If True, the trusted messages are created using the full validation, i.e. in the same way as any other messages.
+SIMULATION_VALIDATE_TRUSTED_MESSAGES = "SIMULATION_VALIDATE_TRUSTED_MESSAGES"
+
 
 def abstract_message_generator(message_id_generator: Iterator[str], simulation_id: str, source_process_id: str) \
         -> Iterator[AbstractMessage]:
@@ -40,17 +45,33 @@ def abstract_message_generator(message_id_generator: Iterator[str], simulation_i
 
 class MessageGenerator:
     """Message generator class to help with the creation of simulation message objects."""
-    def __init__(self, simulation_id: str, source_process_id: str, start_message_id: int = 1):
+    def __init__(self, simulation_id: str, source_process_id: str, start_message_id: int = 1,
+                 validate_trusted_messages: Optional[bool] = None):
+        """If validate_trusted_messages is None, its value is read from the environmental variable
+           SIMULATION_VALIDATE_TRUSTED_MESSAGES (default value: False)."""
         # TODO: add checks for the parameters
+        self._simulation_id = simulation_id
+        self._source_process_id = source_process_id
+        self._trusted_simulation_id: Optional[str] = None
         self._message_id_generator = get_next_message_id(source_process_id, start_message_id)
         self._abstract_message_generator = abstract_message_generator(
             self._message_id_generator, simulation_id, source_process_id)
 
+        if validate_trusted_messages is None:
+            validate_trusted_messages = cast(
+                bool, EnvironmentVariable(SIMULATION_VALIDATE_TRUSTED_MESSAGES, bool, False).value)
+        self._validate_trusted_messages = validate_trusted_messages
+
     @property
     def message_id_generator(self) -> Iterator[str]:
         """Iterator that is used by the message generator to generate message ids."""
         return self._message_id_generator
 
+    @property
+    def validate_trusted_messages(self) -> bool:
+        """Whether the messages created with get_trusted_message are validated like all the other messages."""
+        return self._validate_trusted_messages
+
     def get_abstract_message(self) -> AbstractMessage:
         """Returns a new AbstractMessage instance."""
         return next(self._abstract_message_generator)
@@ -84,6 +105,42 @@ class MessageGenerator:
             **kwargs
         )
 
+    def get_trusted_message(self, message_class: Type[AbstractMessage], **kwargs) -> AbstractMessage:
+        """Returns a new message instance of type message_class according to the given parameters
+           without validating the parameters again.
+
+           Meant for messages whose values are taken from already validated message objects or are otherwise
+           known to be valid, e.g. when copying the attributes from a received message to a new message.
+           The datetime values must be in the ISO 8601 format used by the message classes and the block values
+           must be block objects for them to be taken by reference. Other values, e.g. dictionaries or
+           floats given for quantity block attributes, are converted and validated as usual.
+           If validate_trusted_messages is True, works exactly like get_message.
+        """
+        if self._validate_trusted_messages:
+            return self.get_message(message_class, **kwargs)
+
+        if not issubclass(message_class, AbstractMessage):
+            raise MessageError("{:s} is not a subclass of {:s}".format(
+                getattr(message_class, "__name__"), AbstractMessage.__name__))
+
+        return cast(AbstractMessage, MessageFactory.get_codec(message_class).create_trusted({
+            **kwargs,
+            "Type": message_class.CLASS_MESSAGE_TYPE,
+            "SimulationId": self.__get_trusted_simulation_id(),
+            "SourceProcessId": self._source_process_id,
+            "MessageId": next(self._message_id_generator),
+            "Timestamp": get_utcnow_in_milliseconds()
+        }))
+
+    def __get_trusted_simulation_id(self) -> str:
+        """Returns the simulation id in the ISO 8601 format used by the message classes."""
+        if self._trusted_simulation_id is None:
+            iso_format_string = to_iso_format_datetime_string(self._simulation_id)
+            if not isinstance(iso_format_string, str):
+                raise MessageDateError("'{:s}' is an invalid datetime".format(str(self._simulation_id)))
+            self._trusted_simulation_id = iso_format_string
+        return self._trusted_simulation_id
+
     def get_epoch_message(self, EpochNumber: int, TriggeringMessageIds: List[str],
                           StartTime: Union[str, datetime.datetime], EndTime: Union[str, datetime.datetime],
                           LastUpdatedInEpoch: Optional[int] = None, Warnings: Optional[List[str]] = None,
@@ -131,7 +188,8 @@ class MessageGenerator:
 
     def get_status_ready_message(self, EpochNumber: int, TriggeringMessageIds: List[str],
                                  LastUpdatedInEpoch: Optional[int] = None, Warnings: Optional[List[str]] = None,
-                                 IterationStatus: Optional[str] = None) -> StatusMessage:
+                                 IterationStatus: Optional[str] = None,
+                                 IdleUntilEpoch: Optional[int] = None) -> StatusMessage:
         """Returns a new StatusMessage corresponding to the given parameters.
            Throws an exception if the message creation was unsuccessful."""
         # pylint: disable=invalid-name
@@ -147,7 +205,8 @@ class MessageGenerator:
             LastUpdatedInEpoch=LastUpdatedInEpoch,
             Warnings=Warnings,
             IterationStatus=IterationStatus,
-            Value=StatusMessage.STATUS_VALUES[0]  # should be "ready"
+            Value=StatusMessage.STATUS_VALUES[0],  # should be "ready"
+            IdleUntilEpoch=IdleUntilEpoch
         )
 
     def get_status_error_message(self, EpochNumber: int, TriggeringMessageIds: List[str],
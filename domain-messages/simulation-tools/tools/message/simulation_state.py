@@ -7,7 +7,7 @@
 """This module contains the message class for the simulation platform simulation state messages."""
 
 from __future__ import annotations
-from typing import Any, Dict, Union
+from typing import Any, Dict, Union, cast
 
 from tools.exceptions.messages import MessageStateValueError, MessageValueError
 from tools.message.abstract import AbstractMessage
@@ -98,9 +98,7 @@ class SimulationStateMessage(AbstractMessage):
     def from_json(cls, json_message: Dict[str, Any]) -> Union[SimulationStateMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON does not contain valid values, returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Union[SimulationStateMessage, None], super().from_json(json_message))
 
 
 SimulationStateMessage.register_to_factory()
@@ -7,7 +7,7 @@
 """This module contains the message class for the simulation platform status messages."""
 
 from __future__ import annotations
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union, cast
 
 from tools.exceptions.messages import MessageValueError
 from tools.message.abstract import AbstractResultMessage
@@ -23,9 +23,13 @@ class StatusMessage(AbstractResultMessage):
 
     MESSAGE_ATTRIBUTES = {
         "Value": "value",
-        "Description": "description"
+        "Description": "description",
+        "IdleUntilEpoch": "idle_until_epoch"
     }
-    OPTIONAL_ATTRIBUTES = ["Description"]  # Description SHOULD be used if status value is "error"
+    # Description SHOULD be used if status value is "error"
+    # IdleUntilEpoch can be used with the status value "ready" to announce that the component has nothing to do
+    # in the epochs following EpochNumber up to and including IdleUntilEpoch
+    OPTIONAL_ATTRIBUTES = ["Description", "IdleUntilEpoch"]
 
     STATUS_VALUES = ["ready", "error"]
 
@@ -37,7 +41,8 @@ class StatusMessage(AbstractResultMessage):
 
     def __init__(self, **kwargs):
         """Only arguments "Type", "SimulationId", SourceProcessId", MessageId", "Timestamp",
-           "EpochNumber", "LastUpdatedInEpoch", "TriggeringMessageIds", "Warnings", and "Value" are considered.
+           "EpochNumber", "LastUpdatedInEpoch", "TriggeringMessageIds", "Warnings", "Value", "Description",
+           and "IdleUntilEpoch" are considered.
            If one the arguments is not valid, throws an instance of MessageError.
         """
         super().__init__(**kwargs)
@@ -57,6 +62,12 @@ class StatusMessage(AbstractResultMessage):
            This SHOULD be used only with an error state."""
         return self.__description
 
+    @property
+    def idle_until_epoch(self) -> Optional[int]:
+        """The last epoch for which the component has announced to be idle, i.e. the component does not need
+           to process the epochs from EpochNumber + 1 to IdleUntilEpoch. None, if no idle epochs were announced."""
+        return self.__idle_until_epoch
+
     @value.setter
     def value(self, value: str):
         if not self._check_value(value):
@@ -71,12 +82,20 @@ class StatusMessage(AbstractResultMessage):
 
         self.__description = description
 
+    @idle_until_epoch.setter
+    def idle_until_epoch(self, idle_until_epoch: Optional[int]):
+        if not self._check_idle_until_epoch(idle_until_epoch):
+            raise MessageValueError("'{}' is an invalid value for IdleUntilEpoch".format(idle_until_epoch))
+
+        self.__idle_until_epoch = idle_until_epoch
+
     def __eq__(self, other: Any) -> bool:
         return (
             super().__eq__(other) and
             isinstance(other, StatusMessage) and
             self.value == other.value and
-            self.description == other.description
+            self.description == other.description and
+            self.idle_until_epoch == other.idle_until_epoch
         )
 
     @classmethod
@@ -88,13 +107,19 @@ class StatusMessage(AbstractResultMessage):
         # Allow an empty status description.
         return description is None or isinstance(description, str)
 
+    @classmethod
+    def _check_idle_until_epoch(cls, idle_until_epoch: Optional[int]) -> bool:
+        return idle_until_epoch is None or (
+            isinstance(idle_until_epoch, int) and
+            not isinstance(idle_until_epoch, bool) and
+            idle_until_epoch > 0
+        )
+
     @classmethod
     def from_json(cls, json_message: Dict[str, Any]) -> Union[StatusMessage, None]:
         """Returns a class object created based on the given JSON attributes.
            If the given JSON does not contain valid values, returns None."""
-        if cls.validate_json(json_message):
-            return cls(**json_message)
-        return None
+        return cast(Union[StatusMessage, None], super().from_json(json_message))
 
 
 StatusMessage.register_to_factory()
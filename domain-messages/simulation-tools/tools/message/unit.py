@@ -4,140 +4,281 @@
 # This source code is licensed under the MIT license. See LICENSE in the repository root directory.
 # Author(s): Ville Heikkilä <ville.heikkila@tuni.fi>
 
-"""This module contains tools for dealing with UCUM unit codes."""
+"""This module contains tools for dealing with UCUM unit codes.
+
+   The unit codes are validated without any external processes. The premade unit code lists are loaded
+   once when the module is imported and the unit codes that are not in the lists are validated with
+   a pure Python parser that supports the UCUM grammar with the most common prefixes and units.
+   The results of the parser are kept in a cache with a limited size.
+"""
 
 from __future__ import annotations
 import csv
+import functools
 import pathlib
-import subprocess
-from typing import Dict, Union
+import re
+from typing import Dict, List, Match, Optional, Tuple, Union, cast
 
 from tools.tools import FullLogger
 
 LOGGER = FullLogger(__name__)
 
+# The UCUM prefixes that can be used with the metric units.
+UCUM_PREFIXES = {
+    "Y": "yotta", "Z": "zetta", "E": "exa", "P": "peta", "T": "tera", "G": "giga", "M": "mega", "k": "kilo",
+    "h": "hecto", "da": "deka", "d": "deci", "c": "centi", "m": "milli", "u": "micro", "n": "nano", "p": "pico",
+    "f": "femto", "a": "atto", "z": "zepto", "y": "yocto", "Ki": "kibi", "Mi": "mebi", "Gi": "gibi", "Ti": "tebi"
+}
+
+# The UCUM units that can be used with the prefixes.
+UCUM_METRIC_UNITS = {
+    "m": "meter", "s": "second", "g": "gram", "rad": "radian", "K": "kelvin", "C": "coulomb", "cd": "candela",
+    "mol": "mole", "sr": "steradian", "Hz": "hertz", "N": "newton", "Pa": "pascal", "J": "joule", "W": "watt",
+    "A": "ampere", "V": "volt", "F": "farad", "Ohm": "ohm", "S": "siemens", "Wb": "weber", "Cel": "degree Celsius",
+    "T": "tesla", "H": "henry", "lm": "lumen", "lx": "lux", "Bq": "becquerel", "Gy": "gray", "Sv": "sievert",
+    "l": "liter", "L": "liter", "ar": "are", "t": "tonne", "bar": "bar", "u": "unified atomic mass unit",
+    "eV": "electronvolt", "cal": "calorie", "B": "bel", "Np": "neper", "bit": "bit", "By": "byte", "Bd": "baud",
+    "mho": "mho", "G": "gauss", "Ci": "curie", "R": "roentgen"
+}
+
+# The UCUM units that cannot be used with the prefixes.
+UCUM_NON_METRIC_UNITS = {
+    "min": "minute", "h": "hour", "d": "day", "a": "year", "wk": "week", "mo": "month", "a_j": "mean Julian year",
+    "a_t": "tropical year", "mo_j": "mean Julian month", "mo_g": "mean Gregorian month", "deg": "degree",
+    "'": "minute", "''": "second", "gon": "gon", "%": "percent", "10*": "the number ten for arbitrary powers",
+    "10^": "the number ten for arbitrary powers", "[pi]": "the number pi", "[ppth]": "parts per thousand",
+    "[ppm]": "parts per million", "[ppb]": "parts per billion", "[degF]": "degree Fahrenheit",
+    "[degR]": "degree Rankine", "[in_i]": "inch", "[ft_i]": "foot", "[yd_i]": "yard", "[mi_i]": "mile",
+    "[nmi_i]": "nautical mile", "[kn_i]": "knot", "[lb_av]": "pound", "[oz_av]": "ounce", "[gal_us]": "gallon",
+    "[psi]": "pound per square inch", "[Btu]": "British thermal unit", "[HP]": "horsepower", "[car_m]": "carat"
+}
+
+# The platform specific unit codes that are not UCUM codes but are accepted as units of measurement,
+# e.g. the price and duration units used by the Offer and LFMMarketResult messages.
+NON_UCUM_UNIT_CODES = {
+    "EUR": "euro",
+    "Minute": "minute"
+}
+
+# The maximum number of unit codes for which the result of the parser is cached.
+PARSED_UNIT_CODE_CACHE_SIZE = 1024
+
+UCUM_MULTIPLICATION = "."
+UCUM_DIVISION = "/"
+UCUM_ANNOTATION_START = "{"
+UCUM_ANNOTATION_END = "}"
+UCUM_GROUP_START = "("
+UCUM_GROUP_END = ")"
+# the exponent is an optionally signed integer at the end of the unit symbol
+UCUM_EXPONENT_PATTERN = re.compile(r"(.*?)([+-]?[0-9]+)?", re.DOTALL)
+UCUM_OPERATORS = UCUM_MULTIPLICATION + UCUM_DIVISION + UCUM_GROUP_START + UCUM_GROUP_END + UCUM_ANNOTATION_START
+
+
+class UcumParseError(ValueError):
+    """Error raised when a unit code does not follow the supported UCUM grammar."""
+
+
+class UcumExpressionParser:
+    """Recursive descent parser for the UCUM unit code grammar:
+         main term:   ["/"] term
+         term:        component {("." | "/") component}
+         component:   (simple unit [exponent] | factor | "(" term ")") [annotation] | annotation
+         simple unit: [prefix] metric unit | non-metric unit
+       Only the units listed in UCUM_METRIC_UNITS and UCUM_NON_METRIC_UNITS are recognized.
+    """
+
+    def __init__(self, unit_code: str):
+        self.__unit_code = unit_code
+        self.__position = 0
+
+    def parse(self) -> str:
+        """Returns a description of the unit code. Raises UcumParseError if the unit code is not valid."""
+        if not self.__unit_code:
+            raise UcumParseError("empty unit code")
+
+        description_parts = []
+        if self.__peek() == UCUM_DIVISION:
+            self.__position += 1
+            description_parts.append("per")
+        description_parts.append(self.__parse_term())
+
+        if self.__position != len(self.__unit_code):
+            raise UcumParseError("unexpected '{:s}' at position {:d}".format(
+                self.__unit_code[self.__position], self.__position))
+        return " ".join(description_parts)
+
+    def __peek(self) -> str:
+        return self.__unit_code[self.__position:self.__position + 1]
+
+    def __parse_term(self) -> str:
+        description_parts = [self.__parse_component()]
+        while self.__peek() in (UCUM_MULTIPLICATION, UCUM_DIVISION):
+            operator = self.__peek()
+            self.__position += 1
+            description_parts.append("*" if operator == UCUM_MULTIPLICATION else "/")
+            description_parts.append(self.__parse_component())
+        return " ".join(description_parts)
+
+    def __parse_component(self) -> str:
+        next_character = self.__peek()
+        if next_character == UCUM_ANNOTATION_START:
+            return self.__parse_annotation()
+
+        if next_character == UCUM_GROUP_START:
+            self.__position += 1
+            description = "({:s})".format(self.__parse_term())
+            if self.__peek() != UCUM_GROUP_END:
+                raise UcumParseError("missing ')' at position {:d}".format(self.__position))
+            self.__position += 1
+        else:
+            description = self.__parse_annotatable()
+
+        if self.__peek() == UCUM_ANNOTATION_START:
+            description = " ".join([description, self.__parse_annotation()])
+        return description
+
+    def __parse_annotation(self) -> str:
+        end_index = self.__unit_code.find(UCUM_ANNOTATION_END, self.__position)
+        if end_index < 0:
+            raise UcumParseError("missing '}' for annotation")
+        annotation = self.__unit_code[self.__position + 1:end_index]
+        if UCUM_ANNOTATION_START in annotation or not all(33 <= ord(character) <= 126 for character in annotation):
+            raise UcumParseError("invalid annotation '{:s}'".format(annotation))
+        self.__position = end_index + 1
+        return annotation
+
+    def __parse_annotatable(self) -> str:
+        start_index = self.__position
+        end_index = start_index
+        while end_index < len(self.__unit_code) and self.__unit_code[end_index] not in UCUM_OPERATORS:
+            if self.__unit_code[end_index] == "[":
+                # the square brackets can contain any characters, e.g. "[in_i]"
+                end_index = self.__unit_code.find("]", end_index)
+                if end_index < 0:
+                    raise UcumParseError("missing ']'")
+            end_index += 1
+        self.__position = end_index
+
+        symbol = self.__unit_code[start_index:end_index]
+        if symbol.isascii() and symbol.isdigit():
+            return symbol  # a factor
+        unit_symbol, exponent = self.__split_exponent(symbol)
+        description = self.__get_simple_unit_description(unit_symbol)
+        if exponent:
+            description = "{:s}^{:s}".format(description, exponent)
+        return description
+
+    @staticmethod
+    def __split_exponent(symbol: str) -> Tuple[str, str]:
+        """Splits the symbol into the unit symbol and the exponent, e.g. "m3" -> ("m", "3")."""
+        symbol_match = cast(Match[str], UCUM_EXPONENT_PATTERN.fullmatch(symbol))
+        return symbol_match.group(1), symbol_match.group(2) or ""
+
+    @staticmethod
+    def __get_simple_unit_description(unit_symbol: str) -> str:
+        # the units are checked before the prefixes, e.g. "cd" is candela and not centiday
+        if unit_symbol in UCUM_METRIC_UNITS:
+            return UCUM_METRIC_UNITS[unit_symbol]
+        if unit_symbol in UCUM_NON_METRIC_UNITS:
+            return UCUM_NON_METRIC_UNITS[unit_symbol]
+        for prefix_length in (1, 2):
+            prefix = unit_symbol[:prefix_length]
+            metric_unit = unit_symbol[prefix_length:]
+            if prefix in UCUM_PREFIXES and metric_unit in UCUM_METRIC_UNITS:
+                return UCUM_PREFIXES[prefix] + UCUM_METRIC_UNITS[metric_unit]
+        raise UcumParseError("unknown unit '{:s}'".format(unit_symbol))
+
+
+def parse_unit_code(unit_code: str) -> Optional[str]:
+    """Returns a description for the given UCUM unit code or None if the unit code is not valid
+       according to the supported UCUM grammar."""
+    try:
+        return UcumExpressionParser(unit_code).parse()
+    except UcumParseError as parse_error:
+        LOGGER.debug("Unit code '{:s}' is not valid: {:s}".format(unit_code, str(parse_error)))
+        return None
+
+
+@functools.lru_cache(maxsize=PARSED_UNIT_CODE_CACHE_SIZE)
+def get_parsed_unit_description(unit_code: str) -> Optional[str]:
+    """Returns the result of parse_unit_code for the given unit code.
+       The results for the most recently used unit codes are cached."""
+    return parse_unit_code(unit_code)
+
 
 class UnitCode:
-    """Class for verifying a string as a valid UCUM (The Unified Code for Units of Measure) code."""
+    """Class for verifying a string as a valid UCUM (The Unified Code for Units of Measure) code.
+       The platform specific non-UCUM unit codes listed in NON_UCUM_UNIT_CODES are also accepted by default."""
 
     # Parameters related to the premade unit code files.
-    UNIT_CODE_FILE_PATH = "resources"
+    # The files are located in the resources directory of the simulation tools package.
+    UNIT_CODE_FILE_PATH = pathlib.Path(__file__).resolve().parents[2] / "resources"
     UNIT_CODE_FILE_NAMES = ["unit_codes.csv", "unit_codes_addition.csv"]
     UNIT_CODE_FILE_COLUMN_SEPARATOR = ";"
     UNIT_CODE_FILE_CODE_COLUMN = "Code"
     UNIT_CODE_FILE_DESCRIPTION_COLUMN = "Description"
 
-    # Name of the Javascript UCUM unit code validator.
-    # The use of the validator requires that NodeJS is installed in the system.
-    JAVASCRIPT_VALIDATOR = "validator.js"
-    JAVASCRIPT_SYSTEM_CALL = "nodejs"
-    VALIDATOR_VALID_TEXT = "valid"
-    VALIDATOR_RESULT_SEPARATOR = ";"
-
-    UNIT_CODE_LIST = {}
+    # The premade UCUM unit codes. The unit codes validated by the parser are not added to this list.
+    UNIT_CODE_LIST: Dict[str, str] = {}
+    NON_UCUM_UNIT_CODES: Dict[str, str] = NON_UCUM_UNIT_CODES
 
     @classmethod
-    def is_valid(cls, unit_code: str) -> bool:
-        """Returns True if unit_code is a valid UCUM code."""
-        if not cls.UNIT_CODE_LIST:
-            cls.UNIT_CODE_LIST = cls.__return_unit_code_list()
-
-        # Check against the preloaded unit codes.
-        if unit_code in cls.UNIT_CODE_LIST:
-            return True
-
-        # Use Javascript library ucum-lhc to validate the unit code.
-        javascript_validator = cls.__find_resource_filename(cls.UNIT_CODE_FILE_PATH, cls.JAVASCRIPT_VALIDATOR)
-        if javascript_validator is None:
-            # Could not find the JavaScript validator file and the given unit code was not in the premade lists.
-            return False
-        try:
-            validator_result = subprocess.run([cls.JAVASCRIPT_SYSTEM_CALL, javascript_validator, unit_code],
-                                              check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            validator_output = validator_result.stdout.decode("UTF-8").strip()
-
-            # The output from the Javascript validator should be <validator_text>;<unit_description>
-            output_parts = validator_output.split(cls.VALIDATOR_RESULT_SEPARATOR)
-            LOGGER.debug("Result UCUM unit validator: {:s} -> {:s}".format(unit_code, output_parts[0]))
-            if output_parts[0] != cls.VALIDATOR_VALID_TEXT:
-                return False
-
-            unit_description = cls.VALIDATOR_RESULT_SEPARATOR.join(output_parts[1:])
-            cls.UNIT_CODE_LIST[unit_code] = unit_description
-            cls.__add_new_unit_code(unit_code, unit_description)
-            return True
-
-        except subprocess.CalledProcessError as error:
-            LOGGER.warning("CalledProcessError '{}' when trying to validate unit code: {:s}".format(error, unit_code))
-        except OSError as error:
-            LOGGER.warning("OSError '{}' when trying to validate unit code: {:s}".format(error, unit_code))
-
-        # An error occurred while trying to use the JavaScript validator and
-        # the given unit code was not in the premade lists.
-        return False
+    def is_valid(cls, unit_code: str, allow_non_ucum: bool = True) -> bool:
+        """Returns True if unit_code is a valid UCUM code or, if allow_non_ucum is True,
+           one of the accepted non-UCUM unit codes."""
+        return cls.get_description(unit_code, allow_non_ucum) is not None
 
     @classmethod
-    def get_description(cls, unit_code: str) -> Union[str, None]:
+    def get_description(cls, unit_code: str, allow_non_ucum: bool = True) -> Union[str, None]:
         """Returns the description for the given unit code. Return None if the code is not valid."""
+        if not isinstance(unit_code, str):
+            return None
         if not cls.UNIT_CODE_LIST:
-            cls.UNIT_CODE_LIST = cls.__return_unit_code_list()
+            cls.load_unit_codes()
 
-        return cls.UNIT_CODE_LIST.get(unit_code, None)
+        unit_description = cls.UNIT_CODE_LIST.get(unit_code, None)
+        if unit_description is None and allow_non_ucum:
+            unit_description = cls.NON_UCUM_UNIT_CODES.get(unit_code, None)
+        if unit_description is None:
+            unit_description = get_parsed_unit_description(unit_code)
+        return unit_description
 
     @classmethod
-    def __find_resource_filename(cls, resource_path, resource_file) -> Union[str, None]:
-        """Returns the full path to the resource file or None if the file is not found."""
-        file_list = list(pathlib.Path(".").glob("/".join(["**", resource_path, resource_file])))
-        if file_list:
-            return "/".join(file_list[0].parts)
-        return None
+    def load_unit_codes(cls, unit_code_files: Optional[List[pathlib.Path]] = None):
+        """Loads the unit codes from the premade unit code files.
+           By default, the files in UNIT_CODE_FILE_PATH are used."""
+        if unit_code_files is None:
+            unit_code_files = [
+                cls.UNIT_CODE_FILE_PATH / unit_code_file_name
+                for unit_code_file_name in cls.UNIT_CODE_FILE_NAMES
+            ]
 
-    @classmethod
-    def __return_unit_code_list(cls) -> Dict[str, str]:
         unit_code_dict = {}
+        for unit_code_file in unit_code_files:
+            try:
+                with open(unit_code_file, mode="r", encoding="UTF-8") as csv_file:
+                    csv_reader = csv.DictReader(csv_file, delimiter=cls.UNIT_CODE_FILE_COLUMN_SEPARATOR)
+                    for csv_row in csv_reader:
+                        unit_code = csv_row[cls.UNIT_CODE_FILE_CODE_COLUMN]
+                        unit_description = csv_row[cls.UNIT_CODE_FILE_DESCRIPTION_COLUMN]
 
-        current_path = pathlib.Path(".")
-        for unit_code_file_name in cls.UNIT_CODE_FILE_NAMES:
-            # Use glob to find the resource file paths to allow code usage in a submodule.
-            for unit_code_file in current_path.glob("/".join(["**", cls.UNIT_CODE_FILE_PATH, unit_code_file_name])):
-                try:
-                    with open(unit_code_file, mode="r") as csv_file:
-                        csv_reader = csv.DictReader(csv_file, delimiter=cls.UNIT_CODE_FILE_COLUMN_SEPARATOR)
-                        for csv_row in csv_reader:
-                            unit_code = csv_row[cls.UNIT_CODE_FILE_CODE_COLUMN]
-                            unit_description = csv_row[cls.UNIT_CODE_FILE_DESCRIPTION_COLUMN]
+                        unit_code_dict[unit_code] = unit_description
 
-                            unit_code_dict[unit_code] = unit_description
+            except KeyError as key_error:
+                LOGGER.error("KeyError '{:s}' while trying to read unit codes from file {:s}".format(
+                    str(key_error), str(unit_code_file)))
 
-                except KeyError as key_error:
-                    LOGGER.error("KeyError '{:s}' while trying to read unit codes from file {:s}".format(
-                        str(key_error), unit_code_file))
+            except csv.Error as csv_error:
+                LOGGER.error("csv.Error '{:s}' while trying to read unit codes from file {:s}".format(
+                    str(csv_error), str(unit_code_file)))
 
-                except csv.Error as csv_error:
-                    LOGGER.error("csv.Error '{:s}' while trying to read unit codes from file {:s}".format(
-                        str(csv_error), unit_code_file))
+            except OSError as os_error:
+                LOGGER.error("OSError '{:s}' while trying to read file {:s}".format(
+                    str(os_error), str(unit_code_file)
+                ))
 
-                except OSError as os_error:
-                    LOGGER.error("OSError '{:s}' while trying to read file {:s}".format(
-                        str(os_error), unit_code_file
-                    ))
+        cls.UNIT_CODE_LIST = unit_code_dict
 
-        return unit_code_dict
 
-    @classmethod
-    def __add_new_unit_code(cls, unit_code: str, unit_description: str):
-        """Adds a new unit code to the unit code file that is preloaded before the first validator query."""
-
-        # find out the actual path of the unit code file to allow use when included as a submodule
-        unit_code_file_path = next(pathlib.Path(".").glob(
-            "/".join(["**", cls.UNIT_CODE_FILE_PATH, cls.UNIT_CODE_FILE_NAMES[0]])))
-        additional_file = "/".join(list(unit_code_file_path.parts[:-1]) + [cls.UNIT_CODE_FILE_NAMES[-1]])
-
-        try:
-            with open(additional_file, mode="a", encoding="UTF-8") as additional_unit_file:
-                additional_unit_file.write(cls.UNIT_CODE_FILE_COLUMN_SEPARATOR.join(
-                    [unit_code, unit_description]) + "\n")
-        except OSError as os_error:
-            LOGGER.error("OSError '{:s}' while trying to write to file {:s}".format(
-                str(os_error), additional_file
-            ))
+# load the premade unit codes only once when the module is imported
+UnitCode.load_unit_codes()
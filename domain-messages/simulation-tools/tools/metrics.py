@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains classes for collecting latency and throughput metrics in the simulation components.
+
+   The metrics are collected to the module level registry METRICS which is disabled by default.
+   The collection is enabled with the environmental variable SIMULATION_METRICS_ENABLED, and the collected metrics
+   can be exported either as JSON or in the Prometheus text format.
+"""
+
+import asyncio
+import bisect
+import functools
+import math
+import os
+from typing import cast, Any, Dict, List, Optional, Sequence, Tuple
+
+from tools import serialization
+from tools.tools import FullLogger, EnvironmentVariable
+
+LOGGER = FullLogger(__name__)
+
+# The names of the environmental variables used for the metrics.
+SIMULATION_METRICS_ENABLED = "SIMULATION_METRICS_ENABLED"
+# The number of epochs between the exported metrics summaries, 0 means no summaries.
+SIMULATION_METRICS_INTERVAL = "SIMULATION_METRICS_INTERVAL"
+# The topic for the metrics summary messages, empty value means that no messages are sent.
+SIMULATION_METRICS_TOPIC = "SIMULATION_METRICS_TOPIC"
+# The file to which the metrics summary is written, empty value means that no file is written.
+SIMULATION_METRICS_FILE = "SIMULATION_METRICS_FILE"
+# The format for the metrics file, either "prometheus" or "json".
+SIMULATION_METRICS_FILE_FORMAT = "SIMULATION_METRICS_FILE_FORMAT"
+
+# the message type for the metrics summary messages
+METRICS_MESSAGE_TYPE = "Metrics"
+
+METRICS_FORMAT_PROMETHEUS = "prometheus"
+METRICS_FORMAT_JSON = "json"
+
+# The metric names used by the simulation tools library.
+EPOCH_DURATION = "simulation_epoch_duration_seconds"
+HANDLER_DURATION = "simulation_handler_duration_seconds"
+LOCK_WAIT = "simulation_lock_wait_seconds"
+DECODE_DURATION = "simulation_message_decode_seconds"
+ENCODE_DURATION = "simulation_message_encode_seconds"
+PUBLISH_DURATION = "simulation_publish_duration_seconds"
+RECEIVED_MESSAGES = "simulation_received_messages_total"
+SENT_MESSAGES = "simulation_sent_messages_total"
+STARTUP_DURATION = "simulation_startup_duration_seconds"
+
+METRIC_DESCRIPTIONS = {
+    EPOCH_DURATION: "Time from receiving the Epoch message to sending the Status ready message",
+    HANDLER_DURATION: "Time spent in the message handler for each received message",
+    LOCK_WAIT: "Time that the received messages waited for the message handling lock",
+    DECODE_DURATION: "Time spent decoding the received messages into message objects",
+    ENCODE_DURATION: "Time spent encoding the message objects for sending",
+    PUBLISH_DURATION: "Time spent publishing the messages to the message bus",
+    RECEIVED_MESSAGES: "Number of received messages",
+    SENT_MESSAGES: "Number of sent messages",
+    STARTUP_DURATION: "Time spent in each component startup phase"
+}
+
+# the upper bounds, in seconds, for the histogram buckets
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0
+)
+
+# (metric name, sorted tuple of (label name, label value) pairs)
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Histogram:
+    """Histogram with fixed bucket upper bounds that also keeps the count, sum, minimum and maximum."""
+    __slots__ = ("__buckets", "__bucket_counts", "__count", "__sum", "__min", "__max")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.__buckets = tuple(sorted(buckets))
+        # the last count is for the values larger than the largest bucket upper bound
+        self.__bucket_counts = [0] * (len(self.__buckets) + 1)
+        self.__count = 0
+        self.__sum = 0.0
+        self.__min = math.inf
+        self.__max = -math.inf
+
+    @property
+    def buckets(self) -> Tuple[float, ...]:
+        """The upper bounds for the histogram buckets."""
+        return self.__buckets
+
+    @property
+    def count(self) -> int:
+        """The number of observed values."""
+        return self.__count
+
+    @property
+    def sum(self) -> float:
+        """The sum of the observed values."""
+        return self.__sum
+
+    @property
+    def min(self) -> Optional[float]:
+        """The smallest observed value or None if there are no observations."""
+        return self.__min if self.__count > 0 else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """The largest observed value or None if there are no observations."""
+        return self.__max if self.__count > 0 else None
+
+    def observe(self, value: float) -> None:
+        """Adds the given value to the histogram."""
+        self.__bucket_counts[bisect.bisect_left(self.__buckets, value)] += 1
+        self.__count += 1
+        self.__sum += value
+        if value < self.__min:
+            self.__min = value
+        if value > self.__max:
+            self.__max = value
+
+    def cumulative_counts(self) -> List[int]:
+        """Returns the cumulative counts for each bucket followed by the total count."""
+        cumulative_counts = []
+        total = 0
+        for bucket_count in self.__bucket_counts:
+            total += bucket_count
+            cumulative_counts.append(total)
+        return cumulative_counts
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """Returns an estimate for the given quantile (between 0 and 1) by linear interpolation within the bucket
+           containing the quantile. Returns None if there are no observations."""
+        if self.__count == 0:
+            return None
+
+        target = quantile * self.__count
+        lower_count = 0
+        for index, bucket_count in enumerate(self.__bucket_counts):
+            if bucket_count > 0 and lower_count + bucket_count >= target:
+                lower_bound = self.__buckets[index - 1] if index > 0 else 0.0
+                upper_bound = self.__buckets[index] if index < len(self.__buckets) else self.__max
+                lower_bound = max(lower_bound, self.__min)
+                upper_bound = min(upper_bound, self.__max)
+                fraction = (target - lower_count) / bucket_count
+                return lower_bound + (upper_bound - lower_bound) * fraction
+            lower_count += bucket_count
+        return self.__max
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns a summary of the histogram as a JSON compatible dictionary."""
+        return {
+            "Count": self.__count,
+            "Sum": self.__sum,
+            "Min": self.min,
+            "Max": self.max,
+            "Mean": self.__sum / self.__count if self.__count > 0 else None,
+            "P50": self.quantile(0.5),
+            "P90": self.quantile(0.9),
+            "P99": self.quantile(0.99)
+        }
+
+
+class MetricsRegistry:
+    """Holds the histograms and the counters identified by the metric name and the label values.
+       When the registry is disabled, the observations are ignored. The code doing the measurements should check
+       the enabled attribute before taking the timestamps to avoid any overhead when the metrics are not used.
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.__buckets = tuple(buckets)
+        self.__histograms: Dict[MetricKey, Histogram] = {}
+        self.__counters: Dict[MetricKey, float] = {}
+
+    def observe(self, metric_name: str, value: float, **labels: str) -> None:
+        """Adds the given value to the histogram identified by the metric name and the labels."""
+        if not self.enabled:
+            return
+        key = (metric_name, tuple(sorted(labels.items())))
+        histogram = self.__histograms.get(key, None)
+        if histogram is None:
+            histogram = Histogram(self.__buckets)
+            self.__histograms[key] = histogram
+        histogram.observe(value)
+
+    def increment(self, metric_name: str, value: float = 1, **labels: str) -> None:
+        """Increments the counter identified by the metric name and the labels."""
+        if not self.enabled:
+            return
+        key = (metric_name, tuple(sorted(labels.items())))
+        self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def get_histogram(self, metric_name: str, **labels: str) -> Optional[Histogram]:
+        """Returns the histogram for the given metric name and labels or None if there are no observations."""
+        return self.__histograms.get((metric_name, tuple(sorted(labels.items()))), None)
+
+    def get_counter(self, metric_name: str, **labels: str) -> float:
+        """Returns the counter value for the given metric name and labels."""
+        return self.__counters.get((metric_name, tuple(sorted(labels.items()))), 0)
+
+    def clear(self) -> None:
+        """Removes all the collected metrics."""
+        self.__histograms.clear()
+        self.__counters.clear()
+
+    def to_json(self) -> Dict[str, Any]:
+        """Returns the collected metrics as a JSON compatible dictionary.
+           Each metric name is mapped to a list of the label values and the corresponding summary or counter value."""
+        metrics_json: Dict[str, Any] = {}
+        for (metric_name, labels), histogram in sorted(self.__histograms.items()):
+            metrics_json.setdefault(metric_name, []).append({"Labels": dict(labels), **histogram.summary()})
+        for (metric_name, labels), value in sorted(self.__counters.items()):
+            metrics_json.setdefault(metric_name, []).append({"Labels": dict(labels), "Value": value})
+        return metrics_json
+
+    def to_prometheus(self, **extra_labels: str) -> str:
+        """Returns the collected metrics in the Prometheus text exposition format.
+           The extra labels, e.g. the component name, are added to all the metrics."""
+        lines: List[str] = []
+        previous_name = None
+        for (metric_name, labels), histogram in sorted(self.__histograms.items()):
+            if metric_name != previous_name:
+                lines.extend(self.__get_header_lines(metric_name, "histogram"))
+                previous_name = metric_name
+            all_labels = {**extra_labels, **dict(labels)}
+            for upper_bound, cumulative_count in zip(
+                    list(histogram.buckets) + [math.inf], histogram.cumulative_counts()):
+                bucket_labels = {**all_labels, "le": "+Inf" if upper_bound == math.inf else repr(upper_bound)}
+                lines.append("{}_bucket{} {}".format(
+                    metric_name, get_prometheus_labels(bucket_labels), cumulative_count))
+            lines.append("{}_sum{} {}".format(metric_name, get_prometheus_labels(all_labels), repr(histogram.sum)))
+            lines.append("{}_count{} {}".format(metric_name, get_prometheus_labels(all_labels), histogram.count))
+
+        for (metric_name, labels), value in sorted(self.__counters.items()):
+            if metric_name != previous_name:
+                lines.extend(self.__get_header_lines(metric_name, "counter"))
+                previous_name = metric_name
+            lines.append("{}{} {}".format(
+                metric_name, get_prometheus_labels({**extra_labels, **dict(labels)}), repr(value)))
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def get_file_contents(self, file_format: str = METRICS_FORMAT_PROMETHEUS, **extra_labels: str) -> bytes:
+        """Returns the collected metrics as the contents for a metrics file in the given format
+           ("prometheus" or "json")."""
+        if file_format == METRICS_FORMAT_JSON:
+            return serialization.dumps(self.to_json())
+        return self.to_prometheus(**extra_labels).encode("UTF-8")
+
+    def write_file(self, filename: str, file_format: str = METRICS_FORMAT_PROMETHEUS, **extra_labels: str) -> bool:
+        """Writes the collected metrics to the given file in the given format ("prometheus" or "json").
+           The file is replaced atomically so that it can be read at any time, e.g. by the Prometheus node exporter.
+           Returns True if the file was written successfully."""
+        return write_metrics_file(filename, self.get_file_contents(file_format, **extra_labels))
+
+    @staticmethod
+    def __get_header_lines(metric_name: str, metric_type: str) -> List[str]:
+        """Returns the HELP and TYPE lines for the given metric in the Prometheus text format."""
+        header_lines = []
+        if metric_name in METRIC_DESCRIPTIONS:
+            header_lines.append("# HELP {} {}".format(metric_name, METRIC_DESCRIPTIONS[metric_name]))
+        header_lines.append("# TYPE {} {}".format(metric_name, metric_type))
+        return header_lines
+
+
+def get_prometheus_labels(labels: Dict[str, str]) -> str:
+    """Returns the given labels in the Prometheus text format, e.g. '{topic="Epoch"}'."""
+    if not labels:
+        return ""
+    return "{" + ",".join(
+        '{}="{}"'.format(label_name, str(label_value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for label_name, label_value in labels.items()
+    ) + "}"
+
+
+def write_metrics_file(filename: str, contents: bytes) -> bool:
+    """Writes the given contents to the metrics file by replacing the file atomically.
+       Returns True if the file was written successfully."""
+    temporary_filename = "{}.tmp".format(filename)
+    try:
+        with open(temporary_filename, mode="wb") as metrics_file:
+            metrics_file.write(contents)
+        os.replace(temporary_filename, filename)
+        return True
+    except OSError as file_error:
+        LOGGER.warning("Could not write the metrics file '{}': {}".format(filename, file_error))
+        return False
+
+
+class MetricsExporter:
+    """Exports the metrics from a registry after every given number of epochs.
+       The export can be done as a summary message to the message bus and as a local file."""
+
+    def __init__(self, registry: "MetricsRegistry", interval: Optional[int] = None, topic_name: Optional[str] = None,
+                 filename: Optional[str] = None, file_format: Optional[str] = None):
+        """Creates a new exporter. The missing parameters are read from the environmental variables:
+           - interval     : SIMULATION_METRICS_INTERVAL, the number of epochs between the exports (default: 0)
+           - topic_name   : SIMULATION_METRICS_TOPIC, the topic for the summary messages (default: "")
+           - filename     : SIMULATION_METRICS_FILE, the file for the metrics (default: "")
+           - file_format  : SIMULATION_METRICS_FILE_FORMAT, "prometheus" or "json" (default: "prometheus")
+        """
+        if interval is None:
+            interval = cast(int, EnvironmentVariable(SIMULATION_METRICS_INTERVAL, int, 0).value)
+        if topic_name is None:
+            topic_name = cast(str, EnvironmentVariable(SIMULATION_METRICS_TOPIC, str, "").value)
+        if filename is None:
+            filename = cast(str, EnvironmentVariable(SIMULATION_METRICS_FILE, str, "").value)
+        if file_format is None:
+            file_format = cast(
+                str, EnvironmentVariable(SIMULATION_METRICS_FILE_FORMAT, str, METRICS_FORMAT_PROMETHEUS).value)
+
+        self.__registry = registry
+        self.__interval = max(interval, 0)
+        self.__topic_name = topic_name
+        self.__filename = filename
+        self.__file_format = file_format.lower()
+
+    @property
+    def topic_name(self) -> str:
+        """The topic for the metrics summary messages, empty if no messages are sent."""
+        return self.__topic_name
+
+    @property
+    def filename(self) -> str:
+        """The file for the metrics, empty if no file is written."""
+        return self.__filename
+
+    def is_export_epoch(self, epoch_number: int) -> bool:
+        """Returns True if the metrics should be exported after the given epoch."""
+        return (
+            self.__registry.enabled and
+            self.__interval > 0 and
+            epoch_number > 0 and
+            epoch_number % self.__interval == 0 and
+            bool(self.__topic_name or self.__filename)
+        )
+
+    def write_file(self, **extra_labels: str) -> None:
+        """Writes the metrics file if a filename has been given."""
+        if self.__filename:
+            self.__registry.write_file(self.__filename, self.__file_format, **extra_labels)
+
+    async def write_file_async(self, **extra_labels: str) -> None:
+        """Writes the metrics file if a filename has been given without blocking the event loop.
+           The file contents are created in the event loop so that the metrics are not modified during
+           the export, and only the file operations are run in the default executor."""
+        if self.__filename:
+            contents = self.__registry.get_file_contents(self.__file_format, **extra_labels)
+            await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(write_metrics_file, self.__filename, contents))
+
+
+# the registry used by the simulation tools library
+METRICS = MetricsRegistry(enabled=cast(bool, EnvironmentVariable(SIMULATION_METRICS_ENABLED, bool, False).value))
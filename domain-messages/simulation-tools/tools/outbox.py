@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains an outbox class for buffering outgoing messages while the message bus is unavailable."""
+
+import base64
+import collections
+import json
+import os
+from typing import Deque, List, Optional, Tuple, cast
+
+from tools.tools import FullLogger
+
+LOGGER = FullLogger(__name__)
+
+OutboxItem = Tuple[str, bytes]
+
+
+class MessageOutbox:
+    """Bounded first-in-first-out buffer for outgoing messages (topic name, message bytes).
+       The messages are kept in memory until the memory limit is reached. After that, if a spill file
+       has been given, the following messages are appended to the spill file. The messages are always
+       returned in the same order in which they were added regardless of where they were stored.
+    """
+    TOPIC_ATTRIBUTE = "Topic"
+    BODY_ATTRIBUTE = "Body"
+    FILE_ENCODING = "UTF-8"
+
+    def __init__(self, max_messages: int, max_memory_messages: Optional[int] = None,
+                 spill_filename: Optional[str] = None):
+        """Creates a new outbox.
+           - max_messages         : the maximum total number of messages in the outbox
+           - max_memory_messages  : the maximum number of messages kept in memory,
+                                    if None, max_messages is used
+           - spill_filename       : the file used for the messages that do not fit in memory,
+                                    if None or empty, no spill file is used
+        """
+        self.__max_messages = max(max_messages, 0)
+        if max_memory_messages is None:
+            self.__max_memory_messages = self.__max_messages
+        else:
+            self.__max_memory_messages = min(max(max_memory_messages, 0), self.__max_messages)
+        self.__spill_filename = spill_filename if spill_filename else None
+
+        self.__memory_queue: Deque[OutboxItem] = collections.deque()
+        self.__spilled_messages = 0
+
+        # remove any leftovers from earlier runs to avoid sending outdated messages
+        if self.__spill_filename is not None and os.path.exists(self.__spill_filename):
+            self.__truncate_spill_file()
+
+    @property
+    def depth(self) -> int:
+        """The total number of messages in the outbox."""
+        return len(self.__memory_queue) + self.__spilled_messages
+
+    @property
+    def memory_depth(self) -> int:
+        """The number of messages that are currently kept in memory."""
+        return len(self.__memory_queue)
+
+    @property
+    def spilled_depth(self) -> int:
+        """The number of messages that are currently stored in the spill file."""
+        return self.__spilled_messages
+
+    @property
+    def max_messages(self) -> int:
+        """The maximum total number of messages in the outbox."""
+        return self.__max_messages
+
+    @property
+    def spill_filename(self) -> Optional[str]:
+        """The name of the spill file or None if no spill file is used."""
+        return self.__spill_filename
+
+    def is_empty(self) -> bool:
+        """Returns True, if there are no messages in the outbox."""
+        return self.depth == 0
+
+    def is_full(self) -> bool:
+        """Returns True, if no more messages can be added to the outbox."""
+        return self.depth >= self.__max_messages
+
+    def put(self, topic_name: str, message_bytes: bytes) -> bool:
+        """Adds a new message to the end of the outbox.
+           Returns True if the message was added and False if the outbox was full."""
+        if self.is_full():
+            LOGGER.error("Outbox is full ({} messages), dropping message to topic '{}'".format(
+                self.depth, topic_name))
+            return False
+
+        # once a message has been spilled to the file, the following ones must go there as well to keep the order
+        if self.__spilled_messages > 0 or len(self.__memory_queue) >= self.__max_memory_messages:
+            if self.__spill_filename is None or not self.__spill_to_file(topic_name, message_bytes):
+                LOGGER.error("Outbox memory is full ({} messages), dropping message to topic '{}'".format(
+                    len(self.__memory_queue), topic_name))
+                return False
+        else:
+            self.__memory_queue.append((topic_name, message_bytes))
+
+        return True
+
+    def peek(self) -> Optional[OutboxItem]:
+        """Returns the oldest message in the outbox without removing it. Returns None if the outbox is empty."""
+        if not self.__memory_queue and self.__spilled_messages > 0:
+            self.__load_from_file()
+
+        if self.__memory_queue:
+            return self.__memory_queue[0]
+        return None
+
+    def pop(self) -> Optional[OutboxItem]:
+        """Removes and returns the oldest message in the outbox. Returns None if the outbox is empty."""
+        if self.peek() is None:
+            return None
+        return self.__memory_queue.popleft()
+
+    def clear(self) -> None:
+        """Removes all the messages from the outbox."""
+        self.__memory_queue.clear()
+        if self.__spilled_messages > 0:
+            self.__truncate_spill_file()
+        self.__spilled_messages = 0
+
+    def __spill_to_file(self, topic_name: str, message_bytes: bytes) -> bool:
+        """Appends the given message to the spill file. Returns True if the write was successful."""
+        try:
+            with open(cast(str, self.__spill_filename), mode="a", encoding=self.FILE_ENCODING) as spill_file:
+                spill_file.write(json.dumps({
+                    MessageOutbox.TOPIC_ATTRIBUTE: topic_name,
+                    MessageOutbox.BODY_ATTRIBUTE: base64.b64encode(message_bytes).decode("ascii")
+                }) + "\n")
+            self.__spilled_messages += 1
+            return True
+
+        except OSError as os_error:
+            LOGGER.error("OSError '{}' while trying to write to outbox file {}".format(
+                os_error, self.__spill_filename))
+            return False
+
+    def __load_from_file(self) -> None:
+        """Moves the oldest spilled messages from the spill file to the memory queue.
+           The rest of the spilled messages are written back to the spill file."""
+        try:
+            with open(cast(str, self.__spill_filename), mode="r", encoding=self.FILE_ENCODING) as spill_file:
+                lines = spill_file.readlines()
+
+            load_count = max(self.__max_memory_messages, 1)
+            for line in lines[:load_count]:
+                item = json.loads(line)
+                self.__memory_queue.append((
+                    item[MessageOutbox.TOPIC_ATTRIBUTE],
+                    base64.b64decode(item[MessageOutbox.BODY_ATTRIBUTE])
+                ))
+
+            remaining_lines: List[str] = lines[load_count:]
+            with open(cast(str, self.__spill_filename), mode="w", encoding=self.FILE_ENCODING) as spill_file:
+                spill_file.writelines(remaining_lines)
+            self.__spilled_messages = len(remaining_lines)
+
+        except (OSError, ValueError, KeyError) as error:
+            LOGGER.error("{} '{}' while trying to read outbox file {}, spilled messages are lost".format(
+                type(error).__name__, error, self.__spill_filename))
+            self.__spilled_messages = 0
+
+    def __truncate_spill_file(self) -> None:
+        """Empties the spill file."""
+        try:
+            with open(cast(str, self.__spill_filename), mode="w", encoding=self.FILE_ENCODING):
+                pass
+        except OSError as os_error:
+            LOGGER.error("OSError '{}' while trying to truncate outbox file {}".format(
+                os_error, self.__spill_filename))
+
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains a profiler class that can be used to capture cProfile profiles from the simulation components
+   for a given number of epochs."""
+
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import re
+from typing import cast, Iterator, List, Optional
+
+from tools.tools import FullLogger, EnvironmentVariable
+
+LOGGER = FullLogger(__name__)
+
+# The names of the environmental variables used by the profiler.
+# The number of epochs that are profiled starting from the beginning of the simulation, 0 means no profiling.
+SIMULATION_PROFILING_EPOCHS = "SIMULATION_PROFILING_EPOCHS"
+# The directory to which the profiles are written.
+SIMULATION_PROFILING_DIRECTORY = "SIMULATION_PROFILING_DIRECTORY"
+# A comma separated list of the profiled targets, see PROFILING_TARGETS.
+SIMULATION_PROFILING_TARGETS = "SIMULATION_PROFILING_TARGETS"
+# The topic for the control messages that start the profiling, empty value means that no control messages are used.
+SIMULATION_PROFILING_TOPIC = "SIMULATION_PROFILING_TOPIC"
+
+TARGET_PROCESS_EPOCH = "process_epoch"
+TARGET_MESSAGE_HANDLER = "general_message_handler"
+TARGET_SEND_MESSAGE = "send_message"
+PROFILING_TARGETS = [TARGET_PROCESS_EPOCH, TARGET_MESSAGE_HANDLER, TARGET_SEND_MESSAGE]
+
+DEFAULT_PROFILING_DIRECTORY = "/logs"
+# the number of functions included in the text summaries written next to the profiles
+SUMMARY_FUNCTION_COUNT = 40
+
+# The attribute names for the profiling control messages.
+# ProfiledEpochs is required, Targets and ComponentNames are optional lists.
+PROFILED_EPOCHS_ATTRIBUTE = "ProfiledEpochs"
+TARGETS_ATTRIBUTE = "Targets"
+COMPONENT_NAMES_ATTRIBUTE = "ComponentNames"
+
+FILENAME_UNSAFE_CHARACTERS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def parse_targets(targets: str) -> List[str]:
+    """Returns the known profiling targets from the given comma separated string."""
+    target_list = [target.strip() for target in targets.split(",") if target.strip()]
+    for target in target_list:
+        if target not in PROFILING_TARGETS:
+            LOGGER.warning("Unknown profiling target: '{}'".format(target))
+    return [target for target in target_list if target in PROFILING_TARGETS]
+
+
+class EpochProfiler:
+    """Captures cProfile profiles for the wrapped calls of a simulation component and writes a separate profile
+       for each epoch. The profiling is started either at the start of the simulation, by setting the number of
+       profiled epochs in the environmental variable SIMULATION_PROFILING_EPOCHS, or later by calling start.
+
+       The profiler is enabled when a call to one of the profiled targets starts and disabled when it ends,
+       so the profile contains everything executed during the wrapped calls, including the other coroutines
+       that run while the wrapped call is waiting. Nested wrapped calls are handled by the outermost call.
+       If an epoch is finished inside a wrapped call, e.g. when process_epoch is called from the message handler,
+       the profile for the epoch is written when the outermost wrapped call ends.
+       For each profiled epoch, a binary profile file (.prof), readable with pstats or for example snakeviz, and
+       a text summary (.txt) of the most time consuming functions are written to the profiling directory.
+    """
+
+    def __init__(self, component_name: str, simulation_id: str, epochs: Optional[int] = None,
+                 directory: Optional[str] = None, targets: Optional[List[str]] = None):
+        """Creates a new profiler. The missing parameters are read from the environmental variables:
+           - epochs     : SIMULATION_PROFILING_EPOCHS, the number of profiled epochs (default: 0)
+           - directory  : SIMULATION_PROFILING_DIRECTORY, the directory for the profiles (default: "/logs")
+           - targets    : SIMULATION_PROFILING_TARGETS, the profiled calls
+                          (default: "process_epoch,general_message_handler,send_message")
+        """
+        if epochs is None:
+            epochs = cast(int, EnvironmentVariable(SIMULATION_PROFILING_EPOCHS, int, 0).value)
+        if directory is None:
+            directory = cast(
+                str, EnvironmentVariable(SIMULATION_PROFILING_DIRECTORY, str, DEFAULT_PROFILING_DIRECTORY).value)
+        if targets is None:
+            targets = parse_targets(cast(str, EnvironmentVariable(
+                SIMULATION_PROFILING_TARGETS, str, ",".join(PROFILING_TARGETS)).value))
+
+        self.__file_prefix = "_".join([
+            FILENAME_UNSAFE_CHARACTERS.sub("", component_name),
+            FILENAME_UNSAFE_CHARACTERS.sub("", simulation_id)
+        ])
+        self.__directory = directory
+        self.__remaining_epochs = 0
+        self.__targets: List[str] = []
+        self.__profile: Optional[cProfile.Profile] = None
+        self.__depth = 0
+        # the finished epoch whose profile is written when the outermost wrapped call ends
+        self.__pending_epoch: Optional[int] = None
+        self.__written_files: List[str] = []
+
+        if epochs > 0:
+            self.start(epochs, targets)
+
+    @property
+    def is_active(self) -> bool:
+        """True if there are epochs left to be profiled."""
+        return self.__remaining_epochs > 0
+
+    @property
+    def remaining_epochs(self) -> int:
+        """The number of epochs left to be profiled, including the current epoch."""
+        return self.__remaining_epochs
+
+    @property
+    def targets(self) -> List[str]:
+        """The currently profiled targets."""
+        return list(self.__targets)
+
+    @property
+    def directory(self) -> str:
+        """The directory to which the profiles are written."""
+        return self.__directory
+
+    @property
+    def written_files(self) -> List[str]:
+        """The names of the profile files written so far."""
+        return list(self.__written_files)
+
+    def start(self, epochs: int, targets: Optional[List[str]] = None) -> None:
+        """Starts profiling the given targets for the given number of epochs, starting from the current epoch.
+           If targets is None or empty, all the targets are profiled."""
+        self.__remaining_epochs = max(epochs, 0)
+        self.__targets = list(targets) if targets else list(PROFILING_TARGETS)
+        LOGGER.info("Profiling {} for {} epochs".format(", ".join(self.__targets), self.__remaining_epochs))
+
+    def stop(self) -> None:
+        """Stops the profiling without writing the profile for the current epoch."""
+        self.__remaining_epochs = 0
+        if self.__profile is not None and self.__depth > 0:
+            self.__profile.disable()
+        self.__profile = None
+        self.__depth = 0
+        self.__pending_epoch = None
+
+    @contextlib.contextmanager
+    def profile(self, target: str) -> Iterator[None]:
+        """Context manager that profiles the wrapped code if the given target is being profiled."""
+        if self.__remaining_epochs <= 0 or target not in self.__targets:
+            yield
+            return
+
+        if self.__profile is None:
+            self.__profile = cProfile.Profile()
+        profile = self.__profile
+        if self.__depth == 0:
+            profile.enable()
+        self.__depth += 1
+        try:
+            yield
+        finally:
+            self.__depth -= 1
+            if self.__depth == 0 and profile is self.__profile:
+                profile.disable()
+                if self.__pending_epoch is not None:
+                    self.__write_profile(self.__pending_epoch)
+
+    def finish_epoch(self, epoch_number: int) -> Optional[str]:
+        """Writes the profile for the given epoch if anything was profiled during the epoch.
+           If a profiled call is still in progress, the profile is written when the outermost call ends.
+           Returns the name of the written profile file or None if no file was written."""
+        if self.__remaining_epochs <= 0 or epoch_number <= 0 or self.__profile is None:
+            return None
+
+        if self.__depth > 0:
+            self.__pending_epoch = epoch_number
+            return None
+        return self.__write_profile(epoch_number)
+
+    def __write_profile(self, epoch_number: int) -> Optional[str]:
+        """Writes the current profile for the given epoch and counts the epoch as profiled.
+           Returns the name of the written profile file or None if the file could not be written."""
+        profile = cast(cProfile.Profile, self.__profile)
+        self.__profile = None
+        self.__pending_epoch = None
+
+        filename = os.path.join(self.__directory, "{}_epoch_{:05d}.prof".format(self.__file_prefix, epoch_number))
+        try:
+            os.makedirs(self.__directory, exist_ok=True)
+            profile.dump_stats(filename)
+            with open(os.path.splitext(filename)[0] + ".txt", mode="w", encoding="UTF-8") as summary_file:
+                summary_file.write(self.get_summary(profile))
+        except OSError as file_error:
+            # the later profiles could not be written either
+            LOGGER.warning("Could not write the profile for epoch {}, stopping the profiling: {}".format(
+                epoch_number, file_error))
+            self.stop()
+            return None
+
+        LOGGER.info("Wrote the profile for epoch {} to '{}'".format(epoch_number, filename))
+        self.__remaining_epochs -= 1
+        self.__written_files.append(filename)
+        return filename
+
+    @staticmethod
+    def get_summary(profile: cProfile.Profile) -> str:
+        """Returns a text summary of the most time consuming functions in the given profile."""
+        summary_stream = io.StringIO()
+        statistics = pstats.Stats(profile, stream=summary_stream)
+        statistics.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_FUNCTION_COUNT)
+        return summary_stream.getvalue()
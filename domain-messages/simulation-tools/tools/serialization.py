@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains the serialization functions that are used with the message bus messages.
+   The serialization works directly with bytes. If the orjson library is installed, it is used by default
+   for JSON. Otherwise, the standard library json module is used.
+
+   As an alternative to JSON, the messages can be sent in MessagePack format if the msgpack library is installed.
+   The format of a message body is indicated by the AMQP content type.
+"""
+
+import datetime
+import json
+import math
+import re
+import struct
+from typing import Any, Callable, Dict, Optional, Union, cast
+
+from tools.tools import FullLogger, EnvironmentVariable
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None
+
+LOGGER = FullLogger(__name__)
+
+# The environmental variable for selecting the JSON backend: "auto", "orjson" or "json".
+# With "auto", orjson is used if it is installed and the standard library json module otherwise.
+SIMULATION_JSON_BACKEND = "SIMULATION_JSON_BACKEND"
+
+JSON_BACKEND_AUTO = "auto"
+JSON_BACKEND_ORJSON = "orjson"
+JSON_BACKEND_STDLIB = "json"
+
+MESSAGE_ENCODING = "UTF-8"
+
+DumpsFunctionType = Callable[[Any], bytes]
+LoadsFunctionType = Callable[[Union[bytes, str]], Any]
+
+
+def stdlib_dumps(json_object: Any) -> bytes:
+    """Returns the given JSON object as UTF-8 encoded bytes using the standard library json module."""
+    return json.dumps(json_object).encode(MESSAGE_ENCODING)
+
+
+def stdlib_loads(json_bytes: Union[bytes, str]) -> Any:
+    """Returns the JSON object parsed from the given bytes or string using the standard library json module."""
+    return json.loads(json_bytes)
+
+
+def has_non_finite_float(json_object: Any) -> bool:
+    """Returns True if the given JSON object contains a NaN or an infinite float value."""
+    if isinstance(json_object, float):
+        return not math.isfinite(json_object)
+    if isinstance(json_object, dict):
+        return any(has_non_finite_float(value) for value in json_object.values())
+    if isinstance(json_object, (list, tuple)):
+        return any(has_non_finite_float(value) for value in json_object)
+    return False
+
+
+def orjson_dumps(json_object: Any) -> bytes:
+    """Returns the given JSON object as UTF-8 encoded bytes using orjson.
+       Falls back to the standard library for the objects that orjson does not support,
+       e.g. integers larger than 64 bits or dictionaries with non-string keys.
+       orjson writes NaN and infinite values as null, so the standard library is also used for those
+       to keep the output the same as with the standard library backend."""
+    try:
+        json_bytes = orjson.dumps(json_object)
+    except TypeError:
+        return stdlib_dumps(json_object)
+
+    # the non-finite values can only be present when the output contains null values
+    if b"null" in json_bytes and has_non_finite_float(json_object):
+        return stdlib_dumps(json_object)
+    return json_bytes
+
+
+def orjson_loads(json_bytes: Union[bytes, str]) -> Any:
+    """Returns the JSON object parsed from the given bytes or string using orjson.
+       Falls back to the standard library for the input that orjson does not accept, e.g. NaN values."""
+    try:
+        return orjson.loads(json_bytes)
+    except orjson.JSONDecodeError:
+        # raises json.decoder.JSONDecodeError if the input is not JSON even for the standard library
+        return stdlib_loads(json_bytes)
+
+
+JSON_BACKENDS: Dict[str, Any] = {
+    JSON_BACKEND_STDLIB: (stdlib_dumps, stdlib_loads),
+    JSON_BACKEND_ORJSON: (orjson_dumps, orjson_loads)
+}
+
+
+def get_json_backend_name(backend_name: str) -> str:
+    """Returns the name of the JSON backend that corresponds to the given backend setting."""
+    backend_name = backend_name.lower()
+    if backend_name == JSON_BACKEND_AUTO:
+        return JSON_BACKEND_ORJSON if orjson is not None else JSON_BACKEND_STDLIB
+
+    if backend_name not in JSON_BACKENDS:
+        LOGGER.warning("Unknown JSON backend '{}', using '{}'".format(backend_name, JSON_BACKEND_STDLIB))
+        return JSON_BACKEND_STDLIB
+    if backend_name == JSON_BACKEND_ORJSON and orjson is None:
+        LOGGER.warning("JSON backend '{}' is not installed, using '{}'".format(backend_name, JSON_BACKEND_STDLIB))
+        return JSON_BACKEND_STDLIB
+
+    return backend_name
+
+
+class JsonSerializer:
+    """Holds the currently used JSON backend."""
+    __backend_name = get_json_backend_name(
+        cast(str, EnvironmentVariable(SIMULATION_JSON_BACKEND, str, JSON_BACKEND_AUTO).value))
+    __dumps, __loads = JSON_BACKENDS[__backend_name]
+
+    @classmethod
+    def get_backend_name(cls) -> str:
+        """Returns the name of the currently used JSON backend."""
+        return cls.__backend_name
+
+    @classmethod
+    def set_backend(cls, backend_name: str) -> str:
+        """Sets the used JSON backend: "auto", "orjson" or "json". Returns the name of the backend that was set."""
+        cls.__backend_name = get_json_backend_name(backend_name)
+        cls.__dumps, cls.__loads = JSON_BACKENDS[cls.__backend_name]
+        return cls.__backend_name
+
+    @classmethod
+    def dumps(cls, json_object: Any) -> bytes:
+        """Returns the given JSON object as UTF-8 encoded bytes."""
+        return cls.__dumps(json_object)
+
+    @classmethod
+    def loads(cls, json_bytes: Union[bytes, str]) -> Any:
+        """Returns the JSON object parsed from the given UTF-8 encoded bytes or string.
+           Raises json.decoder.JSONDecodeError if the input is not valid JSON."""
+        return cls.__loads(json_bytes)
+
+
+def dumps(json_object: Any) -> bytes:
+    """Returns the given JSON object as UTF-8 encoded bytes using the currently used JSON backend."""
+    return JsonSerializer.dumps(json_object)
+
+
+def loads(json_bytes: Union[bytes, str]) -> Any:
+    """Returns the JSON object parsed from the given bytes or string using the currently used JSON backend.
+       Raises json.decoder.JSONDecodeError if the input is not valid JSON."""
+    return JsonSerializer.loads(json_bytes)
+
+
+# The AMQP content types for the supported wire formats.
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_MSGPACK = "application/msgpack"
+MSGPACK_CONTENT_TYPES = frozenset([CONTENT_TYPE_MSGPACK, "application/x-msgpack", "application/vnd.msgpack"])
+
+# The environmental variable for selecting the wire format for the sent message objects: "json" or "msgpack".
+SIMULATION_WIRE_FORMAT = "SIMULATION_WIRE_FORMAT"
+WIRE_FORMAT_JSON = "json"
+WIRE_FORMAT_MSGPACK = "msgpack"
+WIRE_FORMAT_CONTENT_TYPES = {
+    WIRE_FORMAT_JSON: CONTENT_TYPE_JSON,
+    WIRE_FORMAT_MSGPACK: CONTENT_TYPE_MSGPACK
+}
+# The control messages are always sent as JSON regardless of the wire format, so that the simulation manager and
+# the other components can follow the simulation even without msgpack. The wire format only applies to
+# the data messages sent between the components.
+JSON_ONLY_MESSAGE_TYPES = frozenset(["Epoch", "SimState", "Status"])
+
+# MessagePack extension types:
+# - an array of floats packed as little-endian 64-bit floating point numbers
+# - a time index packed as little-endian 64-bit integers containing milliseconds since the Unix epoch
+EXT_TYPE_FLOAT_ARRAY = 1
+EXT_TYPE_TIME_INDEX = 2
+TIME_INDEX_ATTRIBUTE = "TimeIndex"
+
+# Only datetime strings in this exact format are packed to make sure that they can be restored as such.
+CANONICAL_DATETIME_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$")
+CANONICAL_DATETIME_FORMAT = "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}.{:03d}Z"
+UNIX_EPOCH = datetime.datetime(1970, 1, 1)
+ONE_MILLISECOND = datetime.timedelta(milliseconds=1)
+
+
+class MessagePackDecodeError(ValueError):
+    """Error raised when a message body cannot be decoded from MessagePack format."""
+
+
+# The errors that are raised by the decode function when the message body is not in the expected format.
+DECODE_ERRORS = (json.decoder.JSONDecodeError, MessagePackDecodeError)
+
+
+def get_wire_format_content_type(wire_format: str) -> str:
+    """Returns the content type for the given wire format ("json" or "msgpack").
+       Returns the JSON content type if the wire format is unknown or its library is not installed."""
+    wire_format = wire_format.lower()
+    if wire_format == WIRE_FORMAT_MSGPACK and msgpack is None:
+        LOGGER.warning("Wire format '{}' is not installed, using '{}'".format(wire_format, WIRE_FORMAT_JSON))
+        return CONTENT_TYPE_JSON
+    if wire_format not in WIRE_FORMAT_CONTENT_TYPES:
+        LOGGER.warning("Unknown wire format '{}', using '{}'".format(wire_format, WIRE_FORMAT_JSON))
+        return CONTENT_TYPE_JSON
+    return WIRE_FORMAT_CONTENT_TYPES[wire_format]
+
+
+def is_msgpack_content_type(content_type: Optional[str]) -> bool:
+    """Returns True if the given content type corresponds to the MessagePack format."""
+    return content_type is not None and content_type in MSGPACK_CONTENT_TYPES
+
+
+def get_content_type(message_body: bytes) -> str:
+    """Returns the content type of the given message body that has been created by the encode function.
+       The messages are JSON objects or MessagePack maps, so the format can be determined from the first byte."""
+    if message_body:
+        first_byte = message_body[0]
+        if 0x80 <= first_byte <= 0x8f or first_byte in (0xde, 0xdf):
+            return CONTENT_TYPE_MSGPACK
+    return CONTENT_TYPE_JSON
+
+
+def datetime_string_to_milliseconds(datetime_string: str) -> int:
+    """Returns the number of milliseconds since the Unix epoch for a canonical datetime string."""
+    datetime_object = datetime.datetime(
+        int(datetime_string[0:4]), int(datetime_string[5:7]), int(datetime_string[8:10]),
+        int(datetime_string[11:13]), int(datetime_string[14:16]), int(datetime_string[17:19]))
+    return (datetime_object - UNIX_EPOCH) // ONE_MILLISECOND + int(datetime_string[20:23])
+
+
+def milliseconds_to_datetime_string(milliseconds: int) -> str:
+    """Returns the canonical datetime string for the given number of milliseconds since the Unix epoch."""
+    datetime_object = UNIX_EPOCH + datetime.timedelta(milliseconds=milliseconds)
+    return CANONICAL_DATETIME_FORMAT.format(
+        datetime_object.year, datetime_object.month, datetime_object.day,
+        datetime_object.hour, datetime_object.minute, datetime_object.second,
+        datetime_object.microsecond // 1000)
+
+
+def pack_arrays(json_object: Any, attribute_name: Optional[str] = None) -> Any:
+    """Returns a copy of the given JSON object where the float arrays and the time indexes
+       have been replaced with the corresponding MessagePack extension types."""
+    if isinstance(json_object, dict):
+        return {
+            key: pack_arrays(value, key)
+            for key, value in json_object.items()
+        }
+
+    if isinstance(json_object, list) and json_object:
+        if all(type(value) is float for value in json_object):  # pylint: disable=unidiomatic-typecheck
+            return msgpack.ExtType(
+                EXT_TYPE_FLOAT_ARRAY, struct.pack("<{}d".format(len(json_object)), *json_object))
+
+        if (attribute_name == TIME_INDEX_ATTRIBUTE and
+                all(isinstance(value, str) and CANONICAL_DATETIME_PATTERN.match(value) for value in json_object)):
+            return msgpack.ExtType(
+                EXT_TYPE_TIME_INDEX,
+                struct.pack("<{}q".format(len(json_object)),
+                            *(datetime_string_to_milliseconds(value) for value in json_object)))
+
+        return [pack_arrays(value) for value in json_object]
+
+    return json_object
+
+
+def unpack_ext_type(ext_type: int, data: bytes) -> Any:
+    """The extension type hook for the MessagePack decoding."""
+    if ext_type == EXT_TYPE_FLOAT_ARRAY:
+        return list(struct.unpack("<{}d".format(len(data) // 8), data))
+    if ext_type == EXT_TYPE_TIME_INDEX:
+        return [
+            milliseconds_to_datetime_string(milliseconds)
+            for milliseconds in struct.unpack("<{}q".format(len(data) // 8), data)
+        ]
+    return msgpack.ExtType(ext_type, data)
+
+
+def msgpack_dumps(json_object: Any) -> bytes:
+    """Returns the given JSON object in MessagePack format with the float arrays and time indexes packed."""
+    return msgpack.packb(pack_arrays(json_object), use_bin_type=True)
+
+
+def msgpack_loads(message_body: bytes) -> Any:
+    """Returns the JSON object parsed from the given MessagePack formatted bytes.
+       Raises MessagePackDecodeError if the input is not valid MessagePack."""
+    try:
+        return msgpack.unpackb(message_body, raw=False, ext_hook=unpack_ext_type, strict_map_key=False)
+    except (ValueError, TypeError, struct.error) as unpack_error:
+        raise MessagePackDecodeError("Invalid MessagePack content: {}".format(unpack_error)) from unpack_error
+
+
+def encode(json_object: Any, content_type: str = CONTENT_TYPE_JSON) -> bytes:
+    """Returns the given JSON object as bytes in the format given by the content type."""
+    if is_msgpack_content_type(content_type):
+        return msgpack_dumps(json_object)
+    return dumps(json_object)
+
+
+def decode(message_body: bytes, content_type: Optional[str] = None) -> Any:
+    """Returns the JSON object parsed from the given message body in the format given by the content type.
+       If the content type is None, JSON is assumed. Raises json.decoder.JSONDecodeError for invalid JSON and
+       MessagePackDecodeError for invalid MessagePack or if the msgpack library is not installed."""
+    if is_msgpack_content_type(content_type):
+        if msgpack is None:
+            raise MessagePackDecodeError(
+                "Cannot decode content type '{}' since msgpack is not installed".format(content_type))
+        return msgpack_loads(message_body)
+    return loads(message_body)
+
+
+def get_message_content_type(message_type: str, content_type: str) -> str:
+    """Returns the content type that is used for sending a message of the given type when the wire format
+       of the sender has the given content type. The control messages always use the JSON content type."""
+    if message_type in JSON_ONLY_MESSAGE_TYPES:
+        return CONTENT_TYPE_JSON
+    return content_type
+
+
+def get_default_content_type() -> str:
+    """Returns the content type for the wire format determined by the environmental variable
+       SIMULATION_WIRE_FORMAT ("json" by default)."""
+    return get_wire_format_content_type(
+        cast(str, EnvironmentVariable(SIMULATION_WIRE_FORMAT, str, WIRE_FORMAT_JSON).value))
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""This module contains the tools for starting a simulation component quickly: a timer for the startup phases
+   and a preflight warm-up that loads the message classes of the listened message types and exercises the message
+   codecs before the first messages arrive."""
+
+import contextlib
+import time
+from typing import Dict, Iterator, List, Optional
+
+from tools.datetime_tools import to_utc_datetime_object
+from tools.message.factory import MessageFactory
+from tools.message.unit import UnitCode
+from tools.messages import MessageGenerator
+from tools.metrics import METRICS, STARTUP_DURATION
+from tools import serialization
+from tools.tools import FullLogger
+
+LOGGER = FullLogger(__name__)
+
+# The names of the environmental variables used at the component startup.
+# Whether to load the message classes and exercise the message codecs while the connections are being opened.
+SIMULATION_STARTUP_PREFLIGHT = "SIMULATION_STARTUP_PREFLIGHT"
+# The maximum time in seconds to wait for the message bus connections and the preflight warm-up at startup,
+# 0 means no waiting.
+SIMULATION_STARTUP_TIMEOUT = "SIMULATION_STARTUP_TIMEOUT"
+DEFAULT_STARTUP_TIMEOUT = 0.0
+
+PHASE_CLIENT = "client"
+PHASE_PREFLIGHT = "preflight"
+PHASE_SEND_CONNECTION = "send_connection"
+PHASE_LISTENERS = "listeners"
+PHASE_TOTAL = "total"
+
+# the example values used in the warm-up messages
+WARM_UP_EPOCH_START = "2020-01-01T00:00:00.000Z"
+WARM_UP_EPOCH_END = "2020-01-01T01:00:00.000Z"
+WARM_UP_UNIT_CODES = ["kW", "kW.h", "Cel", "W/m2"]
+# the message types that are handled by every simulation component
+CONTROL_MESSAGE_TYPES = ["Epoch", "SimState", "Status"]
+
+
+class StartupTimer:
+    """Records the durations of the startup phases. The phases can overlap, e.g. the connections are opened
+       concurrently, so the total time is measured separately from the start of the timer."""
+
+    def __init__(self):
+        self.__start_time = time.perf_counter()
+        self.__durations: Dict[str, float] = {}
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        """The recorded phase durations in seconds in the order the phases finished."""
+        return dict(self.__durations)
+
+    def elapsed(self) -> float:
+        """Returns the time in seconds since the timer was created."""
+        return time.perf_counter() - self.__start_time
+
+    def record(self, phase: str, duration: float) -> None:
+        """Records the duration for the given phase."""
+        self.__durations[phase] = duration
+        METRICS.observe(STARTUP_DURATION, duration, phase=phase)
+
+    def record_since_start(self, phase: str) -> None:
+        """Records the time since the timer was created as the duration for the given phase."""
+        self.record(phase, self.elapsed())
+
+    @contextlib.contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Context manager that records the duration of the wrapped code for the given phase.
+           Nothing is recorded if the wrapped code raises an exception or is cancelled."""
+        phase_start_time = time.perf_counter()
+        yield
+        self.record(phase, time.perf_counter() - phase_start_time)
+
+    def report(self) -> str:
+        """Returns a one line summary of the recorded phase durations."""
+        return ", ".join(
+            "{}={:.3f} s".format(phase, duration)
+            for phase, duration in self.__durations.items()
+        )
+
+
+def get_topic_message_types(topic_names: List[str]) -> List[str]:
+    """Returns the control message types and the supported message types that match the given topics.
+       The message type for a topic is the first part of the topic name, e.g. "Offer" for "Offer.market1"."""
+    supported_types = set(MessageFactory.get_message_types())
+    message_types = list(CONTROL_MESSAGE_TYPES)
+    for topic_name in topic_names:
+        message_type = topic_name.split(".", maxsplit=1)[0]
+        if message_type in supported_types and message_type not in message_types:
+            message_types.append(message_type)
+    return message_types
+
+
+def preflight_warm_up(simulation_id: str, component_name: str,
+                      message_types: Optional[List[str]] = None) -> List[str]:
+    """Prepares the message handling before the first messages arrive:
+       - imports the message classes for the given message types, by default only the control message types,
+         see get_topic_message_types for the message types of the listened topics
+       - encodes and decodes example Epoch, SimState and Status messages with the used wire format
+       - parses the example datetime values and validates the example unit codes
+
+       Does not use the event loop, so it can be run in an executor while the connections are being opened.
+       Returns the list of message types whose classes could not be loaded."""
+    if message_types is None:
+        message_types = CONTROL_MESSAGE_TYPES
+
+    missing_types = [
+        message_type
+        for message_type in message_types
+        if MessageFactory.get_message_class(message_type) is None
+    ]
+
+    generator = MessageGenerator(simulation_id, component_name)
+    triggering_message_ids = ["{}-0".format(component_name)]
+    warm_up_messages = [
+        generator.get_epoch_message(
+            EpochNumber=1, TriggeringMessageIds=triggering_message_ids,
+            StartTime=WARM_UP_EPOCH_START, EndTime=WARM_UP_EPOCH_END),
+        generator.get_simulation_state_message(SimulationState="running"),
+        generator.get_status_ready_message(EpochNumber=1, TriggeringMessageIds=triggering_message_ids)
+    ]
+    content_type = serialization.get_default_content_type()
+    for warm_up_message in warm_up_messages:
+        MessageFactory.get_message(**serialization.decode(
+            serialization.encode(warm_up_message.json(), content_type), content_type))
+
+    to_utc_datetime_object(WARM_UP_EPOCH_START)
+    to_utc_datetime_object(WARM_UP_EPOCH_END)
+    for unit_code in WARM_UP_UNIT_CODES:
+        UnitCode.is_valid(unit_code)
+
+    if missing_types:
+        LOGGER.warning("Could not load the message classes for: {}".format(", ".join(missing_types)))
+    return missing_types
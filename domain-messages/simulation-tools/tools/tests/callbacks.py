@@ -8,7 +8,8 @@
 
 import asyncio
 import json
-from typing import Union
+from typing import Optional, Union
+import unittest
 
 from aiormq.types import DeliveredMessage
 from aiounittest.case import AsyncTestCase
@@ -16,7 +17,8 @@ from aio_pika.message import IncomingMessage
 import pamqp
 import pamqp.specification
 
-from tools.callbacks import MessageCallback
+from tools import serialization
+from tools.callbacks import MessageCallback, MessageDeduplicator, MessageHeader
 from tools.messages import (
     BaseMessage, EpochMessage, GeneralMessage, ResultMessage, SimulationStateMessage, StatusMessage)
 from tools.tests.messages_abstract import ALTERNATE_JSON, DEFAULT_TIMESTAMP, FULL_JSON, MESSAGE_TYPE_ATTRIBUTE
@@ -27,11 +29,11 @@ FAIL_TEST_JSON = {
 FAIL_TEST_STR = '{"test" "fail"}'
 
 
-def get_incoming_message(body, routing_key) -> IncomingMessage:
+def get_incoming_message(body, routing_key, content_type: Optional[str] = None) -> IncomingMessage:
     """Returns a dummy incoming message withough the message for the use of the unit tests."""
     delivered_message = DeliveredMessage(
         delivery=pamqp.specification.Basic.Deliver(routing_key=routing_key),
-        header=pamqp.ContentHeader(),
+        header=pamqp.ContentHeader(properties=pamqp.specification.Basic.Properties(content_type=content_type)),
         body=body,
         channel=1)
     return IncomingMessage(delivered_message)
@@ -224,3 +226,120 @@ class TestMessageCallback(AsyncTestCase):
         await callback_object.callback(
             get_incoming_message(bytes(FAIL_TEST_STR, encoding="UTF-8"), TestMessageCallback.TEST_TOPIC1))
         await self.helper_equality_tester(callback_object, FAIL_TEST_STR, TestMessageCallback.TEST_TOPIC1)
+
+    async def test_deduplication(self):
+        """Unit test for dropping the repeated deliveries of the same message."""
+        deduplicator = MessageDeduplicator(max_size=2)
+        callback_object = MessageCallback(HANDLER.message_handler, deduplicator=deduplicator)
+        self.assertIs(callback_object.deduplicator, deduplicator)
+
+        epoch_message = EpochMessage(**{**TestMessageCallback.GENERAL_JSON, MESSAGE_TYPE_ATTRIBUTE: "Epoch"})
+        status_message = StatusMessage(**{**ALTERNATE_JSON, MESSAGE_TYPE_ATTRIBUTE: "Status"})
+        self.assertEqual(
+            MessageDeduplicator.get_message_identifier(epoch_message.bytes()),
+            (epoch_message.source_process_id, epoch_message.message_id))
+        self.assertIsNone(MessageDeduplicator.get_message_identifier(bytes(FAIL_TEST_STR, encoding="UTF-8")))
+
+        await callback_object.callback(
+            get_incoming_message(epoch_message.bytes(), TestMessageCallback.TEST_TOPIC1))
+        await self.helper_equality_tester(callback_object, epoch_message, TestMessageCallback.TEST_TOPIC1)
+
+        await callback_object.callback(
+            get_incoming_message(status_message.bytes(), TestMessageCallback.TEST_TOPIC2))
+        await self.helper_equality_tester(callback_object, status_message, TestMessageCallback.TEST_TOPIC2)
+
+        # the redelivered message should not reach the handler
+        await callback_object.callback(
+            get_incoming_message(epoch_message.bytes(), TestMessageCallback.TEST_TOPIC1))
+        await self.helper_equality_tester(callback_object, status_message, TestMessageCallback.TEST_TOPIC2)
+        self.assertEqual(deduplicator.duplicate_count, 1)
+
+        # the messages without an identifier are never dropped
+        for _ in range(2):
+            self.assertFalse(deduplicator.is_duplicate(bytes(FAIL_TEST_STR, encoding="UTF-8")))
+
+        # the oldest identifiers are forgotten when the maximum size is exceeded
+        self.assertFalse(deduplicator.is_duplicate(b'{"SourceProcessId": "other", "MessageId": "other-1"}'))
+        self.assertEqual(len(deduplicator), 2)
+        self.assertFalse(deduplicator.is_duplicate(epoch_message.bytes()))
+
+        # the identifiers older than the maximum age are forgotten
+        deduplicator = MessageDeduplicator(max_age=0.0)
+        self.assertFalse(deduplicator.is_duplicate(epoch_message.bytes()))
+        await asyncio.sleep(0.01)
+        self.assertFalse(deduplicator.is_duplicate(epoch_message.bytes()))
+
+    async def test_prefilter(self):
+        """Unit test for discarding messages based on the message header."""
+        epoch_message = EpochMessage(**{**TestMessageCallback.GENERAL_JSON, MESSAGE_TYPE_ATTRIBUTE: "Epoch"})
+        status_message = StatusMessage(**{**ALTERNATE_JSON, MESSAGE_TYPE_ATTRIBUTE: "Status"})
+
+        message_header = MessageHeader.from_bytes(epoch_message.bytes())
+        self.assertEqual(message_header.message_type, epoch_message.message_type)
+        self.assertEqual(message_header.simulation_id, epoch_message.simulation_id)
+        self.assertEqual(message_header.epoch_number, epoch_message.epoch_number)
+        self.assertEqual(message_header.source_process_id, epoch_message.source_process_id)
+
+        message_header = MessageHeader.from_bytes(bytes(FAIL_TEST_STR, encoding="UTF-8"))
+        self.assertIsNone(message_header.message_type)
+        self.assertIsNone(message_header.epoch_number)
+
+        received_headers = []
+
+        def epoch_only_prefilter(message_header: MessageHeader, message_topic: str) -> bool:
+            received_headers.append((message_header.message_type, message_topic))
+            return message_header.message_type == "Epoch"
+
+        callback_object = MessageCallback(HANDLER.message_handler, prefilter=epoch_only_prefilter)
+        self.assertIs(callback_object.prefilter, epoch_only_prefilter)
+
+        await callback_object.callback(
+            get_incoming_message(epoch_message.bytes(), TestMessageCallback.TEST_TOPIC1))
+        await self.helper_equality_tester(callback_object, epoch_message, TestMessageCallback.TEST_TOPIC1)
+
+        # the status message should be discarded before it reaches the handler
+        await callback_object.callback(
+            get_incoming_message(status_message.bytes(), TestMessageCallback.TEST_TOPIC2))
+        await self.helper_equality_tester(callback_object, epoch_message, TestMessageCallback.TEST_TOPIC1)
+        self.assertEqual(
+            received_headers, [("Epoch", TestMessageCallback.TEST_TOPIC1), ("Status", TestMessageCallback.TEST_TOPIC2)])
+
+    @unittest.skipIf(serialization.msgpack is None, "msgpack is not installed")
+    async def test_msgpack_messages(self):
+        """Unit test for receiving messages in MessagePack format."""
+        epoch_message = EpochMessage(**{**TestMessageCallback.GENERAL_JSON, MESSAGE_TYPE_ATTRIBUTE: "Epoch"})
+        status_message = StatusMessage(**{**ALTERNATE_JSON, MESSAGE_TYPE_ATTRIBUTE: "Status"})
+        epoch_body = serialization.encode(epoch_message.json(), serialization.CONTENT_TYPE_MSGPACK)
+        status_body = serialization.encode(status_message.json(), serialization.CONTENT_TYPE_MSGPACK)
+
+        message_header = MessageHeader.from_json(epoch_message.json())
+        self.assertEqual(message_header.message_type, epoch_message.message_type)
+        self.assertEqual(message_header.simulation_id, epoch_message.simulation_id)
+        self.assertEqual(message_header.epoch_number, epoch_message.epoch_number)
+        self.assertEqual(message_header.source_process_id, epoch_message.source_process_id)
+        self.assertEqual(
+            MessageDeduplicator.get_message_identifier(epoch_message.json()),
+            (epoch_message.source_process_id, epoch_message.message_id))
+
+        deduplicator = MessageDeduplicator()
+        callback_object = MessageCallback(
+            HANDLER.message_handler, deduplicator=deduplicator,
+            prefilter=lambda message_header, message_topic: message_header.message_type == "Epoch")
+
+        await callback_object.callback(get_incoming_message(
+            epoch_body, TestMessageCallback.TEST_TOPIC1, serialization.CONTENT_TYPE_MSGPACK))
+        await self.helper_equality_tester(callback_object, epoch_message, TestMessageCallback.TEST_TOPIC1)
+
+        # the status message is discarded by the prefilter and the repeated epoch message by the deduplicator
+        await callback_object.callback(get_incoming_message(
+            status_body, TestMessageCallback.TEST_TOPIC2, serialization.CONTENT_TYPE_MSGPACK))
+        await callback_object.callback(get_incoming_message(
+            epoch_body, TestMessageCallback.TEST_TOPIC2, serialization.CONTENT_TYPE_MSGPACK))
+        await self.helper_equality_tester(callback_object, epoch_message, TestMessageCallback.TEST_TOPIC1)
+        self.assertEqual(deduplicator.duplicate_count, 1)
+
+        # invalid content is handled in the same way as invalid JSON
+        callback_object = MessageCallback(HANDLER.message_handler)
+        await callback_object.callback(get_incoming_message(
+            b"\xc1", TestMessageCallback.TEST_TOPIC1, serialization.CONTENT_TYPE_MSGPACK))
+        await self.helper_equality_tester(callback_object, "\ufffd", TestMessageCallback.TEST_TOPIC1)
@@ -8,10 +8,11 @@
 
 import asyncio
 from typing import Iterator, Union
+import unittest
 
 from aiounittest.case import AsyncTestCase
 
-from tools.clients import RabbitmqClient
+from tools.clients import RabbitmqClient, ReconnectPolicy
 from tools.messages import BaseMessage, EpochMessage, GeneralMessage, StatusMessage, get_next_message_id
 from tools.tests.messages_common import EPOCH_TEST_JSON, ERROR_TEST_JSON, GENERAL_TEST_JSON, STATUS_TEST_JSON
 
@@ -129,3 +130,52 @@ class TestRabbitmqClient(AsyncTestCase):
     async def test_connection_failures(self):
         """Unit tests for failed connections to the message bus."""
         # TODO: implement test_connection_failures
+
+
+class TestReconnectPolicy(unittest.TestCase):
+    """Unit tests for the ReconnectPolicy class."""
+    def test_delays(self):
+        """Tests that the wait times follow the capped exponential backoff."""
+        policy = ReconnectPolicy(base_interval=0.5, max_interval=10.0, max_tries=5)
+        self.assertEqual(policy.base_interval, 0.5)
+        self.assertEqual(policy.max_interval, 10.0)
+        self.assertEqual(policy.max_tries, 5)
+
+        for attempt_number in range(100):
+            upper_limit = min(10.0, 0.5 * 2 ** attempt_number)
+            for _ in range(20):
+                delay = policy.get_delay(attempt_number)
+                self.assertGreaterEqual(delay, 0.0)
+                self.assertLessEqual(delay, upper_limit)
+
+    def test_jitter(self):
+        """Tests that the wait times are randomized."""
+        policy = ReconnectPolicy(base_interval=1.0, max_interval=30.0, max_tries=5)
+        self.assertGreater(len({policy.get_delay(5) for _ in range(20)}), 1)
+
+        robust_intervals = [policy.get_robust_reconnect_interval() for _ in range(100)]
+        for robust_interval in robust_intervals:
+            self.assertIsInstance(robust_interval, int)
+            self.assertGreaterEqual(robust_interval, 1)
+            self.assertLessEqual(robust_interval, 30)
+        self.assertGreater(len(set(robust_intervals)), 1)
+
+    def test_total_retry_time(self):
+        """Tests that the connection attempts are continued until the timeout regardless of the jitter."""
+        policy = ReconnectPolicy(base_interval=5.0, max_interval=30.0, max_tries=18, timeout=765.0)
+        self.assertEqual(policy.timeout, 765.0)
+        for _ in range(20):
+            failed_attempts = 1
+            elapsed_time = 0.0
+            while policy.should_retry(failed_attempts, elapsed_time):
+                elapsed_time += policy.get_delay(failed_attempts - 1, elapsed_time)
+                failed_attempts += 1
+            # the wait times never extend past the timeout
+            self.assertAlmostEqual(elapsed_time, 765.0)
+            # with the average wait time of 15 seconds, much more than max_tries attempts are needed
+            self.assertGreater(failed_attempts, 18)
+
+        # without a timeout, the number of attempts is limited
+        policy = ReconnectPolicy(base_interval=5.0, max_interval=30.0, max_tries=18)
+        self.assertTrue(policy.should_retry(17, 10000.0))
+        self.assertFalse(policy.should_retry(18, 0.0))
@@ -9,7 +9,10 @@
 from datetime import datetime, timedelta, timezone
 import unittest
 
-from tools.datetime_tools import get_utcnow_in_milliseconds, to_iso_format_datetime_string, to_utc_datetime_object
+from tools.datetime_tools import (
+    get_utcnow_in_milliseconds, is_canonical_datetime_string, parse_canonical_datetime_string,
+    to_iso_format_datetime_string, to_utc_datetime_object
+)
 
 
 class TestDatetimeTools(unittest.TestCase):
@@ -65,6 +68,34 @@ class TestDatetimeTools(unittest.TestCase):
         self.assertRaises(ValueError, to_utc_datetime_object, input_string_invalid1)
         self.assertRaises(ValueError, to_utc_datetime_object, input_string_invalid2)
 
+    def test_canonical_format(self):
+        """Unit test for the fast path for the datetime strings that are in the format used in the messages."""
+        canonical_string = "2020-05-25T15:24:59.987Z"
+        test_object = datetime(2020, 5, 25, 15, 24, 59, 987000, tzinfo=timezone.utc)
+
+        self.assertTrue(is_canonical_datetime_string(canonical_string))
+        self.assertEqual(parse_canonical_datetime_string(canonical_string), test_object)
+        self.assertIs(to_iso_format_datetime_string(canonical_string), canonical_string)
+
+        # the parsed datetime objects are cached
+        self.assertIs(to_utc_datetime_object(canonical_string), to_utc_datetime_object(canonical_string))
+        self.assertGreater(to_utc_datetime_object.cache_info().hits, 0)
+
+        for other_format_string in ["2020-05-25T15:24:59.987654Z", "2020-05-25T15:24:59Z",
+                                    "2020-05-25 15:24:59.987Z", "2020-05-25T18:24:59.987+03:00"]:
+            with self.subTest(datetime_string=other_format_string):
+                self.assertFalse(is_canonical_datetime_string(other_format_string))
+                self.assertRaises(ValueError, parse_canonical_datetime_string, other_format_string)
+                self.assertEqual(to_utc_datetime_object(other_format_string).replace(microsecond=0),
+                                 test_object.replace(microsecond=0))
+                self.assertEqual(
+                    to_iso_format_datetime_string(other_format_string)[:19], canonical_string[:19])
+
+        for invalid_string in ["2020-02-30T15:24:59.987Z", "0000-01-01T00:00:00.000Z", "２０２０-05-25T15:24:59.987Z"]:
+            with self.subTest(invalid_string=invalid_string):
+                self.assertRaises(ValueError, to_iso_format_datetime_string, invalid_string)
+                self.assertRaises(ValueError, to_utc_datetime_object, invalid_string)
+
 
 if __name__ == '__main__':
     unittest.main()
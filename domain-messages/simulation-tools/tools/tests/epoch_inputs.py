@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the EpochInputTracker class and the declarative epoch inputs in AbstractSimulationComponent."""
+
+import asyncio
+from typing import List
+import unittest
+
+from aiounittest.case import AsyncTestCase
+
+from tools.epoch_inputs import EpochInputTracker
+from tools.messages import MessageGenerator, ResultMessage
+
+from tools.tests.helpers import SIMULATION_ID, RecordingComponent
+
+COMPONENT_NAME = "tracker"
+
+
+class TestEpochInputTracker(unittest.TestCase):
+    """Unit tests for the EpochInputTracker class."""
+
+    def test_specific_sources(self):
+        """Unit test for expected inputs from specific sources."""
+        tracker = EpochInputTracker()
+        self.assertFalse(tracker.has_expectations)
+        self.assertTrue(tracker.is_complete(1))
+
+        tracker.expect("Result", "A")
+        tracker.expect("Result", "B", 2)
+        self.assertTrue(tracker.has_expectations)
+        self.assertEqual(tracker.expected_inputs, [("Result", "A", 1), ("Result", "B", 2)])
+        self.assertFalse(tracker.is_complete(1))
+        self.assertEqual(tracker.missing_inputs(1), [("Result", "A", 1), ("Result", "B", 2)])
+
+        self.assertFalse(tracker.add_arrival(1, "Result", "B", "B-1"))
+        # repeated delivery is not counted twice
+        self.assertFalse(tracker.add_arrival(1, "Result", "B", "B-1"))
+        # unexpected topics and sources are ignored
+        self.assertFalse(tracker.add_arrival(1, "Other", "A", "A-1"))
+        self.assertFalse(tracker.add_arrival(1, "Result", "C", "C-1"))
+        self.assertFalse(tracker.add_arrival(1, "Result", "A", "A-2"))
+        self.assertEqual(tracker.missing_inputs(1), [("Result", "B", 1)])
+        self.assertFalse(tracker.is_complete(1))
+
+        # the completing arrival is the only one returning True
+        self.assertTrue(tracker.add_arrival(1, "Result", "B", "B-2"))
+        self.assertTrue(tracker.is_complete(1))
+        self.assertFalse(tracker.add_arrival(1, "Result", "B", "B-3"))
+        self.assertEqual(tracker.missing_inputs(1), [])
+
+        # arrivals for different epochs are tracked separately
+        self.assertFalse(tracker.is_complete(2))
+        self.assertFalse(tracker.add_arrival(2, "Result", "A", "A-3"))
+        tracker.start_epoch(2)
+        self.assertFalse(tracker.is_complete(1))
+        self.assertEqual(tracker.missing_inputs(2), [("Result", "B", 2)])
+
+    def test_any_source(self):
+        """Unit test for expected inputs from any source."""
+        tracker = EpochInputTracker()
+        tracker.expect("Result", count=2)
+        tracker.expect("Result", "A")
+
+        # the specific source is filled first
+        self.assertFalse(tracker.add_arrival(1, "Result", "A", "A-1"))
+        self.assertEqual(tracker.missing_inputs(1), [("Result", None, 2)])
+        self.assertFalse(tracker.add_arrival(1, "Result", "A", "A-2"))
+        self.assertTrue(tracker.add_arrival(1, "Result", "B"))
+        self.assertEqual(tracker.missing_inputs(1), [])
+        self.assertTrue(tracker.is_complete(1))
+
+    def test_changing_expectations(self):
+        """Unit test for modifying the expected inputs after some messages have arrived."""
+        tracker = EpochInputTracker()
+        tracker.expect("Result", "A")
+        tracker.expect("Result", "B")
+        self.assertFalse(tracker.add_arrival(1, "Result", "A", "A-1"))
+
+        tracker.expect("Result", "B", 0)
+        self.assertTrue(tracker.is_complete(1))
+        tracker.expect("Info", count=1)
+        self.assertFalse(tracker.is_complete(1))
+        self.assertTrue(tracker.add_arrival(1, "Info", "C", "C-1"))
+
+        tracker.clear_expectations()
+        self.assertFalse(tracker.has_expectations)
+        self.assertTrue(tracker.is_complete(2))
+        with self.assertRaises(ValueError):
+            tracker.expect("Result", "A", -1)
+
+
+class DeclarativeComponent(RecordingComponent):
+    """Test component that expects one Result message from each of two sources for each epoch."""
+    def __init__(self, **kwargs):
+        super().__init__(component_name=COMPONENT_NAME, **kwargs)
+        self.expect_epoch_input("Result", "A")
+        self.expect_epoch_input("Result", "B")
+        self.processed_epochs: List[int] = []
+
+    async def process_epoch(self) -> bool:
+        self.processed_epochs.append(self._latest_epoch)
+        return True
+
+
+class TestDeclarativeEpochInputs(AsyncTestCase):
+    """Unit tests for the declarative epoch inputs in AbstractSimulationComponent."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manager = MessageGenerator(SIMULATION_ID, "manager")
+        self.generators = {
+            source: MessageGenerator(SIMULATION_ID, source)
+            for source in ["A", "B"]
+        }
+
+    async def send_epoch(self, component: DeclarativeComponent, epoch_number: int) -> None:
+        """Delivers an Epoch message to the component."""
+        await component.general_message_handler_base(
+            self.manager.get_epoch_message(
+                EpochNumber=epoch_number, TriggeringMessageIds=["manager-0"],
+                StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z"),
+            "Epoch")
+
+    async def send_result(self, component: DeclarativeComponent, source: str, epoch_number: int) -> None:
+        """Delivers a Result message from the given source to the component."""
+        await component.general_message_handler_base(
+            self.generators[source].get_message(
+                ResultMessage, EpochNumber=epoch_number, TriggeringMessageIds=["manager-1"]),
+            "Result")
+
+    async def test_process_once(self):
+        """Unit test for processing the epoch once when all the expected inputs have arrived."""
+        component = DeclarativeComponent()
+        await component.general_message_handler_base(
+            self.manager.get_simulation_state_message(SimulationState="running"), "SimState")
+
+        await self.send_epoch(component, 1)
+        await self.send_result(component, "A", 1)
+        self.assertEqual(component.processed_epochs, [])
+        await self.send_result(component, "A", 1)
+        self.assertEqual(component.processed_epochs, [])
+        await self.send_result(component, "B", 1)
+        self.assertEqual(component.processed_epochs, [1])
+        await self.send_result(component, "B", 1)
+        self.assertEqual(component.processed_epochs, [1])
+        self.assertEqual(component.status_epochs, [0, 1])
+
+        # the inputs that arrive before the Epoch message are counted for their own epoch
+        await self.send_result(component, "A", 2)
+        await self.send_result(component, "B", 2)
+        self.assertEqual(component.processed_epochs, [1])
+        await self.send_epoch(component, 2)
+        self.assertEqual(component.processed_epochs, [1, 2])
+        self.assertEqual(component.status_epochs, [0, 1, 2])
+
+    async def test_deadline(self):
+        """Unit test for processing the epoch after the deadline when some of the inputs are missing."""
+        component = DeclarativeComponent(epoch_input_deadline=0.2)
+        await component.general_message_handler_base(
+            self.manager.get_simulation_state_message(SimulationState="running"), "SimState")
+
+        await self.send_epoch(component, 1)
+        await self.send_result(component, "A", 1)
+        await asyncio.sleep(0.4)
+        self.assertEqual(component.processed_epochs, [1])
+        self.assertEqual(component.status_epochs, [0, 1])
+
+        # a late input does not cause a second processing
+        await self.send_result(component, "B", 1)
+        self.assertEqual(component.processed_epochs, [1])
+
+        # the deadline has no effect when the epoch was completed on time
+        await self.send_epoch(component, 2)
+        await self.send_result(component, "A", 2)
+        await self.send_result(component, "B", 2)
+        await asyncio.sleep(0.4)
+        self.assertEqual(component.processed_epochs, [1, 2])
+        self.assertEqual(component.status_epochs, [0, 1, 2])
+        await component.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
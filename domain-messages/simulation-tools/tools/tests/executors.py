@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the WorkerPool class and for decoding the messages in the worker pool."""
+
+import asyncio
+import os
+import threading
+import unittest
+
+from aiounittest.case import AsyncTestCase
+
+from tools.callbacks import MessageCallback, decode_message
+from tools.executors import WorkerPool, WORKER_POOL_TYPE_NONE, WORKER_POOL_TYPE_PROCESS, WORKER_POOL_TYPE_THREAD
+from tools.messages import EpochMessage, MessageGenerator
+
+from tools.tests.callbacks import DummyHandler, get_incoming_message
+
+SIMULATION_ID = "2020-01-01T00:00:00.000Z"
+
+
+def get_process_id() -> int:
+    """Returns the id of the current process."""
+    return os.getpid()
+
+
+def get_epoch_message() -> EpochMessage:
+    """Returns an epoch message for the tests."""
+    return MessageGenerator(SIMULATION_ID, "manager").get_epoch_message(
+        EpochNumber=1, TriggeringMessageIds=["manager-1"],
+        StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z")
+
+
+class TestWorkerPool(AsyncTestCase):
+    """Unit tests for the WorkerPool class."""
+
+    async def test_disabled_pool(self):
+        """Unit test for running the functions in the event loop when the pool is disabled."""
+        pool = WorkerPool(pool_type=WORKER_POOL_TYPE_NONE)
+        self.assertFalse(pool.is_enabled)
+        self.assertFalse(pool.should_decode(10**9))
+        self.assertEqual(await pool.run(threading.get_ident), threading.get_ident())
+
+        # unknown pool types disable the pool
+        self.assertEqual(WorkerPool(pool_type="unknown").pool_type, WORKER_POOL_TYPE_NONE)
+
+    async def test_thread_pool(self):
+        """Unit test for running the functions in a thread pool."""
+        pool = WorkerPool(pool_type=WORKER_POOL_TYPE_THREAD, max_workers=2, decode_threshold=100)
+        self.assertTrue(pool.is_enabled)
+        self.assertFalse(pool.should_decode(99))
+        self.assertTrue(pool.should_decode(100))
+        try:
+            self.assertNotEqual(await pool.run(threading.get_ident), threading.get_ident())
+            self.assertEqual(await pool.run(sorted, [3, 1, 2], reverse=True), [3, 2, 1])
+        finally:
+            pool.shutdown()
+
+    async def test_process_pool(self):
+        """Unit test for decoding a message in a process pool."""
+        pool = WorkerPool(pool_type=WORKER_POOL_TYPE_PROCESS, max_workers=1)
+        epoch_message = get_epoch_message()
+        try:
+            self.assertNotEqual(await pool.run(get_process_id), os.getpid())
+            message_object, message_type = await pool.run(decode_message, epoch_message.bytes(), None)
+            self.assertEqual(message_type, EpochMessage.CLASS_MESSAGE_TYPE)
+            self.assertIsInstance(message_object, EpochMessage)
+            self.assertEqual(message_object, epoch_message)
+        finally:
+            pool.shutdown()
+
+
+class TestWorkerPoolDecoding(AsyncTestCase):
+    """Unit tests for decoding the received messages in the worker pool."""
+
+    async def test_callback_decoding(self):
+        """Unit test for the callback decoding the large messages in the worker pool."""
+        pool = WorkerPool(pool_type=WORKER_POOL_TYPE_THREAD, max_workers=1, decode_threshold=10)
+        handler = DummyHandler()
+        callback_object = MessageCallback(handler.message_handler, worker_pool=pool)
+        self.assertIs(callback_object.worker_pool, pool)
+
+        epoch_message = get_epoch_message()
+        try:
+            await callback_object.callback(get_incoming_message(epoch_message.bytes(), "Epoch"))
+            await asyncio.sleep(0.1)
+            self.assertEqual(handler.last_message, epoch_message)
+
+            # the invalid messages are handled in the same way as when decoding in the event loop
+            await callback_object.callback(get_incoming_message(b'{"Type": "Epoch", "EpochNumber": 1}', "Epoch"))
+            await asyncio.sleep(0.1)
+            self.assertEqual(handler.last_message, {"Type": "Epoch", "EpochNumber": 1})
+
+            await callback_object.callback(get_incoming_message(b'{"invalid" "json"}', "Epoch"))
+            await asyncio.sleep(0.1)
+            self.assertEqual(handler.last_message, '{"invalid" "json"}')
+        finally:
+            pool.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the HealthServer class and the health status of AbstractSimulationComponent."""
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+from typing import Any, Tuple
+import unittest
+
+from aiounittest.case import AsyncTestCase
+
+from tools.health import HealthServer
+from tools.messages import MessageGenerator
+
+from tools.tests.helpers import SIMULATION_ID, RecordingComponent
+
+
+def get_free_port() -> int:
+    """Returns a TCP port that is currently not in use."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as free_socket:
+        free_socket.bind(("127.0.0.1", 0))
+        return free_socket.getsockname()[1]
+
+
+async def send_request(connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+                       request_line: str) -> Tuple[int, bytes]:
+    """Sends a HTTP request using the given connection and returns the response status code and body."""
+    reader, writer = connection
+    writer.write("{}\r\nHost: localhost\r\n\r\n".format(request_line).encode("ascii"))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    header, _, body = response.partition(b"\r\n\r\n")
+    return int(header.split()[1]), body
+
+
+class TestHealthServer(AsyncTestCase):
+    """Unit tests for the HealthServer class."""
+
+    async def test_endpoints(self):
+        """Unit test for the health and metrics endpoints on a TCP port and on a Unix socket."""
+        health_status = {"Healthy": True, "LatestEpoch": 3}
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            socket_path = os.path.join(temporary_directory, "health.sock")
+            port = get_free_port()
+            server = HealthServer(lambda: health_status, lambda: "metric 1\n", port=port, socket_path=socket_path)
+            self.assertTrue(server.is_enabled)
+            self.assertTrue(await server.start())
+
+            status_code, body = await send_request(
+                await asyncio.open_connection("127.0.0.1", port), "GET /health HTTP/1.1")
+            self.assertEqual(status_code, 200)
+            self.assertEqual(json.loads(body), health_status)
+
+            status_code, body = await send_request(
+                await asyncio.open_unix_connection(socket_path), "GET /metrics?format=text HTTP/1.0")
+            self.assertEqual(status_code, 200)
+            self.assertEqual(body, b"metric 1\n")
+
+            self.assertEqual((await send_request(
+                await asyncio.open_unix_connection(socket_path), "GET /other HTTP/1.0"))[0], 404)
+            self.assertEqual((await send_request(
+                await asyncio.open_unix_connection(socket_path), "POST /health HTTP/1.0"))[0], 405)
+
+            health_status["Healthy"] = False
+            self.assertEqual((await send_request(
+                await asyncio.open_unix_connection(socket_path), "GET /health HTTP/1.0"))[0], 503)
+
+            await server.stop()
+            self.assertFalse(server.is_running)
+            self.assertFalse(os.path.exists(socket_path))
+
+    async def test_too_long_header(self):
+        """Unit test for the response to a request with a header line longer than the stream reader limit."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            socket_path = os.path.join(temporary_directory, "health.sock")
+            server = HealthServer(lambda: {}, str, port=0, socket_path=socket_path)
+            self.assertTrue(await server.start())
+
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 70000 + b"\r\n\r\n")
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), timeout=5.0)
+            writer.close()
+            self.assertTrue(response.startswith(b"HTTP/1.0 400"))
+
+            await server.stop()
+
+    async def test_errors(self):
+        """Unit test for the error responses when the status or metrics functions fail."""
+        def failing_status():
+            raise RuntimeError("status error")
+
+        server = HealthServer(failing_status, lambda: {"not": "text"}, port=0, socket_path="")  # type: ignore
+        header, _, body = server.get_response("GET", "/health").partition(b"\r\n\r\n")
+        self.assertTrue(header.startswith(b"HTTP/1.0 500"))
+        self.assertIn(b"Content-Type: application/json", header)
+        self.assertEqual(json.loads(body), {"Error": "status error"})
+
+        header, _, body = server.get_response("GET", "/metrics").partition(b"\r\n\r\n")
+        self.assertTrue(header.startswith(b"HTTP/1.0 500"))
+        self.assertIn("Error", json.loads(body))
+
+    async def test_disabled(self):
+        """Unit test for the server without a port or a socket path."""
+        server = HealthServer(dict, str, port=0, socket_path="")
+        self.assertFalse(server.is_enabled)
+        self.assertFalse(await server.start())
+        await server.stop()
+
+
+class HealthComponent(RecordingComponent):
+    """Test component that expects one Result message for each epoch."""
+    def __init__(self, **kwargs):
+        super().__init__(component_name="healthy", **kwargs)
+        self.expect_epoch_input("Result", "source")
+
+    async def general_message_handler(self, message_object: Any, message_routing_key: str) -> None:
+        pass
+
+
+class TestComponentHealthStatus(AsyncTestCase):
+    """Unit tests for the health status of AbstractSimulationComponent."""
+
+    async def test_health_status(self):
+        """Unit test for the epoch and input information in the health status."""
+        component = HealthComponent()
+        manager = MessageGenerator(SIMULATION_ID, "manager")
+        await component.general_message_handler_base(
+            manager.get_simulation_state_message(SimulationState="running"), "SimState")
+        await component.general_message_handler_base(
+            manager.get_epoch_message(
+                EpochNumber=1, TriggeringMessageIds=["manager-1"],
+                StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z"),
+            "Epoch")
+
+        health_status = component.get_health_status()
+        self.assertTrue(health_status["Healthy"])
+        self.assertEqual(health_status["SimulationState"], "running")
+        self.assertEqual(health_status["LatestEpoch"], 1)
+        self.assertEqual(health_status["CompletedEpoch"], 0)
+        self.assertEqual(
+            health_status["WaitingForInputs"], [{"Topic": "Result", "SourceProcessId": "source", "Count": 1}])
+        self.assertEqual(health_status["WaitingMessages"], 0)
+        # the status is given as JSON by the health server
+        json.dumps(health_status)
+
+        result_message = MessageGenerator(SIMULATION_ID, "source").get_abstract_message()
+        result_message.epoch_number = 1
+        await component.general_message_handler_base(result_message, "Result")
+        health_status = component.get_health_status()
+        self.assertEqual(health_status["CompletedEpoch"], 1)
+        self.assertEqual(health_status["WaitingForInputs"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
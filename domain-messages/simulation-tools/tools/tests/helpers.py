@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Common helper classes for the unit tests of AbstractSimulationComponent."""
+
+from typing import List, Tuple
+
+from tools.components import AbstractSimulationComponent
+from tools.messages import AbstractMessage, StatusMessage
+
+SIMULATION_ID = "2020-01-01T00:00:00.000Z"
+
+
+class RecordingClient:
+    """Message client replacement that only stores the sent messages."""
+    def __init__(self):
+        self.sent_messages: List[Tuple[str, AbstractMessage]] = []
+        self.is_closed = False
+
+    async def send_message(self, topic_name: str, message_object: AbstractMessage) -> None:
+        """Stores the given message."""
+        self.sent_messages.append((topic_name, message_object))
+
+    async def close(self) -> None:
+        """Marks the client closed."""
+        self.is_closed = True
+
+
+class RecordingComponent(AbstractSimulationComponent):
+    """Test component that uses a RecordingClient instead of a connection to the message bus."""
+    def __init__(self, simulation_id: str = SIMULATION_ID, component_name: str = "component", **kwargs):
+        super().__init__(simulation_id=simulation_id, component_name=component_name, **kwargs)
+        self._rabbitmq_client = RecordingClient()
+        # the messages are given directly to the message handler, so the component is not started
+        self._is_stopped = False
+
+    @property
+    def status_messages(self) -> List[StatusMessage]:
+        """The sent status messages."""
+        return [
+            message for _, message in self._rabbitmq_client.sent_messages  # type: ignore
+            if isinstance(message, StatusMessage)
+        ]
+
+    @property
+    def status_epochs(self) -> List[int]:
+        """The epoch numbers of the sent status messages."""
+        return [message.epoch_number for message in self.status_messages]
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the SimulationComponentHost class."""
+
+import json
+import os
+import tempfile
+from typing import Any, List, Tuple
+import unittest
+from unittest import mock
+
+from aiounittest.case import AsyncTestCase
+
+from tools.callbacks import MessageHeader
+from tools.components import AbstractSimulationComponent
+from tools.health import SIMULATION_HEALTH_SOCKET
+from tools.hosting import SimulationComponentHost
+from tools.messages import AbstractMessage, BaseMessage, MessageGenerator, StatusMessage
+
+FIRST_SIMULATION = "2020-01-01T00:00:00.000Z"
+SECOND_SIMULATION = "2020-01-02T00:00:00.000Z"
+THIRD_SIMULATION = "2020-01-03T00:00:00.000Z"
+
+
+class SharedClient:
+    """Message client replacement that stores the added listeners and the sent messages."""
+    def __init__(self):
+        self.listeners: List[Tuple[List[str], Any, Any]] = []
+        self.sent_messages: List[Tuple[str, AbstractMessage]] = []
+        self.is_closed = False
+
+    def add_listener(self, topic_names: List[str], callback_function, prefilter=None, **kwargs) -> None:
+        """Stores the listener information."""
+        # pylint: disable=unused-argument
+        self.listeners.append((topic_names, callback_function, prefilter))
+
+    async def send_message(self, topic_name: str, message_object: AbstractMessage) -> None:
+        """Stores the given message."""
+        self.sent_messages.append((topic_name, message_object))
+
+    async def close(self) -> None:
+        """Marks the client closed."""
+        self.is_closed = True
+
+
+class CountingComponent(AbstractSimulationComponent):
+    """Test component that stores the handled messages."""
+    def __init__(self, **kwargs):
+        super().__init__(component_name="hosted", other_topics=["Result"], message_deduplication=True, **kwargs)
+        self.handled_messages: List[BaseMessage] = []
+
+    async def general_message_handler(self, message_object: Any, message_routing_key: str) -> None:
+        self.handled_messages.append(message_object)
+
+
+class TestSimulationComponentHost(AsyncTestCase):
+    """Unit tests for the SimulationComponentHost class."""
+
+    @staticmethod
+    async def deliver(host: SimulationComponentHost, message_object: AbstractMessage, topic_name: str) -> bool:
+        """Delivers the message to the host like the message client would. Returns False if the message was
+           discarded by the prefilter."""
+        if not host.message_prefilter(MessageHeader.from_json(message_object.json()), topic_name):
+            return False
+        await host.message_handler(message_object, topic_name)
+        return True
+
+    async def test_routing(self):
+        """Unit test for routing the messages to the components based on the simulation id."""
+        client = SharedClient()
+        host = SimulationComponentHost(
+            CountingComponent, simulation_ids=[FIRST_SIMULATION, SECOND_SIMULATION], rabbitmq_client=client)
+        await host.start()
+        self.assertFalse(host.is_stopped)
+        self.assertEqual(host.simulation_ids, [FIRST_SIMULATION, SECOND_SIMULATION])
+        self.assertEqual(host.listened_topics, ["Epoch", "Result", "SimState"])
+        self.assertEqual(len(client.listeners), 1)
+
+        first_component = host.get_component(FIRST_SIMULATION)
+        second_component = host.get_component("2020-01-02T00:00:00Z")
+        self.assertIsInstance(first_component, CountingComponent)
+        self.assertIsInstance(second_component, CountingComponent)
+        self.assertFalse(first_component.is_stopped)
+
+        # the messages from the components in different simulations can have the same message ids
+        first_result = MessageGenerator(FIRST_SIMULATION, "source").get_abstract_message()
+        second_result = MessageGenerator(SECOND_SIMULATION, "source").get_abstract_message()
+        self.assertEqual(first_result.message_id, second_result.message_id)
+        third_result = MessageGenerator(THIRD_SIMULATION, "source").get_abstract_message()
+
+        self.assertTrue(await self.deliver(host, first_result, "Result"))
+        self.assertTrue(await self.deliver(host, second_result, "Result"))
+        self.assertTrue(await self.deliver(host, first_result, "Result"))
+        self.assertFalse(await self.deliver(host, third_result, "Result"))
+        self.assertEqual(first_component.handled_messages, [first_result])
+        self.assertEqual(second_component.handled_messages, [second_result])
+
+        # the component stopping does not close the shared client
+        await self.deliver(
+            host, MessageGenerator(FIRST_SIMULATION, "manager").get_simulation_state_message(
+                SimulationState="stopped"), "SimState")
+        self.assertTrue(first_component.is_stopped)
+        self.assertEqual(host.simulation_ids, [SECOND_SIMULATION])
+        self.assertFalse(client.is_closed)
+
+        # the host stops after the last simulation has stopped
+        await self.deliver(
+            host, MessageGenerator(SECOND_SIMULATION, "manager").get_simulation_state_message(
+                SimulationState="stopped"), "SimState")
+        self.assertTrue(host.is_stopped)
+        self.assertTrue(client.is_closed)
+
+    async def test_new_simulations(self):
+        """Unit test for creating the components for new simulations."""
+        client = SharedClient()
+        host = SimulationComponentHost(
+            CountingComponent, simulation_ids=[], accept_new_simulations=True, max_simulations=2,
+            rabbitmq_client=client)
+        await host.start()
+        self.assertEqual(host.simulation_ids, [])
+        self.assertEqual(host.listened_topics, ["SimState"])
+
+        # other messages than SimState running do not create new components
+        self.assertFalse(await self.deliver(
+            host, MessageGenerator(FIRST_SIMULATION, "source").get_abstract_message(), "Result"))
+        await self.deliver(
+            host, MessageGenerator(FIRST_SIMULATION, "manager").get_simulation_state_message(
+                SimulationState="stopped"), "SimState")
+        self.assertEqual(host.simulation_ids, [])
+
+        for simulation_id in [FIRST_SIMULATION, SECOND_SIMULATION, THIRD_SIMULATION]:
+            await self.deliver(
+                host, MessageGenerator(simulation_id, "manager").get_simulation_state_message(
+                    SimulationState="running"), "SimState")
+        self.assertEqual(host.simulation_ids, [FIRST_SIMULATION, SECOND_SIMULATION])
+        self.assertEqual(host.listened_topics, ["Epoch", "Result", "SimState"])
+        self.assertEqual(len(client.listeners), 2)
+
+        # the new components have received the SimState running message and sent their ready status
+        status_simulations = [
+            message.simulation_id for _, message in client.sent_messages if isinstance(message, StatusMessage)]
+        self.assertEqual(status_simulations, [FIRST_SIMULATION, SECOND_SIMULATION])
+
+        await host.stop()
+        self.assertTrue(host.is_stopped)
+        self.assertEqual(host.simulation_ids, [])
+        self.assertTrue(client.is_closed)
+
+
+    async def test_health_server(self):
+        """Unit test for the health status of the host and the hosted components."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            socket_path = os.path.join(temporary_directory, "health.sock")
+            with mock.patch.dict(os.environ, {SIMULATION_HEALTH_SOCKET: socket_path}):
+                host = SimulationComponentHost(
+                    CountingComponent, simulation_ids=[FIRST_SIMULATION, SECOND_SIMULATION],
+                    rabbitmq_client=SharedClient())
+                await host.start()
+            self.assertTrue(host.health_server.is_running)
+            self.assertTrue(os.path.exists(socket_path))
+
+            header, _, body = host.health_server.get_response("GET", "/health").partition(b"\r\n\r\n")
+            self.assertTrue(header.startswith(b"HTTP/1.0 200"))
+            health_status = json.loads(body)
+            self.assertTrue(health_status["Healthy"])
+            self.assertEqual(list(health_status["Simulations"]), [FIRST_SIMULATION, SECOND_SIMULATION])
+            self.assertEqual(health_status["Simulations"][FIRST_SIMULATION]["ComponentName"], "hosted")
+
+            await host.stop()
+            self.assertFalse(host.health_server.is_running)
+            self.assertFalse(os.path.exists(socket_path))
+            self.assertFalse(host.get_health_status()["Healthy"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the idle epochs in AbstractSimulationComponent."""
+
+import datetime
+from typing import List
+import unittest
+
+from aiounittest.case import AsyncTestCase
+
+from tools.messages import MessageGenerator
+
+from tools.tests.helpers import SIMULATION_ID, RecordingComponent
+
+# the first epoch starts at 19:00 and the epochs are one hour long
+FIRST_EPOCH_START = datetime.datetime(2020, 1, 1, 19, tzinfo=datetime.timezone.utc)
+EPOCH_LENGTH = datetime.timedelta(hours=1)
+
+
+class NightIdleComponent(RecordingComponent):
+    """Test component that is idle during the epochs starting between 20:00 and 07:00."""
+    def __init__(self, **kwargs):
+        super().__init__(component_name="idler", **kwargs)
+        self.processed_epochs: List[int] = []
+
+    async def process_epoch(self) -> bool:
+        self.processed_epochs.append(self._latest_epoch)
+        return True
+
+    def is_idle_epoch(self, epoch_number: int, start_time: datetime.datetime, end_time: datetime.datetime) -> bool:
+        return start_time.hour >= 20 or start_time.hour < 7
+
+
+class TestIdleEpochs(AsyncTestCase):
+    """Unit tests for the idle epochs in AbstractSimulationComponent."""
+
+    def setUp(self):
+        self.manager = MessageGenerator(SIMULATION_ID, "manager")
+
+    async def run_epochs(self, component: NightIdleComponent, epoch_numbers: List[int]) -> None:
+        """Delivers the SimState running message and the Epoch messages for the given epochs to the component."""
+        await component.general_message_handler_base(
+            self.manager.get_simulation_state_message(SimulationState="running"), "SimState")
+        for epoch_number in epoch_numbers:
+            start_time = FIRST_EPOCH_START + (epoch_number - 1) * EPOCH_LENGTH
+            await component.general_message_handler_base(
+                self.manager.get_epoch_message(
+                    EpochNumber=epoch_number, TriggeringMessageIds=["manager-1"],
+                    StartTime=start_time.isoformat(), EndTime=(start_time + EPOCH_LENGTH).isoformat()),
+                "Epoch")
+
+    async def test_idle_epoch_acknowledgements(self):
+        """Unit test for acknowledging the idle epochs without processing them."""
+        component = NightIdleComponent(idle_epoch_announcements=False)
+        await self.run_epochs(component, list(range(1, 16)))
+
+        # the epochs 2-12 (starting from 20:00-06:00) are idle
+        self.assertEqual(component.processed_epochs, [1, 13, 14, 15])
+        self.assertEqual(
+            [message.epoch_number for message in component.status_messages], list(range(0, 16)))
+        self.assertTrue(all(message.idle_until_epoch is None for message in component.status_messages))
+
+    async def test_idle_epoch_announcements(self):
+        """Unit test for announcing the idle epochs in the status message."""
+        component = NightIdleComponent(idle_epoch_announcements=True)
+        await self.run_epochs(component, list(range(1, 16)))
+
+        self.assertEqual(component.processed_epochs, [1, 13, 14, 15])
+        self.assertEqual(
+            [(message.epoch_number, message.idle_until_epoch) for message in component.status_messages],
+            [(0, None), (1, 12), (13, None), (14, None), (15, None)])
+
+        # the manager can also skip the idle epochs entirely
+        component = NightIdleComponent(idle_epoch_announcements=True)
+        await self.run_epochs(component, [1, 13])
+        self.assertEqual(component.processed_epochs, [1, 13])
+
+    async def test_limited_lookahead(self):
+        """Unit test for the idle epoch lookahead."""
+        component = NightIdleComponent(idle_epoch_lookahead=5, idle_epoch_announcements=True)
+        await self.run_epochs(component, list(range(1, 16)))
+
+        # the idle range is extended with a status message at the last epoch of the previous range
+        self.assertEqual(component.processed_epochs, [1, 13, 14, 15])
+        self.assertEqual(
+            [(message.epoch_number, message.idle_until_epoch) for message in component.status_messages],
+            [(0, None), (1, 6), (6, 11), (11, 12), (13, None), (14, None), (15, None)])
+
+        component = NightIdleComponent(idle_epoch_lookahead=0)
+        await self.run_epochs(component, [1, 2])
+        self.assertEqual(component.processed_epochs, [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
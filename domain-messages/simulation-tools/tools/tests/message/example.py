@@ -245,6 +245,19 @@ class TestExampleMessage(unittest.TestCase):
         message_json_copy = ExampleMessage(**message_json).json()
         self.assertEqual(message_json_copy, message_json)
 
+    def test_compact_storage(self):
+        """Unit test for checking that the attribute values are stored in slots instead of instance dictionaries."""
+        message_original = ExampleMessage(**EXAMPLE_MESSAGE)
+        message_original.bytes()
+        self.assertIn("__positive_integer", ExampleMessage.__slots__)
+        self.assertEqual(message_original.__dict__, {})
+        self.assertEqual(copy.deepcopy(message_original), message_original)
+
+        for block in [message_original.power_quantity, message_original.current_array, message_original.temperature,
+                      message_original.temperature.series["PlaceA"]]:
+            self.assertFalse(hasattr(block, "__dict__"))
+            self.assertEqual(copy.deepcopy(block), block)
+
     def test_message_bytes(self):
         """Unit test for testing that the bytes conversion works correctly."""
         # Convert to bytes and back to Message instance
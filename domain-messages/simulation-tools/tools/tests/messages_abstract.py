@@ -14,6 +14,7 @@ import unittest
 import tools.exceptions.messages
 import tools.messages
 from tools.datetime_tools import to_utc_datetime_object
+from tools.message.example import ExampleMessage
 
 from tools.tests.messages_common import (
     MESSAGE_TYPE_ATTRIBUTE, TIMESTAMP_ATTRIBUTE, SIMULATION_ID_ATTRIBUTE,
@@ -21,6 +22,7 @@ from tools.tests.messages_common import (
     DEFAULT_TYPE, DEFAULT_TIMESTAMP, DEFAULT_SIMULATION_ID, DEFAULT_SOURCE_PROCESS_ID,
     DEFAULT_MESSAGE_ID, FULL_JSON, ALTERNATE_JSON
 )
+from tools.tests.message.example import EXAMPLE_MESSAGE
 
 
 class TestAbstractMessage(unittest.TestCase):
@@ -76,6 +78,59 @@ class TestAbstractMessage(unittest.TestCase):
         self.assertEqual(message_copy.source_process_id, message_full.source_process_id)
         self.assertEqual(message_copy.message_id, message_full.message_id)
 
+    def test_serialization_cache(self):
+        """Unit test for the cached JSON and bytes representations."""
+        message_full = tools.messages.AbstractMessage(**FULL_JSON)
+        message_json = message_full.json()
+        message_bytes = message_full.bytes()
+        self.assertIs(message_full.bytes(), message_bytes)
+        self.assertEqual(message_full.json(), message_json)
+
+        # modifying the returned JSON does not affect the message
+        message_json[MESSAGE_ID_ATTRIBUTE] = "modified-1"
+        self.assertEqual(message_full.json()[MESSAGE_ID_ATTRIBUTE], DEFAULT_MESSAGE_ID)
+
+        # the property setters, including the ones defined in subclasses, clear the cache
+        message_full.message_id = "modified-2"
+        self.assertEqual(message_full.json()[MESSAGE_ID_ATTRIBUTE], "modified-2")
+        self.assertEqual(json.loads(message_full.bytes())[MESSAGE_ID_ATTRIBUTE], "modified-2")
+
+        epoch_message = tools.messages.EpochMessage(**{**FULL_JSON, MESSAGE_TYPE_ATTRIBUTE: "Epoch"})
+        epoch_bytes = epoch_message.bytes()
+        epoch_message.epoch_number += 1
+        self.assertNotEqual(epoch_message.bytes(), epoch_bytes)
+        self.assertEqual(epoch_message.json()["EpochNumber"], FULL_JSON["EpochNumber"] + 1)
+
+        # the in place modifications of the list attributes are detected
+        epoch_message.triggering_message_ids.append("extra-1")
+        self.assertIn("extra-1", json.loads(epoch_message.bytes())["TriggeringMessageIds"])
+        epoch_message.triggering_message_ids[0] = "replaced-1"
+        self.assertEqual(json.loads(epoch_message.bytes())["TriggeringMessageIds"][0], "replaced-1")
+        self.assertEqual(json.loads(epoch_message.bytes()), epoch_message.json())
+        epoch_bytes = epoch_message.bytes()
+        self.assertIs(epoch_message.bytes(), epoch_bytes)
+
+    def test_serialization_cache_with_blocks(self):
+        """Unit test for clearing the cached bytes representation when a block in the message is modified."""
+        example_message = ExampleMessage(**EXAMPLE_MESSAGE)
+        example_bytes = example_message.bytes()
+        self.assertIs(example_message.bytes(), example_bytes)
+
+        example_message.power_quantity.value = 99.0
+        self.assertEqual(json.loads(example_message.bytes())["PowerQuantity"]["Value"], 99.0)
+
+        example_bytes = example_message.bytes()
+        example_message.temperature.get_single_series("PlaceA").values = [1.0, 2.0, 3.0]
+        self.assertEqual(
+            json.loads(example_message.bytes())["Temperature"]["Series"]["PlaceA"]["Values"], [1.0, 2.0, 3.0])
+        self.assertNotEqual(example_message.bytes(), example_bytes)
+
+        # modifying the nested values of the returned JSON does not affect the message
+        example_json = example_message.json()
+        example_json["PowerQuantity"]["Value"] = 1.0
+        self.assertEqual(example_message.json()["PowerQuantity"]["Value"], 99.0)
+        self.assertEqual(json.loads(example_message.bytes())["PowerQuantity"]["Value"], 99.0)
+
     def test_message_equals(self):
         """Unit test for testing if the __eq__ comparison works correctly."""
         message_full = tools.messages.AbstractMessage(Timestamp=DEFAULT_TIMESTAMP, **FULL_JSON)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit test for the MessageCodec class."""
+
+import copy
+import unittest
+
+from tools.exceptions.messages import MessageError
+from tools.message.block import QuantityBlock
+from tools.message.codec import MessageCodec
+from tools.message.example import ExampleMessage
+from tools.messages import AbstractResultMessage, EpochMessage, MessageFactory, MessageGenerator, StatusMessage
+
+from tools.tests.messages_common import (
+    EPOCH_NUMBER_ATTRIBUTE, MESSAGE_TYPE_ATTRIBUTE, START_TIME_ATTRIBUTE, TIMESTAMP_ATTRIBUTE, WARNINGS_ATTRIBUTE,
+    DEFAULT_TIMESTAMP, FULL_JSON
+)
+from tools.tests.message.example import EXAMPLE_MESSAGE
+
+EPOCH_JSON = {**FULL_JSON, MESSAGE_TYPE_ATTRIBUTE: "Epoch", TIMESTAMP_ATTRIBUTE: DEFAULT_TIMESTAMP}
+STATUS_JSON = {**FULL_JSON, MESSAGE_TYPE_ATTRIBUTE: "Status", TIMESTAMP_ATTRIBUTE: DEFAULT_TIMESTAMP}
+
+
+class TestMessageCodec(unittest.TestCase):
+    """Unit tests for the MessageCodec class."""
+
+    def test_get_codec(self):
+        """Unit test for getting the codecs from the message factory."""
+        epoch_codec = MessageFactory.get_codec(EpochMessage)
+        self.assertIsInstance(epoch_codec, MessageCodec)
+        self.assertIs(epoch_codec.message_class, EpochMessage)
+        self.assertIs(MessageFactory.get_codec(EpochMessage), epoch_codec)
+        self.assertEqual(epoch_codec.attribute_names, list(EpochMessage.MESSAGE_ATTRIBUTES_FULL))
+
+        # codecs are also available for the classes that have not been registered to the factory
+        abstract_codec = MessageFactory.get_codec(AbstractResultMessage)
+        self.assertIs(abstract_codec.message_class, AbstractResultMessage)
+
+    def test_round_trip(self):
+        """Unit test for decoding and encoding messages with the codec."""
+        for message_class, message_json in [(EpochMessage, EPOCH_JSON), (StatusMessage, STATUS_JSON)]:
+            with self.subTest(message_class=message_class.__name__):
+                codec = MessageFactory.get_codec(message_class)
+                self.assertTrue(codec.validate(message_json))
+
+                message_object = codec.decode(message_json)
+                self.assertIsInstance(message_object, message_class)
+                self.assertEqual(message_object, message_class(**message_json))
+                self.assertEqual(message_object, message_class.from_json(message_json))
+
+                expected_json = {
+                    attribute_name: attribute_value
+                    for attribute_name, attribute_value in message_json.items()
+                    if attribute_name in message_class.MESSAGE_ATTRIBUTES_FULL
+                }
+                self.assertEqual(codec.encode(message_object), expected_json)
+                self.assertEqual(message_object.json(), expected_json)
+
+    def test_invalid_messages(self):
+        """Unit test for decoding and validating invalid messages."""
+        codec = MessageFactory.get_codec(EpochMessage)
+
+        missing_attribute_json = copy.deepcopy(EPOCH_JSON)
+        missing_attribute_json.pop(START_TIME_ATTRIBUTE)
+        invalid_value_json = {**EPOCH_JSON, EPOCH_NUMBER_ATTRIBUTE: -1}
+        invalid_warnings_json = {**EPOCH_JSON, WARNINGS_ATTRIBUTE: ["no-warning"]}
+
+        for invalid_json in [missing_attribute_json, invalid_value_json, invalid_warnings_json]:
+            self.assertFalse(codec.validate(invalid_json))
+            self.assertIsNone(codec.decode(invalid_json))
+            self.assertIsNone(EpochMessage.from_json(invalid_json))
+
+        # the optionally generated attributes can be missing
+        no_timestamp_json = copy.deepcopy(EPOCH_JSON)
+        no_timestamp_json.pop(TIMESTAMP_ATTRIBUTE)
+        self.assertTrue(codec.validate(no_timestamp_json))
+        self.assertIsInstance(codec.decode(no_timestamp_json), EpochMessage)
+
+    def test_trusted_creation(self):
+        """Unit test for creating messages without validating the attribute values."""
+        source_message = ExampleMessage(**EXAMPLE_MESSAGE)
+        header_attributes = ["Type", "SimulationId", "SourceProcessId", "MessageId", TIMESTAMP_ATTRIBUTE]
+        attributes = {
+            json_attribute_name: getattr(source_message, object_attribute_name)
+            for json_attribute_name, object_attribute_name in ExampleMessage.MESSAGE_ATTRIBUTES_FULL.items()
+            if json_attribute_name not in header_attributes
+        }
+
+        trusted_generator = MessageGenerator("2020-11-19T15:00:00Z", "trusted", validate_trusted_messages=False)
+        validating_generator = MessageGenerator("2020-11-19T15:00:00Z", "trusted", validate_trusted_messages=True)
+        self.assertFalse(trusted_generator.validate_trusted_messages)
+        self.assertTrue(validating_generator.validate_trusted_messages)
+
+        trusted_message = trusted_generator.get_trusted_message(ExampleMessage, **attributes)
+        validated_message = validating_generator.get_trusted_message(ExampleMessage, **attributes)
+        self.assertIsInstance(trusted_message, ExampleMessage)
+        self.assertEqual(trusted_message.message_id, "trusted-1")
+        self.assertEqual(trusted_message.simulation_id, "2020-11-19T15:00:00.000Z")
+
+        trusted_json = trusted_message.json()
+        validated_json = validated_message.json()
+        trusted_json.pop(TIMESTAMP_ATTRIBUTE)
+        validated_json.pop(TIMESTAMP_ATTRIBUTE)
+        self.assertEqual(trusted_json, validated_json)
+        self.assertEqual(ExampleMessage.from_json(trusted_message.json()), trusted_message)
+
+        # the blocks are taken by reference while the lists are copied
+        self.assertIs(trusted_message.power_quantity, source_message.power_quantity)
+        self.assertIs(trusted_message.temperature, source_message.temperature)
+        self.assertEqual(trusted_message.triggering_message_ids, source_message.triggering_message_ids)
+        self.assertIsNot(trusted_message.triggering_message_ids, source_message.triggering_message_ids)
+
+        # the values that are not in the stored format are still converted and validated
+        self.assertIsInstance(trusted_generator.get_trusted_message(
+            ExampleMessage, **{**attributes, "PowerQuantity": 10.5}).power_quantity, QuantityBlock)
+        with self.assertRaises(MessageError):
+            trusted_generator.get_trusted_message(ExampleMessage, **{**attributes, "PowerQuantity": {"Value": 1}})
+        with self.assertRaises(MessageError):
+            validating_generator.get_trusted_message(ExampleMessage, **{**attributes, "PositiveInteger": -1})
+
+
+if __name__ == '__main__':
+    unittest.main()
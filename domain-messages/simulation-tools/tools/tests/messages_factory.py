@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the MessageFactory class."""
+
+import json
+import subprocess
+import sys
+import unittest
+
+from tools.messages import EpochMessage, MessageFactory
+
+from tools.tests.message.example import EXAMPLE_MESSAGE
+
+# The lazy registration is tested in a new interpreter to make sure that the example message module
+# has not been imported before the first message of that type is created.
+LAZY_REGISTRATION_CODE = """
+import json, sys
+from tools.message.factory import MessageFactory
+
+MessageFactory.register_lazy_message_type("Example", "tools.message.example")
+assert "tools.message.example" not in sys.modules
+assert MessageFactory.has_message_type("Example")
+assert "Example" in MessageFactory.get_message_types()
+
+message_object = MessageFactory.get_message(**json.loads(sys.argv[1]))
+assert "tools.message.example" in sys.modules
+assert type(message_object).__name__ == "ExampleMessage"
+assert MessageFactory.get_message_types().count("Example") == 1
+print("ok")
+"""
+
+
+class TestMessageFactory(unittest.TestCase):
+    """Unit tests for the MessageFactory class."""
+
+    def test_registered_types(self):
+        """Unit test for the directly registered message types."""
+        self.assertTrue(MessageFactory.has_message_type("Epoch"))
+        self.assertIs(MessageFactory.get_message_class("Epoch"), EpochMessage)
+        self.assertFalse(MessageFactory.has_message_type("Unknown"))
+        self.assertIsNone(MessageFactory.get_message_class("Unknown"))
+
+        # a lazy registration for an already registered type is ignored
+        MessageFactory.register_lazy_message_type("Epoch", "tools.tests.unknown_module")
+        self.assertIs(MessageFactory.get_message_class("Epoch"), EpochMessage)
+
+    def test_lazy_registration(self):
+        """Unit test for importing the message class module when the message type is first used."""
+        result = subprocess.run(
+            [sys.executable, "-c", LAZY_REGISTRATION_CODE, json.dumps(EXAMPLE_MESSAGE)],
+            check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0, result.stderr.decode("UTF-8"))
+        self.assertEqual(result.stdout.decode("UTF-8").strip().splitlines()[-1], "ok")
+
+    def test_invalid_lazy_registration(self):
+        """Unit test for the lazily registered message types whose module cannot be imported."""
+        MessageFactory.register_lazy_message_type("LazyUnknown", "tools.tests.unknown_module")
+        self.assertTrue(MessageFactory.has_message_type("LazyUnknown"))
+        with self.assertRaises(TypeError):
+            MessageFactory.get_message(Type="LazyUnknown")
+        # the lazy registration is kept, so that the import is tried again
+        self.assertTrue(MessageFactory.has_message_type("LazyUnknown"))
+        self.assertIn("LazyUnknown", MessageFactory.get_message_types())
+        self.assertIsNone(MessageFactory.get_message_class("LazyUnknown"))
+
+        # the module is imported but it does not register the message type
+        MessageFactory.register_lazy_message_type("LazyMissing", "tools.tests.messages_common")
+        self.assertIsNone(MessageFactory.get_message_class("LazyMissing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -165,6 +165,20 @@ class TestStatusMessage(unittest.TestCase):
                 setattr(message_copy, attribute_name, getattr(message_full, attribute_name))
                 self.assertEqual(message_copy, message_full)
 
+    def test_idle_until_epoch(self):
+        """Unit test for the optional IdleUntilEpoch attribute."""
+        message_idle = tools.messages.StatusMessage(IdleUntilEpoch=DEFAULT_EPOCH_NUMBER + 10, **FULL_JSON)
+        self.assertEqual(message_idle.idle_until_epoch, DEFAULT_EPOCH_NUMBER + 10)
+        self.assertEqual(message_idle.json()["IdleUntilEpoch"], DEFAULT_EPOCH_NUMBER + 10)
+        self.assertEqual(tools.messages.StatusMessage.from_json(message_idle.json()), message_idle)
+        self.assertNotEqual(tools.messages.StatusMessage(**FULL_JSON), message_idle)
+        self.assertNotIn("IdleUntilEpoch", tools.messages.StatusMessage(**FULL_JSON).json())
+
+        for invalid_value in [0, -1, "12", True, 1.5]:
+            with self.subTest(value=invalid_value):
+                with self.assertRaises(tools.exceptions.messages.MessageValueError):
+                    tools.messages.StatusMessage(IdleUntilEpoch=invalid_value, **FULL_JSON)
+
     def test_invalid_values(self):
         """Unit tests for testing that invalid attribute values are recognized."""
         message_full = tools.messages.StatusMessage(**FULL_JSON)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the metrics module."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from aiounittest.case import AsyncTestCase
+
+from tools import metrics
+from tools.metrics import Histogram, MetricsExporter, MetricsRegistry
+from tools.messages import MessageGenerator
+
+from tools.tests.helpers import SIMULATION_ID, RecordingComponent
+
+SIMULATION_ID = "2020-01-01T00:00:00.000Z"
+
+
+class TestHistogram(unittest.TestCase):
+    """Unit tests for the Histogram class."""
+
+    def test_observations(self):
+        """Unit test for the histogram counts and the quantile estimates."""
+        histogram = Histogram(buckets=(1.0, 2.0, 5.0))
+        self.assertIsNone(histogram.quantile(0.5))
+        self.assertIsNone(histogram.summary()["Mean"])
+
+        for value in [0.5, 1.5, 1.5, 4.0, 10.0]:
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.sum, 17.5)
+        self.assertEqual(histogram.min, 0.5)
+        self.assertEqual(histogram.max, 10.0)
+        self.assertEqual(histogram.cumulative_counts(), [1, 3, 4, 5])
+
+        # the quantiles are interpolated within the buckets and limited by the minimum and maximum values
+        self.assertAlmostEqual(histogram.quantile(0.5), 1.75)
+        self.assertAlmostEqual(histogram.quantile(0.0), 0.5)
+        self.assertAlmostEqual(histogram.quantile(1.0), 10.0)
+
+        summary = histogram.summary()
+        self.assertEqual(summary["Count"], 5)
+        self.assertAlmostEqual(summary["Mean"], 3.5)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Unit tests for the MetricsRegistry class."""
+
+    def test_disabled(self):
+        """Unit test for ignoring the observations in a disabled registry."""
+        registry = MetricsRegistry(enabled=False)
+        registry.observe(metrics.HANDLER_DURATION, 0.1, message_type="Epoch")
+        registry.increment(metrics.RECEIVED_MESSAGES, message_type="Epoch")
+        self.assertIsNone(registry.get_histogram(metrics.HANDLER_DURATION, message_type="Epoch"))
+        self.assertEqual(registry.get_counter(metrics.RECEIVED_MESSAGES, message_type="Epoch"), 0)
+        self.assertEqual(registry.to_json(), {})
+        self.assertEqual(registry.to_prometheus(), "")
+
+    def test_export_formats(self):
+        """Unit test for the JSON and Prometheus representations of the metrics."""
+        registry = MetricsRegistry(enabled=True, buckets=(0.1, 1.0))
+        registry.observe(metrics.HANDLER_DURATION, 0.05, message_type="Epoch")
+        registry.observe(metrics.HANDLER_DURATION, 0.5, message_type="Epoch")
+        registry.increment(metrics.SENT_MESSAGES, topic="Status.Ready")
+        registry.increment(metrics.SENT_MESSAGES, 2, topic="Status.Ready")
+        self.assertEqual(registry.get_histogram(metrics.HANDLER_DURATION, message_type="Epoch").count, 2)
+        self.assertEqual(registry.get_counter(metrics.SENT_MESSAGES, topic="Status.Ready"), 3)
+
+        metrics_json = registry.to_json()
+        self.assertEqual(metrics_json[metrics.HANDLER_DURATION][0]["Labels"], {"message_type": "Epoch"})
+        self.assertEqual(metrics_json[metrics.HANDLER_DURATION][0]["Count"], 2)
+        self.assertEqual(metrics_json[metrics.SENT_MESSAGES], [{"Labels": {"topic": "Status.Ready"}, "Value": 3}])
+
+        self.assertEqual(
+            registry.to_prometheus(component="test").splitlines(),
+            [
+                "# HELP simulation_handler_duration_seconds " + metrics.METRIC_DESCRIPTIONS[metrics.HANDLER_DURATION],
+                "# TYPE simulation_handler_duration_seconds histogram",
+                'simulation_handler_duration_seconds_bucket{component="test",message_type="Epoch",le="0.1"} 1',
+                'simulation_handler_duration_seconds_bucket{component="test",message_type="Epoch",le="1.0"} 2',
+                'simulation_handler_duration_seconds_bucket{component="test",message_type="Epoch",le="+Inf"} 2',
+                'simulation_handler_duration_seconds_sum{component="test",message_type="Epoch"} 0.55',
+                'simulation_handler_duration_seconds_count{component="test",message_type="Epoch"} 2',
+                "# HELP simulation_sent_messages_total " + metrics.METRIC_DESCRIPTIONS[metrics.SENT_MESSAGES],
+                "# TYPE simulation_sent_messages_total counter",
+                'simulation_sent_messages_total{component="test",topic="Status.Ready"} 3'
+            ])
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            prometheus_filename = os.path.join(temporary_directory, "metrics.prom")
+            json_filename = os.path.join(temporary_directory, "metrics.json")
+            self.assertTrue(registry.write_file(prometheus_filename))
+            self.assertTrue(registry.write_file(json_filename, metrics.METRICS_FORMAT_JSON))
+            with open(prometheus_filename, mode="r", encoding="UTF-8") as prometheus_file:
+                self.assertEqual(prometheus_file.read(), registry.to_prometheus())
+            with open(json_filename, mode="r", encoding="UTF-8") as json_file:
+                self.assertEqual(json.load(json_file), metrics_json)
+            self.assertEqual(sorted(os.listdir(temporary_directory)), ["metrics.json", "metrics.prom"])
+
+        registry.clear()
+        self.assertEqual(registry.to_json(), {})
+
+
+class MetricsComponent(RecordingComponent):
+    """Test component that does not need any input other than the Epoch messages."""
+    def __init__(self, **kwargs):
+        super().__init__(component_name="measured", **kwargs)
+
+
+class TestComponentMetrics(AsyncTestCase):
+    """Unit tests for the metrics collected and exported by AbstractSimulationComponent."""
+
+    def setUp(self):
+        self.original_registry_state = metrics.METRICS.enabled
+        metrics.METRICS.enabled = True
+        metrics.METRICS.clear()
+
+    def tearDown(self):
+        metrics.METRICS.enabled = self.original_registry_state
+        metrics.METRICS.clear()
+
+    async def test_epoch_metrics(self):
+        """Unit test for the epoch and handler metrics and for the metrics summary message and file."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            metrics_filename = os.path.join(temporary_directory, "metrics.prom")
+            component = MetricsComponent()
+            component._metrics_exporter = MetricsExporter(  # pylint: disable=protected-access
+                metrics.METRICS, interval=2, topic_name="Metrics", filename=metrics_filename)
+
+            manager = MessageGenerator(SIMULATION_ID, "manager")
+            await component.general_message_handler_base(
+                manager.get_simulation_state_message(SimulationState="running"), "SimState")
+            for epoch_number in [1, 2]:
+                await component.general_message_handler_base(
+                    manager.get_epoch_message(
+                        EpochNumber=epoch_number, TriggeringMessageIds=["manager-1"],
+                        StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z"),
+                    "Epoch")
+
+            self.assertEqual(metrics.METRICS.get_histogram(metrics.EPOCH_DURATION).count, 2)
+            self.assertEqual(
+                metrics.METRICS.get_histogram(metrics.HANDLER_DURATION, message_type="Epoch").count, 2)
+            self.assertEqual(
+                metrics.METRICS.get_histogram(metrics.LOCK_WAIT, message_type="SimState").count, 1)
+
+            # the metrics are exported only after the second epoch
+            sent_messages = component._rabbitmq_client.sent_messages  # pylint: disable=protected-access
+            metrics_messages = [
+                json.loads(message_bytes)
+                for topic_name, message_bytes in sent_messages
+                if topic_name == "Metrics"
+            ]
+            self.assertEqual(len(metrics_messages), 1)
+            self.assertEqual(metrics_messages[0]["Type"], metrics.METRICS_MESSAGE_TYPE)
+            self.assertEqual(metrics_messages[0]["EpochNumber"], 2)
+            self.assertEqual(metrics_messages[0]["Metrics"][metrics.EPOCH_DURATION][0]["Count"], 2)
+
+            with open(metrics_filename, mode="r", encoding="UTF-8") as metrics_file:
+                self.assertIn('simulation_epoch_duration_seconds_count{component="measured"} 2', metrics_file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
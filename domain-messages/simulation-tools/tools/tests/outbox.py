@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the MessageOutbox class."""
+
+import os
+import tempfile
+import unittest
+
+from tools.outbox import MessageOutbox
+
+
+def get_test_messages(message_count: int):
+    """Returns a list of test messages as (topic, bytes) tuples."""
+    return [
+        ("Topic.{}".format(index % 3), bytes('{{"Index": {}}}'.format(index), encoding="UTF-8"))
+        for index in range(message_count)
+    ]
+
+
+class TestMessageOutbox(unittest.TestCase):
+    """Unit tests for the MessageOutbox class."""
+
+    def test_memory_only(self):
+        """Tests that the messages are returned in order and that the size limit is respected."""
+        outbox = MessageOutbox(max_messages=5)
+        self.assertTrue(outbox.is_empty())
+        self.assertIsNone(outbox.peek())
+        self.assertIsNone(outbox.pop())
+
+        test_messages = get_test_messages(7)
+        for index, (topic_name, message_bytes) in enumerate(test_messages):
+            self.assertEqual(outbox.put(topic_name, message_bytes), index < 5)
+        self.assertTrue(outbox.is_full())
+        self.assertEqual(outbox.depth, 5)
+        self.assertEqual(outbox.memory_depth, 5)
+        self.assertEqual(outbox.spilled_depth, 0)
+
+        self.assertEqual(outbox.peek(), test_messages[0])
+        for test_message in test_messages[:5]:
+            self.assertEqual(outbox.pop(), test_message)
+        self.assertTrue(outbox.is_empty())
+
+    def test_spill_file(self):
+        """Tests that the messages that do not fit in memory are stored in the spill file in order."""
+        with tempfile.TemporaryDirectory() as temp_directory:
+            spill_filename = os.path.join(temp_directory, "outbox.jsonl")
+            outbox = MessageOutbox(max_messages=10, max_memory_messages=3, spill_filename=spill_filename)
+
+            test_messages = get_test_messages(12)
+            for index, (topic_name, message_bytes) in enumerate(test_messages):
+                self.assertEqual(outbox.put(topic_name, message_bytes), index < 10)
+            self.assertEqual(outbox.depth, 10)
+            self.assertEqual(outbox.memory_depth, 3)
+            self.assertEqual(outbox.spilled_depth, 7)
+
+            # new messages must go behind the spilled ones even if there is room in memory
+            self.assertEqual(outbox.pop(), test_messages[0])
+            self.assertTrue(outbox.put(*test_messages[10]))
+            self.assertEqual(outbox.memory_depth, 2)
+            self.assertEqual(outbox.spilled_depth, 8)
+
+            received_messages = []
+            while not outbox.is_empty():
+                received_messages.append(outbox.pop())
+            self.assertEqual(received_messages, test_messages[1:11])
+            self.assertEqual(outbox.spilled_depth, 0)
+
+    def test_without_spill_file(self):
+        """Tests that the memory limit is used as the limit when no spill file is given."""
+        outbox = MessageOutbox(max_messages=10, max_memory_messages=2)
+        test_messages = get_test_messages(3)
+        self.assertTrue(outbox.put(*test_messages[0]))
+        self.assertTrue(outbox.put(*test_messages[1]))
+        self.assertFalse(outbox.put(*test_messages[2]))
+        self.assertEqual(outbox.depth, 2)
+
+    def test_clear(self):
+        """Tests clearing the outbox."""
+        with tempfile.TemporaryDirectory() as temp_directory:
+            spill_filename = os.path.join(temp_directory, "outbox.jsonl")
+            outbox = MessageOutbox(max_messages=10, max_memory_messages=1, spill_filename=spill_filename)
+            for test_message in get_test_messages(4):
+                outbox.put(*test_message)
+            self.assertEqual(outbox.depth, 4)
+
+            outbox.clear()
+            self.assertTrue(outbox.is_empty())
+            self.assertEqual(os.path.getsize(spill_filename), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
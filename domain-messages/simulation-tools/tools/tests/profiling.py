@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the profiling module."""
+
+import os
+import pstats
+import tempfile
+from typing import Any
+import unittest
+from unittest import mock
+
+from aiounittest.case import AsyncTestCase
+
+from tools import profiling
+from tools.messages import GeneralMessage, MessageGenerator
+from tools.profiling import EpochProfiler, parse_targets
+
+from tools.tests.helpers import SIMULATION_ID, RecordingComponent
+
+PROFILING_TOPIC = "Profiling"
+
+
+def busy_function() -> int:
+    """Function that shows up in the profiles."""
+    return sum(range(1000))
+
+
+class TestEpochProfiler(unittest.TestCase):
+    """Unit tests for the EpochProfiler class."""
+
+    def test_parse_targets(self):
+        """Unit test for parsing the profiling targets."""
+        self.assertEqual(
+            parse_targets(" process_epoch, unknown ,send_message,"),
+            [profiling.TARGET_PROCESS_EPOCH, profiling.TARGET_SEND_MESSAGE])
+        self.assertEqual(parse_targets(""), [])
+
+    def test_epoch_profiles(self):
+        """Unit test for writing the profiles for the given number of epochs."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            profiler = EpochProfiler(
+                "component:1", SIMULATION_ID, epochs=2, directory=temporary_directory,
+                targets=[profiling.TARGET_PROCESS_EPOCH])
+            self.assertTrue(profiler.is_active)
+            self.assertEqual(profiler.targets, [profiling.TARGET_PROCESS_EPOCH])
+
+            # the epoch 0 is not counted as a profiled epoch
+            self.assertIsNone(profiler.finish_epoch(0))
+            self.assertEqual(profiler.remaining_epochs, 2)
+
+            for epoch_number in [1, 2, 3]:
+                # nested calls and the targets that are not profiled are handled by the outermost call
+                with profiler.profile(profiling.TARGET_PROCESS_EPOCH):
+                    with profiler.profile(profiling.TARGET_PROCESS_EPOCH):
+                        busy_function()
+                    with profiler.profile(profiling.TARGET_MESSAGE_HANDLER):
+                        busy_function()
+                profiler.finish_epoch(epoch_number)
+
+            self.assertFalse(profiler.is_active)
+            expected_files = [
+                os.path.join(temporary_directory, "component1_2020-01-01T000000.000Z_epoch_{:05d}.prof".format(epoch))
+                for epoch in [1, 2]
+            ]
+            self.assertEqual(profiler.written_files, expected_files)
+            self.assertEqual(len(os.listdir(temporary_directory)), 4)
+
+            statistics = pstats.Stats(expected_files[0])
+            busy_calls = [
+                call_statistics[1]
+                for (_, _, function_name), call_statistics in statistics.stats.items()  # type: ignore
+                if function_name == busy_function.__name__
+            ]
+            self.assertEqual(busy_calls, [2])
+            with open(os.path.splitext(expected_files[0])[0] + ".txt", mode="r", encoding="UTF-8") as summary_file:
+                self.assertIn(busy_function.__name__, summary_file.read())
+
+    def test_epoch_finished_in_nested_call(self):
+        """Unit test for finishing the epoch inside a profiled call, e.g. process_epoch called from
+           the message handler."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            profiler = EpochProfiler("component", SIMULATION_ID, epochs=1, directory=temporary_directory)
+            with profiler.profile(profiling.TARGET_MESSAGE_HANDLER):
+                with profiler.profile(profiling.TARGET_PROCESS_EPOCH):
+                    busy_function()
+                # the profile is written only after the outermost call has ended
+                self.assertIsNone(profiler.finish_epoch(1))
+                self.assertEqual(profiler.remaining_epochs, 1)
+                self.assertEqual(os.listdir(temporary_directory), [])
+
+            self.assertEqual(
+                [os.path.basename(filename) for filename in profiler.written_files],
+                ["component_2020-01-01T000000.000Z_epoch_00001.prof"])
+            self.assertFalse(profiler.is_active)
+
+    def test_stop(self):
+        """Unit test for stopping the profiling before the epoch has been finished."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            profiler = EpochProfiler("component", SIMULATION_ID, epochs=0, directory=temporary_directory)
+            self.assertFalse(profiler.is_active)
+            profiler.start(1)
+            self.assertEqual(profiler.targets, profiling.PROFILING_TARGETS)
+            with profiler.profile(profiling.TARGET_SEND_MESSAGE):
+                busy_function()
+            profiler.stop()
+            self.assertIsNone(profiler.finish_epoch(1))
+            self.assertEqual(os.listdir(temporary_directory), [])
+
+
+class ProfiledComponent(RecordingComponent):
+    """Test component that does not need any input other than the Epoch messages."""
+    def __init__(self, **kwargs):
+        super().__init__(component_name="profiled", **kwargs)
+
+    async def process_epoch(self) -> bool:
+        busy_function()
+        return True
+
+
+class HandlerStartedComponent(ProfiledComponent):
+    """Test component that starts the epochs from the message handler after receiving a Result message."""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.input_received = False
+
+    async def ready_for_new_epoch(self) -> bool:
+        return self.input_received
+
+    async def general_message_handler(self, message_object: Any, message_routing_key: str) -> None:
+        self.input_received = True
+        await self.start_epoch()
+
+
+class TestComponentProfiling(AsyncTestCase):
+    """Unit tests for the profiling of AbstractSimulationComponent."""
+
+    async def test_environment_variables(self):
+        """Unit test for starting the profiling with the environmental variables."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            with mock.patch.dict(os.environ, {
+                    profiling.SIMULATION_PROFILING_EPOCHS: "1",
+                    profiling.SIMULATION_PROFILING_DIRECTORY: temporary_directory}):
+                component = ProfiledComponent()
+            self.assertTrue(component.profiler.is_active)
+
+            manager = MessageGenerator(SIMULATION_ID, "manager")
+            await component.general_message_handler_base(
+                manager.get_simulation_state_message(SimulationState="running"), "SimState")
+            for epoch_number in [1, 2]:
+                await component.general_message_handler_base(
+                    manager.get_epoch_message(
+                        EpochNumber=epoch_number, TriggeringMessageIds=["manager-1"],
+                        StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z"),
+                    "Epoch")
+
+            self.assertEqual(
+                [os.path.basename(filename) for filename in component.profiler.written_files],
+                ["profiled_2020-01-01T000000.000Z_epoch_00001.prof"])
+            self.assertFalse(component.profiler.is_active)
+
+    async def test_epoch_started_from_handler(self):
+        """Unit test for profiling the epochs that are started from the message handler."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            with mock.patch.dict(os.environ, {
+                    profiling.SIMULATION_PROFILING_EPOCHS: "1",
+                    profiling.SIMULATION_PROFILING_DIRECTORY: temporary_directory}):
+                component = HandlerStartedComponent()
+
+            manager = MessageGenerator(SIMULATION_ID, "manager")
+            await component.general_message_handler_base(
+                manager.get_simulation_state_message(SimulationState="running"), "SimState")
+            await component.general_message_handler_base(
+                manager.get_epoch_message(
+                    EpochNumber=1, TriggeringMessageIds=["manager-1"],
+                    StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z"),
+                "Epoch")
+            self.assertEqual(component.profiler.written_files, [])
+
+            result_message = MessageGenerator(SIMULATION_ID, "source").get_abstract_message()
+            result_message.epoch_number = 1
+            await component.general_message_handler_base(result_message, "Result")
+            self.assertEqual(component.status_epochs[-1], 1)
+            self.assertEqual(
+                [os.path.basename(filename) for filename in component.profiler.written_files],
+                ["profiled_2020-01-01T000000.000Z_epoch_00001.prof"])
+
+    async def test_control_message(self):
+        """Unit test for starting the profiling with a control message."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            with mock.patch.dict(os.environ, {
+                    profiling.SIMULATION_PROFILING_TOPIC: PROFILING_TOPIC,
+                    profiling.SIMULATION_PROFILING_DIRECTORY: temporary_directory}):
+                component = ProfiledComponent()
+            self.assertFalse(component.profiler.is_active)
+            self.assertIn(PROFILING_TOPIC, component.listened_topics)
+
+            manager = MessageGenerator(SIMULATION_ID, "manager")
+            await component.general_message_handler_base(
+                manager.get_simulation_state_message(SimulationState="running"), "SimState")
+
+            def get_control_message(**attributes) -> GeneralMessage:
+                return GeneralMessage(
+                    Type="ProfilingControl", SimulationId=SIMULATION_ID, SourceProcessId="manager",
+                    MessageId="manager-control", Timestamp="2020-01-01T00:00:00.000Z", **attributes)
+
+            # the control messages for other components are ignored
+            await component.general_message_handler_base(
+                get_control_message(ProfiledEpochs=1, ComponentNames=["other"]), PROFILING_TOPIC)
+            self.assertFalse(component.profiler.is_active)
+
+            await component.general_message_handler_base(
+                get_control_message(
+                    ProfiledEpochs=3, Targets=[profiling.TARGET_PROCESS_EPOCH], ComponentNames=["profiled"]),
+                PROFILING_TOPIC)
+            self.assertEqual(component.profiler.remaining_epochs, 3)
+            self.assertEqual(component.profiler.targets, [profiling.TARGET_PROCESS_EPOCH])
+
+            await component.general_message_handler_base(
+                manager.get_epoch_message(
+                    EpochNumber=1, TriggeringMessageIds=["manager-1"],
+                    StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z"),
+                "Epoch")
+            self.assertEqual(len(component.profiler.written_files), 1)
+
+            # ProfiledEpochs 0 stops the profiling
+            await component.general_message_handler_base(get_control_message(ProfiledEpochs=0), PROFILING_TOPIC)
+            self.assertFalse(component.profiler.is_active)
+
+
+if __name__ == '__main__':
+    unittest.main()
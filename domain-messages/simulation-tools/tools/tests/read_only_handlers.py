@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the read-only message handlers in AbstractSimulationComponent."""
+
+import asyncio
+from typing import Any, List, Tuple
+import unittest
+
+from aiounittest.case import AsyncTestCase
+
+from tools.messages import MessageGenerator
+
+from tools.tests.helpers import SIMULATION_ID, RecordingComponent
+
+# the maximum time in seconds to wait for a handler that should not be blocked
+HANDLER_TIMEOUT = 1.0
+
+
+class QueryComponent(RecordingComponent):
+    """Test component with a blocking handler for the Result messages and a read-only handler for
+       the Query messages."""
+    def __init__(self, **kwargs):
+        super().__init__(component_name="queried", other_topics=["Result"], **kwargs)
+        self.add_read_only_handler("Query", self.query_handler)
+        self.result_handling_allowed = asyncio.Event()
+        self.handled_results: List[Any] = []
+        self.answered_queries: List[Tuple[Any, int]] = []
+
+    async def general_message_handler(self, message_object: Any, message_routing_key: str) -> None:
+        await self.result_handling_allowed.wait()
+        self.handled_results.append(message_object)
+
+    async def query_handler(self, message_object: Any, message_routing_key: str) -> None:
+        """Stores the query together with the current epoch number."""
+        self.answered_queries.append((message_object, self._latest_epoch))
+
+
+class TestReadOnlyHandlers(AsyncTestCase):
+    """Unit tests for handling the read-only messages without the message handling lock."""
+
+    async def test_read_only_topic(self):
+        """Unit test for handling the messages from a read-only topic while another handler is running."""
+        component = QueryComponent()
+        self.assertEqual(component.read_only_topics, ["Query"])
+        self.assertIn("Query", component.listened_topics)
+
+        # the Epoch and SimState topics cannot be read-only
+        component.add_read_only_handler("Epoch", component.query_handler)
+        self.assertEqual(component.read_only_topics, ["Query"])
+
+        source = MessageGenerator(SIMULATION_ID, "source")
+        result_message = source.get_abstract_message()
+        query_message = source.get_abstract_message()
+        result_task = asyncio.create_task(component.general_message_handler_base(result_message, "Result"))
+        await asyncio.sleep(0)
+        self.assertFalse(result_task.done())
+
+        await asyncio.wait_for(component.general_message_handler_base(query_message, "Query"), HANDLER_TIMEOUT)
+        self.assertEqual(component.answered_queries, [(query_message, 0)])
+        self.assertEqual(component.handled_results, [])
+
+        component.result_handling_allowed.set()
+        await result_task
+        self.assertEqual(component.handled_results, [result_message])
+
+    async def test_repeated_control_messages(self):
+        """Unit test for handling the repeated Epoch and SimState messages while another handler is running."""
+        component = QueryComponent()
+        component.result_handling_allowed.set()
+        manager = MessageGenerator(SIMULATION_ID, "manager")
+        await component.general_message_handler_base(
+            manager.get_simulation_state_message(SimulationState="running"), "SimState")
+        epoch_message = manager.get_epoch_message(
+            EpochNumber=1, TriggeringMessageIds=["manager-1"],
+            StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z")
+        await component.general_message_handler_base(epoch_message, "Epoch")
+        sent_messages = component._rabbitmq_client.sent_messages  # pylint: disable=protected-access
+        self.assertEqual(len(sent_messages), 2)
+        status_message_id = sent_messages[-1][1].message_id
+
+        component.result_handling_allowed.clear()
+        result_task = asyncio.create_task(
+            component.general_message_handler_base(MessageGenerator(SIMULATION_ID, "source").get_abstract_message(),
+                                                   "Result"))
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(component.general_message_handler_base(
+            manager.get_epoch_message(
+                EpochNumber=1, TriggeringMessageIds=[status_message_id],
+                StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z"),
+            "Epoch"), HANDLER_TIMEOUT)
+        await asyncio.wait_for(component.general_message_handler_base(
+            manager.get_simulation_state_message(SimulationState="running"), "SimState"), HANDLER_TIMEOUT)
+        self.assertEqual(len(sent_messages), 2)
+        self.assertFalse(result_task.done())
+
+        # a new epoch waits for the running handler
+        next_epoch_task = asyncio.create_task(component.general_message_handler_base(
+            manager.get_epoch_message(
+                EpochNumber=2, TriggeringMessageIds=[status_message_id],
+                StartTime="2020-01-01T01:00:00Z", EndTime="2020-01-01T02:00:00Z"),
+            "Epoch"))
+        await asyncio.sleep(0.05)
+        self.assertFalse(next_epoch_task.done())
+
+        component.result_handling_allowed.set()
+        await asyncio.gather(result_task, next_epoch_task)
+        self.assertEqual(len(sent_messages), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
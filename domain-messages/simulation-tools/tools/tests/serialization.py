@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the JSON serialization functions."""
+
+import json
+import math
+import unittest
+
+from tools import serialization
+from tools.clients import validate_message
+from tools.message.block import TimeSeriesBlock, ValueArrayBlock
+from tools.messages import EpochMessage, ResultMessage, StatusMessage
+from tools.serialization import JsonSerializer
+
+from tools.tests.messages_common import FULL_JSON
+
+TEST_MESSAGES = [
+    EpochMessage(**{**FULL_JSON, "Type": "Epoch"}),
+    StatusMessage(**{**FULL_JSON, "Type": "Status"})
+]
+
+
+class TestJsonSerializer(unittest.TestCase):
+    """Unit tests for the JsonSerializer class."""
+
+    def tearDown(self):
+        JsonSerializer.set_backend(serialization.JSON_BACKEND_AUTO)
+
+    def test_backend_selection(self):
+        """Unit test for selecting the JSON backend."""
+        self.assertEqual(JsonSerializer.set_backend("json"), serialization.JSON_BACKEND_STDLIB)
+        self.assertEqual(JsonSerializer.get_backend_name(), serialization.JSON_BACKEND_STDLIB)
+        self.assertEqual(JsonSerializer.set_backend("unknown"), serialization.JSON_BACKEND_STDLIB)
+
+        expected_backend = (
+            serialization.JSON_BACKEND_STDLIB if serialization.orjson is None
+            else serialization.JSON_BACKEND_ORJSON)
+        self.assertEqual(JsonSerializer.set_backend("auto"), expected_backend)
+        self.assertEqual(JsonSerializer.set_backend("orjson"), expected_backend)
+
+    def test_backends(self):
+        """Unit test for checking that all the backends produce the same JSON content."""
+        for backend_name in [serialization.JSON_BACKEND_STDLIB, serialization.JSON_BACKEND_ORJSON]:
+            with self.subTest(backend=JsonSerializer.set_backend(backend_name)):
+                for message in TEST_MESSAGES:
+                    message_bytes = message.bytes()
+                    if backend_name == serialization.JSON_BACKEND_STDLIB:
+                        # the standard library backend produces exactly the same output as before
+                        self.assertEqual(message_bytes, bytes(json.dumps(message.json()), encoding="UTF-8"))
+                    self.assertIsInstance(message_bytes, bytes)
+                    self.assertEqual(json.loads(message_bytes), message.json())
+                    self.assertEqual(serialization.loads(message_bytes), message.json())
+                    self.assertEqual(serialization.loads(message_bytes.decode("UTF-8")), message.json())
+                    self.assertEqual(message.__class__(**serialization.loads(message_bytes)), message)
+
+                # values that are not supported by all the backends
+                self.assertEqual(serialization.loads(serialization.dumps({1: 2 ** 70})), {"1": 2 ** 70})
+                with self.assertRaises(json.decoder.JSONDecodeError):
+                    serialization.loads(b'{"test" "fail"}')
+
+    def test_non_finite_values(self):
+        """Unit test for checking that NaN and infinite values are not written as null."""
+        json_object = {"Values": [1.5, float("inf"), float("-inf")], "Nested": {"Value": float("nan")}, "Null": None}
+        for backend_name in [serialization.JSON_BACKEND_STDLIB, serialization.JSON_BACKEND_ORJSON]:
+            with self.subTest(backend=JsonSerializer.set_backend(backend_name)):
+                json_bytes = serialization.dumps(json_object)
+                self.assertEqual(json_bytes, bytes(json.dumps(json_object), encoding="UTF-8"))
+                self.assertIn(b"NaN", json_bytes)
+                self.assertIn(b"-Infinity", json_bytes)
+
+                loaded_object = serialization.loads(json_bytes)
+                self.assertEqual(loaded_object["Values"], [1.5, float("inf"), float("-inf")])
+                self.assertTrue(math.isnan(loaded_object["Nested"]["Value"]))
+                self.assertIsNone(loaded_object["Null"])
+
+                # the null values without any non-finite values are written normally
+                self.assertEqual(serialization.loads(serialization.dumps({"Value": None})), {"Value": None})
+
+
+@unittest.skipIf(serialization.msgpack is None, "msgpack is not installed")
+class TestMessagePack(unittest.TestCase):
+    """Unit tests for the MessagePack wire format."""
+
+    def test_content_types(self):
+        """Unit test for determining the content type."""
+        self.assertEqual(serialization.get_wire_format_content_type("json"), serialization.CONTENT_TYPE_JSON)
+        self.assertEqual(serialization.get_wire_format_content_type("MsgPack"), serialization.CONTENT_TYPE_MSGPACK)
+        self.assertEqual(serialization.get_wire_format_content_type("unknown"), serialization.CONTENT_TYPE_JSON)
+
+        for message in TEST_MESSAGES:
+            self.assertEqual(serialization.get_content_type(message.bytes()), serialization.CONTENT_TYPE_JSON)
+            self.assertEqual(
+                serialization.get_content_type(
+                    serialization.encode(message.json(), serialization.CONTENT_TYPE_MSGPACK)),
+                serialization.CONTENT_TYPE_MSGPACK)
+
+    def test_control_messages(self):
+        """Unit test for sending the control messages as JSON regardless of the wire format."""
+        result_message = ResultMessage(**{**TEST_MESSAGES[0].json(), "Type": "Result"})
+        for message in TEST_MESSAGES + [result_message]:
+            with self.subTest(message_type=message.message_type):
+                topic_name, message_bytes = validate_message("Topic", message, serialization.CONTENT_TYPE_MSGPACK)
+                self.assertEqual(topic_name, "Topic")
+                expected_content_type = (
+                    serialization.CONTENT_TYPE_JSON if message.message_type in serialization.JSON_ONLY_MESSAGE_TYPES
+                    else serialization.CONTENT_TYPE_MSGPACK)
+                self.assertEqual(serialization.get_content_type(message_bytes), expected_content_type)
+                self.assertEqual(serialization.decode(message_bytes, expected_content_type), message.json())
+
+    def test_round_trip(self):
+        """Unit test for encoding and decoding messages in MessagePack format."""
+        time_series = TimeSeriesBlock(
+            TimeIndex=["2020-06-03T04:00:00.000Z", "2020-06-03T05:00:00.000Z", "2020-06-03T06:00:00.125Z"],
+            Series={
+                "Active": ValueArrayBlock(Values=[1.5, -2.25, 3.0], UnitOfMeasure="kW"),
+                "Count": ValueArrayBlock(Values=[1, 2, 3], UnitOfMeasure="m")
+            })
+        result_message = ResultMessage(**{**TEST_MESSAGES[0].json(), "Type": "Result", "Forecast": time_series.json()})
+
+        for message in TEST_MESSAGES + [result_message]:
+            with self.subTest(message_type=message.message_type):
+                message_json = message.json()
+                message_bytes = serialization.encode(message_json, serialization.CONTENT_TYPE_MSGPACK)
+                decoded_json = serialization.decode(message_bytes, serialization.CONTENT_TYPE_MSGPACK)
+                self.assertEqual(decoded_json, message_json)
+                self.assertEqual(message.__class__(**decoded_json), message)
+                self.assertLess(len(message_bytes), len(message.bytes()))
+
+        # the time indexes that are not in the canonical format are kept as strings
+        irregular_json = {"TimeIndex": ["2020-06-03T04:00:00Z", "2020-06-03T05:00:00.000+03:00"], "Values": [1.0]}
+        self.assertEqual(
+            serialization.decode(
+                serialization.encode(irregular_json, serialization.CONTENT_TYPE_MSGPACK),
+                serialization.CONTENT_TYPE_MSGPACK),
+            irregular_json)
+
+        with self.assertRaises(serialization.DECODE_ERRORS):
+            serialization.decode(b"\xc1", serialization.CONTENT_TYPE_MSGPACK)
+
+
+if __name__ == '__main__':
+    unittest.main()
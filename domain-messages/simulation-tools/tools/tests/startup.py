@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the startup module and for the startup of AbstractSimulationComponent."""
+
+import asyncio
+from typing import List
+import unittest
+from unittest import mock
+
+from aiounittest.case import AsyncTestCase
+
+from tools import startup
+from tools.message.factory import MessageFactory
+from tools.startup import StartupTimer, get_topic_message_types, preflight_warm_up
+
+from tools.tests.helpers import SIMULATION_ID, RecordingClient, RecordingComponent
+
+
+class TestStartupTimer(unittest.TestCase):
+    """Unit tests for the StartupTimer class."""
+
+    def test_phases(self):
+        """Unit test for recording the phase durations."""
+        timer = StartupTimer()
+        with timer.measure(startup.PHASE_PREFLIGHT):
+            pass
+        timer.record(startup.PHASE_LISTENERS, 0.25)
+        timer.record_since_start(startup.PHASE_TOTAL)
+
+        durations = timer.durations
+        self.assertEqual(
+            list(durations), [startup.PHASE_PREFLIGHT, startup.PHASE_LISTENERS, startup.PHASE_TOTAL])
+        self.assertEqual(durations[startup.PHASE_LISTENERS], 0.25)
+        self.assertGreaterEqual(durations[startup.PHASE_TOTAL], durations[startup.PHASE_PREFLIGHT])
+        self.assertIn("listeners=0.250 s", timer.report())
+
+        # failed phases are not recorded
+        with self.assertRaises(ValueError):
+            with timer.measure(startup.PHASE_CLIENT):
+                raise ValueError("failed")
+        self.assertNotIn(startup.PHASE_CLIENT, timer.durations)
+
+    def test_preflight_warm_up(self):
+        """Unit test for loading the message classes in the preflight warm-up."""
+        self.assertEqual(preflight_warm_up(SIMULATION_ID, "warm", ["Epoch", "Status"]), [])
+
+        # only the given message types are loaded, by default the control message types
+        MessageFactory.register_lazy_message_type("StartupTestMessage", "tools.tests.nonexistent_module")
+        self.assertEqual(preflight_warm_up(SIMULATION_ID, "warm"), [])
+        self.assertIn("StartupTestMessage", MessageFactory.get_message_types())
+        self.assertEqual(
+            preflight_warm_up(SIMULATION_ID, "warm", ["Epoch", "StartupTestMessage"]), ["StartupTestMessage"])
+        self.assertIsNone(MessageFactory.get_message_class("StartupTestMessage"))
+
+    def test_topic_message_types(self):
+        """Unit test for determining the warmed up message types from the listened topics."""
+        MessageFactory.register_lazy_message_type("StartupTopicMessage", "tools.tests.nonexistent_module")
+        self.assertEqual(
+            get_topic_message_types(["Epoch", "StartupTopicMessage.market1", "UnknownTopic", "Status.Ready"]),
+            startup.CONTROL_MESSAGE_TYPES + ["StartupTopicMessage"])
+
+
+class StartupClient(RecordingClient):
+    """Message client replacement with adjustable delays for opening the connections."""
+    def __init__(self, send_delay: float, listener_delay: float):
+        super().__init__()
+        self.send_delay = send_delay
+        self.listener_delay = listener_delay
+        self.listened_topics: List[str] = []
+
+    def add_listener(self, topic_names: List[str], callback_function, **kwargs) -> None:
+        """Stores the listened topics."""
+        # pylint: disable=unused-argument
+        self.listened_topics.extend(topic_names)
+
+    async def open_send_connection(self) -> bool:
+        """Opens the send connection after the send delay."""
+        await asyncio.sleep(self.send_delay)
+        return True
+
+    async def wait_for_listeners(self, timeout=None) -> bool:
+        """Waits for the listener delay."""
+        # pylint: disable=unused-argument
+        await asyncio.sleep(self.listener_delay)
+        return True
+
+
+class StartupComponent(RecordingComponent):
+    """Test component that uses the given client as its own client."""
+    def __init__(self, client: StartupClient, **kwargs):
+        super().__init__(component_name="starting", **kwargs)
+        self._rabbitmq_client = client
+
+
+class TestComponentStartup(AsyncTestCase):
+    """Unit tests for the startup of AbstractSimulationComponent."""
+
+    async def test_concurrent_connections(self):
+        """Unit test for opening the connections concurrently during the startup."""
+        client = StartupClient(send_delay=0.2, listener_delay=0.2)
+        component = StartupComponent(client, startup_timeout=5.0)
+        await component.start()
+        self.assertFalse(component.is_stopped)
+        self.assertEqual(client.listened_topics, component.listened_topics)
+
+        durations = component.startup_durations
+        self.assertEqual(
+            set(durations),
+            {startup.PHASE_PREFLIGHT, startup.PHASE_SEND_CONNECTION, startup.PHASE_LISTENERS, startup.PHASE_TOTAL})
+        self.assertGreaterEqual(durations[startup.PHASE_SEND_CONNECTION], 0.2)
+        self.assertGreaterEqual(durations[startup.PHASE_LISTENERS], 0.2)
+        # the connections were opened at the same time
+        self.assertLess(durations[startup.PHASE_TOTAL], 0.35)
+
+    async def test_startup_timeout(self):
+        """Unit test for continuing the startup when the connections are not ready before the timeout."""
+        client = StartupClient(send_delay=0.0, listener_delay=10.0)
+        component = StartupComponent(client, startup_timeout=0.2, startup_preflight=False)
+        await component.start()
+        self.assertFalse(component.is_stopped)
+
+        durations = component.startup_durations
+        self.assertEqual(set(durations), {startup.PHASE_SEND_CONNECTION, startup.PHASE_TOTAL})
+        self.assertLess(durations[startup.PHASE_TOTAL], 1.0)
+
+    async def test_non_blocking_start(self):
+        """Unit test for not waiting for the connections or the warm-up by default."""
+        component = StartupComponent(StartupClient(send_delay=10.0, listener_delay=10.0))
+        await asyncio.wait_for(component.start(), timeout=1.0)
+        self.assertFalse(component.is_stopped)
+        self.assertLess(component.startup_durations[startup.PHASE_TOTAL], 1.0)
+
+        # the warm-up is finished in the background
+        await component._preflight_task  # pylint: disable=protected-access
+        self.assertEqual(set(component.startup_durations), {startup.PHASE_PREFLIGHT, startup.PHASE_TOTAL})
+
+    async def test_failed_warm_up(self):
+        """Unit test for continuing the startup when the preflight warm-up fails."""
+        client = StartupClient(send_delay=0.0, listener_delay=0.0)
+        component = StartupComponent(client, startup_timeout=5.0)
+        with mock.patch("tools.components.preflight_warm_up", side_effect=RuntimeError("warm-up error")):
+            await component.start()
+        self.assertFalse(component.is_stopped)
+        self.assertEqual(
+            set(component.startup_durations),
+            {startup.PHASE_SEND_CONNECTION, startup.PHASE_LISTENERS, startup.PHASE_TOTAL})
+
+
+if __name__ == '__main__':
+    unittest.main()
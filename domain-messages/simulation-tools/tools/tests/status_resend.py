@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Copyright 2026 Tampere University and VTT Technical Research Centre of Finland
+# This software was developed as a part of the ProCemPlus project: https://www.senecc.fi/projects/procemplus
+# This source code is licensed under the MIT license. See LICENSE in the repository root directory.
+# Author(s): agent <agent@local>
+
+"""Unit tests for the status message resending in AbstractSimulationComponent."""
+
+import asyncio
+import unittest
+
+from aiounittest.case import AsyncTestCase
+
+from tools.messages import MessageGenerator, ResultMessage
+
+from tools.tests.helpers import SIMULATION_ID, RecordingComponent
+
+# the status resend interval in seconds used in the tests
+RESEND_INTERVAL = 0.05
+
+
+class LateInputComponent(RecordingComponent):
+    """Test component that calls start_epoch after each received message, like the LFM component."""
+    def __init__(self, **kwargs):
+        super().__init__(component_name="late", **kwargs)
+
+    async def general_message_handler(self, message_object, message_routing_key):
+        await self.start_epoch()
+
+
+class TestStatusResend(AsyncTestCase):
+    """Unit tests for the status message resending in AbstractSimulationComponent."""
+
+    def setUp(self):
+        self.manager = MessageGenerator(SIMULATION_ID, "manager")
+        self.source = MessageGenerator(SIMULATION_ID, "source")
+
+    async def send_epoch(self, component: LateInputComponent, epoch_number: int) -> None:
+        """Delivers a new Epoch message for the given epoch to the component."""
+        await component.general_message_handler_base(
+            self.manager.get_epoch_message(
+                EpochNumber=epoch_number, TriggeringMessageIds=["manager-1"],
+                StartTime="2020-01-01T00:00:00Z", EndTime="2020-01-01T01:00:00Z"),
+            "Epoch")
+
+    async def send_result(self, component: LateInputComponent, epoch_number: int) -> None:
+        """Delivers a Result message for the given epoch to the component."""
+        await component.general_message_handler_base(
+            self.source.get_message(ResultMessage, EpochNumber=epoch_number, TriggeringMessageIds=["manager-1"]),
+            "Result")
+
+    async def test_late_inputs(self):
+        """Unit test for not resending the status message after the late inputs."""
+        component = LateInputComponent(status_resend_interval=0.0)
+        await component.general_message_handler_base(
+            self.manager.get_simulation_state_message(SimulationState="running"), "SimState")
+        await self.send_epoch(component, 1)
+        self.assertEqual(component.status_epochs, [0, 1])
+
+        for _ in range(3):
+            await self.send_result(component, 1)
+        self.assertEqual(component.status_epochs, [0, 1])
+
+        # a repeated Epoch message is an explicit request to resend the status
+        await self.send_epoch(component, 1)
+        self.assertEqual(component.status_epochs, [0, 1, 1])
+        await self.send_result(component, 1)
+        self.assertEqual(component.status_epochs, [0, 1, 1])
+
+        await self.send_epoch(component, 2)
+        self.assertEqual(component.status_epochs, [0, 1, 1, 2])
+
+    async def test_resend_interval(self):
+        """Unit test for resending the status at the end of the resend interval for the repeated requests
+           received within the interval."""
+        component = LateInputComponent(status_resend_interval=RESEND_INTERVAL)
+        await component.general_message_handler_base(
+            self.manager.get_simulation_state_message(SimulationState="running"), "SimState")
+        await self.send_epoch(component, 1)
+        await self.send_epoch(component, 1)
+        await self.send_epoch(component, 1)
+        self.assertEqual(component.status_epochs, [0, 1])
+
+        # the repeated requests within the interval are answered with one status message
+        await asyncio.sleep(2 * RESEND_INTERVAL)
+        self.assertEqual(component.status_epochs, [0, 1, 1])
+
+        # a request after the interval is answered immediately
+        await self.send_epoch(component, 1)
+        self.assertEqual(component.status_epochs, [0, 1, 1, 1])
+
+        # the delayed resend is cancelled when a new epoch starts or when the component is stopped
+        await self.send_epoch(component, 1)
+        await self.send_epoch(component, 2)
+        await self.send_epoch(component, 2)
+        self.assertEqual(component.status_epochs, [0, 1, 1, 1, 2])
+        await component.stop()
+        await asyncio.sleep(2 * RESEND_INTERVAL)
+        self.assertEqual(component.status_epochs, [0, 1, 1, 1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
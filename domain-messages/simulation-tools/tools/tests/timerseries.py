@@ -15,7 +15,8 @@ import unittest
 
 from tools.datetime_tools import to_iso_format_datetime_string
 from tools.exceptions.messages import MessageDateError, MessageValueError, MessageUnitValueError
-from tools.message.unit import UnitCode
+from tools.message.unit import UnitCode, get_parsed_unit_description, parse_unit_code
+from tools.message import block, unit
 from tools.message.block import ValueArrayBlock, TimeSeriesBlock, QuantityArrayBlock
 
 
@@ -90,6 +91,42 @@ class TestUnitCode(unittest.TestCase):
             with self.subTest(invalid_code=invalid_code):
                 self.assertFalse(UnitCode.is_valid(invalid_code))
 
+    def test_unit_code_grammar(self):
+        """Unit test for validating the unit codes that are not in the premade unit code lists."""
+        valid_codes = {
+            "kW.h": "kilowatt * hour",
+            "{EUR}/(MW.h)": "EUR / (megawatt * hour)",
+            "kg.m2.s-2": "kilogram * meter^2 * second^-2",
+            "/min": "per minute",
+            "10*6.[in_i]3": "the number ten for arbitrary powers^6 * inch^3"
+        }
+        invalid_codes = ["kWh", "kW..h", "(kW.h", "kW)", "m{", "W/", "Kikg", "[in_i", "\u00b2"]
+
+        for valid_code, description in valid_codes.items():
+            with self.subTest(valid_code=valid_code):
+                self.assertEqual(parse_unit_code(valid_code), description)
+                self.assertTrue(UnitCode.is_valid(valid_code))
+                self.assertEqual(UnitCode.get_description(valid_code), description)
+        for invalid_code in invalid_codes:
+            with self.subTest(invalid_code=invalid_code):
+                self.assertIsNone(parse_unit_code(invalid_code))
+                self.assertFalse(UnitCode.is_valid(invalid_code))
+                self.assertIsNone(UnitCode.get_description(invalid_code))
+
+        # the parsed unit codes are kept in a bounded cache instead of the premade unit code list
+        self.assertNotIn("kW.h", UnitCode.UNIT_CODE_LIST)
+        self.assertLessEqual(get_parsed_unit_description.cache_info().currsize, unit.PARSED_UNIT_CODE_CACHE_SIZE)
+
+    def test_non_ucum_unit_codes(self):
+        """Unit test for the platform specific unit codes that are not UCUM codes."""
+        self.assertEqual(UnitCode.get_description("EUR"), "euro")
+        self.assertEqual(UnitCode.get_description("Minute"), "minute")
+        self.assertNotIn("EUR", UnitCode.UNIT_CODE_LIST)
+        self.assertNotIn("Minute", UnitCode.UNIT_CODE_LIST)
+        self.assertFalse(UnitCode.is_valid("EUR", allow_non_ucum=False))
+        self.assertFalse(UnitCode.is_valid("Minute", allow_non_ucum=False))
+        self.assertTrue(UnitCode.is_valid("min", allow_non_ucum=False))
+
 
 class TestValueArrayBlock(unittest.TestCase):
     """Unit tests for the ValueArrayBlock class."""
@@ -270,5 +307,102 @@ class TestTimeSeriesBlock(unittest.TestCase):
                           "Z", ValueArrayBlock(**attribute_valid_3))
 
 
+@unittest.skipIf(not block.NUMPY_AVAILABLE, "numpy is not installed")
+class TestArrayBackedBlocks(unittest.TestCase):
+    """Unit tests for the blocks that use NumPy arrays."""
+
+    def setUp(self):
+        start_time = datetime.datetime(2020, 6, 3, 4, tzinfo=datetime.timezone.utc)
+        self.time_index = [
+            to_iso_format_datetime_string(start_time + datetime.timedelta(minutes=15 * index))
+            for index in range(96)
+        ]
+        self.values = [index * 0.25 - 10.0 for index in range(96)]
+        self.block_json = {
+            "TimeIndex": self.time_index,
+            "Series": {"Power": {"UnitOfMeasure": "kW", "Values": self.values}}
+        }
+
+    def tearDown(self):
+        ValueArrayBlock.ARRAY_BACKING = False
+
+    def test_array_values(self):
+        """Unit test for giving the values as NumPy arrays."""
+        numpy = block.get_numpy()
+        list_block = ValueArrayBlock(Values=self.values, UnitOfMeasure="kW")
+        array_block = ValueArrayBlock(Values=numpy.array(self.values), UnitOfMeasure="kW")
+        quantity_array_block = QuantityArrayBlock(Values=numpy.arange(3), UnitOfMeasure="kW")
+
+        # the values are always given as a list while values_array gives the stored array
+        self.assertIsInstance(array_block.values, list)
+        self.assertEqual(array_block.values, self.values)
+        self.assertEqual(array_block.values_array.dtype, numpy.float64)
+        self.assertIs(array_block.values_array, array_block.values_array)
+        self.assertEqual(array_block.json(), list_block.json())
+        self.assertEqual(array_block, list_block)
+        self.assertEqual(list_block, array_block)
+        self.assertNotEqual(array_block, ValueArrayBlock(Values=self.values[:-1] + [0.0], UnitOfMeasure="kW"))
+        self.assertTrue(numpy.array_equal(list_block.values_array, array_block.values_array))
+
+        # the integer arrays keep their integer type
+        self.assertEqual(quantity_array_block.values, [0, 1, 2])
+        self.assertEqual(quantity_array_block.values_array.dtype.kind, "i")
+        self.assertEqual(quantity_array_block.json(), {"UnitOfMeasure": "kW", "Values": [0, 1, 2]})
+        self.assertEqual(quantity_array_block, QuantityArrayBlock(Values=[0, 1, 2], UnitOfMeasure="kW"))
+        self.assertEqual(
+            QuantityArrayBlock(Values=numpy.array([1.5], dtype="float32"), UnitOfMeasure="kW").values_array.dtype,
+            numpy.float64)
+        self.assertRaises(ValueError, getattr, ValueArrayBlock(Values=["a"], UnitOfMeasure="kW"), "values_array")
+
+        for invalid_values in [numpy.array([1.0, numpy.nan]), numpy.array(["1.0"]), numpy.zeros((2, 2))]:
+            with self.subTest(invalid_values=invalid_values):
+                self.assertRaises(MessageValueError, ValueArrayBlock, Values=invalid_values, UnitOfMeasure="kW")
+
+        # with array backing, only the lists containing just floats are stored as arrays
+        ValueArrayBlock.ARRAY_BACKING = True
+        backed_block = ValueArrayBlock(Values=self.values, UnitOfMeasure="kW")
+        self.assertIsInstance(backed_block.values_array, numpy.ndarray)
+        self.assertEqual(backed_block.values, self.values)
+        self.assertEqual(backed_block.json(), list_block.json())
+        int_values = list(range(96))
+        self.assertIs(ValueArrayBlock(Values=int_values, UnitOfMeasure="kW").values, int_values)
+
+    def test_array_time_index(self):
+        """Unit test for the time index validated in bulk and given as a NumPy array."""
+        numpy = block.get_numpy()
+        list_block = TimeSeriesBlock(**self.block_json)
+        self.assertEqual(list_block.time_index, self.time_index)
+        self.assertEqual(list_block.time_index_array.dtype, numpy.dtype("datetime64[ms]"))
+        self.assertEqual(list_block.json(), self.block_json)
+
+        array_block = TimeSeriesBlock(
+            TimeIndex=list_block.time_index_array,
+            Series={"Power": ValueArrayBlock(Values=numpy.array(self.values), UnitOfMeasure="kW")})
+        self.assertEqual(array_block.time_index, self.time_index)
+        self.assertEqual(array_block, list_block)
+        self.assertEqual(array_block.json(), self.block_json)
+
+        # the strings that are not in the canonical format are converted one by one
+        other_format_block = TimeSeriesBlock(**{
+            **self.block_json,
+            "TimeIndex": [datetime_value.replace(".000Z", "+00:00") for datetime_value in self.time_index]
+        })
+        self.assertEqual(other_format_block, list_block)
+        self.assertTrue(numpy.array_equal(other_format_block.time_index_array, list_block.time_index_array))
+
+        # the array follows the in place modifications of the time index list
+        other_format_block.time_index[0] = "2019-12-31T00:00:00.000Z"
+        self.assertEqual(other_format_block.time_index_array[0], numpy.datetime64("2019-12-31T00:00:00.000"))
+        self.assertEqual(list_block.time_index_array[0], numpy.datetime64(self.time_index[0][:-1]))
+
+        invalid_time_index = self.time_index[:-1] + ["2020-02-30T00:00:00.000Z"]
+        self.assertRaises(MessageDateError, TimeSeriesBlock, **{**self.block_json, "TimeIndex": invalid_time_index})
+        self.assertRaises(MessageValueError, TimeSeriesBlock,
+                          **{**self.block_json, "TimeIndex": self.time_index[:-1]})
+        self.assertRaises(MessageDateError, setattr, list_block, "time_index", self.time_index[:-1])
+        self.assertRaises(MessageDateError, TimeSeriesBlock,
+                          **{**self.block_json, "TimeIndex": numpy.array(self.values)})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,7 +9,7 @@
 import logging
 import unittest
 
-from tools.tools import FullLogger, load_environmental_variables
+from tools.tools import FullLogger, LogSampler, load_environmental_variables
 
 
 def add_log_message(logger: FullLogger, check_list: list, log_level: int, log_message: str):
@@ -108,6 +108,21 @@ class TestTools(unittest.TestCase):
             logger.error("Error test")
             add_log_message(logger, check_logs, logging.CRITICAL, "Critical test")
         self.assertEqual(test_logger.output, check_logs)
+        self.assertTrue(logger.is_enabled_for(logging.CRITICAL))
+        self.assertFalse(logger.is_enabled_for(logging.ERROR))
+
+    def test_log_sampler(self):
+        """Unit test for the LogSampler class."""
+        sampler = LogSampler(1)
+        self.assertTrue(all(sampler.should_log("topic") for _ in range(5)))
+
+        sampler = LogSampler(3)
+        self.assertEqual(sampler.sample_interval, 3)
+        self.assertEqual([sampler.should_log("topic.a") for _ in range(7)],
+                         [True, False, False, True, False, False, True])
+        # the events are counted separately for each key
+        self.assertTrue(sampler.should_log("topic.b"))
+        self.assertFalse(sampler.should_log("topic.a"))
 
 
 if __name__ == '__main__':
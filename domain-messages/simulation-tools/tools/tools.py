@@ -17,6 +17,8 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, cast
 SIMULATION_LOG_LEVEL = "SIMULATION_LOG_LEVEL"
 SIMULATION_LOG_FILE = "SIMULATION_LOG_FILE"
 SIMULATION_LOG_FORMAT = "SIMULATION_LOG_FORMAT"
+# Only every Nth message received from or sent to a topic is logged in the message handling logs.
+SIMULATION_LOG_MESSAGE_SAMPLING = "SIMULATION_LOG_MESSAGE_SAMPLING"
 
 EnvironmentVariableValue = Union[bool, int, float, str]
 EnvironmentVariableType = Union[Type[bool], Type[int], Type[float], Type[str]]
@@ -142,7 +144,8 @@ LOGGING_MSEC_FORMAT = "%s.%03d"
 COMMON_ENV_VARIABLES = load_environmental_variables(
     (SIMULATION_LOG_LEVEL, int, logging.DEBUG),
     (SIMULATION_LOG_FILE, str, DEFAULT_LOGFILE_NAME),
-    (SIMULATION_LOG_FORMAT, str, DEFAULT_LOGFILE_FORMAT)
+    (SIMULATION_LOG_FORMAT, str, DEFAULT_LOGFILE_FORMAT),
+    (SIMULATION_LOG_MESSAGE_SAMPLING, int, 1)
 )
 
 
@@ -191,6 +194,11 @@ class FullLogger:
         """Writes log message with CRITICAL logging level."""
         self.__logger.critical(message, *args)
 
+    def is_enabled_for(self, log_level: int) -> bool:
+        """Returns True, if a log message with the given logging level would be written.
+           Can be used to avoid building expensive log messages that would not be written anyway."""
+        return self.__logger.isEnabledFor(log_level)
+
     @property
     def level(self) -> int:
         """Returns the logging level of the logger."""
@@ -240,6 +248,34 @@ def get_logger(logger_name: str, log_level: Optional[int] = None) -> logging.Log
 LOGGER = FullLogger(__name__)
 
 
+class LogSampler:
+    """Class for deciding which of the repeated log events, for example received messages, are written to the log.
+       The events are counted separately for each key, e.g. a topic name, and the first event and after that every
+       Nth event for each key is selected. This keeps the logs readable and cheap for high-rate topics."""
+
+    def __init__(self, sample_interval: Optional[int] = None):
+        """Creates a new log sampler. If sample_interval is None, the value is determined by the environment
+           variable SIMULATION_LOG_MESSAGE_SAMPLING. Values less than 2 mean that every event is logged."""
+        if sample_interval is None:
+            sample_interval = cast(int, COMMON_ENV_VARIABLES[SIMULATION_LOG_MESSAGE_SAMPLING])
+        self.__sample_interval = max(sample_interval, 1)
+        self.__event_counts: Dict[str, int] = {}
+
+    @property
+    def sample_interval(self) -> int:
+        """Only every Nth event for each key is selected where N is the sample interval."""
+        return self.__sample_interval
+
+    def should_log(self, key: str) -> bool:
+        """Registers a new event for the given key and returns True if the event should be logged."""
+        if self.__sample_interval == 1:
+            return True
+
+        event_count = self.__event_counts.get(key, 0)
+        self.__event_counts[key] = event_count + 1
+        return event_count % self.__sample_interval == 0
+
+
 def traceback_to_str(traceback: Optional[TracebackType]) -> str:
     """Return a string representation of the given traceback."""
     if isinstance(traceback, TracebackType):
@@ -12,10 +12,12 @@ from typing import Any, cast, Set, Union
 
 
 from tools.message.abstract import validate_json
-from tools.components import AbstractSimulationComponent
+from tools.callbacks import MessageHeader
+from tools.components import AbstractSimulationComponent, SIMULATION_MESSAGE_DEDUPLICATION
 from tools.exceptions.messages import MessageError
-from tools.messages import BaseMessage,StatusMessage,EpochMessage
-from tools.tools import FullLogger, load_environmental_variables, log_exception
+from tools.hosting import SimulationComponentHost, hosting_enabled
+from tools.messages import BaseMessage,StatusMessage,EpochMessage,SimulationStateMessage
+from tools.tools import FullLogger, EnvironmentVariable, load_environmental_variables, log_exception
 from tools.message.block import TimeSeriesBlock, ValueArrayBlock
 from tools.datetime_tools import to_utc_datetime_object
 
@@ -65,11 +67,18 @@ class LFM(AbstractSimulationComponent):
     """
     This is procem LFM component, see wiki for proper description.
     """
-    def __init__(self, procurers: str, producers, market_open_hour, market_closing_hour):
+    def __init__(self, procurers: str, producers, market_open_hour, market_closing_hour, **kwargs: Any):
         # This will initialize various variables including the message client for message bus access.
+        # The keyword arguments are passed to AbstractSimulationComponent, e.g. simulation_id and rabbitmq_client
+        # when the component is run by SimulationComponentHost.
         LOGGER.info("LFM constructor: procurers: {}".format(procurers))
         LOGGER.info("LFM constructor: producers: {}".format(producers))
-        super().__init__()
+        # The repeated deliveries are dropped by default in the LFM. The caller or the environment variable
+        # SIMULATION_MESSAGE_DEDUPLICATION can still switch the deduplication off.
+        if kwargs.get("message_deduplication", None) is None:
+            kwargs["message_deduplication"] = cast(
+                bool, EnvironmentVariable(SIMULATION_MESSAGE_DEDUPLICATION, bool, True).value)
+        super().__init__(**kwargs)
 
         self._other_topics = [
             FLEXNEED_TOPIC_PREFIX + self.component_name,
@@ -218,6 +227,49 @@ class LFM(AbstractSimulationComponent):
         return True
 
 
+    def message_prefilter(self, message_header: MessageHeader, message_routing_key: str) -> bool:
+        """
+        Discards the non-control messages that arrive before the first epoch without decoding them.
+        The epoch number is tracked from the epoch message headers, since _latest_epoch is only updated
+        once the epoch message has been handled.
+        """
+        if not super().message_prefilter(message_header, message_routing_key):
+            return False
+
+        if (self._latest_prefiltered_epoch == 0 and
+                message_header.message_type not in (EpochMessage.CLASS_MESSAGE_TYPE,
+                                                    SimulationStateMessage.CLASS_MESSAGE_TYPE)):
+            LOGGER.debug("message_prefilter: discarding {} message received before the first epoch".format(
+                message_header.message_type))
+            return False
+        return True
+
+    def get_health_status(self) -> dict:
+        """
+        Adds the open market state to the health status: the numbers of open needs, offers and results
+        and the producers and procurers the market is still waiting for in the current epoch.
+        """
+        health_status = super().get_health_status()
+
+        waiting_producers = set()
+        for need in self._needs:
+            expected_counts = self._expected_offer_count.get(need.congestion_id, {})
+            received_counts = self._received_offer_count.get(need.congestion_id, {})
+            if not isinstance(expected_counts, dict) or not isinstance(received_counts, dict):
+                continue
+            for producer in self._producers:
+                if expected_counts.get(producer, None) is None or \
+                        received_counts.get(producer, 0) != expected_counts[producer]:
+                    waiting_producers.add(producer)
+
+        health_status["OpenNeeds"] = len(self._needs)
+        health_status["OpenOffers"] = len(self._offers)
+        health_status["Results"] = len(self._results)
+        health_status["WaitingForProducers"] = sorted(waiting_producers)
+        health_status["WaitingForProcurers"] = sorted(
+            procurer for procurer, is_ready in self._procurersReady.items() if not is_ready)
+        return health_status
+
     async def general_message_handler(self, message_object: Union[BaseMessage, Any],
                                       message_routing_key: str) -> None:
         LOGGER.info("general_message_handler: begin general_message_handler")
@@ -309,7 +361,7 @@ class LFM(AbstractSimulationComponent):
 
     async def _publishRequest( self, flexneed_msg: FlexibilityNeedMessage ):
         LOGGER.info("_publishRequest: Generating Request msg")
-        result_msg = self._message_generator.get_message(
+        result_msg = self._message_generator.get_trusted_message(
             RequestMessage,
             EpochNumber=self._latest_epoch,
             TriggeringMessageIds=self._triggering_message_ids,
@@ -326,7 +378,7 @@ class LFM(AbstractSimulationComponent):
         LOGGER.info("_publishRequest: Publishing Request msg")
         await self._rabbitmq_client.send_message(
             topic_name=self._request_topic,
-            message_bytes=result_msg.bytes()
+            message_bytes=result_msg
         )
         LOGGER.info("_publishRequest: Done")
 
@@ -349,7 +401,7 @@ class LFM(AbstractSimulationComponent):
 
                     if offer_count == 0:
                         LOGGER.info("_publishOpenOffers: generating empty LFMOfferingMessage ")
-                        result_msg = self._message_generator.get_message(
+                        result_msg = self._message_generator.get_trusted_message(
                             LFMOfferingMessage,
                             EpochNumber=self._latest_epoch,
                             TriggeringMessageIds=self._triggering_message_ids,
@@ -367,7 +419,7 @@ class LFM(AbstractSimulationComponent):
                         LOGGER.info("_publishOpenOffers: Publishing empty LFMOffering msg")
                         await self._rabbitmq_client.send_message(
                             topic_name=self._market_offering_topic + procurer,
-                            message_bytes=result_msg.bytes()
+                            message_bytes=result_msg
                         )
 
                     else:
@@ -375,7 +427,7 @@ class LFM(AbstractSimulationComponent):
                             if offer.congestion_id == need.congestion_id and offer.offer_count != 0:
 
                                 LOGGER.info("_publishOpenOffers: generating LFMOfferingMessage for offer_id: {}".format( offer.offer_id ))
-                                result_msg = self._message_generator.get_message(
+                                result_msg = self._message_generator.get_trusted_message(
                                     LFMOfferingMessage,
                                     EpochNumber=self._latest_epoch,
                                     TriggeringMessageIds=self._triggering_message_ids,
@@ -393,13 +445,13 @@ class LFM(AbstractSimulationComponent):
                                 LOGGER.info("_publishOpenOffers: publishing LFMOfferingMessage for offer_id: {}".format( offer.offer_id ))
                                 await self._rabbitmq_client.send_message(
                                     topic_name=self._market_offering_topic + procurer,
-                                    message_bytes=result_msg.bytes()
+                                    message_bytes=result_msg
                                 )
 
     async def _publishMarketResult(self, result_index: int):
         LOGGER.info("_publishMarketResult: Generating LFMMarketResult msg")
         if result_index < 0:
-            result_msg = self._message_generator.get_message(
+            result_msg = self._message_generator.get_trusted_message(
                 LFMMarketResultMessage,
                 EpochNumber=self._latest_epoch,
                 TriggeringMessageIds=self._triggering_message_ids,
@@ -417,7 +469,7 @@ class LFM(AbstractSimulationComponent):
             LOGGER.info("_publishMarketResult: Publishing empty LFMMarketResult msg")
             await self._rabbitmq_client.send_message(
                 topic_name=self._market_result_topic,
-                message_bytes=result_msg.bytes()
+                message_bytes=result_msg
             )
         else:
             accepted_offer_msg = self._results[result_index]
@@ -428,7 +480,7 @@ class LFM(AbstractSimulationComponent):
                     total_results = total_results + 1
 
 
-            result_msg = self._message_generator.get_message(
+            result_msg = self._message_generator.get_trusted_message(
                 LFMMarketResultMessage,
                 EpochNumber=self._latest_epoch,
                 TriggeringMessageIds=self._triggering_message_ids,
@@ -446,7 +498,7 @@ class LFM(AbstractSimulationComponent):
         LOGGER.info("_publishMarketResult: Publishing LFMMarketResult msg")
         await self._rabbitmq_client.send_message(
             topic_name=self._market_result_topic,
-            message_bytes=result_msg.bytes()
+            message_bytes=result_msg
         )
         LOGGER.info("_publishMarketResult: Done")
 
@@ -508,9 +560,10 @@ class LFM(AbstractSimulationComponent):
         else:
             return True
 
-def create_component() -> LFM:
+def create_component(**kwargs: Any) -> LFM:
     """
-    Creates and returns the componet
+    Creates and returns the componet.
+    The keyword arguments are passed to the AbstractSimulationComponent constructor.
     """
     environment_variables = load_environmental_variables(
         (MARKET_OPENING_TIME, float, 0),
@@ -523,7 +576,8 @@ def create_component() -> LFM:
         procurers=environment_variables[FLEXIBILITY_PROCURER_LIST],
         producers=environment_variables[FLEXIBILITY_PROVIDER_LIST],
         market_open_hour=environment_variables[MARKET_OPENING_TIME],
-        market_closing_hour=environment_variables[MARKET_CLOSING_TIME]
+        market_closing_hour=environment_variables[MARKET_CLOSING_TIME],
+        **kwargs
     )
 
 
@@ -532,6 +586,15 @@ async def start_component():
     Creates and starts the component.
     """
     try:
+        if hosting_enabled():
+            # run the LFM components for several simulations in this process
+            component_host = SimulationComponentHost(create_component)
+            await component_host.start()
+
+            while not component_host.is_stopped:
+                await asyncio.sleep(TIMEOUT)
+            return
+
         LFM_component = create_component()
 
         await LFM_component.start()